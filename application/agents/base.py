@@ -3,11 +3,9 @@ import uuid
 from abc import ABC, abstractmethod
 from typing import Dict, Generator, List, Optional
 
-from bson.objectid import ObjectId
-
 from application.agents.tools.tool_action_parser import ToolActionParser
 from application.agents.tools.tool_manager import ToolManager
-from application.core.mongo_db import MongoDB
+from application.core.data_loader import RequestDataLoader
 from application.core.settings import settings
 from application.llm.handlers.handler_creator import LLMHandlerCreator
 from application.llm.llm_creator import LLMCreator
@@ -35,6 +33,7 @@ class BaseAgent(ABC):
         limited_request_mode: Optional[bool] = False,
         request_limit: Optional[int] = settings.DEFAULT_AGENT_LIMITS["request_limit"],
         compressed_summary: Optional[str] = None,
+        data_loader: Optional[RequestDataLoader] = None,
     ):
         self.endpoint = endpoint
         self.llm_name = llm_name
@@ -66,6 +65,7 @@ class BaseAgent(ABC):
         self.limited_request_mode = limited_request_mode
         self.request_limit = request_limit
         self.compressed_summary = compressed_summary
+        self.data_loader = data_loader or RequestDataLoader()
         self.current_token_count = 0
         self.context_limit_reached = False
 
@@ -82,32 +82,16 @@ class BaseAgent(ABC):
         pass
 
     def _get_tools(self, api_key: str = None) -> Dict[str, Dict]:
-        mongo = MongoDB.get_client()
-        db = mongo[settings.MONGO_DB_NAME]
-        agents_collection = db["agents"]
-        tools_collection = db["user_tools"]
-
-        agent_data = agents_collection.find_one({"key": api_key or self.user_api_key})
+        agent_data = self.data_loader.get_agent(api_key=api_key or self.user_api_key)
         tool_ids = agent_data.get("tools", []) if agent_data else []
 
-        tools = (
-            tools_collection.find(
-                {"_id": {"$in": [ObjectId(tool_id) for tool_id in tool_ids]}}
-            )
-            if tool_ids
-            else []
-        )
-        tools = list(tools)
+        tools = self.data_loader.get_tools(tool_ids) if tool_ids else []
         tools_by_id = {str(tool["_id"]): tool for tool in tools} if tools else {}
 
         return tools_by_id
 
     def _get_user_tools(self, user="local"):
-        mongo = MongoDB.get_client()
-        db = mongo[settings.MONGO_DB_NAME]
-        user_tools_collection = db["user_tools"]
-        user_tools = user_tools_collection.find({"user": user, "status": True})
-        user_tools = list(user_tools)
+        user_tools = self.data_loader.get_user_tools(user)
 
         return {str(i): tool for i, tool in enumerate(user_tools)}
 
@@ -10,6 +10,8 @@ class APITool(Tool):
     A flexible tool for performing various API actions (e.g., sending messages, retrieving data) via custom user-specified APIs
     """
 
+    parallel_safe = True
+
     def __init__(self, config):
         self.config = config
         self.url = config.get("url", "")
@@ -2,6 +2,12 @@ from abc import ABC, abstractmethod
 
 
 class Tool(ABC):
+    # Tools whose actions are independent I/O (HTTP APIs, search, MCP) can
+    # run concurrently with other calls from the same LLM turn.
+    parallel_safe = False
+    # Upper bound on concurrent executions of this tool per process
+    max_concurrency = 4
+
     @abstractmethod
     def execute_action(self, action_name: str, **kwargs):
         pass
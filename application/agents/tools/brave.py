@@ -9,6 +9,9 @@ class BraveSearchTool(Tool):
     Requires an API key for authentication.
     """
 
+    parallel_safe = True
+    max_concurrency = 2  # search APIs rate-limit bursts
+
     def __init__(self, config):
         self.config = config
         self.token = config.get("token", "")
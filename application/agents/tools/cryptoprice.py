@@ -53,6 +53,7 @@ class CryptoPriceTool(Tool):
             {
                 "name": "cryptoprice_get",
                 "description": "Retrieve the price of a specified cryptocurrency in a given currency",
+                "cache_ttl": 60,
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -8,6 +8,9 @@ class DuckDuckGoSearchTool(Tool):
     A tool for performing web and image searches using DuckDuckGo.
     """
 
+    parallel_safe = True
+    max_concurrency = 2  # search APIs rate-limit bursts
+
     def __init__(self, config):
         self.config = config
 
@@ -0,0 +1,285 @@
+"""
+Process-wide pool of connected MCP client sessions.
+
+Opening an MCP session costs a transport connect plus the ``initialize``
+handshake. The pool keeps ``fastmcp.Client`` sessions open on a long-lived
+background event loop (:class:`BackgroundEventLoop`) that owns every MCP
+client in the process, keyed by (server_url, transport, auth identity), so
+calls on a warm session skip the handshake entirely. Calls on the same
+session run concurrently; MCP multiplexes requests over one connection.
+Sessions idle longer than ``idle_timeout`` are closed, the least recently
+used one is evicted beyond ``max_sessions``, and a session idle longer
+than ``probe_interval`` is pinged before it is reused. ``list_tools``
+results are cached per key for ``tools_ttl`` seconds.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastmcp.exceptions import McpError, ToolError
+
+from application.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[[], Any]
+Operation = Callable[[Any], Awaitable[Any]]
+
+
+class BackgroundEventLoop:
+    """An asyncio loop running forever on a daemon thread.
+
+    Synchronous code hands coroutines to :meth:`submit` and gets a
+    ``concurrent.futures.Future`` back, so many coroutines can be in flight
+    at once without blocking the caller's thread. The thread is (re)started
+    lazily so forked workers get their own.
+    """
+
+    def __init__(self, name: str = "mcp-event-loop"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        if self.is_running():
+            return self._loop
+        with self._lock:
+            if not self.is_running():
+                self._pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name=self.name, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule ``coro`` on the loop and return a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the loop and wait up to ``timeout`` for its result."""
+        if self.is_running() and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the background loop from itself")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Operation timed out after {timeout}s")
+
+
+class _PooledSession:
+    def __init__(self, client):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.active = 0
+        self.broken = False
+
+
+class MCPSessionPool:
+    """Keeps MCP client sessions connected between tool calls.
+
+    All sessions live on ``event_loop``; synchronous callers use :meth:`run`
+    to wait for a result or :meth:`submit` to get a future.
+    """
+
+    def __init__(
+        self,
+        event_loop: BackgroundEventLoop,
+        max_sessions: int = 64,
+        idle_timeout: float = 300.0,
+        probe_interval: float = 60.0,
+        tools_ttl: float = 300.0,
+    ):
+        self.event_loop = event_loop
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.probe_interval = probe_interval
+        self.tools_ttl = tools_ttl
+        self._sessions: "OrderedDict[Hashable, _PooledSession]" = OrderedDict()
+        self._connect_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._tools: Dict[Hashable, Tuple[float, List[Any]]] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def submit(
+        self,
+        key: Hashable,
+        client_factory: ClientFactory,
+        operation: Operation,
+    ) -> concurrent.futures.Future:
+        """Schedule ``operation(client)`` on the pooled session for ``key``.
+
+        ``client_factory`` builds a new, unconnected ``fastmcp.Client`` when
+        no warm session exists for ``key``.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Sessions inherited across a fork belong to the parent's loop
+                self._sessions.clear()
+                self._connect_locks.clear()
+                self._pid = os.getpid()
+        return self.event_loop.submit(self._run(key, client_factory, operation))
+
+    def run(
+        self,
+        key: Hashable,
+        client_factory: ClientFactory,
+        operation: Operation,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run ``operation(client)`` on the pooled session and wait for it."""
+        future = self.submit(key, client_factory, operation)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"MCP operation timed out after {timeout}s")
+
+    def list_tools(
+        self,
+        key: Hashable,
+        client_factory: ClientFactory,
+        timeout: Optional[float] = None,
+        refresh: bool = False,
+    ) -> List[Any]:
+        """Return the server's tools, served from cache within ``tools_ttl``."""
+        cached = self._tools.get(key)
+        if (
+            cached is not None
+            and not refresh
+            and time.monotonic() - cached[0] < self.tools_ttl
+        ):
+            return cached[1]
+        tools = self.run(key, client_factory, lambda client: client.list_tools(), timeout)
+        self._tools[key] = (time.monotonic(), tools)
+        return tools
+
+    def close_all(self, timeout: float = 5.0) -> None:
+        """Close every pooled session and drop cached tool schemas."""
+        self._tools.clear()
+        if not self.event_loop.is_running():
+            return
+        future = self.event_loop.submit(self._close_all())
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Failed to close MCP sessions: {e}")
+
+    async def _run(
+        self, key: Hashable, client_factory: ClientFactory, operation: Operation
+    ) -> Any:
+        session = await self._acquire(key, client_factory)
+        session.active += 1
+        try:
+            return await operation(session.client)
+        except (McpError, ToolError):
+            # The server answered, so the session itself is healthy
+            raise
+        except Exception:
+            # New calls reconnect; the broken session closes once unused
+            session.broken = True
+            self._forget(key, session)
+            raise
+        finally:
+            session.active -= 1
+            session.last_used = time.monotonic()
+            if session.broken and session.active == 0:
+                await self._close(key, session)
+
+    async def _acquire(
+        self, key: Hashable, client_factory: ClientFactory
+    ) -> _PooledSession:
+        await self._evict_idle()
+        connect_lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with connect_lock:
+            session = self._sessions.get(key)
+            if (
+                session is not None
+                and session.active == 0
+                and time.monotonic() - session.last_used > self.probe_interval
+                and not await self._is_alive(session)
+            ):
+                await self._discard(key, session)
+                session = None
+            if session is None:
+                client = client_factory()
+                await client.__aenter__()
+                session = _PooledSession(client)
+                self._sessions[key] = session
+                await self._evict_overflow(keep=key)
+            self._sessions.move_to_end(key)
+            return session
+
+    async def _is_alive(self, session: _PooledSession) -> bool:
+        if not session.client.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(session.client.ping(), timeout=5)
+        except McpError:
+            # Ping not supported by the server, but it responded
+            return True
+        except Exception:
+            return False
+        return True
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if session.active == 0 and now - session.last_used > self.idle_timeout:
+                await self._discard(key, session)
+
+    async def _evict_overflow(self, keep: Hashable) -> None:
+        for key, session in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if key != keep and session.active == 0:
+                await self._discard(key, session)
+
+    def _forget(self, key: Hashable, session: _PooledSession) -> None:
+        if self._sessions.get(key) is session:
+            del self._sessions[key]
+
+    async def _discard(self, key: Hashable, session: _PooledSession) -> None:
+        self._forget(key, session)
+        await self._close(key, session)
+
+    async def _close(self, key: Hashable, session: _PooledSession) -> None:
+        try:
+            await session.client.close()
+        except Exception as e:
+            logger.debug(f"Error closing MCP session {key}: {e}")
+
+    async def _close_all(self) -> None:
+        for key, session in list(self._sessions.items()):
+            await self._discard(key, session)
+
+
+mcp_event_loop = BackgroundEventLoop()
+mcp_session_pool = MCPSessionPool(
+    mcp_event_loop,
+    max_sessions=settings.MCP_MAX_SESSIONS,
+    idle_timeout=settings.MCP_SESSION_IDLE_TIMEOUT_SECONDS,
+    probe_interval=settings.MCP_SESSION_PROBE_INTERVAL_SECONDS,
+    tools_ttl=settings.MCP_TOOLS_CACHE_TTL_SECONDS,
+)
+atexit.register(mcp_session_pool.close_all)
@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import hashlib
 import json
 import logging
 import time
@@ -7,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
 from application.agents.tools.base import Tool
+from application.agents.tools.mcp_session_pool import mcp_session_pool
 from application.api.user.tasks import mcp_oauth_status_task, mcp_oauth_task
 from application.cache import get_redis_instance
 
@@ -31,7 +33,7 @@ from redis import Redis
 mongo = MongoDB.get_client()
 db = mongo[settings.MONGO_DB_NAME]
 
-_mcp_clients_cache = {}
+logger = logging.getLogger(__name__)
 
 
 class MCPTool(Tool):
@@ -40,6 +42,10 @@ class MCPTool(Tool):
     Connect to remote Model Context Protocol (MCP) servers to access dynamic tools and resources.
     """
 
+    parallel_safe = True
+    # Calls share pooled sessions on one event loop instead of a loop each
+    max_concurrency = 8
+
     def __init__(self, config: Dict[str, Any], user_id: Optional[str] = None):
         """
         Initialize the MCP Tool with configuration.
@@ -82,42 +88,33 @@ class MCPTool(Tool):
         self._cache_key = self._generate_cache_key()
         self._client = None
 
-        # Only validate and setup if server_url is provided and not OAuth
-
-        if self.server_url and self.auth_type != "oauth":
-            self._setup_client()
-
-    def _generate_cache_key(self) -> str:
-        """Generate a unique cache key for this MCP server configuration."""
-        auth_key = ""
+    def _generate_cache_key(self) -> tuple:
+        """Key pooled sessions by server, transport and auth identity."""
         if self.auth_type == "oauth":
             scopes_str = ",".join(self.oauth_scopes) if self.oauth_scopes else "none"
-            auth_key = f"oauth:{self.oauth_client_name}:{scopes_str}"
-        elif self.auth_type in ["bearer"]:
-            token = self.auth_credentials.get(
-                "bearer_token", ""
-            ) or self.auth_credentials.get("access_token", "")
-            auth_key = f"bearer:{token[:10]}..." if token else "bearer:none"
-        elif self.auth_type == "api_key":
-            api_key = self.auth_credentials.get("api_key", "")
-            auth_key = f"apikey:{api_key[:10]}..." if api_key else "apikey:none"
-        elif self.auth_type == "basic":
-            username = self.auth_credentials.get("username", "")
-            auth_key = f"basic:{username}"
+            # OAuth tokens are stored per user, so sessions must be too
+            auth_key = f"oauth:{self.oauth_client_name}:{scopes_str}:{self.user_id}"
         else:
-            auth_key = "none"
-        return f"{self.server_url}#{self.transport_type}#{auth_key}"
+            identity = json.dumps(
+                {
+                    "credentials": self.auth_credentials,
+                    "headers": self.custom_headers,
+                    "command": self.config.get("command"),
+                    "args": self.config.get("args"),
+                },
+                sort_keys=True,
+                default=str,
+            )
+            fingerprint = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+            auth_key = f"{self.auth_type}:{fingerprint}"
+        return (self.server_url, self.transport_type, auth_key)
 
     def _setup_client(self):
-        """Setup FastMCP client with proper transport and authentication."""
-        global _mcp_clients_cache
-        if self._cache_key in _mcp_clients_cache:
-            cached_data = _mcp_clients_cache[self._cache_key]
-            if time.time() - cached_data["created_at"] < 1800:
-                self._client = cached_data["client"]
-                return
-            else:
-                del _mcp_clients_cache[self._cache_key]
+        """Setup a standalone FastMCP client, outside the session pool."""
+        self._client = self._create_client()
+
+    def _create_client(self) -> Client:
+        """Create a FastMCP client with proper transport and authentication."""
         transport = self._create_transport()
         auth = None
 
@@ -138,11 +135,7 @@ class MCPTool(Tool):
             ) or self.auth_credentials.get("access_token", "")
             if token:
                 auth = BearerAuth(token)
-        self._client = Client(transport, auth=auth)
-        _mcp_clients_cache[self._cache_key] = {
-            "client": self._client,
-            "created_at": time.time(),
-        }
+        return Client(transport, auth=auth)
 
     def _create_transport(self):
         """Create appropriate transport based on configuration."""
@@ -210,74 +203,63 @@ class MCPTool(Tool):
         return tools_dict
 
     async def _execute_with_client(self, operation: str, *args, **kwargs):
-        """Execute operation with FastMCP client."""
+        """Execute operation with the standalone FastMCP client."""
         if not self._client:
             raise Exception("FastMCP client not initialized")
         async with self._client:
-            if operation == "ping":
-                return await self._client.ping()
-            elif operation == "list_tools":
-                tools_response = await self._client.list_tools()
-                self.available_tools = self._format_tools(tools_response)
-                return self.available_tools
-            elif operation == "call_tool":
-                tool_name = args[0]
-                tool_args = kwargs
-                return await self._client.call_tool(tool_name, tool_args)
-            elif operation == "list_resources":
-                return await self._client.list_resources()
-            elif operation == "list_prompts":
-                return await self._client.list_prompts()
-            else:
-                raise Exception(f"Unknown operation: {operation}")
+            return await self._call_client(self._client, operation, *args, **kwargs)
+
+    async def _call_client(self, client: Client, operation: str, *args, **kwargs):
+        if operation == "ping":
+            return await client.ping()
+        elif operation == "list_tools":
+            tools_response = await client.list_tools()
+            self.available_tools = self._format_tools(tools_response)
+            return self.available_tools
+        elif operation == "call_tool":
+            tool_name = args[0]
+            tool_args = kwargs
+            return await client.call_tool(tool_name, tool_args)
+        elif operation == "list_resources":
+            return await client.list_resources()
+        elif operation == "list_prompts":
+            return await client.list_prompts()
+        else:
+            raise Exception(f"Unknown operation: {operation}")
 
     def _run_async_operation(self, operation: str, *args, **kwargs):
-        """Run async operation in sync context."""
+        """Run async operation on a pooled session from sync context."""
         try:
-            try:
-                loop = asyncio.get_running_loop()
-                import concurrent.futures
-
-                def run_in_thread():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(
-                            self._execute_with_client(operation, *args, **kwargs)
-                        )
-                    finally:
-                        new_loop.close()
-
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_thread)
-                    return future.result(timeout=self.timeout)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(
-                        self._execute_with_client(operation, *args, **kwargs)
-                    )
-                finally:
-                    loop.close()
+            return mcp_session_pool.run(
+                self._cache_key,
+                self._create_client,
+                lambda client: self._call_client(client, operation, *args, **kwargs),
+                timeout=self.timeout,
+            )
         except Exception as e:
-            print(f"Error occurred while running async operation: {e}")
+            logger.error(f"Error occurred while running MCP operation: {e}")
             raise
 
-    def discover_tools(self) -> List[Dict]:
+    def discover_tools(self, refresh: bool = False) -> List[Dict]:
         """
         Discover available tools from the MCP server using FastMCP.
 
+        Args:
+            refresh: Bypass the pooled ``list_tools`` cache
+
         Returns:
             List of tool definitions from the server
         """
         if not self.server_url:
             return []
-        if not self._client:
-            self._setup_client()
         try:
-            tools = self._run_async_operation("list_tools")
-            self.available_tools = tools
+            tools_response = mcp_session_pool.list_tools(
+                self._cache_key,
+                self._create_client,
+                timeout=self.timeout,
+                refresh=refresh,
+            )
+            self.available_tools = self._format_tools(tools_response)
             return self.available_tools
         except Exception as e:
             raise Exception(f"Failed to discover tools from MCP server: {str(e)}")
@@ -295,8 +277,6 @@ class MCPTool(Tool):
         """
         if not self.server_url:
             raise Exception("No MCP server configured")
-        if not self._client:
-            self._setup_client()
         cleaned_kwargs = {}
         for key, value in kwargs.items():
             if value == "" or value is None:
@@ -346,8 +326,6 @@ class MCPTool(Tool):
                 "auth_type": self.auth_type,
                 "error_type": "ConfigurationError",
             }
-        if not self._client:
-            self._setup_client()
         try:
             if self.auth_type == "oauth":
                 return self._test_oauth_connection()
@@ -370,7 +348,7 @@ class MCPTool(Tool):
             ping_success = True
         except Exception:
             ping_success = False
-        tools = self.discover_tools()
+        tools = self.discover_tools(refresh=True)
 
         message = f"Successfully connected to MCP server. Found {len(tools)} tools."
         if not ping_success:
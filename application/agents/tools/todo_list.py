@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 import uuid
 
 from .base import Tool
+from application.cache import invalidate_tool_results
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
 
@@ -57,25 +58,26 @@ class TodoListTool(Tool):
         if action_name == "list":
             return self._list()
 
-        if action_name == "create":
-            return self._create(kwargs.get("title", ""))
-
         if action_name == "get":
             return self._get(kwargs.get("todo_id"))
 
-        if action_name == "update":
-            return self._update(
+        if action_name == "create":
+            result = self._create(kwargs.get("title", ""))
+        elif action_name == "update":
+            result = self._update(
                 kwargs.get("todo_id"),
                 kwargs.get("title", "")
             )
+        elif action_name == "complete":
+            result = self._complete(kwargs.get("todo_id"))
+        elif action_name == "delete":
+            result = self._delete(kwargs.get("todo_id"))
+        else:
+            return f"Unknown action: {action_name}"
 
-        if action_name == "complete":
-            return self._complete(kwargs.get("todo_id"))
-
-        if action_name == "delete":
-            return self._delete(kwargs.get("todo_id"))
-
-        return f"Unknown action: {action_name}"
+        # Cached "list"/"get" results (see cache_ttl) are stale after a write
+        invalidate_tool_results(self.tool_id)
+        return result
 
     def get_actions_metadata(self) -> List[Dict[str, Any]]:
         """Return JSON metadata describing supported actions for tool schemas."""
@@ -83,6 +85,7 @@ class TodoListTool(Tool):
             {
                 "name": "list",
                 "description": "List all todos for the user.",
+                "cache_ttl": 300,
                 "parameters": {"type": "object", "properties": {}},
             },
             {
@@ -102,6 +105,7 @@ class TodoListTool(Tool):
             {
                 "name": "get",
                 "description": "Get a specific todo by ID.",
+                "cache_ttl": 300,
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -1,37 +1,123 @@
+import hashlib
 import importlib
 import inspect
+import json
 import os
 import pkgutil
+import threading
+from collections import OrderedDict
 
 from application.agents.tools.base import Tool
+from application.core.settings import settings
+
+USER_SCOPED_TOOLS = {"mcp_tool", "notes", "memory", "todo_list"}
 
 
 class ToolManager:
+    # Process-wide caches shared by every ToolManager: tool module name ->
+    # Tool class, and (tool, config hash, user) -> tool instance (LRU).
+    _tool_classes = None
+    _instances = OrderedDict()
+    _cache_lock = threading.RLock()
+
     def __init__(self, config):
         self.config = config
-        self.tools = {}
-        self.load_tools()
+        self.tool_classes = self.get_tool_classes()
+        self._tools = None
 
-    def load_tools(self):
-        tools_dir = os.path.join(os.path.dirname(__file__))
-        for finder, name, ispkg in pkgutil.iter_modules([tools_dir]):
-            if name == "base" or name.startswith("__"):
-                continue
-            module = importlib.import_module(f"application.agents.tools.{name}")
-            for member_name, obj in inspect.getmembers(module, inspect.isclass):
-                if issubclass(obj, Tool) and obj is not Tool:
-                    tool_config = self.config.get(name, {})
-                    self.tools[name] = obj(tool_config)
+    @property
+    def tools(self):
+        """Instances of every available tool, created on first access."""
+        if self._tools is None:
+            self.load_tools()
+        return self._tools
 
-    def load_tool(self, tool_name, tool_config, user_id=None):
-        self.config[tool_name] = tool_config
+    @tools.setter
+    def tools(self, value):
+        self._tools = value
+
+    @classmethod
+    def get_tool_classes(cls):
+        """Discover tool classes once per process."""
+        with cls._cache_lock:
+            if cls._tool_classes is None:
+                tool_classes = {}
+                tools_dir = os.path.join(os.path.dirname(__file__))
+                for finder, name, ispkg in pkgutil.iter_modules([tools_dir]):
+                    if name == "base" or name.startswith("__"):
+                        continue
+                    tool_class = cls._find_tool_class(name)
+                    if tool_class is not None:
+                        tool_classes[name] = tool_class
+                cls._tool_classes = tool_classes
+            return cls._tool_classes
+
+    @classmethod
+    def get_tool_class(cls, tool_name):
+        tool_class = cls.get_tool_classes().get(tool_name)
+        if tool_class is None:
+            tool_class = cls._find_tool_class(tool_name)
+        return tool_class
+
+    @staticmethod
+    def _find_tool_class(tool_name):
         module = importlib.import_module(f"application.agents.tools.{tool_name}")
         for member_name, obj in inspect.getmembers(module, inspect.isclass):
             if issubclass(obj, Tool) and obj is not Tool:
-                if tool_name in {"mcp_tool", "notes", "memory", "todo_list"} and user_id:
-                    return obj(tool_config, user_id)
-                else:
-                    return obj(tool_config)
+                return obj
+        return None
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._tool_classes = None
+            cls._instances.clear()
+
+    def load_tools(self):
+        self._tools = {}
+        for name, obj in self.tool_classes.items():
+            tool_config = self.config.get(name, {})
+            self._tools[name] = obj(tool_config)
+
+    def load_tool(self, tool_name, tool_config, user_id=None):
+        """Return a tool instance, reusing a cached one for the same config and user."""
+        self.config[tool_name] = tool_config
+        user_scoped = tool_name in USER_SCOPED_TOOLS
+        # User-scoped tools without a user get a fresh isolated instance
+        cache_key = None
+        if not user_scoped or user_id:
+            cache_key = self._instance_cache_key(tool_name, tool_config, user_id)
+        if cache_key is not None:
+            with self._cache_lock:
+                tool = self._instances.get(cache_key)
+                if tool is not None:
+                    self._instances.move_to_end(cache_key)
+                    return tool
+
+        obj = self.get_tool_class(tool_name)
+        if obj is None:
+            return None
+        if user_scoped and user_id:
+            tool = obj(tool_config, user_id)
+        else:
+            tool = obj(tool_config)
+
+        if cache_key is not None:
+            with self._cache_lock:
+                self._instances[cache_key] = tool
+                self._instances.move_to_end(cache_key)
+                while len(self._instances) > settings.TOOL_INSTANCE_CACHE_SIZE:
+                    self._instances.popitem(last=False)
+        return tool
+
+    @staticmethod
+    def _instance_cache_key(tool_name, tool_config, user_id):
+        try:
+            config_json = json.dumps(tool_config, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        config_hash = hashlib.sha256(config_json.encode("utf-8")).hexdigest()
+        return (tool_name, config_hash, user_id if tool_name in USER_SCOPED_TOOLS else None)
 
     def execute_action(self, tool_name, action_name, user_id=None, **kwargs):
         if tool_name not in self.tools:
@@ -89,7 +89,9 @@ class AnswerResource(Resource, BaseAnswerResource):
                 tools_data=tools_data,
             )
 
-            if error := self.check_usage(processor.agent_config):
+            if error := self.check_usage(
+                processor.agent_config, processor.data_loader
+            ):
                 return error
 
             stream = self.complete_stream(
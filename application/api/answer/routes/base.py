@@ -6,6 +6,7 @@ from typing import Any, Dict, Generator, List, Optional
 from flask import jsonify, make_response, Response
 from flask_restx import Namespace
 
+from application.api.answer.services.compression import CompressionOrchestrator
 from application.api.answer.services.conversation_service import ConversationService
 from application.core.model_utils import (
     get_api_key_for_provider,
@@ -13,9 +14,15 @@ from application.core.model_utils import (
     get_provider_from_model_id,
 )
 
+from application.core.data_loader import RequestDataLoader
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
 from application.llm.llm_creator import LLMCreator
+from application.usage_counters import (
+    get_window_usage,
+    mongo_window_usage,
+    reconcile_usage,
+)
 from application.utils import check_required_fields
 
 logger = logging.getLogger(__name__)
@@ -46,11 +53,14 @@ class BaseAnswerResource:
             return missing_fields
         return None
 
-    def check_usage(self, agent_config: Dict) -> Optional[Response]:
+    def check_usage(
+        self, agent_config: Dict, data_loader: Optional[RequestDataLoader] = None
+    ) -> Optional[Response]:
         """Check if there is a usage limit and if it is exceeded
 
         Args:
             agent_config: The config dict of agent instance
+            data_loader: Request loader that may already hold the agent
 
         Returns:
             None or Response if either of limits exceeded.
@@ -59,8 +69,11 @@ class BaseAnswerResource:
         api_key = agent_config.get("user_api_key")
         if not api_key:
             return None
-        agents_collection = self.db["agents"]
-        agent = agents_collection.find_one({"key": api_key})
+        if data_loader is not None:
+            agent = data_loader.get_agent(api_key=api_key)
+        else:
+            agents_collection = self.db["agents"]
+            agent = agents_collection.find_one({"key": api_key})
 
         if not agent:
             return make_response(
@@ -87,38 +100,13 @@ class BaseAnswerResource:
             agent.get("request_limit", settings.DEFAULT_AGENT_LIMITS["request_limit"])
         )
 
-        token_usage_collection = self.db["token_usage"]
-
-        end_date = datetime.datetime.now()
-        start_date = end_date - datetime.timedelta(hours=24)
-
-        match_query = {
-            "timestamp": {"$gte": start_date, "$lte": end_date},
-            "api_key": api_key,
-        }
-
-        if limited_token_mode:
-            token_pipeline = [
-                {"$match": match_query},
-                {
-                    "$group": {
-                        "_id": None,
-                        "total_tokens": {
-                            "$sum": {"$add": ["$prompt_tokens", "$generated_tokens"]}
-                        },
-                    }
-                },
-            ]
-            token_result = list(token_usage_collection.aggregate(token_pipeline))
-            daily_token_usage = token_result[0]["total_tokens"] if token_result else 0
-        else:
-            daily_token_usage = 0
-        if limited_request_mode:
-            daily_request_usage = token_usage_collection.count_documents(match_query)
-        else:
-            daily_request_usage = 0
         if not limited_token_mode and not limited_request_mode:
             return None
+        usage = self._get_daily_usage(
+            api_key, limited_token_mode, limited_request_mode
+        )
+        daily_token_usage = usage["tokens"] if limited_token_mode else 0
+        daily_request_usage = usage["requests"] if limited_request_mode else 0
         token_exceeded = (
             limited_token_mode and token_limit > 0 and daily_token_usage >= token_limit
         )
@@ -140,6 +128,23 @@ class BaseAnswerResource:
             )
         return None
 
+    def _get_daily_usage(
+        self, api_key: str, count_tokens: bool, count_requests: bool
+    ) -> Dict[str, int]:
+        """Read 24h usage from the Redis counters, falling back to Mongo."""
+        token_usage_collection = self.db["token_usage"]
+        usage = get_window_usage(api_key)
+        if usage is None and reconcile_usage(api_key, token_usage_collection):
+            usage = get_window_usage(api_key)
+        if usage is None:
+            usage = mongo_window_usage(
+                api_key,
+                token_usage_collection,
+                count_tokens=count_tokens,
+                count_requests=count_requests,
+            )
+        return usage
+
     def complete_stream(
         self,
         question: str,
@@ -292,6 +297,18 @@ class BaseAnswerResource:
             data = json.dumps(id_data)
             yield f"data: {data}\n\n"
 
+            if conversation_id and settings.ENABLE_CONVERSATION_COMPRESSION:
+                # Summarise long conversations off-request so the next turn
+                # can reuse the summary instead of compressing inline
+                CompressionOrchestrator(
+                    self.conversation_service
+                ).schedule_background_compression(
+                    conversation_id,
+                    decoded_token.get("sub"),
+                    model_id or self.default_model_id,
+                    decoded_token,
+                )
+
             log_data = {
                 "action": "stream_answer",
                 "level": "info",
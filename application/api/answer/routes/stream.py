@@ -89,7 +89,9 @@ class StreamResource(Resource, BaseAnswerResource):
                 docs_together=docs_together, docs=docs_list, tools_data=tools_data
             )
 
-            if error := self.check_usage(processor.agent_config):
+            if error := self.check_usage(
+                processor.agent_config, processor.data_loader
+            ):
                 return error
             return Response(
                 self.complete_stream(
@@ -1,14 +1,16 @@
 """High-level compression orchestration."""
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from application.api.answer.services.compression.service import CompressionService
 from application.api.answer.services.compression.threshold_checker import (
     CompressionThresholdChecker,
 )
+from application.api.answer.services.compression.token_counter import TokenCounter
 from application.api.answer.services.compression.types import CompressionResult
 from application.api.answer.services.conversation_service import ConversationService
+from application.cache import get_redis_instance
 from application.core.model_utils import (
     get_api_key_for_provider,
     get_provider_from_model_id,
@@ -18,6 +20,10 @@ from application.llm.llm_creator import LLMCreator
 
 logger = logging.getLogger(__name__)
 
+# Background compression of a conversation is scheduled at most once per window
+PENDING_KEY_PREFIX = "compression_pending:"
+PENDING_TTL_SECONDS = 600
+
 
 class CompressionOrchestrator:
     """
@@ -49,11 +55,14 @@ class CompressionOrchestrator:
         model_id: str,
         decoded_token: Dict[str, Any],
         current_query_tokens: int = 500,
+        conversation: Optional[Dict[str, Any]] = None,
     ) -> CompressionResult:
         """
         Check if compression is needed and perform it if so.
 
-        This is the main entry point for compression operations.
+        This is the main entry point for compression operations. The decision
+        is made from the stored token counts, reading only the turns after the
+        latest compression point; all turns are loaded only to compress.
 
         Args:
             conversation_id: Conversation ID
@@ -61,15 +70,17 @@ class CompressionOrchestrator:
             model_id: Model being used for conversation
             decoded_token: User's decoded JWT token
             current_query_tokens: Estimated tokens for current query
+            conversation: Conversation already loaded by the caller, with or
+                without its queries (optional)
 
         Returns:
             CompressionResult with summary and recent queries
         """
         try:
-            # Load conversation
-            conversation = self.conversation_service.get_conversation(
-                conversation_id, user_id
-            )
+            if conversation is None:
+                conversation = self.conversation_service.get_conversation(
+                    conversation_id, user_id, include_queries=False
+                )
 
             if not conversation:
                 logger.warning(
@@ -77,15 +88,36 @@ class CompressionOrchestrator:
                 )
                 return CompressionResult.failure("Conversation not found")
 
+            point, recent_queries, context_tokens = self._recent_context(
+                conversation
+            )
+
             # Check if compression is needed
             if not self.threshold_checker.should_compress(
-                conversation, model_id, current_query_tokens
+                conversation,
+                model_id,
+                current_query_tokens,
+                context_tokens=context_tokens,
             ):
-                # No compression needed, return full history
-                queries = conversation.get("queries", [])
-                return CompressionResult.success_no_compression(queries)
-
-            # Perform compression
+                # No compression needed, reuse the latest stored summary (e.g.
+                # one produced in the background) or return the history
+                if point:
+                    return CompressionResult.success_with_stored_summary(
+                        point.get("compressed_summary"), recent_queries
+                    )
+                if recent_queries is None:
+                    recent_queries = self.conversation_service.get_history(
+                        conversation, model_id
+                    )
+                return CompressionResult.success_no_compression(recent_queries)
+
+            # Hard limit reached: compress inline before answering
+            if "queries" not in conversation:
+                conversation = self.conversation_service.get_conversation(
+                    conversation_id, user_id
+                )
+                if not conversation:
+                    return CompressionResult.failure("Conversation not found")
             return self._perform_compression(
                 conversation_id, conversation, model_id, decoded_token
             )
@@ -96,6 +128,176 @@ class CompressionOrchestrator:
             )
             return CompressionResult.failure(str(e))
 
+    def _recent_context(
+        self, conversation: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]], int]:
+        """
+        Latest compression point, the turns after it and the context tokens.
+
+        Without a compression point the stored ``token_count`` is used and no
+        turns are loaded (None is returned for them).
+        """
+        point = self._latest_compression_point(conversation)
+        if point is None and isinstance(conversation.get("token_count"), int):
+            return None, None, conversation["token_count"]
+        start = point.get("query_index", -1) + 1 if point else 0
+        recent_queries = self.conversation_service.get_queries_from(
+            conversation, start
+        )
+        context_tokens = TokenCounter.count_query_tokens(recent_queries)
+        if point:
+            context_tokens += point.get("compressed_token_count", 0)
+        return point, recent_queries, context_tokens
+
+    @staticmethod
+    def _latest_compression_point(
+        conversation: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        compression_metadata = conversation.get("compression_metadata") or {}
+        compression_points = compression_metadata.get("compression_points") or []
+        if not compression_metadata.get("is_compressed") or not compression_points:
+            return None
+        return compression_points[-1]
+
+    @classmethod
+    def _stored_context_tokens(cls, conversation: Dict[str, Any]) -> Optional[int]:
+        """
+        Context tokens estimated from the conversation header alone.
+
+        Turns added since the latest compression are the running
+        ``token_count`` minus the tokens that compression covered.
+        """
+        total_tokens = conversation.get("token_count")
+        if not isinstance(total_tokens, int):
+            return None
+        point = cls._latest_compression_point(conversation)
+        if point is None:
+            return total_tokens
+        recent_tokens = max(total_tokens - point.get("original_token_count", 0), 0)
+        return point.get("compressed_token_count", 0) + recent_tokens
+
+    def schedule_background_compression(
+        self,
+        conversation_id: str,
+        user_id: str,
+        model_id: str,
+        decoded_token: Dict[str, Any],
+    ) -> bool:
+        """
+        Queue compression for a conversation that crossed the soft threshold.
+
+        Called after a turn is saved so the summary is ready before the next
+        request, which then reuses it instead of compressing inline. Only the
+        conversation header is read; the task loads the turns.
+
+        Returns:
+            True if a background compression task was queued
+        """
+        if not settings.ENABLE_BACKGROUND_COMPRESSION:
+            return False
+        try:
+            conversation = self.conversation_service.get_conversation(
+                conversation_id, user_id, include_queries=False
+            )
+            if not conversation:
+                return False
+            context_tokens = self._stored_context_tokens(conversation)
+            if not context_tokens:
+                return False
+            if not self.threshold_checker.should_compress_in_background(
+                conversation, model_id, context_tokens=context_tokens
+            ):
+                return False
+            if not self._claim_pending(conversation_id):
+                logger.debug(
+                    f"Background compression already pending for {conversation_id}"
+                )
+                return False
+
+            from application.api.user.tasks import compress_conversation_task
+
+            compress_conversation_task.delay(
+                conversation_id, user_id, model_id, decoded_token
+            )
+            logger.info(f"Scheduled background compression for {conversation_id}")
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error scheduling background compression: {str(e)}", exc_info=True
+            )
+            self._release_pending(conversation_id)
+            return False
+
+    def compress_in_background(
+        self,
+        conversation_id: str,
+        user_id: str,
+        model_id: str,
+        decoded_token: Dict[str, Any],
+    ) -> CompressionResult:
+        """
+        Compress a conversation outside the request path (Celery worker).
+
+        Re-checks the soft threshold first, since a request may have compressed
+        the conversation inline in the meantime.
+        """
+        try:
+            conversation = self.conversation_service.get_conversation(
+                conversation_id, user_id
+            )
+            if not conversation:
+                return CompressionResult.failure("Conversation not found")
+            if not self.threshold_checker.should_compress_in_background(
+                conversation, model_id
+            ):
+                return self._stored_context(conversation, model_id)
+            return self._perform_compression(
+                conversation_id, conversation, model_id, decoded_token
+            )
+        finally:
+            self._release_pending(conversation_id)
+
+    def _stored_context(
+        self, conversation: Dict[str, Any], model_id: str
+    ) -> CompressionResult:
+        """Build the history from the latest stored compression point, if any."""
+        compressed_summary, recent_queries = CompressionService(
+            llm=None, model_id=model_id
+        ).get_compressed_context(conversation)
+        if compressed_summary:
+            return CompressionResult.success_with_stored_summary(
+                compressed_summary, recent_queries
+            )
+        return CompressionResult.success_no_compression(recent_queries)
+
+    @staticmethod
+    def _claim_pending(conversation_id: str) -> bool:
+        redis_client = get_redis_instance()
+        if redis_client is None:
+            return True
+        try:
+            return bool(
+                redis_client.set(
+                    f"{PENDING_KEY_PREFIX}{conversation_id}",
+                    1,
+                    nx=True,
+                    ex=PENDING_TTL_SECONDS,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Could not mark compression as pending: {str(e)}")
+            return True
+
+    @staticmethod
+    def _release_pending(conversation_id: str) -> None:
+        redis_client = get_redis_instance()
+        if redis_client is None:
+            return
+        try:
+            redis_client.delete(f"{PENDING_KEY_PREFIX}{conversation_id}")
+        except Exception as e:
+            logger.warning(f"Could not clear pending compression flag: {str(e)}")
+
     def _perform_compression(
         self,
         conversation_id: str,
@@ -1,7 +1,7 @@
 """Compression threshold checking logic."""
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from application.core.model_utils import get_token_limit
 from application.core.settings import settings
@@ -13,58 +13,123 @@ logger = logging.getLogger(__name__)
 class CompressionThresholdChecker:
     """Determines if compression is needed based on token thresholds."""
 
-    def __init__(self, threshold_percentage: float = None):
+    def __init__(
+        self,
+        threshold_percentage: float = None,
+        soft_threshold_percentage: float = None,
+    ):
         """
         Initialize threshold checker.
 
         Args:
             threshold_percentage: Percentage of context to use as threshold
                                  (defaults to settings.COMPRESSION_THRESHOLD_PERCENTAGE)
+            soft_threshold_percentage: Percentage of context at which to compress
+                                 in the background (defaults to
+                                 settings.COMPRESSION_SOFT_THRESHOLD_PERCENTAGE)
         """
         self.threshold_percentage = (
             threshold_percentage or settings.COMPRESSION_THRESHOLD_PERCENTAGE
         )
+        self.soft_threshold_percentage = (
+            soft_threshold_percentage
+            or settings.COMPRESSION_SOFT_THRESHOLD_PERCENTAGE
+        )
 
     def should_compress(
         self,
         conversation: Dict[str, Any],
         model_id: str,
         current_query_tokens: int = 500,
+        context_tokens: Optional[int] = None,
     ) -> bool:
         """
-        Determine if compression is needed.
+        Determine if compression is needed before answering.
 
         Args:
             conversation: Full conversation document
             model_id: Target model for this request
             current_query_tokens: Estimated tokens for current query
+            context_tokens: Tokens of the stored history, if already known
 
         Returns:
             True if tokens >= threshold% of context window
         """
+        return self._exceeds_threshold(
+            conversation,
+            model_id,
+            current_query_tokens,
+            self.threshold_percentage,
+            context_tokens=context_tokens,
+        )
+
+    def should_compress_in_background(
+        self,
+        conversation: Dict[str, Any],
+        model_id: str,
+        current_query_tokens: int = 500,
+        context_tokens: Optional[int] = None,
+    ) -> bool:
+        """
+        Determine if the conversation should be compressed ahead of its next turn.
+
+        Args:
+            conversation: Full conversation document
+            model_id: Target model for the conversation
+            current_query_tokens: Estimated tokens for the next query
+            context_tokens: Tokens of the stored history, if already known
+
+        Returns:
+            True if tokens >= soft threshold% of context window
+        """
+        return self._exceeds_threshold(
+            conversation,
+            model_id,
+            current_query_tokens,
+            self.soft_threshold_percentage,
+            background=True,
+            context_tokens=context_tokens,
+        )
+
+    def _exceeds_threshold(
+        self,
+        conversation: Dict[str, Any],
+        model_id: str,
+        current_query_tokens: int,
+        threshold_percentage: float,
+        background: bool = False,
+        context_tokens: Optional[int] = None,
+    ) -> bool:
         try:
-            # Calculate total tokens in conversation
-            total_tokens = TokenCounter.count_conversation_tokens(conversation)
-            total_tokens += current_query_tokens
+            # Tokens of the history the next request would send, reusing
+            # the latest stored summary if there is one
+            if context_tokens is None:
+                context_tokens = TokenCounter.count_context_tokens(conversation)
+            total_tokens = context_tokens + current_query_tokens
 
             # Get context window limit for model
             context_limit = get_token_limit(model_id)
 
             # Calculate threshold
-            threshold = int(context_limit * self.threshold_percentage)
+            threshold = int(context_limit * threshold_percentage)
 
             compression_needed = total_tokens >= threshold
             percentage_used = (total_tokens / context_limit) * 100
 
-            if compression_needed:
+            if compression_needed and not background:
                 logger.warning(
                     f"COMPRESSION TRIGGERED: {total_tokens} tokens / {context_limit} limit "
-                    f"({percentage_used:.1f}% used, threshold: {self.threshold_percentage * 100:.0f}%)"
+                    f"({percentage_used:.1f}% used, threshold: {threshold_percentage * 100:.0f}%)"
+                )
+            elif compression_needed:
+                logger.info(
+                    f"Background compression threshold reached: {total_tokens}/{context_limit} tokens "
+                    f"({percentage_used:.1f}% used, threshold: {threshold_percentage * 100:.0f}%)"
                 )
             else:
                 logger.info(
                     f"Compression check: {total_tokens}/{context_limit} tokens "
-                    f"({percentage_used:.1f}% used, threshold: {self.threshold_percentage * 100:.0f}%) - No compression needed"
+                    f"({percentage_used:.1f}% used, threshold: {threshold_percentage * 100:.0f}%) - No compression needed"
                 )
 
             return compression_needed
@@ -3,7 +3,7 @@
 import logging
 from typing import Any, Dict, List
 
-from application.utils import num_tokens_from_string
+from application.utils import num_tokens_from_strings
 from application.core.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -23,17 +23,19 @@ class TokenCounter:
         Returns:
             Total token count
         """
-        total_tokens = 0
+        texts = []
         for message in messages:
             content = message.get("content", "")
             if isinstance(content, str):
-                total_tokens += num_tokens_from_string(content)
+                texts.append(content)
             elif isinstance(content, list):
                 # Handle structured content (tool calls, etc.)
                 for item in content:
                     if isinstance(item, dict):
-                        total_tokens += num_tokens_from_string(str(item))
-        return total_tokens
+                        texts.append(str(item))
+        return sum(
+            num_tokens_from_strings(texts, estimate=settings.TOKEN_BUDGET_ESTIMATE)
+        )
 
     @staticmethod
     def count_query_tokens(
@@ -50,28 +52,55 @@ class TokenCounter:
             Total token count
         """
         total_tokens = 0
-
+        texts = []
         for query in queries:
-            # Count prompt and response tokens
-            if "prompt" in query:
-                total_tokens += num_tokens_from_string(query["prompt"])
-            if "response" in query:
-                total_tokens += num_tokens_from_string(query["response"])
-            if "thought" in query:
-                total_tokens += num_tokens_from_string(query.get("thought", ""))
-
-            # Count tool call tokens
-            if include_tool_calls and "tool_calls" in query:
-                for tool_call in query["tool_calls"]:
-                    tool_call_string = (
-                        f"Tool: {tool_call.get('tool_name')} | "
-                        f"Action: {tool_call.get('action_name')} | "
-                        f"Args: {tool_call.get('arguments')} | "
-                        f"Response: {tool_call.get('result')}"
-                    )
-                    total_tokens += num_tokens_from_string(tool_call_string)
-
-        return total_tokens
+            # Counts stored at save time always include tool calls
+            stored_tokens = query.get("token_count")
+            if include_tool_calls and isinstance(stored_tokens, int):
+                total_tokens += stored_tokens
+            else:
+                texts.extend(TokenCounter._query_texts(query, include_tool_calls))
+        return total_tokens + sum(
+            num_tokens_from_strings(texts, estimate=settings.TOKEN_BUDGET_ESTIMATE)
+        )
+
+    @staticmethod
+    def count_stored_query_tokens(query: Dict[str, Any]) -> int:
+        """
+        Exact token count of a single query, as persisted on the conversation.
+
+        Args:
+            query: Query object about to be saved
+
+        Returns:
+            Token count including tool calls
+        """
+        return sum(num_tokens_from_strings(TokenCounter._query_texts(query)))
+
+    @staticmethod
+    def _query_texts(
+        query: Dict[str, Any], include_tool_calls: bool = True
+    ) -> List[str]:
+        """Collect the strings of a query object that count towards its tokens."""
+        texts = []
+        # Count prompt and response tokens
+        if "prompt" in query:
+            texts.append(query["prompt"])
+        if "response" in query:
+            texts.append(query["response"])
+        if "thought" in query:
+            texts.append(query.get("thought", ""))
+
+        # Count tool call tokens
+        if include_tool_calls and "tool_calls" in query:
+            for tool_call in query["tool_calls"]:
+                texts.append(
+                    f"Tool: {tool_call.get('tool_name')} | "
+                    f"Action: {tool_call.get('action_name')} | "
+                    f"Args: {tool_call.get('arguments')} | "
+                    f"Response: {tool_call.get('result')}"
+                )
+        return texts
 
     @staticmethod
     def count_conversation_tokens(
@@ -88,8 +117,11 @@ class TokenCounter:
             Total token count
         """
         try:
-            queries = conversation.get("queries", [])
-            total_tokens = TokenCounter.count_query_tokens(queries)
+            # Running total maintained by ConversationService at save time
+            total_tokens = conversation.get("token_count")
+            if not isinstance(total_tokens, int):
+                queries = conversation.get("queries", [])
+                total_tokens = TokenCounter.count_query_tokens(queries)
 
             # Add system prompt tokens if requested
             if include_system_prompt:
@@ -101,3 +133,29 @@ class TokenCounter:
         except Exception as e:
             logger.error(f"Error calculating conversation tokens: {str(e)}")
             return 0
+
+    @staticmethod
+    def count_context_tokens(conversation: Dict[str, Any]) -> int:
+        """
+        Calculate tokens of the history a request would actually send.
+
+        For compressed conversations this is the latest summary plus the
+        queries after its compression point, otherwise the whole conversation.
+
+        Args:
+            conversation: Conversation document
+
+        Returns:
+            Total token count
+        """
+        compression_metadata = conversation.get("compression_metadata") or {}
+        compression_points = compression_metadata.get("compression_points") or []
+        if not compression_metadata.get("is_compressed") or not compression_points:
+            return TokenCounter.count_conversation_tokens(conversation)
+        latest_compression = compression_points[-1]
+        recent_queries = conversation.get("queries", [])[
+            latest_compression.get("query_index", -1) + 1 :
+        ]
+        return latest_compression.get(
+            "compressed_token_count", 0
+        ) + TokenCounter.count_query_tokens(recent_queries)
@@ -65,6 +65,18 @@ class CompressionResult:
             compression_performed=False,
         )
 
+    @classmethod
+    def success_with_stored_summary(
+        cls, summary: str, queries: List[Dict]
+    ) -> "CompressionResult":
+        """Create a successful result reusing a previously stored summary."""
+        return cls(
+            success=True,
+            compressed_summary=summary,
+            recent_queries=queries,
+            compression_performed=False,
+        )
+
     @classmethod
     def failure(cls, error: str) -> "CompressionResult":
         """Create a failure result."""
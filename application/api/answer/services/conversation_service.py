@@ -5,11 +5,25 @@ from typing import Any, Dict, List, Optional
 from application.core.mongo_db import MongoDB
 
 from application.core.settings import settings
+from application.services.analytics_service import AnalyticsRollupService
+from application.services.conversation_messages import (
+    ConversationMessageStore,
+    MESSAGE_STORAGE,
+    uses_message_storage,
+)
+from application.utils import limit_chat_history
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 
 logger = logging.getLogger(__name__)
 
+HISTORY_FIELDS = ("prompt", "response")
+# Turns read per round trip when loading the tail of a split conversation
+HISTORY_PAGE_SIZE = 50
+# $slice needs a count; embedded arrays are bounded by the 16 MB document limit
+EMBEDDED_SLICE_LIMIT = 2**31 - 1
+
 
 class ConversationService:
     def __init__(self):
@@ -17,11 +31,17 @@ class ConversationService:
         db = mongo[settings.MONGO_DB_NAME]
         self.conversations_collection = db["conversations"]
         self.agents_collection = db["agents"]
+        self.analytics_rollups = AnalyticsRollupService(db["analytics_rollups"])
+        self.message_store = ConversationMessageStore(db["conversation_messages"])
 
     def get_conversation(
-        self, conversation_id: str, user_id: str
+        self, conversation_id: str, user_id: str, include_queries: bool = True
     ) -> Optional[Dict[str, Any]]:
-        """Retrieve a conversation with proper access control"""
+        """Retrieve a conversation with proper access control
+
+        ``queries`` is filled in whichever layout the conversation is stored;
+        pass ``include_queries=False`` to skip loading the turns.
+        """
         if not conversation_id or not user_id:
             return None
         try:
@@ -29,7 +49,8 @@ class ConversationService:
                 {
                     "_id": ObjectId(conversation_id),
                     "$or": [{"user": user_id}, {"shared_with": user_id}],
-                }
+                },
+                None if include_queries else {"queries": 0},
             )
 
             if not conversation:
@@ -37,12 +58,71 @@ class ConversationService:
                     f"Conversation not found or unauthorized - ID: {conversation_id}, User: {user_id}"
                 )
                 return None
+            if include_queries and uses_message_storage(conversation):
+                conversation["queries"] = self.message_store.get_queries(
+                    conversation["_id"]
+                )
             conversation["_id"] = str(conversation["_id"])
             return conversation
         except Exception as e:
             logger.error(f"Error fetching conversation: {str(e)}", exc_info=True)
             return None
 
+    def get_queries_from(
+        self, conversation: Dict[str, Any], start: int
+    ) -> List[Dict[str, Any]]:
+        """Return the turns of ``conversation`` from index ``start`` on.
+
+        Only those turns are read when ``conversation`` was loaded without
+        its queries.
+        """
+        if "queries" in conversation:
+            return conversation["queries"][start:]
+        if uses_message_storage(conversation):
+            return self.message_store.get_queries(conversation["_id"], start=start)
+        stored = self.conversations_collection.find_one(
+            {"_id": ObjectId(conversation["_id"])},
+            {"queries": {"$slice": [start, EMBEDDED_SLICE_LIMIT]}},
+        )
+        return (stored or {}).get("queries", [])
+
+    def get_history(
+        self, conversation: Dict[str, Any], model_id: str
+    ) -> List[Dict[str, str]]:
+        """
+        Return the most recent turns of ``conversation`` that fit the model's
+        context, as prompt/response pairs.
+
+        Split conversations are read newest-first a page at a time, so only
+        the tail kept by ``limit_chat_history`` is loaded.
+        """
+        if not uses_message_storage(conversation):
+            queries = conversation.get("queries")
+            if queries is None:
+                stored = self.conversations_collection.find_one(
+                    {"_id": ObjectId(conversation["_id"])},
+                    {f"queries.{field}": 1 for field in HISTORY_FIELDS},
+                )
+                queries = (stored or {}).get("queries", [])
+            history = [
+                {"prompt": query["prompt"], "response": query["response"]}
+                for query in queries
+            ]
+            return limit_chat_history(history, model_id=model_id)
+
+        history: List[Dict[str, str]] = []
+        while True:
+            page = self.message_store.get_recent_queries(
+                conversation["_id"],
+                HISTORY_PAGE_SIZE,
+                skip=len(history),
+                fields=HISTORY_FIELDS,
+            )
+            history = page + history
+            trimmed = limit_chat_history(history, model_id=model_id)
+            if len(trimmed) < len(history) or len(page) < HISTORY_PAGE_SIZE:
+                return trimmed
+
     def save_conversation(
         self,
         conversation_id: Optional[str],
@@ -72,10 +152,26 @@ class ConversationService:
             if "text" in source and isinstance(source["text"], str):
                 source["text"] = source["text"][:1000]
 
+        query = {
+            "prompt": question,
+            "response": response,
+            "thought": thought,
+            "sources": sources,
+            "tool_calls": tool_calls,
+            "timestamp": current_time,
+            "attachments": attachment_ids,
+            "model_id": model_id,
+        }
+        query["token_count"] = self._count_query_tokens(query)
+
         if conversation_id is not None and index is not None:
             # Update existing conversation with new query
 
-            result = self.conversations_collection.update_one(
+            if self._replace_split_query(
+                conversation_id, user_id, index, query, current_time
+            ):
+                return conversation_id
+            previous = self.conversations_collection.find_one_and_update(
                 {
                     "_id": ObjectId(conversation_id),
                     "user": user_id,
@@ -91,12 +187,31 @@ class ConversationService:
                         f"queries.{index}.timestamp": current_time,
                         f"queries.{index}.attachments": attachment_ids,
                         f"queries.{index}.model_id": model_id,
-                    }
+                        f"queries.{index}.token_count": query["token_count"],
+                    },
+                    # Feedback was given on the answer being replaced
+                    "$unset": {
+                        f"queries.{index}.feedback": "",
+                        f"queries.{index}.feedback_timestamp": "",
+                    },
+                },
+                projection={
+                    "api_key": 1,
+                    "queries.timestamp": 1,
+                    "queries.feedback": 1,
+                    "queries.feedback_timestamp": 1,
                 },
+                return_document=ReturnDocument.BEFORE,
             )
 
-            if result.matched_count == 0:
+            if previous is None:
                 raise ValueError("Conversation not found or unauthorized")
+            self._rollup_replaced_queries(
+                user_id,
+                previous.get("api_key"),
+                previous.get("queries", [])[index:],
+                current_time,
+            )
             self.conversations_collection.update_one(
                 {
                     "_id": ObjectId(conversation_id),
@@ -105,30 +220,21 @@ class ConversationService:
                 },
                 {"$push": {"queries": {"$each": [], "$slice": index + 1}}},
             )
+            self._refresh_token_count(conversation_id)
             return conversation_id
         elif conversation_id:
             # Append new message to existing conversation
 
-            result = self.conversations_collection.update_one(
-                {"_id": ObjectId(conversation_id), "user": user_id},
-                {
-                    "$push": {
-                        "queries": {
-                            "prompt": question,
-                            "response": response,
-                            "thought": thought,
-                            "sources": sources,
-                            "tool_calls": tool_calls,
-                            "timestamp": current_time,
-                            "attachments": attachment_ids,
-                            "model_id": model_id,
-                        }
-                    }
-                },
-            )
+            result = self._append_query(conversation_id, query, user_id)
 
-            if result.matched_count == 0:
+            if result is None:
                 raise ValueError("Conversation not found or unauthorized")
+            if "token_count" not in result:
+                # Saved before running totals existed, $inc only saw this query
+                self._refresh_token_count(conversation_id)
+            self.analytics_rollups.record(
+                user_id, result.get("api_key"), current_time, messages=1
+            )
             return conversation_id
         else:
             # Create new conversation
@@ -155,19 +261,14 @@ class ConversationService:
                 "user": user_id,
                 "date": current_time,
                 "name": completion,
-                "queries": [
-                    {
-                        "prompt": question,
-                        "response": response,
-                        "thought": thought,
-                        "sources": sources,
-                        "tool_calls": tool_calls,
-                        "timestamp": current_time,
-                        "attachments": attachment_ids,
-                        "model_id": model_id,
-                    }
-                ],
+                "token_count": query["token_count"],
             }
+            split = settings.CONVERSATION_STORAGE == MESSAGE_STORAGE
+            if split:
+                conversation_data["message_storage"] = MESSAGE_STORAGE
+                conversation_data["message_count"] = 1
+            else:
+                conversation_data["queries"] = [query]
 
             if api_key:
                 if agent_id:
@@ -179,8 +280,212 @@ class ConversationService:
                 if agent:
                     conversation_data["api_key"] = agent["key"]
             result = self.conversations_collection.insert_one(conversation_data)
+            if split:
+                self.message_store.insert(
+                    result.inserted_id,
+                    0,
+                    query,
+                    user_id,
+                    conversation_data.get("api_key"),
+                )
+            self.analytics_rollups.record(
+                user_id, conversation_data.get("api_key"), current_time, messages=1
+            )
             return str(result.inserted_id)
 
+    def _append_query(
+        self,
+        conversation_id: str,
+        query: Dict[str, Any],
+        user_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Append ``query`` to a conversation in either layout.
+
+        The layout new conversations use is tried first, so the common case
+        costs one round trip. Returns the conversation's ``api_key`` and
+        ``token_count`` from before the append, or None if it was not found.
+        """
+        conversation_filter: Dict[str, Any] = {"_id": ObjectId(conversation_id)}
+        if user_id is not None:
+            conversation_filter["user"] = user_id
+
+        def append_split():
+            previous = self.conversations_collection.find_one_and_update(
+                {**conversation_filter, "message_storage": MESSAGE_STORAGE},
+                {"$inc": {"message_count": 1, "token_count": query["token_count"]}},
+                projection={
+                    "user": 1,
+                    "api_key": 1,
+                    "token_count": 1,
+                    "message_count": 1,
+                },
+            )
+            if previous is not None:
+                self.message_store.insert(
+                    conversation_id,
+                    previous.get("message_count", 0),
+                    query,
+                    previous.get("user"),
+                    previous.get("api_key"),
+                )
+            return previous
+
+        def append_embedded():
+            return self.conversations_collection.find_one_and_update(
+                {**conversation_filter, "message_storage": {"$exists": False}},
+                {
+                    "$push": {"queries": query},
+                    "$inc": {"token_count": query["token_count"]},
+                },
+                projection={"api_key": 1, "token_count": 1},
+            )
+
+        if settings.CONVERSATION_STORAGE == MESSAGE_STORAGE:
+            attempts = (append_split, append_embedded)
+        else:
+            attempts = (append_embedded, append_split)
+        for attempt in attempts:
+            previous = attempt()
+            if previous is not None:
+                return previous
+        return None
+
+    def _replace_split_query(
+        self,
+        conversation_id: str,
+        user_id: str,
+        index: int,
+        query: Dict[str, Any],
+        current_time: datetime,
+    ) -> bool:
+        """Rewrite turn ``index`` of a split conversation and drop later turns.
+
+        Returns False when the conversation is not stored in
+        ``conversation_messages``, leaving it to the embedded path.
+        """
+        previous = self.conversations_collection.find_one_and_update(
+            {
+                "_id": ObjectId(conversation_id),
+                "user": user_id,
+                "message_storage": MESSAGE_STORAGE,
+                "message_count": {"$gt": index},
+            },
+            {"$set": {"message_count": index + 1}},
+            projection={"api_key": 1},
+        )
+        if previous is None:
+            return False
+        replaced = self.message_store.replace_from(conversation_id, index, query)
+        self._rollup_replaced_queries(
+            user_id, previous.get("api_key"), replaced, current_time
+        )
+        self._refresh_token_count(conversation_id)
+        return True
+
+    @staticmethod
+    def _count_query_tokens(query: Dict[str, Any]) -> int:
+        from application.api.answer.services.compression.token_counter import (
+            TokenCounter,
+        )
+
+        return TokenCounter.count_stored_query_tokens(query)
+
+    def _refresh_token_count(self, conversation_id: str) -> None:
+        """
+        Recompute a conversation's running ``token_count`` from its queries.
+
+        Used after history is rewritten and for conversations saved before
+        token counts were stored. Queries without a stored count are counted
+        once and backfilled.
+        """
+        try:
+            conversation = self.conversations_collection.find_one(
+                {"_id": ObjectId(conversation_id)},
+                {
+                    "message_storage": 1,
+                    "queries.prompt": 1,
+                    "queries.response": 1,
+                    "queries.thought": 1,
+                    "queries.tool_calls": 1,
+                    "queries.token_count": 1,
+                },
+            )
+            if not conversation:
+                return
+            if uses_message_storage(conversation):
+                self._refresh_split_token_count(conversation_id)
+                return
+            total_tokens = 0
+            updates = {}
+            for i, query in enumerate(conversation.get("queries", [])):
+                query_tokens = query.get("token_count")
+                if not isinstance(query_tokens, int):
+                    query_tokens = self._count_query_tokens(query)
+                    updates[f"queries.{i}.token_count"] = query_tokens
+                total_tokens += query_tokens
+            updates["token_count"] = total_tokens
+            self.conversations_collection.update_one(
+                {"_id": ObjectId(conversation_id)}, {"$set": updates}
+            )
+        except Exception as e:
+            logger.error(
+                f"Error refreshing conversation token count: {str(e)}", exc_info=True
+            )
+
+    def _refresh_split_token_count(self, conversation_id: str) -> None:
+        total_tokens = 0
+        messages = self.message_store.collection.find(
+            {"conversation_id": ObjectId(conversation_id)},
+            {
+                "prompt": 1,
+                "response": 1,
+                "thought": 1,
+                "tool_calls": 1,
+                "token_count": 1,
+            },
+        )
+        for message in messages:
+            query_tokens = message.get("token_count")
+            if not isinstance(query_tokens, int):
+                query_tokens = self._count_query_tokens(message)
+                self.message_store.collection.update_one(
+                    {"_id": message["_id"]}, {"$set": {"token_count": query_tokens}}
+                )
+            total_tokens += query_tokens
+        self.conversations_collection.update_one(
+            {"_id": ObjectId(conversation_id)},
+            {"$set": {"token_count": total_tokens}},
+        )
+
+    def _rollup_replaced_queries(
+        self,
+        user_id: str,
+        api_key: Optional[str],
+        replaced_queries: List[Dict[str, Any]],
+        current_time: datetime,
+    ) -> None:
+        """Adjust analytics rollups when a query and everything after it is rewritten.
+
+        The rewritten query loses its feedback, so it is removed along with
+        that of the dropped queries. All changes go out in one bulk write.
+        """
+        events = []
+        for query in replaced_queries:
+            timestamp = query.get("timestamp")
+            if isinstance(timestamp, datetime):
+                events.append((timestamp, {"messages": -1}))
+            events.extend(
+                self.analytics_rollups.feedback_change_events(
+                    query.get("feedback"),
+                    query.get("feedback_timestamp"),
+                    None,
+                    None,
+                )
+            )
+        events.append((current_time, {"messages": 1}))
+        self.analytics_rollups.record_many(user_id, api_key, events)
+
     def update_compression_metadata(
         self, conversation_id: str, compression_metadata: Dict[str, Any]
     ) -> None:
@@ -235,23 +540,21 @@ class ConversationService:
                 return
             timestamp = compression_metadata.get("timestamp", datetime.now(timezone.utc))
 
-            self.conversations_collection.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {
-                    "$push": {
-                        "queries": {
-                            "prompt": "[Context Compression Summary]",
-                            "response": summary,
-                            "thought": "",
-                            "sources": [],
-                            "tool_calls": [],
-                            "timestamp": timestamp,
-                            "attachments": [],
-                            "model_id": compression_metadata.get("model_used"),
-                        }
-                    }
-                },
-            )
+            query = {
+                "prompt": "[Context Compression Summary]",
+                "response": summary,
+                "thought": "",
+                "sources": [],
+                "tool_calls": [],
+                "timestamp": timestamp,
+                "attachments": [],
+                "model_id": compression_metadata.get("model_used"),
+            }
+            query["token_count"] = self._count_query_tokens(query)
+
+            previous = self._append_query(conversation_id, query)
+            if previous is not None and "token_count" not in previous:
+                self._refresh_token_count(conversation_id)
             logger.info(f"Appended compression summary to conversation {conversation_id}")
         except Exception as e:
             logger.error(
@@ -1,7 +1,10 @@
+import contextvars
 import datetime
 import json
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Dict, Optional, Set
 
@@ -14,12 +17,18 @@ from application.api.answer.services.compression import CompressionOrchestrator
 from application.api.answer.services.compression.token_counter import TokenCounter
 from application.api.answer.services.conversation_service import ConversationService
 from application.api.answer.services.prompt_renderer import PromptRenderer
+from application.cache import (
+    get_cached_tool_result,
+    set_cached_tool_result,
+    tool_result_cache_key,
+)
 from application.core.model_utils import (
     get_api_key_for_provider,
     get_default_model_id,
     get_provider_from_model_id,
     validate_model_id,
 )
+from application.core.data_loader import RequestDataLoader
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
 from application.retriever.retriever_creator import RetrieverCreator
@@ -31,7 +40,7 @@ from application.utils import (
 logger = logging.getLogger(__name__)
 
 
-def get_prompt(prompt_id: str, prompts_collection=None) -> str:
+def get_prompt(prompt_id: str, prompts_collection=None, data_loader=None) -> str:
     """
     Get a prompt by preset name or MongoDB ID
     """
@@ -53,11 +62,14 @@ def get_prompt(prompt_id: str, prompts_collection=None) -> str:
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
     try:
-        if prompts_collection is None:
-            mongo = MongoDB.get_client()
-            db = mongo[settings.MONGO_DB_NAME]
-            prompts_collection = db["prompts"]
-        prompt_doc = prompts_collection.find_one({"_id": ObjectId(prompt_id)})
+        if data_loader is not None:
+            prompt_doc = data_loader.get_prompt(prompt_id)
+        else:
+            if prompts_collection is None:
+                mongo = MongoDB.get_client()
+                db = mongo[settings.MONGO_DB_NAME]
+                prompts_collection = db["prompts"]
+            prompt_doc = prompts_collection.find_one({"_id": ObjectId(prompt_id)})
         if not prompt_doc:
             raise ValueError(f"Prompt with ID {prompt_id} not found")
         return prompt_doc["content"]
@@ -74,6 +86,7 @@ class StreamProcessor:
         self.agents_collection = self.db["agents"]
         self.attachments_collection = self.db["attachments"]
         self.prompts_collection = self.db["prompts"]
+        self.data_loader = RequestDataLoader(self.db)
 
         self.data = request_data
         self.decoded_token = decoded_token
@@ -100,6 +113,7 @@ class StreamProcessor:
         self._required_tool_actions: Optional[Dict[str, Set[Optional[str]]]] = None
         self.compressed_summary: Optional[str] = None
         self.compressed_summary_tokens: int = 0
+        self.timings: Dict[str, float] = {}
 
     def initialize(self):
         """Initialize all required components for processing"""
@@ -114,7 +128,7 @@ class StreamProcessor:
         """Load conversation history either from DB or request"""
         if self.conversation_id and self.initial_user_id:
             conversation = self.conversation_service.get_conversation(
-                self.conversation_id, self.initial_user_id
+                self.conversation_id, self.initial_user_id, include_queries=False
             )
             if not conversation:
                 raise ValueError("Conversation not found or unauthorized")
@@ -123,11 +137,9 @@ class StreamProcessor:
             if settings.ENABLE_CONVERSATION_COMPRESSION:
                 self._handle_compression(conversation)
             else:
-                # Original behavior - load all history
-                self.history = [
-                    {"prompt": query["prompt"], "response": query["response"]}
-                    for query in conversation.get("queries", [])
-                ]
+                self.history = self.conversation_service.get_history(
+                    conversation, self.model_id
+                )
         else:
             self.history = limit_chat_history(
                 json.loads(self.data.get("history", "[]")), model_id=self.model_id
@@ -138,7 +150,7 @@ class StreamProcessor:
         Handle conversation compression logic using orchestrator.
 
         Args:
-            conversation: Full conversation document
+            conversation: Conversation document, loaded without its queries
         """
         try:
             # Use orchestrator to handle all compression logic
@@ -147,20 +159,20 @@ class StreamProcessor:
                 user_id=self.initial_user_id,
                 model_id=self.model_id,
                 decoded_token=self.decoded_token,
+                conversation=conversation,
             )
 
             if not result.success:
                 logger.error(
                     f"Compression failed: {result.error}, using full history"
                 )
-                self.history = [
-                    {"prompt": query["prompt"], "response": query["response"]}
-                    for query in conversation.get("queries", [])
-                ]
+                self.history = self.conversation_service.get_history(
+                    conversation, self.model_id
+                )
                 return
 
-            # Set compressed summary if compression was performed
-            if result.compression_performed and result.compressed_summary:
+            # Set compressed summary if compression was performed now or earlier
+            if result.compressed_summary:
                 self.compressed_summary = result.compressed_summary
                 self.compressed_summary_tokens = TokenCounter.count_message_tokens(
                     [{"content": result.compressed_summary}]
@@ -179,10 +191,9 @@ class StreamProcessor:
                 exc_info=True,
             )
             # Fallback to original behavior
-            self.history = [
-                {"prompt": query["prompt"], "response": query["response"]}
-                for query in conversation.get("queries", [])
-            ]
+            self.history = self.conversation_service.get_history(
+                conversation, self.model_id
+            )
 
     def _process_attachments(self):
         """Process any attachments in the request"""
@@ -241,7 +252,7 @@ class StreamProcessor:
         if not agent_id:
             return None, False, None
         try:
-            agent = self.agents_collection.find_one({"_id": ObjectId(agent_id)})
+            agent = self.data_loader.get_agent(agent_id=agent_id)
             if agent is None:
                 raise Exception("Agent not found")
             is_owner = agent.get("user") == user_id
@@ -266,12 +277,12 @@ class StreamProcessor:
             raise
 
     def _get_data_from_api_key(self, api_key: str) -> Dict[str, Any]:
-        data = self.agents_collection.find_one({"key": api_key})
+        data = self.data_loader.get_agent(api_key=api_key)
         if not data:
             raise Exception("Invalid API Key, please generate a new key", 401)
         source = data.get("source")
         if isinstance(source, DBRef):
-            source_doc = self.db.dereference(source)
+            source_doc = self.data_loader.dereference(source)
             if source_doc:
                 data["source"] = str(source_doc["_id"])
                 data["retriever"] = source_doc.get("retriever", data.get("retriever"))
@@ -296,7 +307,7 @@ class StreamProcessor:
                     }
                     sources_list.append(processed_source)
                 elif isinstance(source_ref, DBRef):
-                    source_doc = self.db.dereference(source_ref)
+                    source_doc = self.data_loader.dereference(source_ref)
                     if source_doc:
                         processed_source = {
                             "id": str(source_doc["_id"]),
@@ -441,7 +452,12 @@ class StreamProcessor:
             self.retriever_config["retriever_name"],
             source=self.source,
             chat_history=self.history,
-            prompt=get_prompt(self.agent_config["prompt_id"], self.prompts_collection),
+            prompt=self._get_prompt_content()
+            or get_prompt(
+                self.agent_config["prompt_id"],
+                self.prompts_collection,
+                self.data_loader,
+            ),
             chunks=self.retriever_config["chunks"],
             doc_token_limit=self.retriever_config.get("doc_token_limit", 50000),
             model_id=self.model_id,
@@ -505,17 +521,13 @@ class StreamProcessor:
         filtering_enabled = required_tool_actions is not None
 
         try:
-            user_tools_collection = self.db["user_tools"]
             user_id = self.initial_user_id or "local"
-
-            user_tools = list(
-                user_tools_collection.find({"user": user_id, "status": True})
-            )
+            user_tools = self.data_loader.get_user_tools(user_id)
 
             if not user_tools:
                 return None
 
-            tools_data = {}
+            prefetch_jobs = []
 
             for tool_doc in user_tools:
                 tool_name = tool_doc.get("name")
@@ -534,16 +546,63 @@ class StreamProcessor:
                 else:
                     required_actions = None
 
-                tool_data = self._fetch_tool_data(tool_doc, required_actions)
-                if tool_data:
-                    tools_data[tool_name] = tool_data
-                    tools_data[tool_id] = tool_data
+                prefetch_jobs.append((tool_doc, required_actions))
 
+            tools_data = self._run_tool_prefetch(prefetch_jobs)
             return tools_data if tools_data else None
         except Exception as e:
             logger.warning(f"Failed to pre-fetch tools: {type(e).__name__}")
             return None
 
+    def _run_tool_prefetch(self, prefetch_jobs) -> Dict[str, Any]:
+        """Fetch tools concurrently, dropping any not done by the global deadline"""
+        if not prefetch_jobs:
+            return {}
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(prefetch_jobs), settings.TOOL_PREFETCH_MAX_WORKERS),
+            thread_name_prefix="tool-prefetch",
+        )
+        futures = [
+            (
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._fetch_tool_data,
+                    tool_doc,
+                    required_actions,
+                ),
+                tool_doc,
+            )
+            for tool_doc, required_actions in prefetch_jobs
+        ]
+        done, not_done = wait(
+            [future for future, _ in futures],
+            timeout=settings.TOOL_PREFETCH_TIMEOUT_SECONDS,
+        )
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        tools_data = {}
+        # Merge in request order so same-named tools resolve as before
+        for future, tool_doc in futures:
+            if future not in done:
+                logger.warning(
+                    f"Tool pre-fetch for '{tool_doc.get('name')}' exceeded "
+                    f"{settings.TOOL_PREFETCH_TIMEOUT_SECONDS}s deadline, skipping"
+                )
+                continue
+            tool_data = future.result()
+            if tool_data:
+                tools_data[tool_doc.get("name")] = tool_data
+                tools_data[str(tool_doc.get("_id"))] = tool_data
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.timings["tool_prefetch_ms"] = elapsed_ms
+        logger.info(
+            f"Tool pre-fetch took {elapsed_ms:.0f}ms "
+            f"({len(done)}/{len(futures)} tools completed, {len(not_done)} timed out)"
+        )
+        return tools_data
+
     def _fetch_tool_data(
         self,
         tool_doc: Dict[str, Any],
@@ -620,7 +679,24 @@ class StreamProcessor:
                         elif "default" in param_spec:
                             kwargs[param_name] = param_spec["default"]
 
-                    result = tool.execute_action(action_name, **kwargs)
+                    # Tools opt into caching per action via "cache_ttl" (seconds)
+                    cache_ttl = action_meta.get("cache_ttl")
+                    cache_key = (
+                        tool_result_cache_key(
+                            tool_config["tool_id"], action_name, kwargs
+                        )
+                        if cache_ttl
+                        else None
+                    )
+                    cache_hit, result = (
+                        get_cached_tool_result(cache_key)
+                        if cache_key
+                        else (False, None)
+                    )
+                    if not cache_hit:
+                        result = tool.execute_action(action_name, **kwargs)
+                        if cache_key:
+                            set_cached_tool_result(cache_key, result, cache_ttl)
                     action_results[action_name] = result
                 except Exception as e:
                     logger.debug(
@@ -646,7 +722,9 @@ class StreamProcessor:
         if not prompt_id:
             return None
         try:
-            self._prompt_content = get_prompt(prompt_id, self.prompts_collection)
+            self._prompt_content = get_prompt(
+                prompt_id, self.prompts_collection, self.data_loader
+            )
         except ValueError as e:
             logger.debug(f"Invalid prompt ID '{prompt_id}': {str(e)}")
             self._prompt_content = None
@@ -712,7 +790,9 @@ class StreamProcessor:
         raw_prompt = self._get_prompt_content()
         if raw_prompt is None:
             raw_prompt = get_prompt(
-                self.agent_config["prompt_id"], self.prompts_collection
+                self.agent_config["prompt_id"],
+                self.prompts_collection,
+                self.data_loader,
             )
             self._prompt_content = raw_prompt
 
@@ -747,6 +827,7 @@ class StreamProcessor:
             attachments=self.attachments,
             json_schema=self.agent_config.get("json_schema"),
             compressed_summary=self.compressed_summary,
+            data_loader=self.data_loader,
         )
 
         agent.conversation_id = self.conversation_id
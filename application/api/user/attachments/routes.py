@@ -3,7 +3,7 @@
 import os
 
 from bson.objectid import ObjectId
-from flask import current_app, jsonify, make_response, request
+from flask import current_app, jsonify, make_response, request, Response
 from flask_restx import fields, Namespace, Resource
 
 from application.api import api
@@ -143,13 +143,12 @@ class ServeImage(Resource):
     @api.doc(description="Serve an image from storage")
     def get(self, image_path):
         try:
-            file_obj = storage.get_file(image_path)
+            chunks = storage.iter_file(image_path)
             extension = image_path.split(".")[-1].lower()
             content_type = f"image/{extension}"
             if extension == "jpg":
                 content_type = "image/jpeg"
-            response = make_response(file_obj.read())
-            response.headers.set("Content-Type", content_type)
+            response = Response(chunks, content_type=content_type)
             response.headers.set("Cache-Control", "max-age=86400")
 
             return response
@@ -15,6 +15,8 @@ from werkzeug.utils import secure_filename
 
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
+from application.services.analytics_service import AnalyticsRollupService
+from application.services.conversation_messages import ConversationMessageStore
 from application.storage.storage_creator import StorageCreator
 from application.vectorstore.vector_creator import VectorCreator
 
@@ -27,6 +29,7 @@ db = mongo[settings.MONGO_DB_NAME]
 
 
 conversations_collection = db["conversations"]
+conversation_messages_collection = db["conversation_messages"]
 sources_collection = db["sources"]
 prompts_collection = db["prompts"]
 feedback_collection = db["feedback"]
@@ -37,6 +40,7 @@ users_collection = db["users"]
 user_logs_collection = db["user_logs"]
 user_tools_collection = db["user_tools"]
 attachments_collection = db["attachments"]
+analytics_rollups_collection = db["analytics_rollups"]
 
 
 try:
@@ -46,6 +50,8 @@ try:
         background=True,
     )
     users_collection.create_index("user_id", unique=True)
+    AnalyticsRollupService(analytics_rollups_collection).ensure_indexes()
+    ConversationMessageStore(conversation_messages_collection).ensure_indexes()
 except Exception as e:
     print("Error creating indexes:", e)
 current_dir = os.path.dirname(
@@ -7,7 +7,17 @@ from flask import current_app, jsonify, make_response, request
 from flask_restx import fields, Namespace, Resource
 
 from application.api import api
-from application.api.user.base import attachments_collection, conversations_collection
+from application.api.user.base import (
+    analytics_rollups_collection,
+    attachments_collection,
+    conversation_messages_collection,
+    conversations_collection,
+)
+from application.services.analytics_service import AnalyticsRollupService
+from application.services.conversation_messages import (
+    ConversationMessageStore,
+    uses_message_storage,
+)
 from application.utils import check_required_fields
 
 conversations_ns = Namespace(
@@ -31,9 +41,13 @@ class DeleteConversation(Resource):
                 jsonify({"success": False, "message": "ID is required"}), 400
             )
         try:
-            conversations_collection.delete_one(
+            result = conversations_collection.delete_one(
                 {"_id": ObjectId(conversation_id), "user": decoded_token["sub"]}
             )
+            if result.deleted_count:
+                ConversationMessageStore(conversation_messages_collection).delete(
+                    [conversation_id]
+                )
         except Exception as err:
             current_app.logger.error(
                 f"Error deleting conversation: {err}", exc_info=True
@@ -54,6 +68,7 @@ class DeleteAllConversations(Resource):
         user_id = decoded_token.get("sub")
         try:
             conversations_collection.delete_many({"user": user_id})
+            conversation_messages_collection.delete_many({"user": user_id})
         except Exception as err:
             current_app.logger.error(
                 f"Error deleting all conversations: {err}", exc_info=True
@@ -127,7 +142,9 @@ class GetSingleConversation(Resource):
                 return make_response(jsonify({"status": "not found"}), 404)
             # Process queries to include attachment names
 
-            queries = conversation["queries"]
+            queries = ConversationMessageStore(
+                conversation_messages_collection
+            ).load_queries(conversation)
             for query in queries:
                 if "attachments" in query and query["attachments"]:
                     attachment_details = []
@@ -238,10 +255,35 @@ class SubmitFeedback(Resource):
         if missing_fields:
             return missing_fields
         try:
-            if data["feedback"] is None:
+            question_index = int(data["question_index"])
+            previous_projection = {
+                "api_key": 1,
+                "queries": {"$slice": [question_index, 1]},
+            }
+            new_timestamp = None
+            if data["feedback"] is not None:
+                new_timestamp = datetime.datetime.now(datetime.timezone.utc)
+            conversation = conversations_collection.find_one(
+                {
+                    "_id": ObjectId(data["conversation_id"]),
+                    "user": decoded_token.get("sub"),
+                },
+                {"api_key": 1, "message_storage": 1},
+            )
+            if uses_message_storage(conversation):
+                previous_query = ConversationMessageStore(
+                    conversation_messages_collection
+                ).set_feedback(
+                    conversation["_id"], question_index, data["feedback"], new_timestamp
+                )
+                previous = {
+                    "api_key": conversation.get("api_key"),
+                    "queries": [previous_query] if previous_query else [],
+                }
+            elif data["feedback"] is None:
                 # Remove feedback and feedback_timestamp if feedback is null
 
-                conversations_collection.update_one(
+                previous = conversations_collection.find_one_and_update(
                     {
                         "_id": ObjectId(data["conversation_id"]),
                         "user": decoded_token.get("sub"),
@@ -253,11 +295,12 @@ class SubmitFeedback(Resource):
                             f"queries.{data['question_index']}.feedback_timestamp": "",
                         }
                     },
+                    projection=previous_projection,
                 )
             else:
                 # Set feedback and feedback_timestamp if feedback has a value
 
-                conversations_collection.update_one(
+                previous = conversations_collection.find_one_and_update(
                     {
                         "_id": ObjectId(data["conversation_id"]),
                         "user": decoded_token.get("sub"),
@@ -268,11 +311,20 @@ class SubmitFeedback(Resource):
                             f"queries.{data['question_index']}.feedback": data[
                                 "feedback"
                             ],
-                            f"queries.{data['question_index']}.feedback_timestamp": datetime.datetime.now(
-                                datetime.timezone.utc
-                            ),
+                            f"queries.{data['question_index']}.feedback_timestamp": new_timestamp,
                         }
                     },
+                    projection=previous_projection,
+                )
+            if previous and previous.get("queries"):
+                previous_query = previous["queries"][0]
+                AnalyticsRollupService(analytics_rollups_collection).record_feedback_change(
+                    decoded_token.get("sub"),
+                    previous.get("api_key"),
+                    previous_query.get("feedback"),
+                    previous_query.get("feedback_timestamp"),
+                    data["feedback"],
+                    new_timestamp,
                 )
         except Exception as err:
             current_app.logger.error(f"Error submitting feedback: {err}", exc_info=True)
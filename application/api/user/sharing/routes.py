@@ -12,9 +12,11 @@ from application.api import api
 from application.api.user.base import (
     agents_collection,
     attachments_collection,
+    conversation_messages_collection,
     conversations_collection,
     shared_conversations_collections,
 )
+from application.services.conversation_messages import ConversationMessageStore
 from application.utils import check_required_fields
 
 sharing_ns = Namespace(
@@ -69,7 +71,7 @@ class ShareConversation(Resource):
                     ),
                     404,
                 )
-            current_n_queries = len(conversation["queries"])
+            current_n_queries = ConversationMessageStore.count(conversation)
             explicit_binary = Binary.from_uuid(
                 uuid.uuid4(), UuidRepresentation.STANDARD
             )
@@ -235,9 +237,9 @@ class GetPubliclySharedConversations(Resource):
                         ),
                         404,
                     )
-                conversation_queries = conversation["queries"][
-                    : (shared["first_n_queries"])
-                ]
+                conversation_queries = ConversationMessageStore(
+                    conversation_messages_collection
+                ).load_queries(conversation, limit=shared["first_n_queries"])
 
                 for query in conversation_queries:
                     if "attachments" in query and query["attachments"]:
@@ -23,6 +23,7 @@ class GetChunks(Resource):
             "per_page": "Number of chunks per page",
             "path": "Optional: Filter chunks by relative file path",
             "search": "Optional: Search term to filter chunks by title or content",
+            "cursor": "Optional: next_cursor of the previous page, used instead of page where the store supports it",
         },
     )
     def get(self):
@@ -34,7 +35,9 @@ class GetChunks(Resource):
         page = int(request.args.get("page", 1))
         per_page = int(request.args.get("per_page", 10))
         path = request.args.get("path")
-        search_term = request.args.get("search", "").strip().lower()
+        search = request.args.get("search", "").strip()
+        search_term = search.lower()
+        cursor = request.args.get("cursor") or None
 
         if not ObjectId.is_valid(doc_id):
             return make_response(jsonify({"error": "Invalid doc_id"}), 400)
@@ -45,43 +48,22 @@ class GetChunks(Resource):
             )
         try:
             store = get_vector_store(doc_id)
-            chunks = store.get_chunks()
-
-            filtered_chunks = []
-            for chunk in chunks:
-                metadata = chunk.get("metadata", {})
-
-                # Filter by path if provided
-
-                if path:
-                    chunk_source = metadata.get("source", "")
-                    # Check if the chunk's source matches the requested path
-
-                    if not chunk_source or not chunk_source.endswith(path):
-                        continue
-                # Filter by search term if provided
-
-                if search_term:
-                    text_match = search_term in chunk.get("text", "").lower()
-                    title_match = search_term in metadata.get("title", "").lower()
-
-                    if not (text_match or title_match):
-                        continue
-                filtered_chunks.append(chunk)
-            chunks = filtered_chunks
-
-            total_chunks = len(chunks)
-            start = (page - 1) * per_page
-            end = start + per_page
-            paginated_chunks = chunks[start:end]
+            chunk_page = store.iter_chunks(
+                path=path or None,
+                search=search or None,
+                offset=(page - 1) * per_page,
+                limit=per_page,
+                cursor=cursor,
+            )
 
             return make_response(
                 jsonify(
                     {
                         "page": page,
                         "per_page": per_page,
-                        "total": total_chunks,
-                        "chunks": paginated_chunks,
+                        "total": chunk_page.total,
+                        "chunks": chunk_page.chunks,
+                        "next_cursor": chunk_page.next_cursor,
                         "path": path if path else None,
                         "search": search_term if search_term else None,
                     }
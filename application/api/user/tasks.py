@@ -4,11 +4,13 @@ from application.celery_init import celery
 from application.worker import (
     agent_webhook_worker,
     attachment_worker,
+    conversation_compression_worker,
     ingest_worker,
     mcp_oauth,
     mcp_oauth_status,
     remote_worker,
     sync_worker,
+    usage_counters_reconcile_worker,
 )
 
 
@@ -38,6 +40,20 @@ def schedule_syncs(self, frequency):
     return resp
 
 
+@celery.task(bind=True)
+def reconcile_usage_counters(self):
+    resp = usage_counters_reconcile_worker(self)
+    return resp
+
+
+@celery.task(bind=True)
+def compress_conversation_task(self, conversation_id, user_id, model_id, decoded_token):
+    resp = conversation_compression_worker(
+        self, conversation_id, user_id, model_id, decoded_token
+    )
+    return resp
+
+
 @celery.task(bind=True)
 def store_attachment(self, file_info, user):
     resp = attachment_worker(self, file_info, user)
@@ -98,6 +114,10 @@ def setup_periodic_tasks(sender, **kwargs):
         timedelta(days=30),
         schedule_syncs.s("monthly"),
     )
+    sender.add_periodic_task(
+        timedelta(minutes=15),
+        reconcile_usage_counters.s(),
+    )
 
 
 @celery.task(bind=True)
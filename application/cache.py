@@ -115,3 +115,68 @@ def stream_cache(func):
                 logger.error(f"Error setting stream cache: {e}", exc_info=True)
 
     return wrapper
+
+
+TOOL_RESULT_PREFIX = "tool_result:"
+TOOL_RESULT_GENERATION_PREFIX = "tool_result_generation:"
+
+
+def tool_result_cache_key(tool_id, action_name, params):
+    """Return the cache key of a tool action result, or None if Redis is unreachable.
+
+    Keys include the tool's current generation, so bumping it in
+    ``invalidate_tool_results`` orphans every earlier result, which then
+    expires on its own TTL.
+    """
+    params_str = json.dumps(params, sort_keys=True, default=str)
+    generation = 0
+    redis_client = get_redis_instance()
+    if redis_client:
+        try:
+            generation = int(
+                redis_client.get(f"{TOOL_RESULT_GENERATION_PREFIX}{tool_id}") or 0
+            )
+        except Exception as e:
+            logger.error(f"Error getting tool result generation: {e}", exc_info=True)
+            return None
+    return (
+        f"{TOOL_RESULT_PREFIX}{tool_id}:{generation}:{action_name}:"
+        f"{get_hash(params_str)}"
+    )
+
+
+def get_cached_tool_result(cache_key):
+    """Return ``(hit, result)`` for a cached tool action result."""
+    redis_client = get_redis_instance()
+    if not redis_client:
+        return False, None
+    try:
+        cached_result = redis_client.get(cache_key)
+        if cached_result is not None:
+            return True, json.loads(cached_result.decode("utf-8"))
+    except Exception as e:
+        logger.error(f"Error getting cached tool result: {e}", exc_info=True)
+    return False, None
+
+
+def set_cached_tool_result(cache_key, result, ttl):
+    redis_client = get_redis_instance()
+    if not redis_client:
+        return
+    try:
+        redis_client.set(cache_key, json.dumps(result), ex=int(ttl))
+    except (TypeError, ValueError):
+        logger.debug(f"Tool result for {cache_key} is not JSON serializable")
+    except Exception as e:
+        logger.error(f"Error setting tool result cache: {e}", exc_info=True)
+
+
+def invalidate_tool_results(tool_id):
+    """Drop every cached action result of a tool, e.g. after it was modified."""
+    redis_client = get_redis_instance()
+    if not redis_client:
+        return
+    try:
+        redis_client.incr(f"{TOOL_RESULT_GENERATION_PREFIX}{tool_id}")
+    except Exception as e:
+        logger.error(f"Error invalidating tool result cache: {e}", exc_info=True)
@@ -0,0 +1,223 @@
+"""
+Process-wide cache for read-mostly configuration documents.
+
+Agents, prompts, ``user_tools`` and sources are read on every answer but
+change rarely. Entries live in an in-process LRU and, optionally, in Redis
+so workers share them. A Mongo change-stream listener (one daemon thread per
+process) bumps a per-collection generation on every write, which makes all
+cached entries of that collection stale at once. Change streams need a
+replica set; on a standalone server entries fall back to a short TTL.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from bson import BSON
+
+from application.cache import get_redis_instance
+from application.core.mongo_db import MongoDB
+from application.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CACHED_COLLECTIONS = ("agents", "prompts", "user_tools", "sources")
+REDIS_PREFIX = "config_cache:"
+# Writes that only touch these fields do not change cached configuration
+IGNORED_UPDATE_FIELDS = {"lastUsedAt", "updatedAt"}
+LISTENER_RETRY_SECONDS = 60.0
+
+
+class ConfigCache:
+    """LRU (plus optional Redis tier) kept coherent by Mongo change streams"""
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        ttl: float = 300.0,
+        fallback_ttl: float = 5.0,
+        use_redis: bool = False,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.fallback_ttl = fallback_ttl
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any, Any]]" = (
+            OrderedDict()
+        )
+        self._generations: Dict[str, int] = {name: 0 for name in CACHED_COLLECTIONS}
+        self._redis_generations: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._listening = False
+        self._listener: Optional[threading.Thread] = None
+        self._listener_pid: Optional[int] = None
+        self._listener_failed_at: Optional[float] = None
+
+    def get_or_load(self, collection: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or store the result of ``loader``.
+
+        Cached values are shared between callers and must not be mutated.
+        """
+        if not settings.ENABLE_CONFIG_CACHE:
+            return loader()
+        self._ensure_listener()
+        generation = self._generation(collection)
+        cache_key = (collection, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                expires_at, entry_generation, value = entry
+                if expires_at > now and entry_generation == generation:
+                    self._entries.move_to_end(cache_key)
+                    return value
+                del self._entries[cache_key]
+
+        hit, value = self._redis_get(collection, key, generation)
+        if not hit:
+            value = loader()
+            self._redis_set(collection, key, generation, value)
+        with self._lock:
+            if generation == self._generation(collection, refresh=False):
+                self._entries[cache_key] = (now + self._entry_ttl(), generation, value)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Mark every entry of ``collection`` (or of all collections) stale."""
+        collections = [collection] if collection else list(self._generations)
+        with self._lock:
+            for name in collections:
+                self._generations[name] = self._generations.get(name, 0) + 1
+        redis_client = get_redis_instance() if self.use_redis else None
+        if redis_client:
+            try:
+                for name in collections:
+                    redis_client.incr(f"{REDIS_PREFIX}generation:{name}")
+            except Exception as e:
+                logger.warning(f"Failed to bump config cache generation: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for name in self._generations:
+                self._generations[name] += 1
+
+    def _entry_ttl(self) -> float:
+        return self.ttl if self._listening else self.fallback_ttl
+
+    def _generation(self, collection: str, refresh: bool = True) -> Tuple[int, Any]:
+        """Local generation plus, with Redis, the shared cross-worker one."""
+        if self.use_redis and refresh:
+            redis_client = get_redis_instance()
+            redis_generation = None
+            if redis_client:
+                try:
+                    redis_generation = redis_client.get(
+                        f"{REDIS_PREFIX}generation:{collection}"
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to read config cache generation: {e}")
+            self._redis_generations[collection] = redis_generation
+        return (
+            self._generations.get(collection, 0),
+            self._redis_generations.get(collection),
+        )
+
+    def _redis_key(self, collection: str, key: Hashable, generation: Any) -> str:
+        redis_generation = generation[1]
+        if isinstance(redis_generation, bytes):
+            redis_generation = redis_generation.decode()
+        return f"{REDIS_PREFIX}{collection}:{redis_generation or 0}:{key}"
+
+    def _redis_get(self, collection: str, key: Hashable, generation: Any):
+        redis_client = get_redis_instance() if self.use_redis else None
+        if not redis_client:
+            return False, None
+        try:
+            cached = redis_client.get(self._redis_key(collection, key, generation))
+            if cached is not None:
+                return True, BSON(cached).decode()["value"]
+        except Exception as e:
+            logger.debug(f"Failed to read config cache entry: {e}")
+        return False, None
+
+    def _redis_set(self, collection: str, key: Hashable, generation: Any, value: Any):
+        redis_client = get_redis_instance() if self.use_redis else None
+        if not redis_client:
+            return
+        try:
+            redis_client.set(
+                self._redis_key(collection, key, generation),
+                BSON.encode({"value": value}),
+                ex=max(1, int(self._entry_ttl())),
+            )
+        except Exception as e:
+            logger.debug(f"Failed to store config cache entry: {e}")
+
+    def _ensure_listener(self) -> None:
+        if self._listener_pid == os.getpid() and (
+            self._listener is not None and self._listener.is_alive()
+        ):
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid() and (
+                self._listener is not None and self._listener.is_alive()
+            ):
+                return
+            if (
+                self._listener_failed_at is not None
+                and self._listener_pid == os.getpid()
+                and time.monotonic() - self._listener_failed_at < LISTENER_RETRY_SECONDS
+            ):
+                return
+            self._listener_pid = os.getpid()
+            self._listening = False
+            self._listener = threading.Thread(
+                target=self._listen, name="config-cache-listener", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self) -> None:
+        try:
+            db = MongoDB.get_client()[settings.MONGO_DB_NAME]
+            pipeline = [{"$match": {"ns.coll": {"$in": list(CACHED_COLLECTIONS)}}}]
+            with db.watch(pipeline) as stream:
+                # Entries cached before the stream opened may have missed writes
+                self.invalidate()
+                self._listening = True
+                for change in stream:
+                    if self._is_relevant(change):
+                        self.invalidate(change["ns"]["coll"])
+        except Exception as e:
+            logger.info(
+                f"Config cache change stream unavailable, "
+                f"using {self.fallback_ttl}s TTL: {e}"
+            )
+        finally:
+            if self._listening:
+                self.invalidate()
+            self._listening = False
+            self._listener_failed_at = time.monotonic()
+
+    @staticmethod
+    def _is_relevant(change: Dict[str, Any]) -> bool:
+        if change.get("operationType") != "update":
+            return True
+        description = change.get("updateDescription") or {}
+        changed = set(description.get("updatedFields") or {})
+        changed.update(description.get("removedFields") or [])
+        return not changed <= IGNORED_UPDATE_FIELDS
+
+
+config_cache = ConfigCache(
+    max_size=settings.CONFIG_CACHE_SIZE,
+    ttl=settings.CONFIG_CACHE_TTL_SECONDS,
+    fallback_ttl=settings.CONFIG_CACHE_FALLBACK_TTL_SECONDS,
+    use_redis=settings.CONFIG_CACHE_REDIS,
+)
@@ -0,0 +1,169 @@
+import copy
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson.dbref import DBRef
+from bson.objectid import ObjectId
+
+from application.core.config_cache import CACHED_COLLECTIONS, config_cache
+from application.core.mongo_db import MongoDB
+from application.core.settings import settings
+
+# Agent fields read while answering; anything else stays in Mongo
+AGENT_PROJECTION = {
+    field: 1
+    for field in (
+        "user",
+        "key",
+        "shared_publicly",
+        "shared_with",
+        "shared_token",
+        "source",
+        "sources",
+        "retriever",
+        "chunks",
+        "prompt_id",
+        "agent_type",
+        "json_schema",
+        "default_model_id",
+        "tools",
+        "limited_token_mode",
+        "limited_request_mode",
+        "token_limit",
+        "request_limit",
+    )
+}
+
+
+class RequestDataLoader:
+    """Request-scoped memo of the Mongo documents an answer needs.
+
+    The answer routes, ``StreamProcessor`` and the agent read the same agent,
+    prompt, tool and source documents; sharing one loader per request fetches
+    each of them once. Misses go through the process-wide ``config_cache``
+    before reaching Mongo. Documents are returned as copies so callers may
+    mutate them freely.
+    """
+
+    def __init__(self, db=None):
+        self._db = db
+        self._agents_by_id: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._agents_by_key: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._prompts: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._user_tools: Dict[str, List[Dict[str, Any]]] = {}
+        self._references: Dict[tuple, Optional[Dict[str, Any]]] = {}
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = MongoDB.get_client()[settings.MONGO_DB_NAME]
+        return self._db
+
+    def get_agent(
+        self, agent_id: Optional[str] = None, api_key: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch an agent by ``_id`` or by API key."""
+        if agent_id is not None:
+            agent_id = str(agent_id)
+            if agent_id not in self._agents_by_id:
+                self._remember_agent(
+                    config_cache.get_or_load(
+                        "agents",
+                        f"id:{agent_id}",
+                        lambda: self.db["agents"].find_one(
+                            {"_id": ObjectId(agent_id)}, AGENT_PROJECTION
+                        ),
+                    ),
+                    agent_id=agent_id,
+                )
+            agent = self._agents_by_id[agent_id]
+        elif api_key is not None:
+            if api_key not in self._agents_by_key:
+                self._remember_agent(
+                    config_cache.get_or_load(
+                        "agents",
+                        f"key:{api_key}",
+                        lambda: self.db["agents"].find_one(
+                            {"key": api_key}, AGENT_PROJECTION
+                        ),
+                    ),
+                    api_key=api_key,
+                )
+            agent = self._agents_by_key[api_key]
+        else:
+            return None
+        return copy.deepcopy(agent)
+
+    def _remember_agent(
+        self,
+        agent: Optional[Dict[str, Any]],
+        agent_id: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> None:
+        if agent is not None:
+            agent_id = str(agent["_id"])
+            api_key = agent.get("key") or api_key
+        if agent_id is not None:
+            self._agents_by_id[agent_id] = agent
+        if api_key is not None:
+            self._agents_by_key[api_key] = agent
+
+    def get_prompt(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a stored prompt document by ``_id``."""
+        if prompt_id not in self._prompts:
+            self._prompts[prompt_id] = config_cache.get_or_load(
+                "prompts",
+                prompt_id,
+                lambda: self.db["prompts"].find_one(
+                    {"_id": ObjectId(prompt_id)}, {"content": 1}
+                ),
+            )
+        return copy.deepcopy(self._prompts[prompt_id])
+
+    def get_tools(self, tool_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Fetch ``user_tools`` documents by ``_id``, skipping missing ones."""
+        tool_ids = [str(tool_id) for tool_id in tool_ids]
+        missing = [tool_id for tool_id in tool_ids if tool_id not in self._tools]
+        if missing:
+            object_ids = [ObjectId(tool_id) for tool_id in missing]
+            tools = config_cache.get_or_load(
+                "user_tools",
+                "ids:" + ",".join(sorted(missing)),
+                lambda: list(self.db["user_tools"].find({"_id": {"$in": object_ids}})),
+            )
+            for tool in tools:
+                self._tools[str(tool["_id"])] = tool
+        return [
+            copy.deepcopy(self._tools[tool_id])
+            for tool_id in dict.fromkeys(tool_ids)
+            if tool_id in self._tools
+        ]
+
+    def get_user_tools(self, user: str) -> List[Dict[str, Any]]:
+        """Fetch the active tools of ``user``."""
+        if user not in self._user_tools:
+            tools = config_cache.get_or_load(
+                "user_tools",
+                f"user:{user}",
+                lambda: list(
+                    self.db["user_tools"].find({"user": user, "status": True})
+                ),
+            )
+            self._user_tools[user] = tools
+            for tool in tools:
+                self._tools.setdefault(str(tool["_id"]), tool)
+        return copy.deepcopy(self._user_tools[user])
+
+    def dereference(self, reference: DBRef) -> Optional[Dict[str, Any]]:
+        """Resolve a ``DBRef`` such as an agent's source."""
+        key = (reference.collection, str(reference.id))
+        if key not in self._references:
+            if reference.collection in CACHED_COLLECTIONS:
+                self._references[key] = config_cache.get_or_load(
+                    reference.collection,
+                    f"id:{key[1]}",
+                    lambda: self.db.dereference(reference),
+                )
+            else:
+                self._references[key] = self.db.dereference(reference)
+        return copy.deepcopy(self._references[key])
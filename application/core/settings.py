@@ -57,10 +57,29 @@ class Settings(BaseSettings):
 
     # GitHub source
     GITHUB_ACCESS_TOKEN: Optional[str] = None  # PAT token with read repo access
+    GITHUB_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Last synced tree of each repo
 
     # LLM Cache
     CACHE_REDIS_URL: str = "redis://localhost:6379/2"
 
+    # Token counting
+    TOKEN_COUNT_CACHE_SIZE: int = 4096  # memoized token counts kept per process
+    TOKEN_BUDGET_ESTIMATE: bool = False  # use byte-ratio estimates for budget checks
+
+    # Agent/prompt/tool config cache
+    ENABLE_CONFIG_CACHE: bool = True
+    CONFIG_CACHE_SIZE: int = 2048  # cached config documents per process
+    CONFIG_CACHE_TTL_SECONDS: float = 300.0  # entry lifetime while change streams keep it coherent
+    CONFIG_CACHE_FALLBACK_TTL_SECONDS: float = 5.0  # entry lifetime without change streams (standalone mongo)
+    CONFIG_CACHE_REDIS: bool = False  # share cached config between workers through redis
+
+    # Prompt templates
+    TEMPLATE_CACHE_SIZE: int = 256  # compiled prompt templates kept per process
+
+    # Token usage recording
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 2.0  # max delay before usage is written
+    USAGE_FLUSH_BATCH_SIZE: int = 100  # flush early once this many records are pending
+
     API_URL: str = "http://localhost:7091"  # backend url for celery worker
 
     API_KEY: Optional[str] = None  # LLM api key (used by LLM_PROVIDER)
@@ -132,6 +151,33 @@ class Settings(BaseSettings):
     FLASK_DEBUG_MODE: bool = False
     STORAGE_TYPE: str = "local"  # local or s3
     URL_STRATEGY: str = "backend"  # backend or s3
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024  # Objects above this use multipart transfers
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 10  # Parallel parts per transfer
+
+    # Web crawler settings
+    CRAWLER_USER_AGENT: str = "DocsGPT-Crawler/1.0 (+https://github.com/arc53/DocsGPT)"
+    CRAWLER_MAX_CONCURRENCY: int = 16
+    CRAWLER_MAX_PER_HOST: int = 4  # Unless robots.txt asks for a crawl delay
+    CRAWLER_TIMEOUT_SECONDS: float = 20.0
+    CRAWLER_CACHE_TTL_SECONDS: int = 45 * 24 * 3600  # Validators kept for re-syncs
+
+    # Disk cache for crawled pages and GitHub files (disabled when unset)
+    REMOTE_CACHE_DIR: Optional[str] = None
+    REMOTE_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+    # Limits for zip archives extracted during ingestion
+    ZIP_MAX_TOTAL_BYTES: int = 2 * 1024 * 1024 * 1024  # Uncompressed bytes
+    ZIP_MAX_ENTRIES: int = 10000
+
+    # Local disk cache in front of remote storage (disabled when unset)
+    STORAGE_CACHE_DIR: Optional[str] = None
+    STORAGE_CACHE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+    STORAGE_CACHE_REVALIDATE_SECONDS: float = 30.0  # Trust a checked version this long
+
+    # Concurrent storage downloads during ingestion
+    STORAGE_TRANSFER_WORKERS: int = 8
+    STORAGE_TRANSFER_MAX_IN_FLIGHT_BYTES: int = 256 * 1024 * 1024
 
     JWT_SECRET_KEY: str = ""
 
@@ -143,6 +189,25 @@ class Settings(BaseSettings):
 
     # Tool pre-fetch settings
     ENABLE_TOOL_PREFETCH: bool = True
+    TOOL_PREFETCH_TIMEOUT_SECONDS: float = 5.0  # Global deadline for all pre-fetched tools
+    TOOL_PREFETCH_MAX_WORKERS: int = 8
+
+    # Tool execution settings
+    ENABLE_PARALLEL_TOOL_CALLS: bool = True  # Run parallel-safe tool calls of one turn concurrently
+    TOOL_CALL_MAX_WORKERS: int = 8
+    TOOL_CALL_TIMEOUT_SECONDS: float = 120.0
+    TOOL_INSTANCE_CACHE_SIZE: int = 256  # Tool instances reused per (tool, config, user)
+
+    # MCP session pool settings
+    MCP_MAX_SESSIONS: int = 64  # Connected MCP sessions kept per process
+    MCP_SESSION_IDLE_TIMEOUT_SECONDS: float = 300.0  # Close sessions unused this long
+    MCP_SESSION_PROBE_INTERVAL_SECONDS: float = 60.0  # Ping idle sessions before reuse
+    MCP_TOOLS_CACHE_TTL_SECONDS: float = 300.0  # Cached list_tools schema lifetime
+    MCP_OAUTH_TIMEOUT_SECONDS: float = 360.0  # OAuth discovery, incl. the 5-minute redirect wait
+
+    # Conversation storage: "embedded" keeps every turn in conversations.queries,
+    # "messages" stores new conversations one turn per conversation_messages document
+    CONVERSATION_STORAGE: str = "embedded"
 
     # Conversation Compression Settings
     ENABLE_CONVERSATION_COMPRESSION: bool = True
@@ -150,6 +215,8 @@ class Settings(BaseSettings):
     COMPRESSION_MODEL_OVERRIDE: Optional[str] = None  # Use different model for compression
     COMPRESSION_PROMPT_VERSION: str = "v1.0"  # Track prompt iterations
     COMPRESSION_MAX_HISTORY_POINTS: int = 3  # Keep only last N compression points to prevent DB bloat
+    ENABLE_BACKGROUND_COMPRESSION: bool = True  # Summarise in Celery ahead of the hard limit
+    COMPRESSION_SOFT_THRESHOLD_PERCENTAGE: float = 0.6  # Schedule background compression at 60%
 
     # Stripe Configuration (set via environment variables)
     STRIPE_SECRET_KEY: Optional[str] = None
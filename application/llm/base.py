@@ -20,6 +20,7 @@ class BaseLLM(ABC):
         self.model_id = model_id
         self.base_url = base_url
         self.token_usage = {"prompt_tokens": 0, "generated_tokens": 0}
+        self._reported_usage = None
         self._fallback_llm = None
         self._fallback_sequence_index = 0
 
@@ -46,6 +47,23 @@ class BaseLLM(ABC):
                 )
         return self._fallback_llm
 
+    def _set_reported_usage(self, prompt_tokens, generated_tokens):
+        """Store token counts reported by the provider for the current call.
+
+        The usage decorators prefer these over re-tokenizing with tiktoken.
+        """
+        if not isinstance(prompt_tokens, int) or not isinstance(generated_tokens, int):
+            return
+        self._reported_usage = {
+            "prompt_tokens": int(prompt_tokens),
+            "generated_tokens": int(generated_tokens),
+        }
+
+    def _pop_reported_usage(self):
+        usage = getattr(self, "_reported_usage", None)
+        self._reported_usage = None
+        return usage
+
     @staticmethod
     def _remove_null_values(args_dict):
         if not isinstance(args_dict, dict):
@@ -410,6 +410,7 @@ class GoogleLLM(BaseLLM):
             contents=messages,
             config=config,
         )
+        self._capture_usage(getattr(response, "usage_metadata", None))
 
         if tools:
             return response
@@ -469,6 +470,7 @@ class GoogleLLM(BaseLLM):
 
         try:
             for chunk in response:
+                self._capture_usage(getattr(chunk, "usage_metadata", None))
                 if hasattr(chunk, "candidates") and chunk.candidates:
                     for candidate in chunk.candidates:
                         if candidate.content and candidate.content.parts:
@@ -483,6 +485,13 @@ class GoogleLLM(BaseLLM):
             if hasattr(response, "close"):
                 response.close()
 
+    def _capture_usage(self, usage_metadata):
+        if usage_metadata is not None:
+            self._set_reported_usage(
+                getattr(usage_metadata, "prompt_token_count", None),
+                getattr(usage_metadata, "candidates_token_count", None),
+            )
+
     def _supports_tools(self):
         """Return whether this LLM supports function calling."""
         return True
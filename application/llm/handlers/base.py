@@ -1,13 +1,46 @@
+import contextvars
 import logging
+import queue
+import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from typing import Any, Dict, Generator, List, Optional, Union
 
+from application.core.settings import settings
 from application.logging import build_stack_data
 
 logger = logging.getLogger(__name__)
 
+_tool_semaphores: Dict[type, threading.BoundedSemaphore] = {}
+_tool_semaphores_lock = threading.Lock()
+
+
+@contextmanager
+def _tool_slot(tool_class):
+    """Hold one of the tool class's ``max_concurrency`` slots for this process."""
+    with _tool_semaphores_lock:
+        semaphore = _tool_semaphores.get(tool_class)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(
+                max(1, getattr(tool_class, "max_concurrency", 1))
+            )
+            _tool_semaphores[tool_class] = semaphore
+    with semaphore:
+        yield
+
+
+def _is_final_tool_event(event) -> bool:
+    """Whether ``event`` is the last one an agent yields before recording a call."""
+    return (
+        isinstance(event, dict)
+        and event.get("type") == "tool_call"
+        and event.get("data", {}).get("status") != "pending"
+    )
+
 
 @dataclass
 class ToolCall:
@@ -597,7 +630,9 @@ class LLMHandler(ABC):
         """
         updated_messages = messages.copy()
 
-        for i, call in enumerate(tool_calls):
+        i = 0
+        while i < len(tool_calls):
+            call = tool_calls[i]
             # Check context limit before executing tool call
             if hasattr(agent, '_check_context_limit') and agent._check_context_limit(updated_messages):
                 # Context limit reached - attempt mid-execution compression
@@ -701,67 +736,278 @@ class LLMHandler(ABC):
                     # Set flag on agent
                     agent.context_limit_reached = True
                     break
-            try:
-                self.tool_calls.append(call)
-                tool_executor_gen = agent._execute_tool_action(tools_dict, call)
-                while True:
-                    try:
-                        yield next(tool_executor_gen)
-                    except StopIteration as e:
-                        tool_response, call_id = e.value
-                        break
-                    
-                function_call_content = {
-                    "function_call": {
-                        "name": call.name,
-                        "args": call.arguments,
-                        "call_id": call_id,
-                    }
-                }
-                # Include thought_signature for Google Gemini 3 models
-                # It should be at the same level as function_call, not inside it
-                if call.thought_signature:
-                    function_call_content["thought_signature"] = call.thought_signature
-                updated_messages.append(
-                    {
-                        "role": "assistant",
-                        "content": [function_call_content],
-                    }
+
+            # Consecutive parallel-safe calls run as one concurrent batch; the
+            # context limit is checked once per batch
+            batch = self._next_tool_batch(tool_calls, i, tools_dict)
+            if len(batch) > 1:
+                yield from self._execute_tool_calls_concurrently(
+                    agent, batch, tools_dict, updated_messages
                 )
+            else:
+                yield from self._execute_tool_call(
+                    agent, call, tools_dict, updated_messages
+                )
+            i += len(batch)
+        return updated_messages
 
+    def _execute_tool_call(
+        self, agent, call: ToolCall, tools_dict: Dict, updated_messages: List[Dict]
+    ) -> Generator:
+        """Execute a single tool call and append its messages."""
+        try:
+            self.tool_calls.append(call)
+            tool_executor_gen = agent._execute_tool_action(tools_dict, call)
+            while True:
+                try:
+                    yield next(tool_executor_gen)
+                except StopIteration as e:
+                    tool_response, call_id = e.value
+                    break
+
+            self._append_tool_result(updated_messages, call, tool_response, call_id)
+        except Exception as e:
+            logger.error(f"Error executing tool: {str(e)}", exc_info=True)
+            error_response = f"Error executing tool: {str(e)}"
+            yield self._append_tool_error(
+                updated_messages, call, tools_dict, error_response
+            )
+
+    def _execute_tool_calls_concurrently(
+        self,
+        agent,
+        batch: List[tuple],
+        tools_dict: Dict,
+        updated_messages: List[Dict],
+    ) -> Generator:
+        """
+        Execute parallel-safe tool calls concurrently.
+
+        Events are streamed as each call progresses. Messages are appended in
+        the original call order once every call has finished or timed out. A
+        call that times out is reported as an error and is never recorded on
+        the agent, even if it completes later.
 
-                updated_messages.append(self.create_tool_message(call, tool_response))
+        Args:
+            agent: The agent instance
+            batch: (ToolCall, tool class) pairs from _next_tool_batch
+            tools_dict: Available tools dictionary
+            updated_messages: Messages list to append results to
+        """
+        calls = [call for call, _ in batch]
+        timeout = settings.TOOL_CALL_TIMEOUT_SECONDS
+        events = queue.Queue()
+        # Set once the batch stops waiting; calls that finish later are dropped
+        cancelled = threading.Event()
+        record_lock = threading.Lock()
+
+        def run(index, call, tool_class):
+            try:
+                with _tool_slot(tool_class):
+                    tool_executor_gen = agent._execute_tool_action(tools_dict, call)
+                    final = False
+                    while True:
+                        # Resuming past the final tool_call event records the
+                        # call on the agent, so that step is taken under the lock
+                        with record_lock if final else nullcontext():
+                            if cancelled.is_set():
+                                tool_executor_gen.close()
+                                return
+                            try:
+                                event = next(tool_executor_gen)
+                            except StopIteration as e:
+                                events.put((index, "result", e.value))
+                                return
+                        events.put((index, "event", event))
+                        final = _is_final_tool_event(event)
             except Exception as e:
-                logger.error(f"Error executing tool: {str(e)}", exc_info=True)
-                error_call = ToolCall(
-                    id=call.id, name=call.name, arguments=call.arguments
+                events.put((index, "error", e))
+
+        def take(index, kind, payload):
+            outcomes[index] = (kind, payload)
+            if kind == "error":
+                logger.error(f"Error executing tool: {str(payload)}", exc_info=payload)
+                return self._tool_error_event(
+                    calls[index], tools_dict, f"Error executing tool: {str(payload)}"
                 )
-                error_response = f"Error executing tool: {str(e)}"
-                error_message = self.create_tool_message(error_call, error_response)
-                updated_messages.append(error_message)
-
-                call_parts = call.name.split("_")
-                if len(call_parts) >= 2:
-                    tool_id = call_parts[-1]  # Last part is tool ID (e.g., "1")
-                    action_name = "_".join(call_parts[:-1])
-                    tool_name = tools_dict.get(tool_id, {}).get("name", "unknown_tool")
-                    full_action_name = f"{action_name}_{tool_id}"
-                else:
-                    tool_name = "unknown_tool"
-                    action_name = call.name
-                    full_action_name = call.name
-                yield {
-                    "type": "tool_call",
-                    "data": {
-                        "tool_name": tool_name,
-                        "call_id": call.id,
-                        "action_name": full_action_name,
-                        "arguments": call.arguments,
-                        "error": error_response,
-                        "status": "error",
-                    },
-                }
-        return updated_messages
+            return None
+
+        agent_tool_calls = getattr(agent, "tool_calls", None)
+        agent_tool_calls_start = (
+            len(agent_tool_calls) if isinstance(agent_tool_calls, list) else None
+        )
+        self.tool_calls.extend(calls)
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(batch), settings.TOOL_CALL_MAX_WORKERS),
+            thread_name_prefix="tool-call",
+        )
+        for index, (call, tool_class) in enumerate(batch):
+            executor.submit(
+                contextvars.copy_context().run, run, index, call, tool_class
+            )
+        # Don't wait for calls that overrun the timeout
+        executor.shutdown(wait=False)
+
+        outcomes = {}
+        deadline = time.monotonic() + timeout
+        while len(outcomes) < len(calls):
+            try:
+                index, kind, payload = events.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                break
+            if kind == "event":
+                yield payload
+                continue
+            error_event = take(index, kind, payload)
+            if error_event:
+                yield error_event
+
+        with record_lock:
+            cancelled.set()
+        # Calls that finished while the wait was timing out still count
+        while True:
+            try:
+                index, kind, payload = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind != "event":
+                error_event = take(index, kind, payload)
+                if error_event:
+                    yield error_event
+
+        for index, call in enumerate(calls):
+            kind, payload = outcomes.get(index, ("timeout", None))
+            if kind == "result":
+                tool_response, call_id = payload
+                self._append_tool_result(updated_messages, call, tool_response, call_id)
+                continue
+            if kind == "error":
+                error_response = f"Error executing tool: {str(payload)}"
+                updated_messages.append(
+                    self.create_tool_message(
+                        ToolCall(id=call.id, name=call.name, arguments=call.arguments),
+                        error_response,
+                    )
+                )
+                continue
+            logger.warning(f"Tool call {call.name} timed out after {timeout:g}s")
+            yield self._append_tool_error(
+                updated_messages,
+                call,
+                tools_dict,
+                f"Error executing tool: timed out after {timeout:g} seconds",
+            )
+
+        if agent_tool_calls_start is not None:
+            # Keep the recorded tool calls in call order, not completion order
+            order = {call.id: index for index, call in enumerate(calls)}
+            agent_tool_calls[agent_tool_calls_start:] = sorted(
+                agent_tool_calls[agent_tool_calls_start:],
+                key=lambda tool_call: order.get(tool_call.get("call_id"), len(calls)),
+            )
+
+    def _next_tool_batch(
+        self, tool_calls: List[ToolCall], start: int, tools_dict: Dict
+    ) -> List[tuple]:
+        """
+        Collect the run of parallel-safe calls starting at ``start``.
+
+        Returns:
+            (ToolCall, tool class) pairs; a single pair if the call at
+            ``start`` has to run on its own
+        """
+        batch = []
+        if settings.ENABLE_PARALLEL_TOOL_CALLS:
+            for call in tool_calls[start:]:
+                tool_class = self._parallel_tool_class(call, tools_dict)
+                if tool_class is None:
+                    break
+                batch.append((call, tool_class))
+        return batch or [(tool_calls[start], None)]
+
+    @staticmethod
+    def _parallel_tool_class(call: ToolCall, tools_dict: Dict):
+        """Return the tool class of a call if it is declared parallel-safe."""
+        from application.agents.tools.tool_manager import ToolManager
+
+        call_parts = (call.name or "").split("_")
+        if len(call_parts) < 2:
+            return None
+        tool_name = tools_dict.get(call_parts[-1], {}).get("name")
+        if not tool_name:
+            return None
+        try:
+            tool_class = ToolManager.get_tool_class(tool_name)
+        except Exception:
+            return None
+        return tool_class if getattr(tool_class, "parallel_safe", False) else None
+
+    def _append_tool_result(
+        self,
+        updated_messages: List[Dict],
+        call: ToolCall,
+        tool_response: Any,
+        call_id: str,
+    ) -> None:
+        function_call_content = {
+            "function_call": {
+                "name": call.name,
+                "args": call.arguments,
+                "call_id": call_id,
+            }
+        }
+        # Include thought_signature for Google Gemini 3 models
+        # It should be at the same level as function_call, not inside it
+        if call.thought_signature:
+            function_call_content["thought_signature"] = call.thought_signature
+        updated_messages.append(
+            {
+                "role": "assistant",
+                "content": [function_call_content],
+            }
+        )
+
+        updated_messages.append(self.create_tool_message(call, tool_response))
+
+    def _append_tool_error(
+        self,
+        updated_messages: List[Dict],
+        call: ToolCall,
+        tools_dict: Dict,
+        error_response: str,
+    ) -> Dict:
+        """Append the error tool message for a failed call and return its event."""
+        error_call = ToolCall(id=call.id, name=call.name, arguments=call.arguments)
+        updated_messages.append(self.create_tool_message(error_call, error_response))
+        return self._tool_error_event(call, tools_dict, error_response)
+
+    @staticmethod
+    def _tool_error_event(
+        call: ToolCall, tools_dict: Dict, error_response: str
+    ) -> Dict:
+        call_parts = call.name.split("_")
+        if len(call_parts) >= 2:
+            tool_id = call_parts[-1]  # Last part is tool ID (e.g., "1")
+            action_name = "_".join(call_parts[:-1])
+            tool_name = tools_dict.get(tool_id, {}).get("name", "unknown_tool")
+            full_action_name = f"{action_name}_{tool_id}"
+        else:
+            tool_name = "unknown_tool"
+            action_name = call.name
+            full_action_name = call.name
+        return {
+            "type": "tool_call",
+            "data": {
+                "tool_name": tool_name,
+                "call_id": call.id,
+                "action_name": full_action_name,
+                "arguments": call.arguments,
+                "error": error_response,
+                "status": "error",
+            },
+        }
 
     def handle_non_streaming(
         self, agent, response: Any, tools_dict: Dict, messages: List[Dict]
@@ -30,6 +30,10 @@ class OpenAILLM(BaseLLM):
             effective_base_url = "https://api.openai.com/v1"
 
         self.client = OpenAI(api_key=self.api_key, base_url=effective_base_url)
+        # OpenAI-compatible servers do not all accept stream_options
+        self._stream_usage_supported = effective_base_url.startswith(
+            "https://api.openai.com"
+        )
         self.storage = StorageCreator.get_storage()
 
     def _clean_messages_openai(self, messages):
@@ -144,6 +148,7 @@ class OpenAILLM(BaseLLM):
         if response_format:
             request_params["response_format"] = response_format
         response = self.client.chat.completions.create(**request_params)
+        self._capture_usage(getattr(response, "usage", None))
 
         if tools:
             return response.choices[0]
@@ -178,10 +183,13 @@ class OpenAILLM(BaseLLM):
             request_params["tools"] = tools
         if response_format:
             request_params["response_format"] = response_format
+        if self._stream_usage_supported:
+            request_params["stream_options"] = {"include_usage": True}
         response = self.client.chat.completions.create(**request_params)
 
         try:
             for line in response:
+                self._capture_usage(getattr(line, "usage", None))
                 if (
                     len(line.choices) > 0
                     and line.choices[0].delta.content is not None
@@ -194,6 +202,13 @@ class OpenAILLM(BaseLLM):
             if hasattr(response, "close"):
                 response.close()
 
+    def _capture_usage(self, usage):
+        if usage is not None:
+            self._set_reported_usage(
+                getattr(usage, "prompt_tokens", None),
+                getattr(usage, "completion_tokens", None),
+            )
+
     def _supports_tools(self):
         return True
 
@@ -425,3 +440,4 @@ class AzureOpenAILLM(OpenAILLM):
             api_version=settings.OPENAI_API_VERSION,
             azure_endpoint=settings.OPENAI_API_BASE,
         )
+        self._stream_usage_supported = False
@@ -0,0 +1,166 @@
+"""
+Streaming zip extraction for ingestion.
+
+Entries are filtered by extension before anything is written, so files the
+directory reader would skip never reach the disk. Nested archives are
+extracted as they are met in the entry list, not by re-walking the output
+directory. ``max_entries`` and ``max_total_bytes`` are enforced across all
+nesting levels and raise ``ArchiveLimitError`` before a limit is crossed.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Iterable, List, Optional
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveLimitError(ValueError):
+    """An archive holds more entries or bytes than extraction allows."""
+
+
+class _ExtractionBudget:
+    def __init__(self, max_entries: Optional[int], max_total_bytes: Optional[int]):
+        self.max_entries = max_entries
+        self.max_total_bytes = max_total_bytes
+        self.entries = 0
+        self.total_bytes = 0
+
+    def reserve(self, info: zipfile.ZipInfo) -> None:
+        if self.max_entries is not None and self.entries + 1 > self.max_entries:
+            raise ArchiveLimitError(
+                f"Archive has more than {self.max_entries} entries to extract"
+            )
+        if (
+            self.max_total_bytes is not None
+            and self.total_bytes + info.file_size > self.max_total_bytes
+        ):
+            raise ArchiveLimitError(
+                f"Archive expands to more than {self.max_total_bytes} bytes"
+            )
+        self.entries += 1
+        self.total_bytes += info.file_size
+
+
+def _safe_parts(name: str) -> List[str]:
+    """Path components of an entry name with anything escaping the target dropped."""
+    name = os.path.splitdrive(name.replace("\\", "/"))[1]
+    return [part for part in name.split("/") if part not in ("", ".", "..")]
+
+
+def _write_entry(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: str) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # Never write through a hard link to a file in storage
+    if os.path.lexists(target):
+        os.remove(target)
+    with zip_ref.open(info) as source, open(target, "wb") as f:
+        shutil.copyfileobj(source, f, COPY_CHUNK_SIZE)
+
+
+def _extract(
+    zip_path: str,
+    extract_to: str,
+    required_exts: Optional[Iterable[str]],
+    depth: int,
+    max_depth: int,
+    budget: _ExtractionBudget,
+    extracted: List[str],
+) -> None:
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+            parts = _safe_parts(info.filename)
+            if not parts:
+                continue
+            if any(part.startswith(".") for part in parts):
+                continue
+            rel_path = os.path.join(*parts)
+            target = os.path.join(extract_to, rel_path)
+
+            if rel_path.lower().endswith(".zip"):
+                if depth + 1 > max_depth:
+                    logging.warning(
+                        f"Skipping nested archive {rel_path}: "
+                        f"maximum recursion depth of {max_depth} reached"
+                    )
+                    continue
+                budget.reserve(info)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, nested_path = tempfile.mkstemp(
+                    prefix=".nested-", suffix=".zip", dir=os.path.dirname(target)
+                )
+                os.close(fd)
+                try:
+                    _write_entry(zip_ref, info, nested_path)
+                    _extract(
+                        nested_path,
+                        os.path.dirname(target),
+                        required_exts,
+                        depth + 1,
+                        max_depth,
+                        budget,
+                        extracted,
+                    )
+                except (zipfile.BadZipFile, OSError) as e:
+                    logging.error(f"Error extracting nested zip {rel_path}: {e}")
+                finally:
+                    if os.path.exists(nested_path):
+                        os.remove(nested_path)
+                continue
+
+            if (
+                required_exts is not None
+                and os.path.splitext(rel_path)[1] not in required_exts
+            ):
+                continue
+            budget.reserve(info)
+            try:
+                _write_entry(zip_ref, info, target)
+            except (zipfile.BadZipFile, OSError) as e:
+                logging.error(f"Error extracting {rel_path} from {zip_path}: {e}")
+                continue
+            extracted.append(target)
+
+
+def extract_zip(
+    zip_path: str,
+    extract_to: str,
+    required_exts: Optional[Iterable[str]] = None,
+    max_depth: int = 5,
+    max_total_bytes: Optional[int] = None,
+    max_entries: Optional[int] = None,
+) -> List[str]:
+    """
+    Extract a zip archive, recursing into nested zips, and remove it afterwards.
+
+    Args:
+        zip_path (str): Path to the zip file to be extracted.
+        extract_to (str): Destination path for extracted files.
+        required_exts (Optional[Iterable[str]]): Only extract files with these
+            extensions; hidden files are always skipped.
+        max_depth (int): Maximum nesting depth of archives to extract.
+        max_total_bytes (Optional[int]): Limit on the uncompressed bytes written.
+        max_entries (Optional[int]): Limit on the number of entries written.
+
+    Returns:
+        List[str]: Paths of the extracted files.
+
+    Raises:
+        ArchiveLimitError: If the archive exceeds ``max_entries`` or
+            ``max_total_bytes``.
+    """
+    extracted: List[str] = []
+    budget = _ExtractionBudget(max_entries, max_total_bytes)
+    if required_exts is not None:
+        required_exts = list(required_exts)
+    try:
+        _extract(zip_path, extract_to, required_exts, 0, max_depth, budget, extracted)
+    except zipfile.BadZipFile as e:
+        logging.error(f"Error extracting zip file {zip_path}: {e}", exc_info=True)
+        return extracted
+    os.remove(zip_path)
+    return extracted
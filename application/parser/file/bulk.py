@@ -1,5 +1,6 @@
 """Simple reader that reads files of different formats from a directory."""
 import logging
+import os
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Union
 
@@ -12,6 +13,7 @@ from application.parser.file.markdown_parser import MarkdownParser
 from application.parser.file.rst_parser import RstParser
 from application.parser.file.tabular_parser import PandasCSVParser,ExcelParser
 from application.parser.file.json_parser import JSONParser
+from application.parser.file.manifest import set_file_entry
 from application.parser.file.pptx_parser import PPTXParser
 from application.parser.file.image_parser import ImageParser
 from application.parser.schema.base import Document
@@ -43,7 +45,9 @@ class SimpleDirectoryReader(BaseReader):
 
     Args:
         input_dir (str): Path to the directory.
-        input_files (List): List of file paths to read (Optional; overrides input_dir)
+        input_files (List): List of file paths to read (Optional; overrides input_dir).
+            Given together with input_dir, only these files are read and
+            input_dir is the base of their sources and the directory structure.
         exclude_hidden (bool): Whether to exclude hidden files (dotfiles).
         errors (str): how encoding and decoding errors are to be handled,
               see https://docs.python.org/3/library/functions.html#open
@@ -86,14 +90,16 @@ class SimpleDirectoryReader(BaseReader):
         self.required_exts = required_exts
         self.num_files_limit = num_files_limit
 
+        self.files_listed = bool(input_files)
+        if input_dir:
+            self.input_dir = Path(input_dir)
         if input_files:
             self.input_files = []
             for path in input_files:
                 print(path)
                 input_file = Path(path)
                 self.input_files.append(input_file)
-        elif input_dir:
-            self.input_dir = Path(input_dir)
+        else:
             self.input_files = self._add_files(self.input_dir)
 
         self.file_extractor = file_extractor or DEFAULT_FILE_EXTRACTOR
@@ -195,7 +201,9 @@ class SimpleDirectoryReader(BaseReader):
                 metadata_list.append(base_metadata)
         
         # Build directory structure if input_dir is provided
-        if hasattr(self, 'input_dir'):
+        if hasattr(self, 'input_dir') and self.files_listed:
+            self.directory_structure = self.build_listed_files_structure()
+        elif hasattr(self, 'input_dir'):
             self.directory_structure = self.build_directory_structure(self.input_dir)
             logging.info("Directory structure built successfully")
         else:
@@ -208,6 +216,25 @@ class SimpleDirectoryReader(BaseReader):
         else:
             return [Document(d) for d in data_list]
 
+    def build_listed_files_structure(self):
+        """Build the directory structure of the listed input files without
+        walking input_dir.
+
+        Returns:
+            dict: A nested dictionary representing the directory structure.
+        """
+        structure = {}
+        base_path = self.input_dir.resolve()
+        for input_file in self.input_files:
+            full_path = str(input_file.resolve())
+            set_file_entry(
+                structure,
+                os.path.relpath(full_path, base_path),
+                full_path,
+                self.file_token_counts.get(full_path, 0),
+            )
+        return structure
+
     def build_directory_structure(self, base_path):
         """Build a dictionary representing the directory structure.
 
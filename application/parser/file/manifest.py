@@ -0,0 +1,114 @@
+"""
+Per-file manifest used to re-ingest only what changed in a source.
+
+Each entry records a file's ``path`` relative to the source directory plus
+the ``size``, ``mtime`` and ``etag`` reported by the storage listing and the
+``sha256`` of its content. Listing metadata decides which files may have
+changed without downloading anything; the content hash then tells a real
+modification apart from e.g. a re-upload of identical bytes.
+"""
+
+import hashlib
+import mimetypes
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_ingestible(rel_path: str, extensions: Iterable[str]) -> bool:
+    """Whether the directory reader would pick up ``rel_path``."""
+    parts = rel_path.replace("\\", "/").split("/")
+    if any(part.startswith(".") for part in parts):
+        return False
+    return os.path.splitext(rel_path)[1] in extensions
+
+
+def manifest_entry(
+    path: str, metadata: Dict[str, Any], sha256: Optional[str] = None
+) -> Dict[str, Any]:
+    entry = {"path": path}
+    for key in ("size", "mtime", "etag"):
+        if metadata.get(key) is not None:
+            entry[key] = metadata[key]
+    if sha256:
+        entry["sha256"] = sha256
+    return entry
+
+
+def manifest_by_path(manifest: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    return {entry["path"]: entry for entry in manifest or [] if "path" in entry}
+
+
+def metadata_unchanged(entry: Dict[str, Any], metadata: Dict[str, Any]) -> bool:
+    """Compare stored and listed metadata; unknown values count as changed."""
+    if entry.get("size") is None or entry.get("size") != metadata.get("size"):
+        return False
+    for key in ("etag", "mtime"):
+        if entry.get(key) is not None and metadata.get(key) is not None:
+            return entry[key] == metadata[key]
+    return False
+
+
+def flatten_directory_structure(struct: Any, prefix: str = "") -> Set[str]:
+    """Return the relative paths of all files in a ``directory_structure``."""
+    files = set()
+    if isinstance(struct, dict):
+        for name, meta in struct.items():
+            current_path = os.path.join(prefix, name) if prefix else name
+            if isinstance(meta, dict) and "type" in meta and "size_bytes" in meta:
+                files.add(current_path)
+            elif isinstance(meta, dict):
+                files |= flatten_directory_structure(meta, current_path)
+    return files
+
+
+def set_file_entry(
+    structure: Dict[str, Any], rel_path: str, local_path: str, token_count: int
+) -> None:
+    """Add or replace a file in a ``directory_structure`` in place."""
+    *dirs, filename = rel_path.split(os.sep)
+    current = structure
+    for part in dirs:
+        if not isinstance(current.get(part), dict):
+            current[part] = {}
+        current = current[part]
+    current[filename] = {
+        "type": mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        "size_bytes": os.path.getsize(local_path),
+        "token_count": token_count,
+    }
+
+
+def remove_file_entry(structure: Dict[str, Any], rel_path: str) -> None:
+    """Remove a file from a ``directory_structure``, pruning empty folders."""
+    *dirs, filename = rel_path.split(os.sep)
+    parents = []
+    current = structure
+    for part in dirs:
+        child = current.get(part)
+        if not isinstance(child, dict):
+            return
+        parents.append((current, part))
+        current = child
+    current.pop(filename, None)
+    for parent, part in reversed(parents):
+        if parent[part]:
+            break
+        del parent[part]
+
+
+def total_token_count(structure: Any) -> int:
+    if not isinstance(structure, dict):
+        return 0
+    if "type" in structure and "size_bytes" in structure:
+        return structure.get("token_count") or 0
+    return sum(total_token_count(child) for child in structure.values())
@@ -0,0 +1,388 @@
+"""
+Concurrent, polite HTTP fetching for the remote loaders.
+
+``AsyncCrawler`` shares one ``httpx.AsyncClient`` (keep-alive connections)
+across all requests, caps concurrency globally and per host, honours
+robots.txt ``Disallow`` rules and ``Crawl-delay``, and revalidates pages seen
+on an earlier sync with conditional GETs. Validators are kept in Redis and
+bodies in the remote disk cache, so a ``304 Not Modified`` still yields the
+page content. Callers that know a page's last modification (a sitemap
+``<lastmod>``) pass it along; a page whose ``lastmod`` matches the cached one
+is not requested at all. Nothing is cached unless ``REMOTE_CACHE_DIR`` is set.
+Large documents such as sitemaps are read through ``stream`` instead, which
+skips the cache and hands the body over in chunks.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from application.cache import get_redis_instance
+from application.core.settings import settings
+from application.parser.remote.disk_cache import DiskCache, get_remote_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "crawler_cache:"
+FRACTIONAL_CRAWL_DELAY = re.compile(r"(?im)^(\s*crawl-delay\s*:\s*)(\d*\.\d+)")
+TEXT_CONTENT_TYPES = ("text/", "application/xhtml", "application/xml", "+xml")
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    final_url: str
+    text: str
+    content_type: str
+    not_modified: bool = False
+
+
+def normalize_url(url: str) -> str:
+    """Drop the fragment so ``page#a`` and ``page#b`` are fetched once."""
+    return urldefrag(url)[0]
+
+
+class PageCache:
+    """Conditional-GET validators of fetched pages in Redis, their bodies on disk.
+
+    Without a body cache nothing is stored, since a 304 is only useful when
+    the body it confirms can be served.
+    """
+
+    def __init__(self, ttl: int, bodies: Optional[DiskCache] = None):
+        self.ttl = ttl
+        self.bodies = bodies
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return CACHE_PREFIX + hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        if self.bodies is None:
+            return None
+        redis_client = get_redis_instance()
+        if not redis_client:
+            return None
+        try:
+            cached = redis_client.get(self._key(url))
+            entry = json.loads(cached) if cached else None
+        except Exception as e:
+            logger.debug(f"Failed to read crawler cache for {url}: {e}")
+            return None
+        if not entry:
+            return None
+        body = self.bodies.get(url)
+        if body is None:
+            return None
+        entry["text"] = body.decode("utf-8", errors="replace")
+        return entry
+
+    def set(
+        self, url: str, response: httpx.Response, lastmod: Optional[str] = None
+    ) -> None:
+        if self.bodies is None:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified and not lastmod:
+            return
+        self.bodies.set(url, response.text.encode("utf-8"))
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "lastmod": lastmod,
+            "final_url": str(response.url),
+            "content_type": response.headers.get("Content-Type", ""),
+        }
+        self.update(url, entry)
+
+    def update(self, url: str, entry: Dict[str, str]) -> None:
+        redis_client = get_redis_instance()
+        if not redis_client:
+            return
+        entry = {key: value for key, value in entry.items() if key != "text"}
+        try:
+            redis_client.set(self._key(url), json.dumps(entry), ex=self.ttl)
+        except Exception as e:
+            logger.debug(f"Failed to store crawler cache for {url}: {e}")
+
+
+class _HostState:
+    def __init__(self, max_per_host: int):
+        self.semaphore = asyncio.Semaphore(max_per_host)
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_lock = asyncio.Lock()
+        self.robots_loaded = False
+        self.delay = 0.0
+        self.delay_lock = asyncio.Lock()
+        self.next_request_at = 0.0
+
+
+class AsyncCrawler:
+    """Fetches pages concurrently while staying polite to each host."""
+
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        respect_robots: bool = True,
+        cache: Optional[PageCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.user_agent = user_agent or settings.CRAWLER_USER_AGENT
+        self.max_concurrency = max_concurrency or settings.CRAWLER_MAX_CONCURRENCY
+        self.max_per_host = max_per_host or settings.CRAWLER_MAX_PER_HOST
+        self.timeout = timeout or settings.CRAWLER_TIMEOUT_SECONDS
+        self.respect_robots = respect_robots
+        self.cache = cache if cache is not None else PageCache(
+            settings.CRAWLER_CACHE_TTL_SECONDS, get_remote_cache()
+        )
+        self.transport = transport
+        self._hosts: Dict[str, _HostState] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={"User-Agent": self.user_agent},
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            transport=self.transport,
+        )
+
+    def _host(self, url: str) -> _HostState:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin not in self._hosts:
+            self._hosts[origin] = _HostState(self.max_per_host)
+        return self._hosts[origin]
+
+    async def _load_robots(self, url: str, host: _HostState) -> None:
+        async with host.robots_lock:
+            if host.robots_loaded:
+                return
+            host.robots_loaded = True
+            parsed = urlparse(url)
+            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+            robots = RobotFileParser(robots_url)
+            try:
+                response = await self._client.get(robots_url)
+            except httpx.HTTPError as e:
+                logger.info(f"Could not fetch {robots_url}, crawling unrestricted: {e}")
+                return
+            if response.status_code in (401, 403):
+                robots.disallow_all = True
+            elif response.status_code >= 400:
+                robots.allow_all = True
+            else:
+                # robotparser only understands whole seconds; round up to stay polite
+                robots_text = FRACTIONAL_CRAWL_DELAY.sub(
+                    lambda m: m.group(1) + str(math.ceil(float(m.group(2)))),
+                    response.text,
+                )
+                robots.parse(robots_text.splitlines())
+            host.robots = robots
+            delay = robots.crawl_delay(self.user_agent)
+            rate = robots.request_rate(self.user_agent)
+            if rate and rate.requests:
+                delay = max(delay or 0, rate.seconds / rate.requests)
+            host.delay = float(delay or 0)
+
+    async def _wait_turn(self, host: _HostState) -> None:
+        if not host.delay:
+            return
+        async with host.delay_lock:
+            wait = host.next_request_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            host.next_request_at = time.monotonic() + host.delay
+
+    @staticmethod
+    def _cached_page(url: str, cached: Dict[str, str]) -> FetchedPage:
+        return FetchedPage(
+            url=url,
+            final_url=cached.get("final_url") or url,
+            text=cached.get("text", ""),
+            content_type=cached.get("content_type", ""),
+            not_modified=True,
+        )
+
+    async def _allowed(self, url: str, host: _HostState) -> bool:
+        if self.respect_robots:
+            await self._load_robots(url, host)
+            if host.robots and not host.robots.can_fetch(self.user_agent, url):
+                logger.info(f"Skipping {url}: disallowed by robots.txt")
+                return False
+        return True
+
+    async def fetch(self, url: str, lastmod: Optional[str] = None) -> Optional[FetchedPage]:
+        """Fetch one text page; None if it is disallowed, missing or not text."""
+        host = self._host(url)
+        if not await self._allowed(url, host):
+            return None
+
+        cached = self.cache.get(url)
+        if lastmod and cached and cached.get("lastmod") == lastmod:
+            return self._cached_page(url, cached)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with self._semaphore, host.semaphore:
+            await self._wait_turn(host)
+            try:
+                response = await self._client.get(url, headers=headers)
+            except httpx.HTTPError as e:
+                logger.error(f"Error processing URL {url}: {e}", exc_info=True)
+                return None
+
+        if response.status_code == 304:
+            if not cached:
+                return None
+            if lastmod and cached.get("lastmod") != lastmod:
+                cached["lastmod"] = lastmod
+                self.cache.update(url, cached)
+            return self._cached_page(url, cached)
+        if response.status_code >= 400:
+            logger.error(f"Error processing URL {url}: HTTP {response.status_code}")
+            return None
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not any(kind in content_type for kind in TEXT_CONTENT_TYPES):
+            logger.info(f"Skipping {url}: unsupported content type {content_type}")
+            return None
+        self.cache.set(url, response, lastmod)
+        return FetchedPage(
+            url=url,
+            final_url=str(response.url),
+            text=response.text,
+            content_type=content_type,
+        )
+
+    @asynccontextmanager
+    async def stream(self, url: str) -> AsyncIterator[Optional[httpx.Response]]:
+        """Open ``url`` for reading in chunks, bypassing the page cache.
+
+        Yields None if the URL is disallowed or the request fails. The
+        concurrency slots are held until the caller is done with the body.
+        """
+        host = self._host(url)
+        if not await self._allowed(url, host):
+            yield None
+            return
+        async with self._semaphore, host.semaphore:
+            await self._wait_turn(host)
+            try:
+                response = await self._client.send(
+                    self._client.build_request("GET", url), stream=True
+                )
+            except httpx.HTTPError as e:
+                logger.error(f"Error processing URL {url}: {e}", exc_info=True)
+                yield None
+                return
+            try:
+                if response.status_code >= 400:
+                    logger.error(f"Error processing URL {url}: HTTP {response.status_code}")
+                    yield None
+                else:
+                    yield response
+            finally:
+                await response.aclose()
+
+    async def fetch_many(
+        self, urls: Iterable[str], lastmods: Optional[Dict[str, str]] = None
+    ) -> List[Optional[FetchedPage]]:
+        """Fetch ``urls`` concurrently; results are in input order."""
+        lastmods = lastmods or {}
+        return await asyncio.gather(
+            *(self.fetch(url, lastmods.get(url)) for url in urls)
+        )
+
+    def run(self, coro_factory):
+        """Run ``coro_factory()`` on a fresh event loop with an open client."""
+        return asyncio.run(self._with_client(coro_factory))
+
+    async def _with_client(self, coro_factory):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._hosts = {}
+        async with self._make_client() as client:
+            self._client = client
+            try:
+                return await coro_factory()
+            finally:
+                self._client = None
+
+    async def _crawl(
+        self,
+        start_url: str,
+        process: Callable[[FetchedPage], Tuple[object, Iterable[str]]],
+        limit: Optional[int],
+    ) -> List[object]:
+        start_url = normalize_url(start_url)
+        seen = {start_url}
+        frontier = deque([start_url])
+        results = []
+        fetched = 0
+        # Level by level: each level is fetched concurrently and its links are
+        # queued in page order, so the crawl order does not depend on timing
+        while frontier and (limit is None or fetched < limit):
+            batch_size = len(frontier) if limit is None else min(len(frontier), limit - fetched)
+            batch = [frontier.popleft() for _ in range(batch_size)]
+            fetched += len(batch)
+            pages = await self.fetch_many(batch)
+            for page in pages:
+                if page is None:
+                    continue
+                try:
+                    result, links = process(page)
+                except Exception as e:
+                    logger.error(f"Error processing URL {page.url}: {e}", exc_info=True)
+                    continue
+                if result is not None:
+                    results.append(result)
+                for link in links:
+                    link = normalize_url(link)
+                    if link not in seen:
+                        seen.add(link)
+                        frontier.append(link)
+        return results
+
+    def crawl(
+        self,
+        start_url: str,
+        process: Callable[[FetchedPage], Tuple[object, Iterable[str]]],
+        limit: Optional[int] = None,
+    ) -> List[object]:
+        """Breadth-first crawl from ``start_url``.
+
+        ``process`` turns each fetched page into a result (None to drop it)
+        and the links to follow. At most ``limit`` URLs are requested.
+        """
+        return self.run(lambda: self._crawl(start_url, process, limit))
+
+    def fetch_all(
+        self, urls: Iterable[str], lastmods: Optional[Dict[str, str]] = None
+    ) -> List[Optional[FetchedPage]]:
+        """Fetch ``urls`` concurrently; results are in input order."""
+        urls = list(urls)
+        return self.run(lambda: self.fetch_many(urls, lastmods))
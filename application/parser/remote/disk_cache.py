@@ -0,0 +1,81 @@
+"""
+Size-bounded disk cache for content fetched by the remote loaders.
+
+Crawled page bodies and GitHub file texts are kept here rather than in
+Redis, which also serves as the app cache and Celery broker. The cache is
+opt-in through ``REMOTE_CACHE_DIR``.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from application.core.settings import settings
+from application.storage.directory_lru import DirectoryLRU
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Key/value byte store under ``directory`` with least-recently-used eviction.
+
+    Entries are sharded by the first two hex digits of their key's hash;
+    size tracking and eviction are left to :class:`DirectoryLRU`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lru = DirectoryLRU(directory, max_bytes)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.debug(f"Failed to read remote cache entry {key}: {e}")
+            return None
+        self.lru.touch(path)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        try:
+            try:
+                previous_size = os.path.getsize(path)
+            except FileNotFoundError:
+                previous_size = 0
+            temp_path = self.lru.temp_path(os.path.dirname(path))
+            try:
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Failed to store remote cache entry {key}: {e}")
+            return
+        self.lru.add_bytes(len(data) - previous_size)
+
+
+@lru_cache(maxsize=None)
+def _disk_cache(directory: str, max_bytes: int) -> DiskCache:
+    return DiskCache(directory, max_bytes)
+
+
+def get_remote_cache() -> Optional[DiskCache]:
+    """The shared disk cache of the remote loaders, or None when it is disabled."""
+    if not settings.REMOTE_CACHE_DIR:
+        return None
+    return _disk_cache(settings.REMOTE_CACHE_DIR, settings.REMOTE_CACHE_MAX_BYTES)
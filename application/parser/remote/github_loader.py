@@ -1,14 +1,79 @@
 import base64
+import hashlib
+import json
+import logging
 import requests
+import tarfile
 import time
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from application.cache import get_redis_instance
 from application.parser.remote.base import BaseRemote
+from application.parser.remote.disk_cache import DiskCache, get_remote_cache
 from application.parser.schema.base import Document
 import mimetypes
 from application.core.settings import settings
 
+CACHE_PREFIX = "github_cache:"
+# The contents API only serves files up to 1 MB, so larger ones were never ingested
+MAX_FILE_BYTES = 1024 * 1024
+# Up to this many changed files are fetched one by one instead of as a tarball
+MAX_BLOB_REQUESTS = 20
+
+
+def git_blob_sha(data: bytes) -> str:
+    """The object SHA git assigns to a file with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class RepoCache:
+    """Each repo's last synced tree, kept in Redis, and file texts keyed by git blob SHA.
+
+    File texts go to the remote disk cache and are not kept when it is disabled.
+    """
+
+    def __init__(self, ttl: int, blobs: Optional[DiskCache] = None):
+        self.ttl = ttl
+        self.blobs = blobs
+
+    def _get(self, key: str):
+        redis_client = get_redis_instance()
+        if not redis_client:
+            return None
+        try:
+            cached = redis_client.get(CACHE_PREFIX + key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logging.debug(f"Failed to read GitHub cache for {key}: {e}")
+            return None
+
+    def _set(self, key: str, value) -> None:
+        redis_client = get_redis_instance()
+        if not redis_client:
+            return
+        try:
+            redis_client.set(CACHE_PREFIX + key, json.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logging.debug(f"Failed to store GitHub cache for {key}: {e}")
+
+    def get_blob(self, sha: str) -> Optional[str]:
+        if self.blobs is None:
+            return None
+        data = self.blobs.get(f"{CACHE_PREFIX}blob:{sha}")
+        return data.decode("utf-8") if data is not None else None
+
+    def set_blob(self, sha: str, text: str) -> None:
+        if self.blobs is not None:
+            self.blobs.set(f"{CACHE_PREFIX}blob:{sha}", text.encode("utf-8"))
+
+    def get_tree(self, repo_name: str) -> Optional[dict]:
+        return self._get(f"tree:{repo_name}")
+
+    def set_tree(self, repo_name: str, commit_sha: str, files: Dict[str, str]) -> None:
+        self._set(f"tree:{repo_name}", {"commit": commit_sha, "files": files})
+
+
 class GitHubLoader(BaseRemote):
-    def __init__(self):
+    def __init__(self, use_archive: bool = True, cache: Optional[RepoCache] = None):
         self.access_token = settings.GITHUB_ACCESS_TOKEN
         self.headers = {
             "Authorization": f"token {self.access_token}",
@@ -16,6 +81,11 @@ class GitHubLoader(BaseRemote):
         } if self.access_token else {
             "Accept": "application/vnd.github.v3+json"
         }
+        # Load via the tree listing and a tarball rather than one request per file
+        self.use_archive = use_archive
+        self.cache = cache if cache is not None else RepoCache(
+            settings.GITHUB_CACHE_TTL_SECONDS, get_remote_cache()
+        )
         return
 
     def is_text_file(self, file_path: str) -> bool:
@@ -74,10 +144,10 @@ class GitHubLoader(BaseRemote):
                 return None
             return file_content
 
-    def _make_request(self, url: str, max_retries: int = 3) -> requests.Response:
+    def _make_request(self, url: str, max_retries: int = 3, **kwargs) -> requests.Response:
         """Make a request with retry logic for rate limiting"""
         for attempt in range(max_retries):
-            response = requests.get(url, headers=self.headers)
+            response = requests.get(url, headers=self.headers, **kwargs)
 
             if response.status_code == 200:
                 return response
@@ -138,8 +208,133 @@ class GitHubLoader(BaseRemote):
                 files.extend(self.fetch_repo_files(repo_url, item["path"]))
         return files
 
+    def _decode(self, file_path: str, data: bytes) -> str:
+        """Text of a file, or "" if it should be skipped (binary or empty files)."""
+        if not self.is_text_file(file_path):
+            return ""
+        try:
+            return data.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            return ""
+
+    def fetch_default_branch(self, repo_name: str) -> str:
+        response = self._make_request(f"https://api.github.com/repos/{repo_name}")
+        return response.json()["default_branch"]
+
+    def fetch_commit_sha(self, repo_name: str, ref: str) -> str:
+        response = self._make_request(f"https://api.github.com/repos/{repo_name}/commits/{ref}")
+        return response.json()["sha"]
+
+    def fetch_tree(self, repo_name: str, commit_sha: str) -> Optional[Dict[str, str]]:
+        """Map each text file of a commit to its blob SHA with a single request.
+
+        Returns None when GitHub truncates the listing of a very large tree.
+        """
+        url = f"https://api.github.com/repos/{repo_name}/git/trees/{commit_sha}?recursive=1"
+        tree = self._make_request(url).json()
+        if tree.get("truncated"):
+            logging.warning(f"Tree listing of {repo_name} is truncated, reading the tarball instead")
+            return None
+        return {
+            item["path"]: item["sha"]
+            for item in tree.get("tree", [])
+            if item["type"] == "blob"
+            and item.get("mode") != "120000"  # symlinks
+            and item.get("size", 0) <= MAX_FILE_BYTES
+            and self.is_text_file(item["path"])
+        }
+
+    def fetch_blob(self, repo_name: str, file_path: str, sha: str) -> str:
+        response = self._make_request(f"https://api.github.com/repos/{repo_name}/git/blobs/{sha}")
+        return self._decode(file_path, base64.b64decode(response.json()["content"]))
+
+    def iter_tarball(
+        self, repo_name: str, ref: str, paths: Optional[Set[str]] = None
+    ) -> Iterator[Tuple[str, str, str]]:
+        """Stream the repository tarball, yielding ``(path, blob_sha, text)`` per text file.
+
+        Only ``paths`` are read when given. Nothing is written to disk.
+        """
+        url = f"https://api.github.com/repos/{repo_name}/tarball/{ref}"
+        response = self._make_request(url, stream=True)
+        with response:
+            response.raw.decode_content = True
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile() or member.size > MAX_FILE_BYTES:
+                        continue
+                    # Members sit under an "<owner>-<repo>-<sha>/" directory
+                    path = member.name.partition("/")[2]
+                    if not path:
+                        continue
+                    if paths is not None:
+                        if path not in paths:
+                            continue
+                    elif not self.is_text_file(path):
+                        continue
+                    data = archive.extractfile(member).read()
+                    yield path, git_blob_sha(data), self._decode(path, data)
+
+    def load_from_archive(self, repo_name: str) -> List[Document]:
+        """Load the default branch with a handful of requests, whatever the repo size.
+
+        Files whose blob SHA is cached from an earlier sync are not downloaded
+        again. The rest come from the blobs API when only a few changed, and
+        from one streamed tarball otherwise.
+        """
+        branch = self.fetch_default_branch(repo_name)
+        commit_sha = self.fetch_commit_sha(repo_name, branch)
+        previous = self.cache.get_tree(repo_name)
+        if previous and previous.get("commit") == commit_sha:
+            files = previous["files"]
+        else:
+            files = self.fetch_tree(repo_name, commit_sha)
+
+        contents: Dict[str, str] = {}
+        if files is None:
+            files = {}
+            for path, sha, text in self.iter_tarball(repo_name, commit_sha):
+                files[path] = sha
+                contents[path] = text
+                self.cache.set_blob(sha, text)
+        else:
+            missing = {}
+            for path, sha in files.items():
+                text = self.cache.get_blob(sha)
+                if text is None:
+                    missing[path] = sha
+                else:
+                    contents[path] = text
+            if len(missing) <= MAX_BLOB_REQUESTS:
+                for path, sha in missing.items():
+                    contents[path] = self.fetch_blob(repo_name, path, sha)
+                    self.cache.set_blob(sha, contents[path])
+            else:
+                for path, _, text in self.iter_tarball(repo_name, commit_sha, set(missing)):
+                    contents[path] = text
+                    # Keyed by the tree's SHA so the next sync finds it
+                    self.cache.set_blob(missing[path], text)
+        self.cache.set_tree(repo_name, commit_sha, files)
+
+        documents = []
+        for file_path in sorted(contents):
+            # Skip binary and empty files
+            if not contents[file_path]:
+                continue
+            documents.append(Document(
+                text=contents[file_path],
+                doc_id=file_path,
+                extra_info={
+                    "title": file_path,
+                    "source": f"https://github.com/{repo_name}/blob/{branch}/{file_path}"
+                }
+            ))
+        return documents
+
     def load_data(self, repo_url: str) -> List[Document]:
         repo_name = repo_url.split("github.com/")[-1]
+        if self.use_archive:
+            return self.load_from_archive(repo_name)
         files = self.fetch_repo_files(repo_name)
         documents = []
         for file_path in files:
@@ -1,82 +1,156 @@
+import asyncio
 import logging
-import requests
-import re  # Import regular expression library
 import xml.etree.ElementTree as ET
+import httpx
+from bs4 import BeautifulSoup
+from application.parser.remote.async_crawler import AsyncCrawler
 from application.parser.remote.base import BaseRemote
+from application.parser.remote.crawler_loader import page_metadata
+from application.parser.schema.base import Document
+
+# Leading bytes checked for a sitemap root element
+SNIFF_BYTES = 2048
+MAX_SITEMAP_DEPTH = 5
+
 
 class SitemapLoader(BaseRemote):
-    def __init__(self, limit=20):
-        from langchain_community.document_loaders import WebBaseLoader
-        self.loader = WebBaseLoader
+    def __init__(self, limit=20, crawler=None):
         self.limit = limit  # Adding limit to control the number of URLs to process
+        self.crawler = crawler or AsyncCrawler()
 
     def load_data(self, inputs):
-        sitemap_url= inputs
+        sitemap_url = inputs
         # Check if the input is a list and if it is, use the first element
         if isinstance(sitemap_url, list) and sitemap_url:
-            url = sitemap_url[0]
+            sitemap_url = sitemap_url[0]
 
-        urls = self._extract_urls(sitemap_url)
-        if not urls:
-            print(f"No URLs found in the sitemap: {sitemap_url}")
+        return self.crawler.run(lambda: self._load(sitemap_url))
+
+    async def _load(self, sitemap_url):
+        entries = await self._extract_urls(sitemap_url)
+        if not entries:
+            logging.info(f"No URLs found in the sitemap: {sitemap_url}")
             return []
 
-        # Load content of extracted URLs
+        lastmods = {url: lastmod for url, lastmod in entries if lastmod}
+        pending = [url for url, _ in entries]
         documents = []
-        processed_urls = 0  # Counter for processed URLs
-        for url in urls:
-            if self.limit is not None and processed_urls >= self.limit:
-                break  # Stop processing if the limit is reached
-
-            try:
-                loader = self.loader([url])
-                documents.extend(loader.load())
-                processed_urls += 1  # Increment the counter after processing each URL
-            except Exception as e:
-                logging.error(f"Error processing URL {url}: {e}", exc_info=True)
-                continue
-
+        # Failed pages do not count towards the limit, so top up from the
+        # remaining URLs until it is reached
+        while pending and (self.limit is None or len(documents) < self.limit):
+            if self.limit is None:
+                batch, pending = pending, []
+            else:
+                needed = self.limit - len(documents)
+                batch, pending = pending[:needed], pending[needed:]
+            pages = await self.crawler.fetch_many(batch, lastmods)
+            for url, page in zip(batch, pages):
+                if page is None:
+                    continue
+                try:
+                    soup = BeautifulSoup(page.text, "html.parser")
+                    metadata = page_metadata(soup, url)
+                    if url in lastmods:
+                        metadata["lastmod"] = lastmods[url]
+                    documents.append(Document(soup.get_text(), extra_info=metadata))
+                except Exception as e:
+                    logging.error(f"Error processing URL {url}: {e}", exc_info=True)
         return documents
 
-    def _extract_urls(self, sitemap_url):
-        try:
-            response = requests.get(sitemap_url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-        except (requests.exceptions.HTTPError, requests.exceptions.ConnectionError) as e:
-            print(f"Failed to fetch sitemap: {sitemap_url}. Error: {e}")
-            return []
-
-        # Determine if this is a sitemap or a URL
-        if self._is_sitemap(response):
-            # It's a sitemap, so parse it and extract URLs
-            return self._parse_sitemap(response.content)
-        else:
+    async def _extract_urls(self, sitemap_url):
+        """Return ``(url, lastmod)`` pairs in sitemap order, nested sitemaps last.
+
+        Nested sitemaps are fetched concurrently, one nesting level at a time.
+        """
+        async with self.crawler.stream(sitemap_url) as response:
+            if response is None:
+                logging.warning(f"Failed to fetch sitemap: {sitemap_url}")
+                return []
+            parsed = await self._parse_sitemap(response, detect=True)
+        if parsed is None:
             # It's not a sitemap, return the URL itself
-            return [sitemap_url]
-
-    def _is_sitemap(self, response):
-        content_type = response.headers.get('Content-Type', '')
-        if 'xml' in content_type or response.url.endswith('.xml'):
-            return True
-
-        if '<sitemapindex' in response.text or '<urlset' in response.text:
+            return [(sitemap_url, None)]
+
+        entries = []
+        seen_sitemaps = {sitemap_url}
+        level = [parsed]
+        for _ in range(MAX_SITEMAP_DEPTH):
+            nested = []
+            for urls, sitemaps in level:
+                entries.extend(urls)
+                nested.extend(url for url in sitemaps if url not in seen_sitemaps)
+                seen_sitemaps.update(sitemaps)
+            if not nested:
+                break
+            level = [
+                nested_parsed
+                for nested_parsed in await asyncio.gather(
+                    *(self._fetch_sitemap(url) for url in nested)
+                )
+                if nested_parsed is not None
+            ]
+        return entries
+
+    async def _fetch_sitemap(self, url):
+        async with self.crawler.stream(url) as response:
+            if response is None:
+                return None
+            return await self._parse_sitemap(response)
+
+    @staticmethod
+    def _is_sitemap(response, head):
+        content_type = response.headers.get("Content-Type", "").lower()
+        if ("xml" in content_type and "xhtml" not in content_type) or str(response.url).endswith(".xml"):
             return True
 
-        return False
-
-    def _parse_sitemap(self, sitemap_content):
-        # Remove namespaces
-        sitemap_content = re.sub(' xmlns="[^"]+"', '', sitemap_content.decode('utf-8'), count=1)
+        head = head[:SNIFF_BYTES]
+        return b"<sitemapindex" in head or b"<urlset" in head
 
-        root = ET.fromstring(sitemap_content)
+    @classmethod
+    async def _parse_sitemap(cls, response, detect=False):
+        """Stream-parse a sitemap response into ``(url, lastmod)`` pairs and nested sitemap URLs.
 
-        urls = []
-        for loc in root.findall('.//url/loc'):
-            urls.append(loc.text)
-
-        # Check for nested sitemaps
-        for sitemap in root.findall('.//sitemap/loc'):
-            nested_sitemap_url = sitemap.text
-            urls.extend(self._extract_urls(nested_sitemap_url))
-
-        return urls
+        The body is fed to the XML parser chunk by chunk as it arrives. With
+        ``detect``, returns None if the response turns out not to be a sitemap.
+        """
+        urls, sitemaps = [], []
+        parser = ET.XMLPullParser(events=("end",))
+        try:
+            chunks = response.aiter_bytes()
+            head = b""
+            async for chunk in chunks:
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    break
+            if detect and not cls._is_sitemap(response, head):
+                return None
+            parser.feed(head)
+            cls._collect_entries(parser, urls, sitemaps)
+            async for chunk in chunks:
+                parser.feed(chunk)
+                cls._collect_entries(parser, urls, sitemaps)
+            parser.close()
+        except (ET.ParseError, httpx.HTTPError) as e:
+            logging.error(f"Error parsing sitemap {response.url}: {e}")
+        return urls, sitemaps
+
+    @staticmethod
+    def _collect_entries(parser, urls, sitemaps):
+        for _, element in parser.read_events():
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in element:
+                child_tag = child.tag.rsplit("}", 1)[-1]
+                if child_tag == "loc" and child.text:
+                    loc = child.text.strip()
+                elif child_tag == "lastmod" and child.text:
+                    lastmod = child.text.strip()
+            if loc:
+                if tag == "url":
+                    urls.append((loc, lastmod))
+                else:
+                    sitemaps.append(loc)
+            # Drop parsed entries so large sitemaps stay small in memory
+            element.clear()
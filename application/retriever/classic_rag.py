@@ -4,7 +4,7 @@ import os
 from application.core.settings import settings
 from application.llm.llm_creator import LLMCreator
 from application.retriever.base import BaseRetriever
-from application.utils import num_tokens_from_string
+from application.utils import num_tokens_from_strings
 from application.vectorstore.vector_creator import VectorCreator
 
 
@@ -130,10 +130,8 @@ class ClassicRAG(BaseRetriever):
                         self.question, k=max(chunks_per_source * 2, 20)
                     )
 
+                    candidates = []
                     for doc in docs_temp:
-                        if cumulative_tokens >= token_budget:
-                            break
-
                         if hasattr(doc, "page_content") and hasattr(doc, "metadata"):
                             page_content = doc.page_content
                             metadata = doc.metadata
@@ -160,19 +158,24 @@ class ClassicRAG(BaseRetriever):
                         if not filename:
                             filename = title
                         source_path = metadata.get("source") or vectorstore_id
+                        candidates.append(
+                            {
+                                "title": title,
+                                "text": page_content,
+                                "source": source_path,
+                                "filename": filename,
+                            }
+                        )
 
-                        doc_text_with_header = f"{filename}\n{page_content}"
-                        doc_tokens = num_tokens_from_string(doc_text_with_header)
-
+                    doc_token_counts = num_tokens_from_strings(
+                        [f"{c['filename']}\n{c['text']}" for c in candidates],
+                        estimate=settings.TOKEN_BUDGET_ESTIMATE,
+                    )
+                    for candidate, doc_tokens in zip(candidates, doc_token_counts):
+                        if cumulative_tokens >= token_budget:
+                            break
                         if cumulative_tokens + doc_tokens < token_budget:
-                            all_docs.append(
-                                {
-                                    "title": title,
-                                    "text": page_content,
-                                    "source": source_path,
-                                    "filename": filename,
-                                }
-                            )
+                            all_docs.append(candidate)
                             cumulative_tokens += doc_tokens
 
                     if cumulative_tokens >= token_budget:
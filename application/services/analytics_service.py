@@ -0,0 +1,333 @@
+"""
+Pre-aggregated analytics rollups for the dashboard endpoints.
+
+Messages, tokens and feedback are counted into minute, hour and day buckets
+per (user, api_key) at write time, so the analytics routes read a handful of
+small documents instead of unwinding every conversation.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, UpdateOne
+
+from application.core.mongo_db import MongoDB
+from application.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = {
+    "minute": {"format": "%Y-%m-%d %H:%M:00", "retention": timedelta(days=2)},
+    "hour": {"format": "%Y-%m-%d %H:00", "retention": timedelta(days=7)},
+    "day": {"format": "%Y-%m-%d", "retention": None},
+}
+METRICS = ("messages", "tokens", "feedback_positive", "feedback_negative")
+FEEDBACK_METRICS = {"LIKE": "feedback_positive", "DISLIKE": "feedback_negative"}
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def truncate_timestamp(timestamp: datetime, granularity: str) -> datetime:
+    """Return the start of the ``granularity`` bucket containing ``timestamp``."""
+    timestamp = _as_utc(timestamp).replace(second=0, microsecond=0)
+    if granularity in ("hour", "day"):
+        timestamp = timestamp.replace(minute=0)
+    if granularity == "day":
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+class AnalyticsRollupService:
+    """Maintains and queries the ``analytics_rollups`` collection"""
+
+    def __init__(self, collection=None):
+        if collection is None:
+            mongo = MongoDB.get_client()
+            collection = mongo[settings.MONGO_DB_NAME]["analytics_rollups"]
+        self.collection = collection
+
+    def ensure_indexes(self) -> None:
+        self.collection.create_index(
+            [
+                ("user", ASCENDING),
+                ("granularity", ASCENDING),
+                ("bucket", ASCENDING),
+                ("api_key", ASCENDING),
+            ],
+            unique=True,
+            name="rollup_bucket_unique",
+        )
+        self.collection.create_index(
+            "expire_at", expireAfterSeconds=0, name="rollup_expiry"
+        )
+
+    def _bucket_updates(
+        self,
+        user: str,
+        api_key: Optional[str],
+        timestamp: datetime,
+        increments: Dict[str, int],
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        updates = []
+        for granularity, config in GRANULARITIES.items():
+            bucket = truncate_timestamp(timestamp, granularity)
+            set_on_insert = {}
+            if config["retention"] is not None:
+                set_on_insert["expire_at"] = bucket + config["retention"]
+            update = {"$inc": dict(increments)}
+            if set_on_insert:
+                update["$setOnInsert"] = set_on_insert
+            updates.append(
+                (
+                    {
+                        "user": user,
+                        "api_key": api_key,
+                        "granularity": granularity,
+                        "bucket": bucket,
+                    },
+                    update,
+                )
+            )
+        return updates
+
+    def record(
+        self,
+        user: Optional[str],
+        api_key: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        **increments: int,
+    ) -> None:
+        """Add ``increments`` (metric name -> delta) to every bucket granularity.
+
+        Failures are logged and swallowed so analytics never break a request.
+        """
+        self.record_many(user, api_key, [(timestamp, increments)])
+
+    def record_many(
+        self,
+        user: Optional[str],
+        api_key: Optional[str],
+        events: Iterable[Tuple[Optional[datetime], Dict[str, int]]],
+    ) -> None:
+        """Apply several ``(timestamp, increments)`` events in one bulk write.
+
+        Events landing in the same bucket are merged into a single update.
+        Failures are logged and swallowed so analytics never break a request.
+        """
+        if not user:
+            return
+        merged: Dict[tuple, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        for timestamp, increments in events:
+            increments = {k: v for k, v in increments.items() if k in METRICS and v}
+            if not increments:
+                continue
+            timestamp = timestamp or datetime.now(timezone.utc)
+            for query, update in self._bucket_updates(
+                user, api_key, timestamp, increments
+            ):
+                key = (query["granularity"], query["bucket"])
+                if key not in merged:
+                    merged[key] = (query, update)
+                    continue
+                totals = merged[key][1]["$inc"]
+                for metric, value in increments.items():
+                    totals[metric] = totals.get(metric, 0) + value
+        if not merged:
+            return
+        try:
+            self.collection.bulk_write(
+                [
+                    UpdateOne(query, update, upsert=True)
+                    for query, update in merged.values()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            logger.error(f"Error updating analytics rollups: {e}", exc_info=True)
+
+    def record_feedback_change(
+        self,
+        user: Optional[str],
+        api_key: Optional[str],
+        old_feedback: Optional[str],
+        old_timestamp: Optional[datetime],
+        new_feedback: Optional[str],
+        new_timestamp: Optional[datetime],
+    ) -> None:
+        """Move a query's feedback from its old bucket/value to the new one."""
+        self.record_many(
+            user,
+            api_key,
+            self.feedback_change_events(
+                old_feedback, old_timestamp, new_feedback, new_timestamp
+            ),
+        )
+
+    @staticmethod
+    def feedback_change_events(
+        old_feedback: Optional[str],
+        old_timestamp: Optional[datetime],
+        new_feedback: Optional[str],
+        new_timestamp: Optional[datetime],
+    ) -> List[Tuple[datetime, Dict[str, int]]]:
+        """The ``record_many`` events that move a query's feedback."""
+        events = []
+        old_metric = FEEDBACK_METRICS.get(old_feedback)
+        if old_metric and isinstance(old_timestamp, datetime):
+            events.append((old_timestamp, {old_metric: -1}))
+        new_metric = FEEDBACK_METRICS.get(new_feedback)
+        if new_metric and new_timestamp:
+            events.append((new_timestamp, {new_metric: 1}))
+        return events
+
+    def get_series(
+        self,
+        user: str,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        api_key: Optional[str] = None,
+        metrics: Iterable[str] = METRICS,
+    ) -> Dict[str, Dict[str, int]]:
+        """Sum the requested metrics per bucket between two dates.
+
+        Returns:
+            Mapping of formatted bucket label (matching the ``generate_*_range``
+            helpers) to a dict of metric totals. Buckets without data are omitted.
+        """
+        metrics = list(metrics)
+        query = {
+            "user": user,
+            "granularity": granularity,
+            "bucket": {
+                "$gte": truncate_timestamp(start_date, granularity),
+                "$lte": _as_utc(end_date),
+            },
+        }
+        if api_key:
+            query["api_key"] = api_key
+        projection = {"_id": 0, "bucket": 1, **{metric: 1 for metric in metrics}}
+        label_format = GRANULARITIES[granularity]["format"]
+        series: Dict[str, Dict[str, int]] = {}
+        for doc in self.collection.find(query, projection):
+            label = _as_utc(doc["bucket"]).strftime(label_format)
+            totals = series.setdefault(label, {metric: 0 for metric in metrics})
+            for metric in metrics:
+                totals[metric] += doc.get(metric, 0)
+        return series
+
+    def rebuild(self, db, start_date: datetime, end_date: datetime) -> int:
+        """Recompute all buckets in a date range from the raw collections.
+
+        Used to backfill existing data and to repair drift. Day buckets that
+        straddle the range edges only receive the part inside the range, so
+        callers should pass whole days.
+
+        Returns:
+            Number of bucket documents written.
+        """
+        start_date, end_date = _as_utc(start_date), _as_utc(end_date)
+        totals: Dict[tuple, Dict[str, int]] = {}
+
+        def add(user, api_key, timestamp, metric, value=1):
+            if not user or not isinstance(timestamp, datetime):
+                return
+            minute = truncate_timestamp(timestamp, "minute")
+            key = (user, api_key, minute)
+            totals.setdefault(key, {m: 0 for m in METRICS})[metric] += value
+
+        date_range = {"$gte": start_date, "$lte": end_date}
+        for entry in db["conversations"].aggregate(
+            [
+                {"$match": {"queries.timestamp": date_range}},
+                {"$unwind": "$queries"},
+                {"$match": {"queries.timestamp": date_range}},
+                {
+                    "$project": {
+                        "user": 1,
+                        "api_key": 1,
+                        "timestamp": "$queries.timestamp",
+                    }
+                },
+            ]
+        ):
+            add(entry.get("user"), entry.get("api_key"), entry["timestamp"], "messages")
+        for entry in db["conversations"].aggregate(
+            [
+                {"$match": {"queries.feedback_timestamp": date_range}},
+                {"$unwind": "$queries"},
+                {"$match": {"queries.feedback_timestamp": date_range}},
+                {
+                    "$project": {
+                        "user": 1,
+                        "api_key": 1,
+                        "feedback": "$queries.feedback",
+                        "timestamp": "$queries.feedback_timestamp",
+                    }
+                },
+            ]
+        ):
+            metric = FEEDBACK_METRICS.get(entry.get("feedback"))
+            if metric:
+                add(entry.get("user"), entry.get("api_key"), entry["timestamp"], metric)
+        # Turns of conversations kept in conversation_messages
+        messages = db["conversation_messages"]
+        for entry in messages.find(
+            {"timestamp": date_range}, {"user": 1, "api_key": 1, "timestamp": 1}
+        ):
+            add(entry.get("user"), entry.get("api_key"), entry["timestamp"], "messages")
+        for entry in messages.find(
+            {"feedback_timestamp": date_range},
+            {"user": 1, "api_key": 1, "feedback": 1, "feedback_timestamp": 1},
+        ):
+            metric = FEEDBACK_METRICS.get(entry.get("feedback"))
+            if metric:
+                add(
+                    entry.get("user"),
+                    entry.get("api_key"),
+                    entry["feedback_timestamp"],
+                    metric,
+                )
+        for entry in db["token_usage"].find(
+            {"timestamp": date_range},
+            {"user_id": 1, "api_key": 1, "timestamp": 1, "prompt_tokens": 1, "generated_tokens": 1},
+        ):
+            tokens = (entry.get("prompt_tokens") or 0) + (entry.get("generated_tokens") or 0)
+            add(entry.get("user_id"), entry.get("api_key"), entry["timestamp"], "tokens", tokens)
+
+        self.collection.delete_many(
+            {
+                "bucket": {
+                    "$gte": truncate_timestamp(start_date, "minute"),
+                    "$lte": end_date,
+                }
+            }
+        )
+        rolled: Dict[tuple, Dict[str, int]] = {}
+        for (user, api_key, minute), values in totals.items():
+            for granularity in GRANULARITIES:
+                key = (user, api_key, granularity, truncate_timestamp(minute, granularity))
+                bucket_totals = rolled.setdefault(key, {m: 0 for m in METRICS})
+                for metric, value in values.items():
+                    bucket_totals[metric] += value
+        documents = []
+        for (user, api_key, granularity, bucket), values in rolled.items():
+            retention = GRANULARITIES[granularity]["retention"]
+            doc = {
+                "user": user,
+                "api_key": api_key,
+                "granularity": granularity,
+                "bucket": bucket,
+                **values,
+            }
+            if retention is not None:
+                doc["expire_at"] = bucket + retention
+            documents.append(doc)
+        if documents:
+            self.collection.insert_many(documents, ordered=False)
+        return len(documents)
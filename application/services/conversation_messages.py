@@ -0,0 +1,190 @@
+"""
+Per-turn storage for conversations.
+
+Conversations originally keep every turn in an embedded ``queries`` array,
+which grows towards Mongo's 16 MB document limit and is loaded whole on every
+read. Conversations created with ``CONVERSATION_STORAGE="messages"`` (or moved
+by ``scripts/migrate_conversation_messages.py``) are marked with
+``message_storage: "messages"`` and keep one document per turn in
+``conversation_messages`` instead, addressed by ``(conversation_id, seq)``
+where ``seq`` is the turn's position. ``message_count`` on the conversation
+hands out the next ``seq``.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from application.core.mongo_db import MongoDB
+from application.core.settings import settings
+
+MESSAGE_STORAGE = "messages"
+QUERY_FIELDS = (
+    "prompt",
+    "response",
+    "thought",
+    "sources",
+    "tool_calls",
+    "timestamp",
+    "attachments",
+    "model_id",
+    "token_count",
+    "feedback",
+    "feedback_timestamp",
+)
+
+
+def uses_message_storage(conversation: Optional[Dict[str, Any]]) -> bool:
+    """True when ``conversation`` keeps its turns in ``conversation_messages``."""
+    return bool(conversation) and conversation.get("message_storage") == MESSAGE_STORAGE
+
+
+class ConversationMessageStore:
+    """Reads and writes the ``conversation_messages`` collection"""
+
+    def __init__(self, collection=None):
+        if collection is None:
+            mongo = MongoDB.get_client()
+            collection = mongo[settings.MONGO_DB_NAME]["conversation_messages"]
+        self.collection = collection
+
+    def ensure_indexes(self) -> None:
+        self.collection.create_index(
+            [("conversation_id", ASCENDING), ("seq", ASCENDING)],
+            name="conversation_seq",
+            unique=True,
+        )
+        # Used by the analytics rollup rebuild
+        self.collection.create_index("timestamp")
+        self.collection.create_index("feedback_timestamp")
+
+    @staticmethod
+    def _projection(fields: Optional[Iterable[str]]) -> Dict[str, int]:
+        return {"_id": 0, **{field: 1 for field in fields or QUERY_FIELDS}}
+
+    def get_queries(
+        self,
+        conversation_id,
+        start: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return turns ``start`` onwards (at most ``limit``) in order."""
+        query: Dict[str, Any] = {"conversation_id": ObjectId(conversation_id)}
+        if start:
+            query["seq"] = {"$gte": start}
+        cursor = self.collection.find(query, self._projection(fields)).sort(
+            "seq", ASCENDING
+        )
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    def get_recent_queries(
+        self,
+        conversation_id,
+        limit: int,
+        skip: int = 0,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the last ``limit`` turns before the newest ``skip``, oldest first."""
+        cursor = (
+            self.collection.find(
+                {"conversation_id": ObjectId(conversation_id)},
+                self._projection(fields),
+            )
+            .sort("seq", DESCENDING)
+            .skip(skip)
+            .limit(limit)
+        )
+        return list(reversed(list(cursor)))
+
+    def load_queries(
+        self,
+        conversation: Dict[str, Any],
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the first ``limit`` turns of ``conversation`` in either layout."""
+        if not uses_message_storage(conversation):
+            queries = conversation.get("queries", [])
+            return queries if limit is None else queries[:limit]
+        return self.get_queries(conversation["_id"], limit=limit)
+
+    @staticmethod
+    def count(conversation: Dict[str, Any]) -> int:
+        if uses_message_storage(conversation):
+            return conversation.get("message_count", 0)
+        return len(conversation.get("queries", []))
+
+    def insert(
+        self,
+        conversation_id,
+        seq: int,
+        query: Dict[str, Any],
+        user: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> None:
+        message = {
+            "conversation_id": ObjectId(conversation_id),
+            "seq": seq,
+            "user": user,
+            **query,
+        }
+        if api_key:
+            message["api_key"] = api_key
+        self.collection.insert_one(message)
+
+    def replace_from(
+        self, conversation_id, seq: int, fields: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Overwrite turn ``seq`` with ``fields`` and drop every later turn.
+
+        Returns the timestamps and feedback of the replaced turns.
+        """
+        conversation_id = ObjectId(conversation_id)
+        previous = list(
+            self.collection.find(
+                {"conversation_id": conversation_id, "seq": {"$gte": seq}},
+                {"_id": 0, "timestamp": 1, "feedback": 1, "feedback_timestamp": 1},
+            ).sort("seq", ASCENDING)
+        )
+        # Feedback was given on the answer being replaced
+        self.collection.update_one(
+            {"conversation_id": conversation_id, "seq": seq},
+            {"$set": fields, "$unset": {"feedback": "", "feedback_timestamp": ""}},
+        )
+        self.collection.delete_many(
+            {"conversation_id": conversation_id, "seq": {"$gt": seq}}
+        )
+        return previous
+
+    def set_feedback(
+        self,
+        conversation_id,
+        seq: int,
+        feedback: Optional[str],
+        timestamp=None,
+    ) -> Optional[Dict[str, Any]]:
+        """Set (or with ``feedback=None`` clear) a turn's feedback.
+
+        Returns the turn's previous feedback fields, or None if it does not exist.
+        """
+        if feedback is None:
+            update = {"$unset": {"feedback": "", "feedback_timestamp": ""}}
+        else:
+            update = {"$set": {"feedback": feedback, "feedback_timestamp": timestamp}}
+        return self.collection.find_one_and_update(
+            {"conversation_id": ObjectId(conversation_id), "seq": seq},
+            update,
+            projection={"_id": 0, "feedback": 1, "feedback_timestamp": 1},
+        )
+
+    def delete(self, conversation_ids: Iterable[Any]) -> None:
+        self.collection.delete_many(
+            {
+                "conversation_id": {
+                    "$in": [ObjectId(conversation_id) for conversation_id in conversation_ids]
+                }
+            }
+        )
@@ -1,7 +1,9 @@
 """Base storage class for file system abstraction."""
 
+import os
+import shutil
 from abc import ABC, abstractmethod
-from typing import BinaryIO, List, Callable
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
 
 
 class BaseStorage(ABC):
@@ -37,6 +39,70 @@ class BaseStorage(ABC):
         """
         pass
 
+    def iter_file(self, path: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Stream a file from storage in chunks.
+
+        The file is opened before returning, so a missing file raises
+        FileNotFoundError here rather than on the first iteration.
+
+        Args:
+            path: Path to the file
+            chunk_size: Maximum size of each chunk in bytes
+
+        Returns:
+            Iterator[bytes]: The file's content
+        """
+        file_data = self.get_file(path)
+
+        def chunks():
+            try:
+                for block in iter(lambda: file_data.read(chunk_size), b""):
+                    yield block
+            finally:
+                file_data.close()
+
+        return chunks()
+
+    def get_file_range(self, path: str, start: int, length: Optional[int] = None) -> bytes:
+        """
+        Read part of a file.
+
+        Args:
+            path: Path to the file
+            start: Offset of the first byte to read
+            length: Number of bytes to read; None reads to the end
+
+        Returns:
+            bytes: The requested bytes, shorter if the file ends first
+        """
+        file_data = self.get_file(path)
+        try:
+            file_data.seek(start)
+            return file_data.read() if length is None else file_data.read(length)
+        finally:
+            file_data.close()
+
+    def download_to(self, path: str, local_path: str) -> str:
+        """
+        Write a file from storage to a local path, streaming it in chunks.
+
+        Args:
+            path: Path to the file in storage
+            local_path: Local destination; parent directories are created
+
+        Returns:
+            str: The local path written
+        """
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        file_data = self.get_file(path)
+        try:
+            with open(local_path, "wb") as f:
+                shutil.copyfileobj(file_data, f, 1024 * 1024)
+        finally:
+            file_data.close()
+        return local_path
+
     @abstractmethod
     def process_file(self, path: str, processor_func: Callable, **kwargs):
         """
@@ -81,6 +147,19 @@ class BaseStorage(ABC):
         """
         pass
 
+    def get_file_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a file's metadata without downloading it.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            Optional[dict]: Any of 'size', 'mtime' and 'etag' as in
+                list_files_with_metadata, or None if the file does not exist
+        """
+        return {} if self.file_exists(path) else None
+
     @abstractmethod
     def list_files(self, directory: str) -> List[str]:
         """
@@ -93,7 +172,42 @@ class BaseStorage(ABC):
             List[str]: List of file paths
         """
         pass
-        
+
+    def list_files_with_metadata(self, directory: str) -> Dict[str, Dict[str, Any]]:
+        """
+        List all files in a directory with the metadata the backend reports
+        without downloading them.
+
+        Args:
+            directory: Directory path to list
+
+        Returns:
+            Dict[str, dict]: File path mapped to any of 'size' (bytes),
+                'mtime' (epoch seconds) and 'etag'; unavailable keys are omitted
+        """
+        return {path: {} for path in self.list_files(directory)}
+
+    def list_directory(self, directory: str) -> Dict[str, List[str]]:
+        """
+        List the immediate contents of a directory.
+
+        Args:
+            directory: Directory path to list
+
+        Returns:
+            dict: 'files' with the paths of files directly in the directory
+                and 'directories' with the paths of its subdirectories
+        """
+        prefix = directory.rstrip("/") + "/" if directory else ""
+        files, directories = [], set()
+        for path in self.list_files(directory):
+            rest = path[len(prefix):] if path.startswith(prefix) else path
+            if "/" in rest.strip("/"):
+                directories.add(prefix + rest.split("/", 1)[0])
+            elif not path.endswith("/"):
+                files.append(path)
+        return {"files": files, "directories": sorted(directories)}
+
     @abstractmethod
     def is_directory(self, path: str) -> bool:
         """
@@ -0,0 +1,188 @@
+"""Read-through disk cache in front of a remote storage backend."""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from application.storage.base import BaseStorage
+from application.storage.directory_lru import TEMP_PREFIX, DirectoryLRU
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class CachingStorage(BaseStorage):
+    """Wraps a storage backend with a size-bounded on-disk LRU cache.
+
+    Cached copies live under ``cache_dir/<hash of path>/<hash of version>``,
+    where the version is the backend's ETag (or size and mtime when there is
+    none), so a changed object never matches a stale copy. Reads revalidate
+    the version with a metadata request at most every ``revalidate_seconds``
+    per path. Size tracking and least-recently-used eviction across
+    ``max_bytes`` are left to :class:`DirectoryLRU`.
+    """
+
+    def __init__(
+        self,
+        backend: BaseStorage,
+        cache_dir: str,
+        max_bytes: int,
+        revalidate_seconds: float = 30.0,
+    ):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._validated: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self.lru = DirectoryLRU(cache_dir, max_bytes)
+
+    def _path_dir(self, path: str) -> str:
+        return os.path.join(self.cache_dir, _digest(path))
+
+    @staticmethod
+    def _version(metadata: Dict[str, Any]) -> Optional[str]:
+        if metadata.get("etag"):
+            return f"etag:{metadata['etag']}"
+        if metadata.get("size") is not None and metadata.get("mtime") is not None:
+            return f"stat:{metadata['size']}:{metadata['mtime']}"
+        return None
+
+    def _current_version(self, path: str) -> Optional[str]:
+        """The object's version, from the recent-validation memo or the backend."""
+        now = time.monotonic()
+        with self._lock:
+            validated = self._validated.get(path)
+        if validated and now - validated[0] < self.revalidate_seconds:
+            return validated[1]
+        metadata = self.backend.get_file_metadata(path)
+        if metadata is None:
+            self.invalidate(path)
+            raise FileNotFoundError(f"File not found: {path}")
+        version = self._version(metadata)
+        with self._lock:
+            if version is None:
+                self._validated.pop(path, None)
+            else:
+                self._validated[path] = (now, version)
+        return version
+
+    def cached_path(self, path: str) -> Optional[str]:
+        """Return a local copy of ``path``, downloading it on a miss.
+
+        Returns None when the backend reports no version to key the copy by.
+        """
+        version = self._current_version(path)
+        if version is None:
+            return None
+        path_dir = self._path_dir(path)
+        entry = os.path.join(path_dir, _digest(version))
+        if self.lru.touch(entry):
+            return entry
+
+        temp_path = self.lru.temp_path(path_dir)
+        try:
+            self.backend.download_to(path, temp_path)
+            os.replace(temp_path, entry)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        freed = self._remove_other_versions(path_dir, keep=entry)
+        self.lru.add_bytes(os.path.getsize(entry) - freed)
+        return entry
+
+    def invalidate(self, path: str) -> None:
+        """Drop every cached version of ``path``."""
+        with self._lock:
+            self._validated.pop(path, None)
+        path_dir = self._path_dir(path)
+        freed = self._remove_other_versions(path_dir, keep=None)
+        shutil.rmtree(path_dir, ignore_errors=True)
+        if freed:
+            self.lru.add_bytes(-freed)
+
+    @staticmethod
+    def _remove_other_versions(path_dir: str, keep: Optional[str]) -> int:
+        """Remove cached versions other than ``keep``; returns the bytes freed."""
+        freed = 0
+        try:
+            names = os.listdir(path_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            entry = os.path.join(path_dir, name)
+            if entry != keep and not name.startswith(TEMP_PREFIX):
+                try:
+                    size = os.path.getsize(entry)
+                    os.remove(entry)
+                    freed += size
+                except FileNotFoundError:
+                    pass
+        return freed
+
+    def save_file(self, file_data: BinaryIO, path: str, **kwargs) -> dict:
+        self.invalidate(path)
+        return self.backend.save_file(file_data, path, **kwargs)
+
+    def get_file(self, path: str) -> BinaryIO:
+        entry = self.cached_path(path)
+        if entry is None:
+            return self.backend.get_file(path)
+        return open(entry, "rb")
+
+    def download_to(self, path: str, local_path: str) -> str:
+        entry = self.cached_path(path)
+        if entry is None:
+            return self.backend.download_to(path, local_path)
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        if os.path.lexists(local_path):
+            os.remove(local_path)
+        try:
+            os.link(entry, local_path)
+        except FileNotFoundError:
+            # Evicted by another worker in the meantime
+            return self.backend.download_to(path, local_path)
+        except OSError:
+            shutil.copyfile(entry, local_path)
+        return local_path
+
+    def get_file_range(self, path: str, start: int, length: Optional[int] = None) -> bytes:
+        return self.backend.get_file_range(path, start, length)
+
+    def process_file(self, path: str, processor_func: Callable, **kwargs):
+        entry = self.cached_path(path)
+        if entry is None:
+            return self.backend.process_file(path, processor_func, **kwargs)
+        return processor_func(local_path=entry, **kwargs)
+
+    def delete_file(self, path: str) -> bool:
+        self.invalidate(path)
+        return self.backend.delete_file(path)
+
+    def file_exists(self, path: str) -> bool:
+        return self.backend.file_exists(path)
+
+    def get_file_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.backend.get_file_metadata(path)
+
+    def list_files(self, directory: str) -> List[str]:
+        return self.backend.list_files(directory)
+
+    def list_files_with_metadata(self, directory: str) -> Dict[str, Dict[str, Any]]:
+        return self.backend.list_files_with_metadata(directory)
+
+    def list_directory(self, directory: str) -> Dict[str, List[str]]:
+        return self.backend.list_directory(directory)
+
+    def is_directory(self, path: str) -> bool:
+        return self.backend.is_directory(path)
+
+    def remove_directory(self, directory: str) -> bool:
+        for path in self.backend.list_files(directory):
+            self.invalidate(path)
+        return self.backend.remove_directory(directory)
@@ -0,0 +1,94 @@
+"""Size accounting and least-recently-used eviction for on-disk caches."""
+
+import os
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+TEMP_PREFIX = ".tmp-"
+# Eviction frees space down to this fraction of max_bytes, so it runs rarely
+EVICT_TO_FRACTION = 0.9
+
+
+class DirectoryLRU:
+    """Keeps the files under ``directory`` within ``max_bytes``.
+
+    Cached files live one level down, in ``directory/<group>/<file>``, and are
+    written under a ``TEMP_PREFIX`` name first, then renamed into place. This
+    lets several workers share the directory. Reads bump a file's mtime, and
+    eviction removes the oldest files first. The total size is counted once,
+    then updated through :meth:`add_bytes`. The directory is only walked
+    again when that total exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def touch(path: str) -> bool:
+        """Mark ``path`` as recently used; False if it does not exist."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def temp_path(group_dir: str) -> str:
+        """Create an empty temporary file in ``group_dir`` to write an entry to."""
+        os.makedirs(group_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=group_dir)
+        os.close(fd)
+        return path
+
+    def add_bytes(self, delta: int) -> None:
+        """Record a change in the cached size, evicting if it is now too large."""
+        with self._lock:
+            if self.total_bytes is None:
+                # Removals before the first count change nothing worth scanning for
+                if delta <= 0:
+                    return
+                self.total_bytes = sum(size for _, size, _ in self.entries())
+            else:
+                self.total_bytes = max(self.total_bytes + delta, 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """``(mtime, size, path)`` of every cached file."""
+        entries = []
+        for group_dir in os.scandir(self.directory):
+            if not group_dir.is_dir():
+                continue
+            for entry in os.scandir(group_dir.path):
+                if entry.name.startswith(TEMP_PREFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self.entries())
+        # Recount, since other workers write to the same directory
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * EVICT_TO_FRACTION)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                continue
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
+        self.total_bytes = total
@@ -1,7 +1,7 @@
 """Local file system implementation."""
 import os
 import shutil
-from typing import BinaryIO, List, Callable
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
 
 from application.storage.base import BaseStorage
 
@@ -51,6 +51,22 @@ class LocalStorage(BaseStorage):
 
         return open(full_path, 'rb')
 
+    def download_to(self, path: str, local_path: str) -> str:
+        """Hard-link a file into ``local_path``, copying across filesystems."""
+        full_path = self._get_full_path(path)
+
+        if not os.path.isfile(full_path):
+            raise FileNotFoundError(f"File not found: {full_path}")
+
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        if os.path.lexists(local_path):
+            os.remove(local_path)
+        try:
+            os.link(full_path, local_path)
+        except OSError:
+            shutil.copyfile(full_path, local_path)
+        return local_path
+
     def delete_file(self, path: str) -> bool:
         """Delete a file from local storage."""
         full_path = self._get_full_path(path)
@@ -66,6 +82,14 @@ class LocalStorage(BaseStorage):
         full_path = self._get_full_path(path)
         return os.path.exists(full_path)
 
+    def get_file_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get the size and mtime of a file in local storage."""
+        try:
+            stat = os.stat(self._get_full_path(path))
+        except OSError:
+            return None
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
     def list_files(self, directory: str) -> List[str]:
         """List all files in a directory in local storage."""
         full_path = self._get_full_path(directory)
@@ -81,6 +105,41 @@ class LocalStorage(BaseStorage):
 
         return result
 
+    def list_files_with_metadata(self, directory: str) -> Dict[str, Dict[str, Any]]:
+        """List all files in a directory in local storage with size and mtime."""
+        full_path = self._get_full_path(directory)
+
+        if not os.path.exists(full_path):
+            return {}
+
+        result = {}
+        for root, _, files in os.walk(full_path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                stat = os.stat(file_path)
+                rel_path = os.path.relpath(file_path, self.base_dir)
+                result[rel_path] = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+        return result
+
+    def list_directory(self, directory: str) -> Dict[str, List[str]]:
+        """List the files and subdirectories directly inside a local directory."""
+        full_path = self._get_full_path(directory)
+
+        files, directories = [], []
+        if not os.path.isdir(full_path):
+            return {"files": files, "directories": directories}
+
+        with os.scandir(full_path) as entries:
+            for entry in entries:
+                rel_path = os.path.relpath(entry.path, self.base_dir)
+                if entry.is_dir():
+                    directories.append(rel_path)
+                elif entry.is_file():
+                    files.append(rel_path)
+
+        return {"files": sorted(files), "directories": sorted(directories)}
+
     def process_file(self, path: str, processor_func: Callable, **kwargs):
         """
         Process a file using the provided processor function.
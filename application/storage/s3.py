@@ -1,11 +1,11 @@
 """S3 storage implementation."""
 
-import io
 import os
-from typing import BinaryIO, Callable, List
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
 
 import boto3
 from application.core.settings import settings
+from boto3.s3.transfer import TransferConfig
 
 from application.storage.base import BaseStorage
 from botocore.exceptions import ClientError
@@ -37,6 +37,18 @@ class S3Storage(BaseStorage):
             aws_secret_access_key=aws_secret_access_key,
             region_name=region_name,
         )
+        self._transfer_config = None
+
+    @property
+    def transfer_config(self) -> TransferConfig:
+        """Multipart settings shared by uploads and downloads."""
+        if self._transfer_config is None:
+            self._transfer_config = TransferConfig(
+                multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+                multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+                max_concurrency=settings.S3_MAX_CONCURRENCY,
+            )
+        return self._transfer_config
 
     def save_file(
         self,
@@ -47,7 +59,11 @@ class S3Storage(BaseStorage):
     ) -> dict:
         """Save a file to S3 storage."""
         self.s3.upload_fileobj(
-            file_data, self.bucket_name, path, ExtraArgs={"StorageClass": storage_class}
+            file_data,
+            self.bucket_name,
+            path,
+            ExtraArgs={"StorageClass": storage_class},
+            Config=self.transfer_config,
         )
 
         region = getattr(settings, "SAGEMAKER_REGION", None)
@@ -60,13 +76,50 @@ class S3Storage(BaseStorage):
         }
 
     def get_file(self, path: str) -> BinaryIO:
-        """Get a file from S3 storage."""
-        if not self.file_exists(path):
-            raise FileNotFoundError(f"File not found: {path}")
-        file_obj = io.BytesIO()
-        self.s3.download_fileobj(self.bucket_name, path, file_obj)
-        file_obj.seek(0)
-        return file_obj
+        """Get a file from S3 storage as a stream over the object body."""
+        return self._get_object(path)["Body"]
+
+    def get_file_range(self, path: str, start: int, length: Optional[int] = None) -> bytes:
+        """Read part of a file with an S3 range request."""
+        if length is not None and length <= 0:
+            return b""
+        end = "" if length is None else start + length - 1
+        try:
+            body = self._get_object(path, Range=f"bytes={start}-{end}")["Body"]
+        except ClientError as e:
+            # The range starts at or past the end of the object
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return b""
+            raise
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def download_to(self, path: str, local_path: str) -> str:
+        """Download a file to disk, using parallel ranged GETs for large objects."""
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        try:
+            self.s3.download_file(
+                self.bucket_name, path, local_path, Config=self.transfer_config
+            )
+        except ClientError as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(f"File not found: {path}") from e
+            raise
+        return local_path
+
+    def _get_object(self, path: str, **kwargs) -> Dict[str, Any]:
+        try:
+            return self.s3.get_object(Bucket=self.bucket_name, Key=path, **kwargs)
+        except ClientError as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(f"File not found: {path}") from e
+            raise
+
+    @staticmethod
+    def _is_not_found(error: ClientError) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")
 
     def delete_file(self, path: str) -> bool:
         """Delete a file from S3 storage."""
@@ -84,6 +137,20 @@ class S3Storage(BaseStorage):
         except ClientError:
             return False
 
+    def get_file_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get the size, mtime and ETag of a file in S3 storage."""
+        try:
+            head = self.s3.head_object(Bucket=self.bucket_name, Key=path)
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        return {
+            "size": head["ContentLength"],
+            "mtime": head["LastModified"].timestamp(),
+            "etag": head["ETag"].strip('"'),
+        }
+
     def list_files(self, directory: str) -> List[str]:
         """List all files in a directory in S3 storage."""
         # Ensure directory ends with a slash if it's not empty
@@ -100,6 +167,43 @@ class S3Storage(BaseStorage):
                     result.append(obj["Key"])
         return result
 
+    def list_directory(self, directory: str) -> Dict[str, List[str]]:
+        """List the files and subdirectories directly under a prefix."""
+        if directory and not directory.endswith("/"):
+            directory += "/"
+        files, directories = [], []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=self.bucket_name, Prefix=directory, Delimiter="/"
+        )
+
+        for page in pages:
+            for obj in page.get("Contents", []):
+                if obj["Key"] != directory:
+                    files.append(obj["Key"])
+            for common_prefix in page.get("CommonPrefixes", []):
+                directories.append(common_prefix["Prefix"].rstrip("/"))
+        return {"files": files, "directories": directories}
+
+    def list_files_with_metadata(self, directory: str) -> Dict[str, Dict[str, Any]]:
+        """List all files in a directory in S3 storage with size, mtime and ETag."""
+        if directory and not directory.endswith("/"):
+            directory += "/"
+        result = {}
+        paginator = self.s3.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=directory)
+
+        for page in pages:
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith("/"):
+                    continue
+                result[obj["Key"]] = {
+                    "size": obj["Size"],
+                    "mtime": obj["LastModified"].timestamp(),
+                    "etag": obj["ETag"].strip('"'),
+                }
+        return result
+
     def process_file(self, path: str, processor_func: Callable, **kwargs):
         """
         Process a file using the provided processor function.
@@ -123,7 +227,9 @@ class S3Storage(BaseStorage):
             try:
                 # Download the file from S3 to the temporary file
 
-                self.s3.download_fileobj(self.bucket_name, path, temp_file)
+                self.s3.download_fileobj(
+                    self.bucket_name, path, temp_file, Config=self.transfer_config
+                )
                 temp_file.flush()
 
                 return processor_func(local_path=temp_file.name, **kwargs)
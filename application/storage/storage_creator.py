@@ -2,6 +2,7 @@
 from typing import Dict, Type
 
 from application.storage.base import BaseStorage
+from application.storage.caching import CachingStorage
 from application.storage.local import LocalStorage
 from application.storage.s3 import S3Storage
 from application.core.settings import settings
@@ -19,7 +20,16 @@ class StorageCreator:
     def get_storage(cls) -> BaseStorage:
         if cls._instance is None:
             storage_type = getattr(settings, "STORAGE_TYPE", "local")
-            cls._instance = cls.create_storage(storage_type)
+            storage = cls.create_storage(storage_type)
+            # A disk cache only pays off in front of a remote backend
+            if settings.STORAGE_CACHE_DIR and storage_type.lower() != "local":
+                storage = CachingStorage(
+                    storage,
+                    settings.STORAGE_CACHE_DIR,
+                    settings.STORAGE_CACHE_MAX_BYTES,
+                    settings.STORAGE_CACHE_REVALIDATE_SECONDS,
+                )
+            cls._instance = storage
         
         return cls._instance
     
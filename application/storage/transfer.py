@@ -0,0 +1,122 @@
+"""Concurrent downloads from storage into a local directory."""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from application.core.settings import settings
+from application.storage.base import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+
+class _ByteBudget:
+    """Blocks callers while the reserved bytes would exceed ``limit``."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        # A single file larger than the whole budget still gets to run alone
+        size = min(size, self.limit)
+        with self._condition:
+            while self._in_flight and self._in_flight + size > self.limit:
+                self._condition.wait()
+            self._in_flight += size
+        return size
+
+    def release(self, size: int) -> None:
+        with self._condition:
+            self._in_flight -= size
+            self._condition.notify_all()
+
+
+class TransferManager:
+    """Download many storage files to disk with a bounded thread pool.
+
+    Each file is streamed to disk by ``BaseStorage.download_to``, so local
+    storage links files instead of copying them. The sizes of files being
+    transferred at once are capped at ``max_in_flight_bytes``; files of
+    unknown size are charged an equal share of that budget.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        max_workers: Optional[int] = None,
+        max_in_flight_bytes: Optional[int] = None,
+    ):
+        self.storage = storage
+        self.max_workers = max(1, max_workers or settings.STORAGE_TRANSFER_WORKERS)
+        self.max_in_flight_bytes = max(
+            1, max_in_flight_bytes or settings.STORAGE_TRANSFER_MAX_IN_FLIGHT_BYTES
+        )
+
+    def download_files(
+        self,
+        files: Iterable[Tuple[str, str]],
+        sizes: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Optional[Exception]]:
+        """Download ``(storage_path, local_path)`` pairs.
+
+        Args:
+            files: Storage paths and the local paths to write them to
+            sizes: Optional known sizes in bytes, keyed by storage path
+
+        Returns:
+            Dict[str, Optional[Exception]]: Storage path mapped to None on
+                success or to the exception that made the download fail
+        """
+        files = list(files)
+        sizes = sizes or {}
+        results: Dict[str, Optional[Exception]] = {}
+        if not files:
+            return results
+
+        budget = _ByteBudget(self.max_in_flight_bytes)
+        unknown_size = max(1, self.max_in_flight_bytes // self.max_workers)
+
+        def transfer(storage_path: str, local_path: str, reserved: int) -> None:
+            try:
+                self.storage.download_to(storage_path, local_path)
+                results[storage_path] = None
+            except Exception as e:
+                logger.error(f"Error downloading file {storage_path}: {e}")
+                results[storage_path] = e
+            finally:
+                budget.release(reserved)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for storage_path, local_path in files:
+                size = sizes.get(storage_path)
+                reserved = budget.acquire(unknown_size if size is None else size)
+                executor.submit(transfer, storage_path, local_path, reserved)
+        return results
+
+    def download_directory(
+        self,
+        directory: str,
+        local_dir: str,
+        files: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, Optional[Exception]]:
+        """Mirror the files under ``directory`` into ``local_dir``.
+
+        ``files`` is a ``list_files_with_metadata`` result to download from;
+        the directory is listed when it is not given.
+        """
+        if files is None:
+            files = self.storage.list_files_with_metadata(directory)
+        pairs = [
+            (path, os.path.join(local_dir, os.path.relpath(path, directory)))
+            for path in files
+        ]
+        sizes = {
+            path: meta["size"]
+            for path, meta in files.items()
+            if meta and meta.get("size") is not None
+        }
+        return self.download_files(pairs, sizes)
@@ -1,15 +1,22 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Set
 
 from jinja2 import (
     ChainableUndefined,
     Environment,
+    meta,
     nodes,
     select_autoescape,
+    Template,
     TemplateSyntaxError,
 )
 from jinja2.exceptions import UndefinedError
 
+from application.core.settings import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,16 +26,57 @@ class TemplateRenderError(Exception):
     pass
 
 
-class TemplateEngine:
-    """Jinja2-based template engine for dynamic prompt rendering"""
+class _CachedTemplate:
+    """Compiled template and parsed metadata for one template source"""
+
+    __slots__ = ("template", "variables", "tool_usages")
 
     def __init__(self):
-        self._env = Environment(
-            undefined=ChainableUndefined,
-            trim_blocks=True,
-            lstrip_blocks=True,
-            autoescape=select_autoescape(default_for_string=True, default=True),
-        )
+        self.template: Optional[Template] = None
+        self.variables: Optional[Set[str]] = None
+        self.tool_usages: Optional[Dict[str, Set[Optional[str]]]] = None
+
+
+class TemplateEngine:
+    """Jinja2-based template engine for dynamic prompt rendering
+
+    The environment and an LRU of compiled templates and parsed metadata are
+    shared by all instances and keyed by a hash of the template source, so a
+    prompt is parsed and compiled once per process rather than per request.
+    """
+
+    _env = Environment(
+        undefined=ChainableUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        autoescape=select_autoescape(default_for_string=True, default=True),
+    )
+    _cache: "OrderedDict[str, _CachedTemplate]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def _cache_entry(cls, template_content: str) -> _CachedTemplate:
+        key = hashlib.sha256(template_content.encode("utf-8")).hexdigest()
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is None:
+                entry = cls._cache[key] = _CachedTemplate()
+                while len(cls._cache) > settings.TEMPLATE_CACHE_SIZE:
+                    cls._cache.popitem(last=False)
+            else:
+                cls._cache.move_to_end(key)
+            return entry
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _get_template(self, template_content: str) -> Template:
+        entry = self._cache_entry(template_content)
+        if entry.template is None:
+            entry.template = self._env.from_string(template_content)
+        return entry.template
 
     def render(self, template_content: str, context: Dict[str, Any]) -> str:
         """
@@ -47,7 +95,7 @@ class TemplateEngine:
         if not template_content:
             return ""
         try:
-            template = self._env.from_string(template_content)
+            template = self._get_template(template_content)
             return template.render(**context)
         except TemplateSyntaxError as e:
             error_msg = f"Template syntax error at line {e.lineno}: {e.message}"
@@ -75,7 +123,7 @@ class TemplateEngine:
         if not template_content:
             return True
         try:
-            self._env.from_string(template_content)
+            self._get_template(template_content)
             return True
         except TemplateSyntaxError as e:
             logger.debug(f"Template syntax invalid at line {e.lineno}: {e.message}")
@@ -97,8 +145,11 @@ class TemplateEngine:
         if not template_content:
             return set()
         try:
-            ast = self._env.parse(template_content)
-            return set(self._env.get_template_module(ast).make_module().keys())
+            entry = self._cache_entry(template_content)
+            if entry.variables is None:
+                ast = self._env.parse(template_content)
+                entry.variables = meta.find_undeclared_variables(ast)
+            return set(entry.variables)
         except TemplateSyntaxError as e:
             logger.debug(f"Cannot extract variables - syntax error at line {e.lineno}")
             return set()
@@ -112,14 +163,25 @@ class TemplateEngine:
         """Extract tool and action references from a template"""
         if not template_content:
             return {}
+        entry = self._cache_entry(template_content)
+        if entry.tool_usages is None:
+            usages = self._parse_tool_usages(template_content)
+            if usages is None:
+                return {}
+            entry.tool_usages = usages
+        return {tool: set(actions) for tool, actions in entry.tool_usages.items()}
+
+    def _parse_tool_usages(
+        self, template_content: str
+    ) -> Optional[Dict[str, Set[Optional[str]]]]:
         try:
             ast = self._env.parse(template_content)
         except TemplateSyntaxError as e:
             logger.debug(f"extract_tool_usages - syntax error at line {e.lineno}")
-            return {}
+            return None
         except Exception as e:
             logger.debug(f"extract_tool_usages - parse error: {type(e).__name__}")
-            return {}
+            return None
 
         usages: Dict[str, Set[Optional[str]]] = {}
 
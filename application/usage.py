@@ -1,13 +1,103 @@
+import atexit
+import logging
+import os
 import sys
+import threading
+from collections import Counter
 from datetime import datetime
 
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
+from application.services.analytics_service import AnalyticsRollupService
+from application.usage_counters import record_usage
 from application.utils import num_tokens_from_object_or_list, num_tokens_from_string
 
+logger = logging.getLogger(__name__)
+
 mongo = MongoDB.get_client()
 db = mongo[settings.MONGO_DB_NAME]
 usage_collection = db["token_usage"]
+analytics_rollups = AnalyticsRollupService(db["analytics_rollups"])
+
+
+class UsageRecorder:
+    """Buffers token usage documents and writes them to Mongo in batches.
+
+    A daemon thread flushes the buffer every ``flush_interval`` seconds, or
+    sooner once ``batch_size`` documents are pending, so LLM calls never wait
+    on the ``token_usage`` insert. Analytics rollups are aggregated per flush.
+    The thread is (re)started lazily so forked workers get their own.
+    """
+
+    def __init__(self, collection, rollups, flush_interval=2.0, batch_size=100):
+        self.collection = collection
+        self.rollups = rollups
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, usage_data):
+        with self._lock:
+            self._buffer.append(usage_data)
+            pending = len(self._buffer)
+        self._ensure_thread()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="usage-recorder", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all buffered documents. Safe to call from any thread."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} token usage records: {e}")
+            with self._lock:
+                if len(self._buffer) + len(batch) <= self.batch_size * 10:
+                    self._buffer[:0] = batch
+            return 0
+        rollup_totals = Counter()
+        for usage_data in batch:
+            minute = usage_data["timestamp"].replace(second=0, microsecond=0)
+            rollup_totals[(usage_data["user_id"], usage_data["api_key"], minute)] += (
+                usage_data["prompt_tokens"] + usage_data["generated_tokens"]
+            )
+        for (user_id, api_key, minute), tokens in rollup_totals.items():
+            self.rollups.record(user_id, api_key, minute, tokens=tokens)
+        return len(batch)
+
+
+usage_recorder = UsageRecorder(
+    usage_collection,
+    analytics_rollups,
+    flush_interval=settings.USAGE_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.USAGE_FLUSH_BATCH_SIZE,
+)
+atexit.register(usage_recorder.flush)
 
 
 def update_token_usage(decoded_token, user_api_key, token_usage):
@@ -24,24 +114,47 @@ def update_token_usage(decoded_token, user_api_key, token_usage):
         "generated_tokens": token_usage["generated_tokens"],
         "timestamp": datetime.now(),
     }
-    usage_collection.insert_one(usage_data)
+    usage_recorder.add(usage_data)
+    record_usage(
+        user_api_key, token_usage["prompt_tokens"], token_usage["generated_tokens"]
+    )
+
+
+def _pop_reported_usage(llm):
+    """Return provider-reported usage for the last call, if the LLM captured it."""
+    pop = getattr(llm, "_pop_reported_usage", None)
+    return pop() if callable(pop) else None
+
+
+def _count_prompt_tokens(messages):
+    return sum(
+        num_tokens_from_string(message["content"])
+        for message in messages
+        if message["content"]
+    )
+
+
+def _record_call_usage(llm, call_usage):
+    llm.token_usage["prompt_tokens"] += call_usage["prompt_tokens"]
+    llm.token_usage["generated_tokens"] += call_usage["generated_tokens"]
+    update_token_usage(llm.decoded_token, llm.user_api_key, call_usage)
 
 
 def gen_token_usage(func):
     def wrapper(self, model, messages, stream, tools, **kwargs):
-        for message in messages:
-            if message["content"]:
-                self.token_usage["prompt_tokens"] += num_tokens_from_string(
-                    message["content"]
-                )
+        _pop_reported_usage(self)
         result = func(self, model, messages, stream, tools, **kwargs)
-        if isinstance(result, str):
-            self.token_usage["generated_tokens"] += num_tokens_from_string(result)
-        else:
-            self.token_usage["generated_tokens"] += num_tokens_from_object_or_list(
-                result
-            )
-        update_token_usage(self.decoded_token, self.user_api_key, self.token_usage)
+        call_usage = _pop_reported_usage(self)
+        if call_usage is None:
+            if isinstance(result, str):
+                generated_tokens = num_tokens_from_string(result)
+            else:
+                generated_tokens = num_tokens_from_object_or_list(result)
+            call_usage = {
+                "prompt_tokens": _count_prompt_tokens(messages),
+                "generated_tokens": generated_tokens,
+            }
+        _record_call_usage(self, call_usage)
         return result
 
     return wrapper
@@ -49,17 +162,19 @@ def gen_token_usage(func):
 
 def stream_token_usage(func):
     def wrapper(self, model, messages, stream, tools, **kwargs):
-        for message in messages:
-            self.token_usage["prompt_tokens"] += num_tokens_from_string(
-                message["content"]
-            )
-        batch = []
+        _pop_reported_usage(self)
+        text_chunks = []
         result = func(self, model, messages, stream, tools, **kwargs)
         for r in result:
-            batch.append(r)
+            if isinstance(r, str):
+                text_chunks.append(r)
             yield r
-        for line in batch:
-            self.token_usage["generated_tokens"] += num_tokens_from_string(line)
-        update_token_usage(self.decoded_token, self.user_api_key, self.token_usage)
+        call_usage = _pop_reported_usage(self)
+        if call_usage is None:
+            call_usage = {
+                "prompt_tokens": _count_prompt_tokens(messages),
+                "generated_tokens": num_tokens_from_string("".join(text_chunks)),
+            }
+        _record_call_usage(self, call_usage)
 
     return wrapper
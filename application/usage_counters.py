@@ -0,0 +1,233 @@
+"""Rolling 24h usage counters for agent API keys.
+
+Each API key owns one Redis hash per ``BUCKET_SECONDS`` slice of time holding
+``tokens`` and ``requests`` fields. Writers increment the current bucket and
+readers sum the buckets of the last 24h in a single pipelined round trip, so
+``check_usage`` no longer scans ``token_usage``.
+
+Redis is only trusted for a key once it has been seeded from Mongo (marked by
+a ``seeded`` key with the window TTL). Until then, or whenever Redis is
+unavailable, callers fall back to the Mongo aggregation. The periodic
+reconciliation task rebuilds the buckets from Mongo to correct any drift.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from application.cache import get_redis_instance
+from application.utils import get_hash
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 300
+WINDOW_SECONDS = 24 * 60 * 60
+KEY_PREFIX = "usage_window"
+UNAVAILABLE_COOLDOWN_SECONDS = 30
+
+_unavailable_until = 0.0
+
+
+def _get_client():
+    """Return the Redis client unless it failed within the cooldown period."""
+    if time.monotonic() < _unavailable_until:
+        return None
+    return get_redis_instance()
+
+
+def _mark_unavailable():
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + UNAVAILABLE_COOLDOWN_SECONDS
+
+
+def _key_base(api_key: str) -> str:
+    return f"{KEY_PREFIX}:{get_hash(api_key)}"
+
+
+def _bucket_key(api_key: str, bucket: int) -> str:
+    return f"{_key_base(api_key)}:{bucket}"
+
+
+def _seeded_key(api_key: str) -> str:
+    return f"{_key_base(api_key)}:seeded"
+
+
+def _bucket_for(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS) * BUCKET_SECONDS
+
+
+def _window_buckets(now: Optional[float] = None) -> range:
+    now = time.time() if now is None else now
+    current = _bucket_for(now)
+    return range(current - WINDOW_SECONDS + BUCKET_SECONDS, current + 1, BUCKET_SECONDS)
+
+
+def record_usage(
+    api_key: str,
+    prompt_tokens: int,
+    generated_tokens: int,
+    timestamp: Optional[float] = None,
+) -> bool:
+    """Add one request and its tokens to the current bucket of ``api_key``.
+
+    Returns:
+        True if the counters were updated, False if Redis was unavailable.
+    """
+    if not api_key:
+        return False
+    redis_client = _get_client()
+    if not redis_client:
+        return False
+    bucket = _bucket_for(time.time() if timestamp is None else timestamp)
+    key = _bucket_key(api_key, bucket)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hincrby(key, "tokens", int(prompt_tokens) + int(generated_tokens))
+        pipe.hincrby(key, "requests", 1)
+        pipe.expire(key, WINDOW_SECONDS + BUCKET_SECONDS)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to update usage counters: {e}")
+        _mark_unavailable()
+        return False
+
+
+def get_window_usage(api_key: str) -> Optional[Dict[str, int]]:
+    """Return ``{"tokens", "requests"}`` used by ``api_key`` in the last 24h.
+
+    Returns:
+        The totals, or None if Redis is unavailable or the key has not been
+        seeded yet, in which case the caller must consult Mongo.
+    """
+    redis_client = _get_client()
+    if not redis_client:
+        return None
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.exists(_seeded_key(api_key))
+        for bucket in _window_buckets():
+            pipe.hmget(_bucket_key(api_key, bucket), "tokens", "requests")
+        results = pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to read usage counters: {e}")
+        _mark_unavailable()
+        return None
+    if not results or not results[0]:
+        return None
+    tokens = 0
+    requests = 0
+    for bucket_tokens, bucket_requests in results[1:]:
+        tokens += int(bucket_tokens or 0)
+        requests += int(bucket_requests or 0)
+    return {"tokens": tokens, "requests": requests}
+
+
+def reconcile_usage(api_key: str, token_usage_collection) -> bool:
+    """Rebuild the Redis buckets of ``api_key`` from ``token_usage``.
+
+    Returns:
+        True if the buckets were rewritten and the key marked as seeded.
+    """
+    redis_client = _get_client()
+    if not redis_client or not api_key:
+        return False
+    try:
+        redis_client.ping()
+    except Exception as e:
+        logger.warning(f"Redis unavailable, skipping usage reconciliation: {e}")
+        _mark_unavailable()
+        return False
+    now = time.time()
+    buckets = _window_buckets(now)
+    start_date = datetime.fromtimestamp(buckets[0])
+    pipeline = [
+        {"$match": {"api_key": api_key, "timestamp": {"$gte": start_date}}},
+        {
+            "$project": {
+                "timestamp": 1,
+                "tokens": {"$add": ["$prompt_tokens", "$generated_tokens"]},
+            }
+        },
+    ]
+    totals: Dict[int, Dict[str, int]] = {}
+    try:
+        for entry in token_usage_collection.aggregate(pipeline):
+            bucket = _bucket_for(entry["timestamp"].timestamp())
+            bucket_totals = totals.setdefault(bucket, {"tokens": 0, "requests": 0})
+            bucket_totals["tokens"] += int(entry.get("tokens") or 0)
+            bucket_totals["requests"] += 1
+    except Exception as e:
+        logger.error(f"Failed to aggregate usage for reconciliation: {e}")
+        return False
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        for bucket in buckets:
+            key = _bucket_key(api_key, bucket)
+            pipe.delete(key)
+            if bucket in totals:
+                pipe.hset(key, mapping=totals[bucket])
+                pipe.expire(key, int(bucket + WINDOW_SECONDS + BUCKET_SECONDS - now))
+        pipe.set(_seeded_key(api_key), 1, ex=WINDOW_SECONDS)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to reconcile usage counters: {e}")
+        _mark_unavailable()
+        return False
+
+
+def reconcile_limited_agents(db, api_keys: Optional[Iterable[str]] = None) -> int:
+    """Reconcile counters for every agent with a usage limit enabled.
+
+    Returns:
+        Number of API keys whose counters were rebuilt.
+    """
+    if api_keys is None:
+        limited = db["agents"].find(
+            {
+                "$or": [
+                    {"limited_token_mode": {"$in": [True, "True"]}},
+                    {"limited_request_mode": {"$in": [True, "True"]}},
+                ]
+            },
+            {"key": 1},
+        )
+        api_keys = [agent["key"] for agent in limited if agent.get("key")]
+    token_usage_collection = db["token_usage"]
+    return sum(1 for key in api_keys if reconcile_usage(key, token_usage_collection))
+
+
+def mongo_window_usage(
+    api_key: str,
+    token_usage_collection,
+    count_tokens: bool = True,
+    count_requests: bool = True,
+) -> Dict[str, int]:
+    """Compute 24h usage for ``api_key`` directly from ``token_usage``."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(seconds=WINDOW_SECONDS)
+    match_query = {
+        "timestamp": {"$gte": start_date, "$lte": end_date},
+        "api_key": api_key,
+    }
+    tokens = 0
+    requests = 0
+    if count_tokens:
+        token_pipeline = [
+            {"$match": match_query},
+            {
+                "$group": {
+                    "_id": None,
+                    "total_tokens": {
+                        "$sum": {"$add": ["$prompt_tokens", "$generated_tokens"]}
+                    },
+                }
+            },
+        ]
+        token_result = list(token_usage_collection.aggregate(token_pipeline))
+        tokens = token_result[0]["total_tokens"] if token_result else 0
+    if count_requests:
+        requests = token_usage_collection.count_documents(match_query)
+    return {"tokens": tokens, "requests": requests}
@@ -1,7 +1,11 @@
 import hashlib
+import math
 import os
 import re
+import threading
 import uuid
+from collections import OrderedDict
+from typing import Iterable, List
 
 import tiktoken
 from flask import jsonify, make_response
@@ -48,13 +52,90 @@ def safe_filename(filename):
     return safe_name
 
 
-def num_tokens_from_string(string: str) -> int:
-    encoding = get_encoding()
-    if isinstance(string, str):
-        num_tokens = len(encoding.encode(string))
-        return num_tokens
-    else:
+_token_count_cache: "OrderedDict[object, int]" = OrderedDict()
+_token_count_lock = threading.Lock()
+_SHORT_STRING_BYTES = 256
+# Observed bytes per token, refined from exact counts; seeds the estimate mode.
+_bytes_per_token = 4.0
+
+
+def _token_cache_key(string: str):
+    """Short strings are their own key; long ones are keyed by a digest."""
+    if len(string) <= _SHORT_STRING_BYTES:
+        return string
+    return hashlib.blake2b(string.encode(), digest_size=16).digest()
+
+
+def _cache_get(key):
+    with _token_count_lock:
+        count = _token_count_cache.get(key)
+        if count is not None:
+            _token_count_cache.move_to_end(key)
+        return count
+
+
+def _cache_put(key, string: str, count: int) -> None:
+    global _bytes_per_token
+    with _token_count_lock:
+        _token_count_cache[key] = count
+        _token_count_cache.move_to_end(key)
+        while len(_token_count_cache) > settings.TOKEN_COUNT_CACHE_SIZE:
+            _token_count_cache.popitem(last=False)
+        if count >= 32:
+            observed = len(string.encode()) / count
+            _bytes_per_token = 0.95 * _bytes_per_token + 0.05 * observed
+
+
+def estimate_tokens(string: str) -> int:
+    """Approximate token count from UTF-8 length, for budgets that need no exactness."""
+    if not isinstance(string, str) or not string:
+        return 0
+    return math.ceil(len(string.encode()) / _bytes_per_token)
+
+
+def num_tokens_from_string(string: str, estimate: bool = False) -> int:
+    """Count tokens with tiktoken, memoized by content.
+
+    Args:
+        string: Text to count. Non-strings count as 0.
+        estimate: Use the byte-ratio estimate instead of encoding.
+    """
+    if not isinstance(string, str):
         return 0
+    if estimate:
+        return estimate_tokens(string)
+    key = _token_cache_key(string)
+    count = _cache_get(key)
+    if count is None:
+        count = len(get_encoding().encode(string))
+        _cache_put(key, string, count)
+    return count
+
+
+def num_tokens_from_strings(strings: Iterable[str], estimate: bool = False) -> List[int]:
+    """Count tokens for many strings, encoding all cache misses in one batch."""
+    strings = list(strings)
+    if estimate:
+        return [estimate_tokens(string) for string in strings]
+    counts = [0] * len(strings)
+    missing = {}
+    for position, string in enumerate(strings):
+        if not isinstance(string, str):
+            continue
+        key = _token_cache_key(string)
+        count = _cache_get(key)
+        if count is None:
+            missing.setdefault(key, (string, []))[1].append(position)
+        else:
+            counts[position] = count
+    if missing:
+        pending = list(missing.items())
+        encoded = get_encoding().encode_batch([string for _, (string, _) in pending])
+        for (key, (string, positions)), tokens in zip(pending, encoded):
+            _cache_put(key, string, len(tokens))
+            for position in positions:
+                counts[position] = len(tokens)
+    return counts
 
 
 def num_tokens_from_object_or_list(thing):
@@ -158,15 +239,16 @@ def limit_chat_history(history, max_token_limit=None, model_id="docsgpt-local"):
     trimmed_history = []
     tokens_current_history = 0
 
+    estimate = settings.TOKEN_BUDGET_ESTIMATE
     for message in reversed(history):
         tokens_batch = 0
         if "prompt" in message and "response" in message:
-            tokens_batch += num_tokens_from_string(message["prompt"])
-            tokens_batch += num_tokens_from_string(message["response"])
+            tokens_batch += num_tokens_from_string(message["prompt"], estimate)
+            tokens_batch += num_tokens_from_string(message["response"], estimate)
         if "tool_calls" in message:
             for tool_call in message["tool_calls"]:
                 tool_call_string = f"Tool: {tool_call.get('tool_name')} | Action: {tool_call.get('action_name')} | Args: {tool_call.get('arguments')} | Response: {tool_call.get('result')}"
-                tokens_batch += num_tokens_from_string(tool_call_string)
+                tokens_batch += num_tokens_from_string(tool_call_string, estimate)
         if tokens_current_history + tokens_batch < max_token_limit:
             tokens_current_history += tokens_batch
             trimmed_history.insert(0, message)
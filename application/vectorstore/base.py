@@ -1,6 +1,8 @@
 import logging
 import os
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
 
 from langchain_openai import OpenAIEmbeddings
 from sentence_transformers import SentenceTransformer
@@ -79,6 +81,38 @@ class EmbeddingsSingleton:
             return EmbeddingsWrapper(embeddings_name, *args, **kwargs)
 
 
+@dataclass
+class ChunkPage:
+    """One page of chunks returned by :meth:`BaseVectorStore.iter_chunks`.
+
+    ``next_cursor`` is an opaque backend token for the following page, or
+    None when the backend pages by offset only or there are no more chunks.
+    """
+
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    total: int = 0
+    next_cursor: Optional[str] = None
+
+
+def chunk_matches(
+    chunk: Dict[str, Any], path: Optional[str] = None, search: Optional[str] = None
+) -> bool:
+    """Whether ``chunk`` comes from a file ending in ``path`` and contains
+    ``search`` (case-insensitive) in its text or title."""
+    metadata = chunk.get("metadata") or {}
+    if path:
+        chunk_source = metadata.get("source") or ""
+        if not chunk_source.endswith(path):
+            return False
+    if search:
+        search = search.lower()
+        text_match = search in (chunk.get("text") or "").lower()
+        title_match = search in (metadata.get("title") or "").lower()
+        if not (text_match or title_match):
+            return False
+    return True
+
+
 class BaseVectorStore(ABC):
     def __init__(self):
         pass
@@ -105,10 +139,48 @@ class BaseVectorStore(ABC):
         """Get all chunks from the vectorstore"""
         pass
 
+    def iter_chunks(
+        self,
+        path: Optional[str] = None,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> ChunkPage:
+        """Get one page of chunks, optionally filtered by file path and search term.
+
+        Backends override this to filter and paginate server-side; ``cursor``
+        (a previous page's ``next_cursor``) takes precedence over ``offset``
+        where supported. This fallback filters :meth:`get_chunks` in memory.
+        """
+        chunks = [
+            chunk
+            for chunk in self.get_chunks() or []
+            if chunk_matches(chunk, path, search)
+        ]
+        return ChunkPage(chunks=chunks[offset : offset + limit], total=len(chunks))
+
     def add_chunk(self, text, metadata=None, *args, **kwargs):
         """Add a single chunk to the vectorstore"""
         pass
 
+    def delete_by_metadata(self, field: str, values: Iterable[Any]) -> int:
+        """Delete every chunk whose metadata ``field`` is one of ``values``.
+
+        Backends override this with a single indexed bulk delete; this
+        fallback scans :meth:`get_chunks` and deletes matches one by one.
+        Returns the number of chunks deleted.
+        """
+        values = set(values)
+        if not values:
+            return 0
+        deleted = 0
+        for chunk in self.get_chunks() or []:
+            if (chunk.get("metadata") or {}).get(field) in values:
+                if self.delete_chunk(chunk["doc_id"]) is not False:
+                    deleted += 1
+        return deleted
+
     def delete_chunk(self, chunk_id, *args, **kwargs):
         """Delete a specific chunk from the vectorstore"""
         pass
@@ -1,4 +1,6 @@
-from application.vectorstore.base import BaseVectorStore
+import logging
+
+from application.vectorstore.base import BaseVectorStore, ChunkPage
 from application.core.settings import settings
 from application.vectorstore.document_class import Document
 
@@ -109,6 +111,77 @@ class ElasticsearchStore(BaseVectorStore):
             doc_list.append(Document(page_content = hit['_source']['text'], metadata = hit['_source']['metadata']))
         return doc_list
 
+    @staticmethod
+    def _wildcard_pattern(value):
+        return value.replace("\\", "\\\\").replace("*", "\\*").replace("?", "\\?")
+
+    def iter_chunks(self, path=None, search=None, offset=0, limit=10, cursor=None):
+        """Page through this source's chunks with a filtered query.
+
+        ``search`` is a case-insensitive substring match on the title. On the
+        analyzed ``text`` field a single word matches as a substring of a
+        token, while several words match as a phrase of whole tokens. Pages
+        are addressed by ``offset`` (``from``/``size``).
+        """
+        filters = [{"match": {"metadata.source_id.keyword": self.source_id}}]
+        if path:
+            filters.append(
+                {
+                    "wildcard": {
+                        "metadata.source.keyword": {
+                            "value": "*" + self._wildcard_pattern(path)
+                        }
+                    }
+                }
+            )
+        if search:
+            pattern = "*" + self._wildcard_pattern(search) + "*"
+            if search.split() == [search]:
+                text_query = {
+                    "wildcard": {"text": {"value": pattern, "case_insensitive": True}}
+                }
+            else:
+                text_query = {"match_phrase": {"text": search}}
+            filters.append(
+                {
+                    "bool": {
+                        "should": [
+                            text_query,
+                            {
+                                "wildcard": {
+                                    "metadata.title.keyword": {
+                                        "value": pattern,
+                                        "case_insensitive": True,
+                                    }
+                                }
+                            },
+                        ],
+                        "minimum_should_match": 1,
+                    }
+                }
+            )
+        try:
+            resp = self.docsearch.search(
+                index=self.index_name,
+                query={"bool": {"filter": filters}},
+                source_excludes=["vector"],
+                from_=offset,
+                size=limit,
+                track_total_hits=True,
+            )
+        except Exception as e:
+            logging.error(f"Error getting chunks: {e}", exc_info=True)
+            return ChunkPage()
+        chunks = [
+            {
+                "doc_id": hit["_id"],
+                "text": hit["_source"].get("text"),
+                "metadata": hit["_source"].get("metadata", {}),
+            }
+            for hit in resp["hits"]["hits"]
+        ]
+        return ChunkPage(chunks=chunks, total=resp["hits"]["total"]["value"])
+
     def _create_index_if_not_exists(
             self, index_name, dims_length
         ):
@@ -202,6 +275,24 @@ class ElasticsearchStore(BaseVectorStore):
         else:
             return []
 
+    def delete_by_metadata(self, field, values):
+        values = list(values)
+        if not values:
+            return 0
+        resp = self._es_connection.delete_by_query(
+            index=self.index_name,
+            query={
+                "bool": {
+                    "filter": [
+                        {"match": {"metadata.source_id.keyword": self.source_id}},
+                        {"terms": {f"metadata.{field}.keyword": values}},
+                    ]
+                }
+            },
+            refresh=True,
+        )
+        return resp.get("deleted", 0)
+
     def delete_index(self):
         self._es_connection.delete_by_query(index=self.index_name, query={"match": {
                                       "metadata.source_id.keyword": self.source_id}},)
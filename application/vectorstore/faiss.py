@@ -1,12 +1,11 @@
 import os
 import tempfile
-import io
 
 from langchain_community.vectorstores import FAISS
 
 from application.core.settings import settings
 from application.parser.schema.base import Document
-from application.vectorstore.base import BaseVectorStore
+from application.vectorstore.base import BaseVectorStore, ChunkPage, chunk_matches
 from application.storage.storage_creator import StorageCreator
 
 
@@ -41,17 +40,12 @@ class FaissStore(BaseVectorStore):
                             f"Index files not found in storage at {self.path}"
                         )
 
-                    faiss_file = self.storage.get_file(faiss_path)
-                    pkl_file = self.storage.get_file(pkl_path)
-
-                    local_faiss_path = os.path.join(temp_dir, "index.faiss")
-                    local_pkl_path = os.path.join(temp_dir, "index.pkl")
-
-                    with open(local_faiss_path, "wb") as f:
-                        f.write(faiss_file.read())
-
-                    with open(local_pkl_path, "wb") as f:
-                        f.write(pkl_file.read())
+                    self.storage.download_to(
+                        faiss_path, os.path.join(temp_dir, "index.faiss")
+                    )
+                    self.storage.download_to(
+                        pkl_path, os.path.join(temp_dir, "index.pkl")
+                    )
 
                     self.docsearch = FAISS.load_local(
                         temp_dir, self.embeddings, allow_dangerous_deserialization=True
@@ -75,18 +69,10 @@ class FaissStore(BaseVectorStore):
         with tempfile.TemporaryDirectory() as temp_dir:
             self.docsearch.save_local(temp_dir)
 
-            faiss_path = os.path.join(temp_dir, "index.faiss")
-            pkl_path = os.path.join(temp_dir, "index.pkl")
-
-            with open(faiss_path, "rb") as f_faiss:
-                faiss_data = f_faiss.read()
-
-            with open(pkl_path, "rb") as f_pkl:
-                pkl_data = f_pkl.read()
-
             storage_path = get_vectorstore(self.source_id)
-            self.storage.save_file(io.BytesIO(faiss_data), f"{storage_path}/index.faiss")
-            self.storage.save_file(io.BytesIO(pkl_data), f"{storage_path}/index.pkl")
+            for filename in ("index.faiss", "index.pkl"):
+                with open(os.path.join(temp_dir, filename), "rb") as f:
+                    self.storage.save_file(f, f"{storage_path}/{filename}")
 
         return True
 
@@ -132,6 +118,25 @@ class FaissStore(BaseVectorStore):
                 chunks.append(chunk_data)
         return chunks
 
+    def iter_chunks(self, path=None, search=None, offset=0, limit=10, cursor=None):
+        """Page through the docstore in index order, building only the page."""
+        page = ChunkPage()
+        if not self.docsearch:
+            return page
+        docstore = self.docsearch.docstore._dict
+        for position in sorted(self.docsearch.index_to_docstore_id):
+            doc_id = self.docsearch.index_to_docstore_id[position]
+            doc = docstore.get(doc_id)
+            if doc is None:
+                continue
+            chunk = {"doc_id": doc_id, "text": doc.page_content, "metadata": doc.metadata}
+            if not chunk_matches(chunk, path, search):
+                continue
+            if offset <= page.total < offset + limit:
+                page.chunks.append(chunk)
+            page.total += 1
+        return page
+
     def add_chunk(self, text, metadata=None):
         """Add a new chunk and save to storage."""
         metadata = metadata or {}
@@ -142,6 +147,21 @@ class FaissStore(BaseVectorStore):
 
 
 
+    def delete_by_metadata(self, field, values):
+        """Delete matching chunks in one pass and upload the index once."""
+        values = set(values)
+        if not values or not self.docsearch:
+            return 0
+        doc_ids = [
+            doc_id
+            for doc_id, doc in self.docsearch.docstore._dict.items()
+            if (doc.metadata or {}).get(field) in values
+        ]
+        if doc_ids:
+            self.docsearch.delete(doc_ids)
+            self._save_to_storage()
+        return len(doc_ids)
+
     def delete_chunk(self, chunk_id):
         """Delete a chunk and save to storage."""
         self.delete_index([chunk_id])
@@ -1,10 +1,15 @@
 import logging
+import re
+
 from application.core.settings import settings
-from application.vectorstore.base import BaseVectorStore
+from application.vectorstore.base import BaseVectorStore, ChunkPage
 from application.vectorstore.document_class import Document
 
 
 class MongoDBVectorStore(BaseVectorStore):
+    # (collection, field) pairs whose delete_by_metadata index this process has created
+    _metadata_indexes = set()
+
     def __init__(
         self,
         source_id: str = "",
@@ -129,27 +134,60 @@ class MongoDBVectorStore(BaseVectorStore):
     def get_chunks(self):
         try:
             chunks = []
-            cursor = self._collection.find({"source_id": self._source_id})
+            cursor = self._collection.find(
+                {"source_id": self._source_id}, {self._embedding_key: 0}
+            )
             for doc in cursor:
-                doc_id = str(doc.get("_id"))
-                text = doc.get(self._text_key)
-                metadata = {
-                    k: v
-                    for k, v in doc.items()
-                    if k
-                    not in ["_id", self._text_key, self._embedding_key, "source_id"]
-                }
-
-                if text:
-                    chunks.append(
-                        {"doc_id": doc_id, "text": text, "metadata": metadata}
-                    )
+                chunk = self._to_chunk(doc)
+                if chunk["text"]:
+                    chunks.append(chunk)
 
             return chunks
         except Exception as e:
             logging.error(f"Error getting chunks: {e}", exc_info=True)
             return []
 
+    def _to_chunk(self, doc):
+        metadata = {
+            k: v
+            for k, v in doc.items()
+            if k not in ["_id", self._text_key, self._embedding_key, "source_id"]
+        }
+        return {
+            "doc_id": str(doc.get("_id")),
+            "text": doc.get(self._text_key),
+            "metadata": metadata,
+        }
+
+    def iter_chunks(self, path=None, search=None, offset=0, limit=10, cursor=None):
+        from bson.objectid import ObjectId
+
+        query = {
+            "source_id": self._source_id,
+            self._text_key: {"$nin": [None, ""]},
+        }
+        if path:
+            query["source"] = {"$regex": re.escape(path) + "$"}
+        if search:
+            pattern = {"$regex": re.escape(search), "$options": "i"}
+            query["$or"] = [{self._text_key: pattern}, {"title": pattern}]
+        try:
+            total = self._collection.count_documents(query)
+            page_query = query
+            if cursor:
+                page_query = {**query, "_id": {"$gt": ObjectId(cursor)}}
+            docs = self._collection.find(
+                page_query, {self._embedding_key: 0}
+            ).sort("_id", 1)
+            if not cursor:
+                docs = docs.skip(offset)
+            chunks = [self._to_chunk(doc) for doc in docs.limit(limit)]
+        except Exception as e:
+            logging.error(f"Error getting chunks: {e}", exc_info=True)
+            return ChunkPage()
+        next_cursor = chunks[-1]["doc_id"] if len(chunks) == limit else None
+        return ChunkPage(chunks=chunks, total=total, next_cursor=next_cursor)
+
     def add_chunk(self, text, metadata=None):
         metadata = metadata or {}
         embeddings = self._embedding.embed_documents([text])
@@ -165,6 +203,21 @@ class MongoDBVectorStore(BaseVectorStore):
         result = self._collection.insert_one(chunk_data)
         return str(result.inserted_id)
 
+    def delete_by_metadata(self, field, values):
+        values = list(values)
+        if not values:
+            return 0
+        index_key = (self._collection.full_name, field)
+        if index_key not in MongoDBVectorStore._metadata_indexes:
+            self._collection.create_index(
+                [("source_id", 1), (field, 1)], name=f"source_id_{field}"
+            )
+            MongoDBVectorStore._metadata_indexes.add(index_key)
+        result = self._collection.delete_many(
+            {"source_id": self._source_id, field: {"$in": values}}
+        )
+        return result.deleted_count
+
     def delete_chunk(self, chunk_id):
         try:
             from bson.objectid import ObjectId
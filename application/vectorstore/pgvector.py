@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional, Any, Dict
 from application.core.settings import settings
-from application.vectorstore.base import BaseVectorStore
+from application.vectorstore.base import BaseVectorStore, ChunkPage
 from application.vectorstore.document_class import Document
 
 
@@ -98,6 +98,13 @@ class PGVectorStore(BaseVectorStore):
             ON {self._table_name} (source_id);
             """
             cursor.execute(source_index_query)
+
+            # Index chunks by source file for bulk deletes on re-ingest
+            source_file_index_query = f"""
+            CREATE INDEX IF NOT EXISTS {self._table_name}_source_file_idx
+            ON {self._table_name} (source_id, ({self._metadata_column}->>'source'));
+            """
+            cursor.execute(source_file_index_query)
             
             conn.commit()
         except Exception as e:
@@ -236,6 +243,70 @@ class PGVectorStore(BaseVectorStore):
         finally:
             cursor.close()
 
+    @staticmethod
+    def _like_pattern(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def iter_chunks(
+        self,
+        path: Optional[str] = None,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> ChunkPage:
+        """Get one filtered page of chunks for this source_id"""
+        conditions = [
+            "source_id = %s",
+            f"{self._text_column} IS NOT NULL",
+        ]
+        params: List[Any] = [self._source_id]
+        if path:
+            conditions.append(f"{self._metadata_column}->>'source' LIKE %s")
+            params.append("%" + self._like_pattern(path))
+        if search:
+            pattern = "%" + self._like_pattern(search) + "%"
+            conditions.append(
+                f"({self._text_column} ILIKE %s "
+                f"OR {self._metadata_column}->>'title' ILIKE %s)"
+            )
+            params.extend([pattern, pattern])
+        where = " AND ".join(conditions)
+
+        conn = self._get_connection()
+        db_cursor = conn.cursor()
+        try:
+            db_cursor.execute(
+                f"SELECT COUNT(*) FROM {self._table_name} WHERE {where};", params
+            )
+            total = db_cursor.fetchone()[0]
+
+            page_where, page_params = where, list(params)
+            if cursor:
+                page_where += " AND id > %s"
+                page_params.append(int(cursor))
+            select_query = f"""
+            SELECT id, {self._text_column}, {self._metadata_column}
+            FROM {self._table_name}
+            WHERE {page_where}
+            ORDER BY id
+            LIMIT %s OFFSET %s;
+            """
+            page_params.extend([limit, 0 if cursor else offset])
+            db_cursor.execute(select_query, page_params)
+            chunks = [
+                {"doc_id": str(doc_id), "text": text, "metadata": metadata or {}}
+                for doc_id, text, metadata in db_cursor.fetchall()
+            ]
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Error getting chunks: {e}")
+            return ChunkPage()
+        finally:
+            db_cursor.close()
+        next_cursor = chunks[-1]["doc_id"] if len(chunks) == limit else None
+        return ChunkPage(chunks=chunks, total=total, next_cursor=next_cursor)
+
     def add_chunk(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Add a single chunk to the vector store"""
         metadata = metadata or {}
@@ -277,6 +348,28 @@ class PGVectorStore(BaseVectorStore):
         finally:
             cursor.close()
 
+    def delete_by_metadata(self, field: str, values) -> int:
+        """Delete all chunks of this source whose metadata field is in values"""
+        values = [str(value) for value in values]
+        if not values:
+            return 0
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            delete_query = f"""
+            DELETE FROM {self._table_name}
+            WHERE source_id = %s AND {self._metadata_column}->>%s = ANY(%s);
+            """
+            cursor.execute(delete_query, (self._source_id, field, values))
+            deleted_count = cursor.rowcount
+            conn.commit()
+            return deleted_count
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
     def delete_chunk(self, chunk_id: str) -> bool:
         """Delete a specific chunk by its ID"""
         conn = self._get_connection()
@@ -1,5 +1,5 @@
 import logging
-from application.vectorstore.base import BaseVectorStore
+from application.vectorstore.base import BaseVectorStore, ChunkPage
 from application.core.settings import settings
 from application.vectorstore.document_class import Document
 
@@ -61,6 +61,17 @@ class QdrantStore(BaseVectorStore):
                 # Index might already exist, which is fine
                 if "already exists" not in str(index_error).lower():
                     logging.warning(f"Could not create index for metadata.source_id: {index_error}")
+
+            # Index source files for bulk deletes on re-ingest
+            try:
+                self._docsearch.client.create_payload_index(
+                    collection_name=settings.QDRANT_COLLECTION_NAME,
+                    field_name="metadata.source",
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            except Exception as index_error:
+                if "already exists" not in str(index_error).lower():
+                    logging.warning(f"Could not create index for metadata.source: {index_error}")
                     
         except Exception as e:
             logging.warning(f"Could not check for collection: {e}")
@@ -107,6 +118,74 @@ class QdrantStore(BaseVectorStore):
             logging.error(f"Error getting chunks: {e}", exc_info=True)
             return []
 
+    def iter_chunks(self, path=None, search=None, offset=0, limit=10, cursor=None):
+        """Page through chunks with a server-side scroll filter.
+
+        Without a full-text index Qdrant's ``MatchText`` is a case-sensitive
+        substring match, so ``path`` matches anywhere in the source path.
+        """
+        from qdrant_client import models
+
+        must = list(self._filter.must)
+        if path:
+            must.append(
+                models.FieldCondition(
+                    key="metadata.source", match=models.MatchText(text=path)
+                )
+            )
+        should = None
+        if search:
+            should = [
+                models.FieldCondition(
+                    key="page_content", match=models.MatchText(text=search)
+                ),
+                models.FieldCondition(
+                    key="metadata.title", match=models.MatchText(text=search)
+                ),
+            ]
+        scroll_filter = models.Filter(must=must, should=should)
+        client = self._docsearch.client
+        try:
+            total = client.count(
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                count_filter=scroll_filter,
+                exact=True,
+            ).count
+            # Point ids are unsigned integers or UUIDs
+            start = int(cursor) if cursor and cursor.isdigit() else cursor
+            if start is None and offset:
+                # Skip ahead without transferring payloads
+                _, start = client.scroll(
+                    collection_name=settings.QDRANT_COLLECTION_NAME,
+                    scroll_filter=scroll_filter,
+                    limit=offset,
+                    with_payload=False,
+                    with_vectors=False,
+                )
+                if start is None:
+                    return ChunkPage(total=total)
+            records, next_offset = client.scroll(
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=limit,
+                with_payload=True,
+                with_vectors=False,
+                offset=start,
+            )
+        except Exception as e:
+            logging.error(f"Error getting chunks: {e}", exc_info=True)
+            return ChunkPage()
+        chunks = [
+            {
+                "doc_id": record.id,
+                "text": record.payload.get("page_content"),
+                "metadata": record.payload.get("metadata"),
+            }
+            for record in records
+        ]
+        next_cursor = str(next_offset) if next_offset is not None else None
+        return ChunkPage(chunks=chunks, total=total, next_cursor=next_cursor)
+
     def add_chunk(self, text, metadata=None):
         import uuid
         metadata = metadata or {}
@@ -124,6 +203,32 @@ class QdrantStore(BaseVectorStore):
         doc_ids = self._docsearch.add_documents([doc])
         return doc_ids[0] if doc_ids else doc_id
 
+    def delete_by_metadata(self, field, values):
+        from qdrant_client import models
+
+        values = list(values)
+        if not values:
+            return 0
+        delete_filter = models.Filter(
+            must=list(self._filter.must)
+            + [
+                models.FieldCondition(
+                    key=f"metadata.{field}", match=models.MatchAny(any=values)
+                )
+            ]
+        )
+        client = self._docsearch.client
+        deleted = client.count(
+            collection_name=settings.QDRANT_COLLECTION_NAME,
+            count_filter=delete_filter,
+            exact=True,
+        ).count
+        client.delete(
+            collection_name=settings.QDRANT_COLLECTION_NAME,
+            points_selector=models.FilterSelector(filter=delete_filter),
+        )
+        return deleted
+
     def delete_chunk(self, chunk_id):
         try:
             self._docsearch.client.delete(
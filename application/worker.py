@@ -7,7 +7,6 @@ import shutil
 import string
 import tempfile
 from typing import Any, Dict
-import zipfile
 
 from collections import Counter
 from urllib.parse import urljoin
@@ -17,20 +16,37 @@ from bson.dbref import DBRef
 from bson.objectid import ObjectId
 
 from application.agents.agent_creator import AgentCreator
+from application.api.answer.services.compression import CompressionOrchestrator
+from application.api.answer.services.conversation_service import ConversationService
 from application.api.answer.services.stream_processor import get_prompt
 
 from application.cache import get_redis_instance
+from application.core.data_loader import RequestDataLoader
 from application.core.mongo_db import MongoDB
 from application.core.settings import settings
 from application.parser.chunking import Chunker
 from application.parser.connectors.connector_creator import ConnectorCreator
 from application.parser.embedding_pipeline import embed_and_store_documents
+from application.parser.file.archive import extract_zip
 from application.parser.file.bulk import SimpleDirectoryReader
+from application.parser.file.manifest import (
+    flatten_directory_structure,
+    is_ingestible,
+    manifest_by_path,
+    manifest_entry,
+    metadata_unchanged,
+    remove_file_entry,
+    set_file_entry,
+    sha256_file,
+    total_token_count,
+)
 from application.parser.remote.remote_creator import RemoteCreator
 from application.parser.schema.base import Document
 from application.retriever.retriever_creator import RetrieverCreator
 
 from application.storage.storage_creator import StorageCreator
+from application.storage.transfer import TransferManager
+from application.usage_counters import reconcile_limited_agents
 from application.utils import count_tokens_docs, num_tokens_from_string
 
 mongo = MongoDB.get_client()
@@ -64,37 +80,6 @@ current_dir = os.path.dirname(
 )
 
 
-def extract_zip_recursive(zip_path, extract_to, current_depth=0, max_depth=5):
-    """
-    Recursively extract zip files with a limit on recursion depth.
-
-    Args:
-        zip_path (str): Path to the zip file to be extracted.
-        extract_to (str): Destination path for extracted files.
-        current_depth (int): Current depth of recursion.
-        max_depth (int): Maximum allowed depth of recursion to prevent infinite loops.
-    """
-    if current_depth > max_depth:
-        logging.warning(f"Reached maximum recursion depth of {max_depth}")
-        return
-    try:
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(extract_to)
-        os.remove(zip_path)  # Remove the zip file after extracting
-    except Exception as e:
-        logging.error(f"Error extracting zip file {zip_path}: {e}", exc_info=True)
-        return
-    # Check for nested zip files and extract them
-
-    for root, dirs, files in os.walk(extract_to):
-        for file in files:
-            if file.endswith(".zip"):
-                # If a nested zip file is found, extract it recursively
-
-                file_path = os.path.join(root, file)
-                extract_zip_recursive(file_path, root, current_depth + 1, max_depth)
-
-
 def download_file(url, params, dest_path):
     try:
         response = requests.get(url, params=params)
@@ -144,7 +129,7 @@ def upload_index(full_path, file_data):
                 file.close()
 
 
-def run_agent_logic(agent_config, input_data):
+def run_agent_logic(agent_config, input_data, data_loader=None):
     try:
         from application.core.model_utils import (
             get_api_key_for_provider,
@@ -154,10 +139,11 @@ def run_agent_logic(agent_config, input_data):
         )
         from application.utils import calculate_doc_token_budget
 
+        data_loader = data_loader or RequestDataLoader(db)
         source = agent_config.get("source")
         retriever = agent_config.get("retriever", "classic")
         if isinstance(source, DBRef):
-            source_doc = db.dereference(source)
+            source_doc = data_loader.dereference(source)
             source = str(source_doc["_id"])
             retriever = source_doc.get("retriever", agent_config.get("retriever"))
         else:
@@ -169,7 +155,7 @@ def run_agent_logic(agent_config, input_data):
         agent_type = agent_config.get("agent_type", "classic")
         decoded_token = {"sub": agent_config.get("user")}
         json_schema = agent_config.get("json_schema")
-        prompt = get_prompt(prompt_id, db["prompts"])
+        prompt = get_prompt(prompt_id, db["prompts"], data_loader)
 
         # Determine model_id: check agent's default_model_id, fallback to system default
         agent_default_model = agent_config.get("default_model_id", "")
@@ -222,6 +208,7 @@ def run_agent_logic(agent_config, input_data):
             decoded_token=decoded_token,
             attachments=[],
             json_schema=json_schema,
+            data_loader=data_loader,
         )
         answer = agent.gen(query=input_data)
         response_full = ""
@@ -292,45 +279,40 @@ def ingest_worker(
             if storage.is_directory(file_path):
                 # Handle directory case
                 logging.info(f"Processing directory: {file_path}")
-                files_list = storage.list_files(file_path)
-
-                for storage_file_path in files_list:
-                    if storage.is_directory(storage_file_path):
-                        continue
-
-                    # Create relative path structure in temp directory
-                    rel_path = os.path.relpath(storage_file_path, file_path)
-                    local_file_path = os.path.join(temp_dir, rel_path)
-
-                    os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-
-                    # Download file
-                    try:
-                        file_data = storage.get_file(storage_file_path)
-                        with open(local_file_path, "wb") as f:
-                            f.write(file_data.read())
-                    except Exception as e:
-                        logging.error(
-                            f"Error downloading file {storage_file_path}: {e}"
-                        )
-                        continue
+                files_metadata = storage.list_files_with_metadata(file_path)
+                results = TransferManager(storage).download_directory(
+                    file_path, temp_dir, files_metadata
+                )
+                failed = [path for path, error in results.items() if error]
+                if failed:
+                    logging.error(f"Failed to download {len(failed)} files: {failed}")
             else:
                 # Handle single file case
                 temp_filename = os.path.basename(file_path)
                 temp_file_path = os.path.join(temp_dir, temp_filename)
 
-                file_data = storage.get_file(file_path)
-                with open(temp_file_path, "wb") as f:
-                    f.write(file_data.read())
+                storage.download_to(file_path, temp_file_path)
 
                 # Handle zip files
                 if temp_filename.endswith(".zip"):
                     logging.info(f"Extracting zip file: {temp_filename}")
-                    extract_zip_recursive(
+                    # Only files the reader will parse are written out
+                    extracted = extract_zip(
                         temp_file_path,
                         temp_dir,
-                        current_depth=0,
+                        required_exts=formats,
                         max_depth=RECURSION_DEPTH,
+                        max_total_bytes=settings.ZIP_MAX_TOTAL_BYTES,
+                        max_entries=settings.ZIP_MAX_ENTRIES,
+                    )
+                    logging.info(f"Extracted {len(extracted)} files from {temp_filename}")
+                    # Parse what was extracted rather than walking temp_dir again
+                    input_files = sorted(
+                        {
+                            path
+                            for path in extracted
+                            if recursive or os.path.dirname(path) == temp_dir
+                        }
                     )
 
             self.update_state(state="PROGRESS", meta={"current": 1})
@@ -399,11 +381,36 @@ def ingest_worker(
     }
 
 
+REINGEST_EXTENSIONS = [
+    ".rst",
+    ".md",
+    ".pdf",
+    ".txt",
+    ".docx",
+    ".csv",
+    ".epub",
+    ".html",
+    ".mdx",
+    ".json",
+    ".xlsx",
+    ".pptx",
+    ".png",
+    ".jpg",
+    ".jpeg",
+]
+
+
 def reingest_source_worker(self, source_id, user):
     """
     Re-ingestion worker that handles incremental updates by:
     1. Adding chunks from newly added files
-    2. Removing chunks from deleted files
+    2. Replacing chunks of modified files
+    3. Removing chunks from deleted files
+
+    Change detection uses the source's ``file_manifest``: the storage listing
+    is compared against the stored size/mtime/etag, and only new files and
+    files whose metadata changed are downloaded. A changed file whose sha256
+    still matches is left alone.
 
     Args:
         self: Task instance
@@ -432,116 +439,112 @@ def reingest_source_worker(self, source_id, user):
             state="PROGRESS", meta={"current": 20, "status": "Scanning current files"}
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Download all files from storage to temp directory, preserving directory structure
-            if storage.is_directory(source_file_path):
-                files_list = storage.list_files(source_file_path)
-
-                for storage_file_path in files_list:
-                    if storage.is_directory(storage_file_path):
-                        continue
-
-                    rel_path = os.path.relpath(storage_file_path, source_file_path)
-                    local_file_path = os.path.join(temp_dir, rel_path)
-
-                    os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-
-                    # Download file
-                    try:
-                        file_data = storage.get_file(storage_file_path)
-                        with open(local_file_path, "wb") as f:
-                            f.write(file_data.read())
-                    except Exception as e:
-                        logging.error(
-                            f"Error downloading file {storage_file_path}: {e}"
-                        )
-                        continue
+        # List current files with their storage metadata, without downloading
+        listing = {}
+        storage_paths = {}
+        if storage.is_directory(source_file_path):
+            files_metadata = storage.list_files_with_metadata(source_file_path)
+            for storage_file_path, file_metadata in files_metadata.items():
+                rel_path = os.path.relpath(storage_file_path, source_file_path)
+                if is_ingestible(rel_path, REINGEST_EXTENSIONS):
+                    listing[rel_path] = file_metadata
+                    storage_paths[rel_path] = storage_file_path
+
+        old_directory_structure = source.get("directory_structure") or {}
+        if isinstance(old_directory_structure, str):
+            try:
+                old_directory_structure = json.loads(old_directory_structure)
+            except Exception:
+                old_directory_structure = {}
+        old_files = flatten_directory_structure(old_directory_structure)
+        old_manifest = manifest_by_path(source.get("file_manifest"))
+
+        added_files = sorted(set(listing) - old_files)
+        removed_files = sorted(old_files - set(listing))
+        # Files indexed before manifests existed are assumed unchanged
+        changed_candidates = sorted(
+            rel_path
+            for rel_path in set(listing) & old_files
+            if rel_path in old_manifest
+            and not metadata_unchanged(old_manifest[rel_path], listing[rel_path])
+        )
+        logging.info(
+            f"Re-ingest scan: {len(added_files)} added, {len(removed_files)} removed, "
+            f"{len(changed_candidates)} possibly modified"
+        )
 
-            reader = SimpleDirectoryReader(
-                input_dir=temp_dir,
-                recursive=True,
-                required_exts=[
-                    ".rst",
-                    ".md",
-                    ".pdf",
-                    ".txt",
-                    ".docx",
-                    ".csv",
-                    ".epub",
-                    ".html",
-                    ".mdx",
-                    ".json",
-                    ".xlsx",
-                    ".pptx",
-                    ".png",
-                    ".jpg",
-                    ".jpeg",
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = os.path.realpath(temp_dir)
+            to_download = added_files + changed_candidates
+            results = TransferManager(storage).download_files(
+                [
+                    (storage_paths[rel_path], os.path.join(temp_dir, rel_path))
+                    for rel_path in to_download
                 ],
-                exclude_hidden=True,
-                file_metadata=metadata_from_filename,
-            )
-            reader.load_data()
-            directory_structure = reader.directory_structure
-            logging.info(
-                f"Directory structure built with token counts: {directory_structure}"
+                sizes={
+                    storage_paths[rel_path]: listing[rel_path]["size"]
+                    for rel_path in to_download
+                    if listing[rel_path].get("size") is not None
+                },
             )
+            local_paths = {}
+            file_hashes = {}
+            for rel_path in to_download:
+                if results.get(storage_paths[rel_path]) is None:
+                    local_paths[rel_path] = os.path.join(temp_dir, rel_path)
+                    file_hashes[rel_path] = sha256_file(local_paths[rel_path])
+            # Their manifest entries must stay as they were, or the new listing
+            # metadata would mark them unchanged and they would never be retried
+            download_failed = {p for p in to_download if p not in local_paths}
+            if download_failed:
+                logging.warning(
+                    f"Failed to download {len(download_failed)} files: "
+                    f"{sorted(download_failed)}"
+                )
 
-            try:
-                old_directory_structure = source.get("directory_structure") or {}
-                if isinstance(old_directory_structure, str):
-                    try:
-                        old_directory_structure = json.loads(old_directory_structure)
-                    except Exception:
-                        old_directory_structure = {}
-
-                def _flatten_directory_structure(struct, prefix=""):
-                    files = set()
-                    if isinstance(struct, dict):
-                        for name, meta in struct.items():
-                            current_path = (
-                                os.path.join(prefix, name) if prefix else name
-                            )
-                            if isinstance(meta, dict) and (
-                                "type" in meta and "size_bytes" in meta
-                            ):
-                                files.add(current_path)
-                            elif isinstance(meta, dict):
-                                files |= _flatten_directory_structure(
-                                    meta, current_path
-                                )
-                    return files
-
-                old_files = _flatten_directory_structure(old_directory_structure)
-                new_files = _flatten_directory_structure(directory_structure)
-
-                added_files = sorted(new_files - old_files)
-                removed_files = sorted(old_files - new_files)
-
-                if added_files:
-                    logging.info(f"Files added since last ingest: {added_files}")
-                else:
-                    logging.info("No files added since last ingest.")
-
-                if removed_files:
-                    logging.info(f"Files removed since last ingest: {removed_files}")
-                else:
-                    logging.info("No files removed since last ingest.")
+            added_files = [p for p in added_files if p in local_paths]
+            modified_files = [
+                p
+                for p in changed_candidates
+                if p in local_paths
+                and file_hashes[p] != old_manifest[p].get("sha256")
+            ]
+            if added_files:
+                logging.info(f"Files added since last ingest: {added_files}")
+            if modified_files:
+                logging.info(f"Files modified since last ingest: {modified_files}")
+            if removed_files:
+                logging.info(f"Files removed since last ingest: {removed_files}")
+
+            def build_manifest(failed=()):
+                manifest = []
+                for rel_path, file_metadata in sorted(listing.items()):
+                    if rel_path in failed or rel_path in download_failed:
+                        if rel_path in old_manifest:
+                            # Keep the old entry so the next run retries the file
+                            manifest.append(old_manifest[rel_path])
+                        continue
+                    if rel_path in file_hashes:
+                        sha256 = file_hashes[rel_path]
+                    else:
+                        sha256 = old_manifest.get(rel_path, {}).get("sha256")
+                    manifest.append(manifest_entry(rel_path, file_metadata, sha256))
+                return manifest
 
-            except Exception as e:
-                logging.error(
-                    f"Error comparing directory structures: {e}", exc_info=True
-                )
-                added_files = []
-                removed_files = []
             try:
-                if not added_files and not removed_files:
+                if not added_files and not removed_files and not modified_files:
                     logging.info("No changes detected.")
+                    sources_collection.update_one(
+                        {"_id": ObjectId(source_id)},
+                        {"$set": {"file_manifest": build_manifest()}},
+                    )
                     return {
                         "source_id": source_id,
                         "user": user,
                         "status": "no_changes",
                         "added_files": [],
                         "removed_files": [],
+                        "modified_files": [],
                     }
 
                 vector_store = VectorCreator.create_vectorstore(
@@ -555,134 +558,103 @@ def reingest_source_worker(self, source_id, user):
                     meta={"current": 40, "status": "Processing file changes"},
                 )
 
-                # 1) Delete chunks from removed files
+                # 1) Delete chunks from removed and modified files
                 deleted = 0
-                if removed_files:
+                delete_failed = False
+                failed_files = set()
+                stale_files = removed_files + modified_files
+                if stale_files:
                     try:
-                        for ch in vector_store.get_chunks() or []:
-                            metadata = (
-                                ch.get("metadata", {})
-                                if isinstance(ch, dict)
-                                else getattr(ch, "metadata", {})
-                            )
-                            raw_source = metadata.get("source")
-
-                            source_file = str(raw_source) if raw_source else ""
-
-                            if source_file in removed_files:
-                                cid = ch.get("doc_id")
-                                if cid:
-                                    try:
-                                        vector_store.delete_chunk(cid)
-                                        deleted += 1
-                                    except Exception as de:
-                                        logging.error(
-                                            f"Failed deleting chunk {cid}: {de}"
-                                        )
+                        deleted = vector_store.delete_by_metadata(
+                            "source", stale_files
+                        )
                         logging.info(
-                            f"Deleted {deleted} chunks from {len(removed_files)} removed files"
+                            f"Deleted {deleted} chunks from {len(stale_files)} "
+                            f"removed or modified files"
                         )
                     except Exception as e:
                         logging.error(
                             f"Error during deletion of removed file chunks: {e}",
                             exc_info=True,
                         )
+                        # Re-indexing now would leave the old chunks next to the
+                        # new ones; keep everything as it was for the next run
+                        delete_failed = True
+                        failed_files = set(modified_files)
 
-                # 2) Add chunks from new files
+                directory_structure = old_directory_structure
+                if not delete_failed:
+                    for rel_path in removed_files:
+                        remove_file_entry(directory_structure, rel_path)
+
+                # 2) Add chunks from new and modified files
                 added = 0
-                if added_files:
+                files_to_index = added_files + [
+                    p for p in modified_files if p not in failed_files
+                ]
+                if files_to_index:
                     try:
-                        # Build list of local files for added files only
-                        added_local_files = []
-                        for rel_path in added_files:
-                            local_path = os.path.join(temp_dir, rel_path)
-                            if os.path.isfile(local_path):
-                                added_local_files.append(local_path)
-
-                        if added_local_files:
-                            reader_new = SimpleDirectoryReader(
-                                input_files=added_local_files,
-                                exclude_hidden=True,
-                                errors="ignore",
-                                file_metadata=metadata_from_filename,
-                            )
-                            raw_docs_new = reader_new.load_data()
-                            chunker_new = Chunker(
-                                chunking_strategy="classic_chunk",
-                                max_tokens=MAX_TOKENS,
-                                min_tokens=MIN_TOKENS,
-                                duplicate_headers=False,
+                        reader_new = SimpleDirectoryReader(
+                            input_files=[local_paths[p] for p in files_to_index],
+                            exclude_hidden=True,
+                            errors="ignore",
+                            file_metadata=metadata_from_filename,
+                        )
+                        raw_docs_new = reader_new.load_data()
+                        chunker_new = Chunker(
+                            chunking_strategy="classic_chunk",
+                            max_tokens=MAX_TOKENS,
+                            min_tokens=MIN_TOKENS,
+                            duplicate_headers=False,
+                        )
+                        chunked_new = chunker_new.chunk(documents=raw_docs_new)
+
+                        for (
+                            file_path,
+                            token_count,
+                        ) in reader_new.file_token_counts.items():
+                            rel_path = os.path.relpath(file_path, start=temp_dir)
+                            set_file_entry(
+                                directory_structure, rel_path, file_path, token_count
                             )
-                            chunked_new = chunker_new.chunk(documents=raw_docs_new)
-
-                            for (
-                                file_path,
-                                token_count,
-                            ) in reader_new.file_token_counts.items():
-                                try:
-                                    rel_path = os.path.relpath(
-                                        file_path, start=temp_dir
-                                    )
-                                    path_parts = rel_path.split(os.sep)
-                                    current_dir = directory_structure
-
-                                    for part in path_parts[:-1]:
-                                        if part in current_dir and isinstance(
-                                            current_dir[part], dict
-                                        ):
-                                            current_dir = current_dir[part]
-                                        else:
-                                            break
-
-                                    filename = path_parts[-1]
-                                    if filename in current_dir and isinstance(
-                                        current_dir[filename], dict
-                                    ):
-                                        current_dir[filename][
-                                            "token_count"
-                                        ] = token_count
-                                        logging.info(
-                                            f"Updated token count for {rel_path}: {token_count}"
-                                        )
-                                except Exception as e:
-                                    logging.warning(
-                                        f"Could not update token count for {file_path}: {e}"
+
+                        for d in chunked_new:
+                            meta = dict(d.extra_info or {})
+                            try:
+                                raw_src = meta.get("source")
+                                if isinstance(raw_src, str) and os.path.isabs(
+                                    raw_src
+                                ):
+                                    meta["source"] = os.path.relpath(
+                                        raw_src, start=temp_dir
                                     )
+                            except Exception:
+                                pass
 
-                            for d in chunked_new:
-                                meta = dict(d.extra_info or {})
-                                try:
-                                    raw_src = meta.get("source")
-                                    if isinstance(raw_src, str) and os.path.isabs(
-                                        raw_src
-                                    ):
-                                        meta["source"] = os.path.relpath(
-                                            raw_src, start=temp_dir
-                                        )
-                                except Exception:
-                                    pass
-
-                                vector_store.add_chunk(d.text, metadata=meta)
-                                added += 1
-                            logging.info(
-                                f"Added {added} chunks from {len(added_files)} new files"
-                            )
+                            vector_store.add_chunk(d.text, metadata=meta)
+                            added += 1
+                        logging.info(
+                            f"Added {added} chunks from {len(files_to_index)} "
+                            f"new or modified files"
+                        )
                     except Exception as e:
                         logging.error(
                             f"Error during ingestion of new files: {e}", exc_info=True
                         )
+                        failed_files |= set(files_to_index)
+                        for rel_path in added_files:
+                            remove_file_entry(directory_structure, rel_path)
 
-                # 3) Update source directory structure timestamp
+                # 3) Update source directory structure and manifest
                 try:
-                    total_tokens = sum(reader.file_token_counts.values())
-
                     sources_collection.update_one(
                         {"_id": ObjectId(source_id)},
                         {
                             "$set": {
                                 "directory_structure": directory_structure,
+                                "file_manifest": build_manifest(failed_files),
                                 "date": datetime.datetime.now(),
-                                "tokens": total_tokens,
+                                "tokens": total_token_count(directory_structure),
                             }
                         },
                     )
@@ -702,6 +674,8 @@ def reingest_source_worker(self, source_id, user):
                     "status": "completed",
                     "added_files": added_files,
                     "removed_files": removed_files,
+                    "modified_files": modified_files,
+                    "failed_files": sorted(failed_files | download_failed),
                     "chunks_added": added,
                     "chunks_deleted": deleted,
                 }
@@ -843,6 +817,32 @@ def sync_worker(self, frequency):
     }
 
 
+def usage_counters_reconcile_worker(self):
+    """Rebuild the Redis usage counters of limited agents from token_usage."""
+    reconciled = reconcile_limited_agents(db)
+    logging.info(f"Reconciled usage counters for {reconciled} API keys")
+    return {"reconciled": reconciled}
+
+
+def conversation_compression_worker(
+    self, conversation_id, user_id, model_id, decoded_token
+):
+    """Summarise a conversation that crossed the soft compression threshold."""
+    orchestrator = CompressionOrchestrator(ConversationService())
+    result = orchestrator.compress_in_background(
+        conversation_id, user_id, model_id, decoded_token
+    )
+    if not result.success:
+        logging.warning(
+            f"Background compression failed for {conversation_id}: {result.error}"
+        )
+    return {
+        "conversation_id": conversation_id,
+        "success": result.success,
+        "compression_performed": result.compression_performed,
+    }
+
+
 def attachment_worker(self, file_info, user):
     """
     Process and store a single attachment without vectorization.
@@ -937,12 +937,11 @@ def agent_webhook_worker(self, agent_id, payload):
     """
     mongo = MongoDB.get_client()
     db = mongo["docsgpt"]
-    agents_collection = db["agents"]
+    data_loader = RequestDataLoader(db)
 
     self.update_state(state="PROGRESS", meta={"current": 1})
     try:
-        agent_oid = ObjectId(agent_id)
-        agent_config = agents_collection.find_one({"_id": agent_oid})
+        agent_config = data_loader.get_agent(agent_id=agent_id)
         if not agent_config:
             raise ValueError(f"Agent with ID {agent_id} not found.")
         input_data = json.dumps(payload)
@@ -951,7 +950,7 @@ def agent_webhook_worker(self, agent_id, payload):
         return {"status": "error", "error": str(e)}
     self.update_state(state="PROGRESS", meta={"current": 50})
     try:
-        result = run_agent_logic(agent_config, input_data)
+        result = run_agent_logic(agent_config, input_data, data_loader)
     except Exception as e:
         logging.error(f"Error running agent logic: {e}", exc_info=True)
         return {"status": "error", "error": str(e)}
@@ -1174,8 +1173,7 @@ def mcp_oauth(self, config: Dict[str, Any], user_id: str = None) -> Dict[str, An
         "[MCP OAuth] Worker started for user_id=%s, config=%s", user_id, config
     )
     try:
-        import asyncio
-
+        from application.agents.tools.mcp_session_pool import mcp_event_loop
         from application.agents.tools.mcp_tool import MCPTool
 
         task_id = self.request.id
@@ -1213,12 +1211,11 @@ def mcp_oauth(self, config: Dict[str, Any], user_id: str = None) -> Dict[str, An
             }
         )
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         try:
-            logging.info("[MCP OAuth] Starting event loop for OAuth discovery...")
-            tools_response = loop.run_until_complete(run_oauth_discovery())
+            logging.info("[MCP OAuth] Starting OAuth discovery on the MCP event loop...")
+            tools_response = mcp_event_loop.run(
+                run_oauth_discovery(), timeout=settings.MCP_OAUTH_TIMEOUT_SECONDS
+            )
             logging.info(
                 "[MCP OAuth] Tools response after async call: %s", tools_response
             )
@@ -1264,9 +1261,6 @@ def mcp_oauth(self, config: Dict[str, Any], user_id: str = None) -> Dict[str, An
                 }
             )
             return {"success": False, "error": error_msg}
-        finally:
-            logging.info("[MCP OAuth] Closing event loop for task_id=%s", task_id)
-            loop.close()
     except Exception as e:
         error_msg = f"Failed to initialize OAuth flow: {str(e)}"
         logging.error(
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Backfill the analytics_rollups collection from conversations and token_usage.
+
+The analytics endpoints read pre-aggregated buckets that are maintained at
+write time. Run this once after deploying rollups (and any time drift is
+suspected) to rebuild the buckets for historic data.
+
+Run from the repository root:
+    PYTHONPATH=. python scripts/backfill_analytics_rollups.py --days 30
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pymongo
+from tqdm import tqdm
+
+from application.services.analytics_service import AnalyticsRollupService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger()
+
+# Configuration
+MONGO_URI = "mongodb://localhost:27017/"
+DB_NAME = "docsgpt"
+
+
+def backfill_analytics_rollups(days):
+    """Rebuild rollup buckets for the last ``days`` whole days, one day at a time."""
+    client = pymongo.MongoClient(MONGO_URI)
+    db = client[DB_NAME]
+    rollups = AnalyticsRollupService(db["analytics_rollups"])
+
+    try:
+        rollups.ensure_indexes()
+        db["conversations"].create_index("queries.timestamp")
+        db["conversations"].create_index("queries.feedback_timestamp")
+
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        written = 0
+        for offset in tqdm(range(days, -1, -1), desc="Rebuilding rollups"):
+            day_start = today - timedelta(days=offset)
+            day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+            written += rollups.rebuild(db, day_start, day_end)
+
+        logger.info(f"Backfill completed: {written} bucket documents written")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30, help="Number of past days to rebuild")
+    args = parser.parse_args()
+    try:
+        logger.info("Starting analytics rollup backfill...")
+        backfill_analytics_rollups(args.days)
+    except Exception as e:
+        logger.error(f"Backfill failed due to error: {e}")
+        raise
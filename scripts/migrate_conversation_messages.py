@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Move conversation turns from the embedded ``queries`` array into the
+``conversation_messages`` collection.
+
+Each migrated conversation gets one message document per turn, keyed by
+(conversation_id, seq), and is marked with ``message_storage: "messages"``;
+its ``queries`` array is removed. A conversation that receives a new turn
+while it is being copied is left untouched and picked up by the next run,
+so the script is safe to re-run. Set ``CONVERSATION_STORAGE=messages`` so new
+conversations are created in the same layout.
+
+Run from the repository root:
+    PYTHONPATH=. python scripts/migrate_conversation_messages.py --dry-run
+"""
+
+import argparse
+import logging
+
+import pymongo
+from tqdm import tqdm
+
+from application.services.conversation_messages import (
+    ConversationMessageStore,
+    MESSAGE_STORAGE,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger()
+
+# Configuration
+MONGO_URI = "mongodb://localhost:27017/"
+DB_NAME = "docsgpt"
+
+
+def migrate_conversation(conversations, store, conversation):
+    """Copy one conversation's turns; returns False if it changed meanwhile."""
+    conversation_id = conversation["_id"]
+    queries = conversation.get("queries") or []
+    # Leftovers of an interrupted earlier run
+    store.delete([conversation_id])
+    if queries:
+        store.collection.insert_many(
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "seq": seq,
+                    "user": conversation.get("user"),
+                    **({"api_key": conversation["api_key"]} if conversation.get("api_key") else {}),
+                    **query,
+                }
+                for seq, query in enumerate(queries)
+            ]
+        )
+    result = conversations.update_one(
+        {
+            "_id": conversation_id,
+            "message_storage": {"$exists": False},
+            "queries": {"$size": len(queries)},
+        },
+        {
+            "$set": {"message_storage": MESSAGE_STORAGE, "message_count": len(queries)},
+            "$unset": {"queries": ""},
+        },
+    )
+    if not result.modified_count:
+        store.delete([conversation_id])
+        return False
+    return True
+
+
+def migrate_conversation_messages(dry_run=False, limit=None):
+    """Split every embedded conversation into conversation_messages."""
+    client = pymongo.MongoClient(MONGO_URI)
+    db = client[DB_NAME]
+    conversations = db["conversations"]
+    store = ConversationMessageStore(db["conversation_messages"])
+
+    try:
+        pending = {"message_storage": {"$exists": False}, "queries": {"$exists": True}}
+        total = conversations.count_documents(pending)
+        if limit:
+            total = min(total, limit)
+        logger.info(f"Found {total} conversations with embedded queries")
+        if dry_run:
+            logger.info("Dry run, nothing was changed")
+            return
+
+        store.ensure_indexes()
+        migrated = skipped = 0
+        cursor = conversations.find(
+            pending, {"user": 1, "api_key": 1, "queries": 1}, no_cursor_timeout=True
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        try:
+            for conversation in tqdm(cursor, total=total, desc="Migrating conversations"):
+                if migrate_conversation(conversations, store, conversation):
+                    migrated += 1
+                else:
+                    skipped += 1
+                    logger.warning(
+                        f"Conversation {conversation['_id']} changed during migration, "
+                        "re-run to migrate it"
+                    )
+        finally:
+            cursor.close()
+
+        logger.info(f"Migration completed: {migrated} migrated, {skipped} skipped")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="Only count conversations to migrate")
+    parser.add_argument("--limit", type=int, default=None, help="Migrate at most this many conversations")
+    args = parser.parse_args()
+    try:
+        logger.info("Starting conversation messages migration...")
+        migrate_conversation_messages(dry_run=args.dry_run, limit=args.limit)
+    except Exception as e:
+        logger.error(f"Migration failed due to error: {e}")
+        raise
@@ -0,0 +1,208 @@
+import time
+
+import pytest
+
+from application.agents.tools.mcp_session_pool import (
+    BackgroundEventLoop,
+    MCPSessionPool,
+)
+
+
+class FakeClient:
+    def __init__(self, alive=True):
+        self.connects = 0
+        self.closed = False
+        self.alive = alive
+        self.pings = 0
+        self.list_calls = 0
+
+    async def __aenter__(self):
+        self.connects += 1
+        return self
+
+    def is_connected(self):
+        return not self.closed
+
+    async def ping(self):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("gone")
+        return True
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return ["search"]
+
+    async def echo(self, value):
+        return value
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    pool = MCPSessionPool(
+        BackgroundEventLoop(), max_sessions=2, idle_timeout=60, probe_interval=30
+    )
+    yield pool
+    pool.close_all()
+
+
+def factory(created, **kwargs):
+    def make():
+        client = FakeClient(**kwargs)
+        created.append(client)
+        return client
+
+    return make
+
+
+@pytest.mark.unit
+class TestMCPSessionPool:
+    def test_warm_session_skips_handshake(self, pool):
+        created = []
+
+        first = pool.run("a", factory(created), lambda c: c.echo(1))
+        second = pool.run("a", factory(created), lambda c: c.echo(2))
+
+        assert (first, second) == (1, 2)
+        assert len(created) == 1
+        assert created[0].connects == 1
+
+    def test_sessions_are_keyed(self, pool):
+        created = []
+
+        pool.run("a", factory(created), lambda c: c.echo(1))
+        pool.run("b", factory(created), lambda c: c.echo(1))
+
+        assert len(created) == 2
+
+    def test_max_sessions_evicts_least_recently_used(self, pool):
+        created = []
+
+        for key in ("a", "b", "a", "c"):
+            pool.run(key, factory(created), lambda c: c.echo(None))
+
+        assert len(created) == 3
+        assert created[1].closed  # "b" was least recently used
+        assert not created[0].closed
+
+    def test_idle_sessions_are_closed(self, pool):
+        created = []
+        pool.run("a", factory(created), lambda c: c.echo(None))
+        pool._sessions["a"].last_used = time.monotonic() - 120
+
+        pool.run("b", factory(created), lambda c: c.echo(None))
+
+        assert created[0].closed
+        assert "a" not in pool._sessions
+
+    def test_dead_session_is_replaced_after_probe(self, pool):
+        created = []
+        pool.run("a", factory(created, alive=False), lambda c: c.echo(None))
+        pool._sessions["a"].last_used = time.monotonic() - 45
+
+        pool.run("a", factory(created), lambda c: c.echo(None))
+
+        assert created[0].pings == 1
+        assert created[0].closed
+        assert len(created) == 2
+
+    def test_failed_operation_discards_session(self, pool):
+        created = []
+
+        async def fail(client):
+            raise ConnectionError("broken pipe")
+
+        with pytest.raises(ConnectionError):
+            pool.run("a", factory(created), fail)
+        pool.run("a", factory(created), lambda c: c.echo(None))
+
+        assert created[0].closed
+        assert len(created) == 2
+
+    def test_list_tools_is_cached(self, pool):
+        created = []
+
+        assert pool.list_tools("a", factory(created)) == ["search"]
+        assert pool.list_tools("a", factory(created)) == ["search"]
+        pool.list_tools("a", factory(created), refresh=True)
+
+        assert created[0].list_calls == 2
+
+    def test_timeout_raises(self, pool):
+        import asyncio
+
+        async def slow(client):
+            await asyncio.sleep(1)
+
+        with pytest.raises(TimeoutError):
+            pool.run("a", factory([]), slow, timeout=0.05)
+
+
+@pytest.mark.unit
+class TestBackgroundEventLoop:
+    def test_submit_runs_coroutines_concurrently(self):
+        import asyncio
+
+        event_loop = BackgroundEventLoop()
+
+        async def nap(value):
+            await asyncio.sleep(0.2)
+            return value
+
+        started = time.monotonic()
+        futures = [event_loop.submit(nap(i)) for i in range(5)]
+
+        assert [future.result(timeout=2) for future in futures] == list(range(5))
+        assert time.monotonic() - started < 0.6
+
+    def test_concurrent_calls_share_one_session(self, pool):
+        import asyncio
+
+        created = []
+        in_flight = []
+
+        async def call(client):
+            in_flight.append(1)
+            peak = len(in_flight)
+            await asyncio.sleep(0.1)
+            in_flight.pop()
+            return peak
+
+        futures = [pool.submit("a", factory(created), call) for _ in range(4)]
+
+        assert max(future.result(timeout=2) for future in futures) > 1
+        assert len(created) == 1
+
+    def test_run_from_loop_thread_is_rejected(self):
+        event_loop = BackgroundEventLoop()
+
+        async def noop():
+            return None
+
+        async def nested():
+            event_loop.run(noop())
+
+        with pytest.raises(RuntimeError):
+            event_loop.run(nested(), timeout=2)
+
+
+@pytest.mark.unit
+class TestMCPToolSessionKey:
+    def test_key_separates_credentials_and_oauth_users(self, mock_mongo_db):
+        from application.agents.tools.mcp_tool import MCPTool
+
+        def key(config, user_id=None):
+            return MCPTool(config, user_id)._generate_cache_key()
+
+        base = {"server_url": "https://mcp.example.com", "auth_type": "bearer"}
+        token_a = {**base, "auth_credentials": {"bearer_token": "token-aaaaaaaaaa-1"}}
+        token_b = {**base, "auth_credentials": {"bearer_token": "token-aaaaaaaaaa-2"}}
+        oauth = {"server_url": "https://mcp.example.com", "auth_type": "oauth"}
+
+        assert key(token_a) == key(dict(token_a))
+        assert key(token_a) != key(token_b)
+        assert key(oauth, "u1") != key(oauth, "u2")
+        assert key(token_a)[:2] == ("https://mcp.example.com", "auto")
@@ -19,6 +19,13 @@ class MockTool(Tool):
         return {"required": ["api_key"]}
 
 
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    ToolManager.clear_cache()
+    yield
+    ToolManager.clear_cache()
+
+
 @pytest.mark.unit
 class TestToolManager:
 
@@ -198,6 +205,71 @@ class TestToolManager:
         assert "test_action" in result
 
 
+class UserTool(MockTool):
+    def __init__(self, config, user_id=None):
+        super().__init__(config)
+        self.user_id = user_id
+
+
+@pytest.mark.unit
+class TestToolManagerCaching:
+
+    def test_tool_classes_discovered_once(self):
+        with patch(
+            "application.agents.tools.tool_manager.pkgutil.iter_modules",
+            return_value=[(None, "mock_tool", False)],
+        ) as mock_iter, patch.object(
+            ToolManager, "_find_tool_class", return_value=MockTool
+        ):
+            first = ToolManager({}).tools
+            second = ToolManager({"mock_tool": {"k": "v"}}).tools
+
+        assert mock_iter.call_count == 1
+        assert isinstance(first["mock_tool"], MockTool)
+        assert second["mock_tool"].config == {"k": "v"}
+
+    def test_tools_are_instantiated_lazily(self):
+        with patch.object(ToolManager, "load_tools") as mock_load, patch(
+            "application.agents.tools.tool_manager.pkgutil.iter_modules",
+            return_value=[],
+        ):
+            ToolManager({})
+
+        mock_load.assert_not_called()
+
+    def test_load_tool_reuses_instance_per_config_and_user(self):
+        with patch.object(
+            ToolManager, "get_tool_class", return_value=UserTool
+        ), patch.object(ToolManager, "get_tool_classes", return_value={}):
+            manager = ToolManager({})
+            a = manager.load_tool("memory", {"tool_id": "1"}, user_id="u1")
+            b = ToolManager({}).load_tool("memory", {"tool_id": "1"}, user_id="u1")
+            other_user = manager.load_tool("memory", {"tool_id": "1"}, user_id="u2")
+            other_config = manager.load_tool("memory", {"tool_id": "2"}, user_id="u1")
+            anonymous = manager.load_tool("memory", {"tool_id": "1"})
+            anonymous_again = manager.load_tool("memory", {"tool_id": "1"})
+
+        assert a is b
+        assert other_user is not a and other_user.user_id == "u2"
+        assert other_config is not a
+        assert anonymous is not anonymous_again
+
+    def test_instance_cache_is_bounded(self):
+        with patch.object(
+            ToolManager, "get_tool_class", return_value=MockTool
+        ), patch.object(ToolManager, "get_tool_classes", return_value={}), patch(
+            "application.agents.tools.tool_manager.settings"
+        ) as mock_settings:
+            mock_settings.TOOL_INSTANCE_CACHE_SIZE = 2
+            manager = ToolManager({})
+            first = manager.load_tool("api_tool", {"url": "a"})
+            manager.load_tool("api_tool", {"url": "b"})
+            manager.load_tool("api_tool", {"url": "c"})
+
+            assert manager.load_tool("api_tool", {"url": "a"}) is not first
+            assert len(ToolManager._instances) == 2
+
+
 @pytest.mark.unit
 class TestToolBase:
 
@@ -240,3 +240,254 @@ class TestConversationServiceSave:
                 model_id="gpt-4",
                 decoded_token={"sub": "hacker_456"},
             )
+
+
+@pytest.mark.unit
+class TestConversationTokenCounts:
+
+    def _save(self, service, conversation_id, question, response, **kwargs):
+        mock_llm = Mock()
+        mock_llm.gen.return_value = "Title"
+        return service.save_conversation(
+            conversation_id=conversation_id,
+            question=question,
+            response=response,
+            thought="",
+            sources=[],
+            tool_calls=kwargs.pop("tool_calls", []),
+            llm=mock_llm,
+            model_id="gpt-4",
+            decoded_token={"sub": "user_123"},
+            **kwargs,
+        )
+
+    def test_running_total_tracks_appends_and_edits(self, mock_mongo_db):
+        from application.api.answer.services.compression.token_counter import (
+            TokenCounter,
+        )
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        service = ConversationService()
+        collection = mock_mongo_db[settings.MONGO_DB_NAME]["conversations"]
+
+        conv_id = self._save(service, None, "What is Python?", "A language.")
+        self._save(
+            service,
+            conv_id,
+            "Search it",
+            "Done",
+            tool_calls=[{"tool_name": "search", "result": "many results " * 20}],
+        )
+        self._save(service, conv_id, "And Rust?", "Also a language.")
+        self._save(service, conv_id, "Edited", "Short", index=1)
+
+        saved = collection.find_one({"_id": ObjectId(conv_id)})
+        assert len(saved["queries"]) == 2
+        expected = sum(
+            TokenCounter.count_stored_query_tokens(q) for q in saved["queries"]
+        )
+        assert all(q["token_count"] > 0 for q in saved["queries"])
+        assert saved["token_count"] == expected
+        assert TokenCounter.count_conversation_tokens(saved) == expected
+
+    def test_backfills_conversations_without_counts(self, mock_mongo_db):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        service = ConversationService()
+        collection = mock_mongo_db[settings.MONGO_DB_NAME]["conversations"]
+        conv_id = ObjectId()
+        collection.insert_one(
+            {
+                "_id": conv_id,
+                "user": "user_123",
+                "queries": [{"prompt": "Q1 " * 50, "response": "A1 " * 50}],
+            }
+        )
+
+        self._save(service, str(conv_id), "Q2", "A2")
+
+        saved = collection.find_one({"_id": conv_id})
+        assert saved["queries"][0]["token_count"] > 0
+        assert saved["token_count"] == sum(q["token_count"] for q in saved["queries"])
+
+
+@pytest.mark.unit
+class TestConversationMessageStorage:
+
+    @pytest.fixture(autouse=True)
+    def message_storage(self, monkeypatch):
+        from application.core.settings import settings
+
+        monkeypatch.setattr(settings, "CONVERSATION_STORAGE", "messages")
+
+    def _save(self, service, conversation_id, question, response, **kwargs):
+        mock_llm = Mock()
+        mock_llm.gen.return_value = "Title"
+        return service.save_conversation(
+            conversation_id=conversation_id,
+            question=question,
+            response=response,
+            thought="",
+            sources=[],
+            tool_calls=[],
+            llm=mock_llm,
+            model_id="gpt-4",
+            decoded_token={"sub": "user_123"},
+            **kwargs,
+        )
+
+    def test_turns_are_stored_as_messages(self, mock_mongo_db):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        service = ConversationService()
+
+        conv_id = self._save(service, None, "Q1", "A1")
+        self._save(service, conv_id, "Q2", "A2")
+        self._save(service, conv_id, "Q3", "A3")
+
+        saved = db["conversations"].find_one({"_id": ObjectId(conv_id)})
+        messages = list(
+            db["conversation_messages"].find({"conversation_id": ObjectId(conv_id)})
+        )
+        assert "queries" not in saved
+        assert saved["message_count"] == 3
+        assert sorted((m["seq"], m["prompt"]) for m in messages) == [
+            (0, "Q1"),
+            (1, "Q2"),
+            (2, "Q3"),
+        ]
+        assert saved["token_count"] == sum(m["token_count"] for m in messages)
+
+        conversation = service.get_conversation(conv_id, "user_123")
+        assert [q["prompt"] for q in conversation["queries"]] == ["Q1", "Q2", "Q3"]
+
+    def test_edit_replaces_turn_and_drops_later_ones(self, mock_mongo_db):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        service = ConversationService()
+        conv_id = self._save(service, None, "Q1", "A1")
+        self._save(service, conv_id, "Q2", "A2")
+        self._save(service, conv_id, "Q3", "A3")
+
+        self._save(service, conv_id, "Edited", "New answer", index=1)
+        self._save(service, conv_id, "Q4", "A4")
+
+        queries = service.get_conversation(conv_id, "user_123")["queries"]
+        saved = db["conversations"].find_one({"_id": ObjectId(conv_id)})
+        assert [q["prompt"] for q in queries] == ["Q1", "Edited", "Q4"]
+        assert saved["message_count"] == 3
+        assert saved["token_count"] == sum(q["token_count"] for q in queries)
+
+    def test_embedded_conversations_keep_working(self, mock_mongo_db):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        conv_id = db["conversations"].insert_one(
+            {"user": "user_123", "queries": [{"prompt": "Q1", "response": "A1"}]}
+        ).inserted_id
+        service = ConversationService()
+
+        self._save(service, str(conv_id), "Q2", "A2")
+
+        saved = db["conversations"].find_one({"_id": conv_id})
+        assert [q["prompt"] for q in saved["queries"]] == ["Q1", "Q2"]
+        assert db["conversation_messages"].count_documents({}) == 0
+
+    def test_get_queries_from_reads_only_later_turns(self, mock_mongo_db):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        service = ConversationService()
+        split_id = self._save(service, None, "Q1", "A1")
+        self._save(service, split_id, "Q2", "A2")
+        self._save(service, split_id, "Q3", "A3")
+        embedded_id = db["conversations"].insert_one(
+            {
+                "user": "user_123",
+                "queries": [
+                    {"prompt": f"Q{i}", "response": f"A{i}"} for i in (1, 2, 3)
+                ],
+            }
+        ).inserted_id
+
+        for conv_id in (split_id, str(embedded_id)):
+            header = service.get_conversation(
+                conv_id, "user_123", include_queries=False
+            )
+            assert "queries" not in header
+            queries = service.get_queries_from(header, 1)
+            assert [q["prompt"] for q in queries] == ["Q2", "Q3"]
+
+    def test_history_reads_only_the_tail(self, mock_mongo_db, monkeypatch):
+        from application.api.answer.services import conversation_service
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        conv_id = ObjectId()
+        db["conversations"].insert_one(
+            {
+                "_id": conv_id,
+                "user": "user_123",
+                "message_storage": "messages",
+                "message_count": 12,
+            }
+        )
+        db["conversation_messages"].insert_many(
+            [
+                {
+                    "conversation_id": conv_id,
+                    "seq": seq,
+                    "prompt": f"Q{seq}",
+                    "response": "answer " * 20,
+                    "sources": [{"text": "large"}],
+                }
+                for seq in range(12)
+            ]
+        )
+        monkeypatch.setattr(conversation_service, "HISTORY_PAGE_SIZE", 3)
+        monkeypatch.setattr(
+            conversation_service,
+            "limit_chat_history",
+            lambda history, model_id=None: history[-4:],
+        )
+        service = conversation_service.ConversationService()
+        store = service.message_store
+        pages = []
+        original = store.get_recent_queries
+
+        def record(*args, **kwargs):
+            page = original(*args, **kwargs)
+            pages.append(page)
+            return page
+
+        monkeypatch.setattr(store, "get_recent_queries", record)
+        conversation = service.get_conversation(
+            str(conv_id), "user_123", include_queries=False
+        )
+
+        history = service.get_history(conversation, "gpt-4")
+
+        assert [turn["prompt"] for turn in history] == ["Q8", "Q9", "Q10", "Q11"]
+        assert len(pages) == 2
+        assert all(set(turn) == {"prompt", "response"} for turn in history)
+
@@ -88,6 +88,53 @@ class TestTemplateEngine:
         result = engine.extract_variables(template)
 
         assert isinstance(result, set)
+        assert result == {"user"}
+
+    def test_compiled_template_shared_across_instances(self):
+        from unittest.mock import patch
+
+        from application.templates.template_engine import TemplateEngine
+
+        TemplateEngine.clear_cache()
+        template = "Hi {{ name }} from {{ tools.memory.memory_ls }}"
+
+        with patch.object(
+            TemplateEngine._env, "from_string", wraps=TemplateEngine._env.from_string
+        ) as from_string, patch.object(
+            TemplateEngine._env, "parse", wraps=TemplateEngine._env.parse
+        ) as parse:
+            first = TemplateEngine().render(template, {"name": "A"})
+            second = TemplateEngine().render(template, {"name": "B"})
+            TemplateEngine().extract_tool_usages(template)
+            usages = TemplateEngine().extract_tool_usages(template)
+
+        assert first.startswith("Hi A") and second.startswith("Hi B")
+        assert from_string.call_count == 1
+        assert parse.call_count == 1
+        assert usages == {"memory": {None, "memory_ls"}}
+
+    def test_tool_usages_copy_does_not_leak_into_cache(self):
+        from application.templates.template_engine import TemplateEngine
+
+        template = "{{ tools.notes.view }}"
+        TemplateEngine().extract_tool_usages(template)["notes"].add("edit")
+
+        assert TemplateEngine().extract_tool_usages(template) == {"notes": {None, "view"}}
+
+    def test_template_cache_evicts_least_recently_used(self, monkeypatch):
+        from application.core.settings import settings
+        from application.templates.template_engine import TemplateEngine
+
+        monkeypatch.setattr(settings, "TEMPLATE_CACHE_SIZE", 2)
+        TemplateEngine.clear_cache()
+        engine = TemplateEngine()
+
+        for template in ("{{ a }}", "{{ b }}", "{{ a }}", "{{ c }}"):
+            engine.render(template, {})
+
+        assert len(TemplateEngine._cache) == 2
+        first_key = next(iter(TemplateEngine._cache))
+        assert TemplateEngine._cache[first_key].template.render(a="x") == "x"
 
 
 @pytest.mark.unit
@@ -848,3 +895,125 @@ class TestStreamProcessorPromptRendering:
             # Empty result should still be included
             assert result is not None
             assert "memory" in result
+
+
+@pytest.mark.unit
+class TestConcurrentToolPrefetch:
+
+    @staticmethod
+    def _insert_tools(names):
+        from application.core.mongo_db import MongoDB
+        from bson import ObjectId
+
+        db = MongoDB.get_client()[list(MongoDB.get_client().keys())[0]]
+        docs = [
+            {"_id": ObjectId(), "name": name, "user": "user1", "status": True, "config": {}}
+            for name in names
+        ]
+        db["user_tools"].insert_many(docs)
+        return docs
+
+    @staticmethod
+    def _make_tool(name, result, cache_ttl=None, delay=0):
+        import time
+        from unittest.mock import MagicMock
+
+        action = {"name": f"{name}_get", "parameters": {"properties": {}}}
+        if cache_ttl:
+            action["cache_ttl"] = cache_ttl
+        tool = MagicMock()
+        tool.get_actions_metadata.return_value = [action]
+
+        def execute_action(action_name, **kwargs):
+            time.sleep(delay)
+            return result
+
+        tool.execute_action.side_effect = execute_action
+        return tool
+
+    def test_prefetch_merges_all_tools_and_records_timing(self, mock_mongo_db):
+        from unittest.mock import MagicMock, patch
+
+        from application.api.answer.services.stream_processor import StreamProcessor
+
+        docs = self._insert_tools(["memory", "todo_list"])
+        tools = {
+            "memory": self._make_tool("memory", "files", delay=0.05),
+            "todo_list": self._make_tool("todo_list", "todos", delay=0.05),
+        }
+        processor = StreamProcessor({"question": "test"}, {"sub": "user1"})
+
+        with patch(
+            "application.agents.tools.tool_manager.ToolManager"
+        ) as mock_manager_class:
+            mock_manager = MagicMock()
+            mock_manager.load_tool.side_effect = lambda name, *a, **k: tools[name]
+            mock_manager_class.return_value = mock_manager
+
+            result = processor.pre_fetch_tools()
+
+        assert result["memory"] == {"memory_get": "files"}
+        assert result["todo_list"] == {"todo_list_get": "todos"}
+        assert result[str(docs[0]["_id"])] == {"memory_get": "files"}
+        assert processor.timings["tool_prefetch_ms"] >= 0
+
+    def test_prefetch_skips_tools_past_deadline(self, mock_mongo_db, monkeypatch):
+        from unittest.mock import MagicMock, patch
+
+        from application.api.answer.services.stream_processor import StreamProcessor
+        from application.core.settings import settings
+
+        monkeypatch.setattr(settings, "TOOL_PREFETCH_TIMEOUT_SECONDS", 0.2)
+        self._insert_tools(["memory", "todo_list"])
+        tools = {
+            "memory": self._make_tool("memory", "files"),
+            "todo_list": self._make_tool("todo_list", "todos", delay=1),
+        }
+        processor = StreamProcessor({"question": "test"}, {"sub": "user1"})
+
+        with patch(
+            "application.agents.tools.tool_manager.ToolManager"
+        ) as mock_manager_class:
+            mock_manager = MagicMock()
+            mock_manager.load_tool.side_effect = lambda name, *a, **k: tools[name]
+            mock_manager_class.return_value = mock_manager
+
+            result = processor.pre_fetch_tools()
+
+        assert result["memory"] == {"memory_get": "files"}
+        assert "todo_list" not in result
+
+    def test_prefetch_uses_cached_action_result(self, mock_mongo_db):
+        from unittest.mock import MagicMock, patch
+
+        from application.api.answer.services.stream_processor import StreamProcessor
+
+        self._insert_tools(["cryptoprice", "memory"])
+        tools = {
+            "cryptoprice": self._make_tool("cryptoprice", "fresh", cache_ttl=60),
+            "memory": self._make_tool("memory", "files"),
+        }
+        processor = StreamProcessor({"question": "test"}, {"sub": "user1"})
+
+        with patch(
+            "application.agents.tools.tool_manager.ToolManager"
+        ) as mock_manager_class, patch(
+            "application.api.answer.services.stream_processor.tool_result_cache_key",
+            return_value="tool_result:key",
+        ), patch(
+            "application.api.answer.services.stream_processor.get_cached_tool_result",
+            return_value=(True, "cached"),
+        ) as mock_get, patch(
+            "application.api.answer.services.stream_processor.set_cached_tool_result"
+        ) as mock_set:
+            mock_manager = MagicMock()
+            mock_manager.load_tool.side_effect = lambda name, *a, **k: tools[name]
+            mock_manager_class.return_value = mock_manager
+
+            result = processor.pre_fetch_tools()
+
+        assert result["cryptoprice"] == {"cryptoprice_get": "cached"}
+        assert result["memory"] == {"memory_get": "files"}
+        tools["cryptoprice"].execute_action.assert_not_called()
+        mock_get.assert_called_once_with("tool_result:key")
+        mock_set.assert_not_called()
@@ -12,6 +12,25 @@ def get_settings():
     return settings
 
 
+@pytest.fixture(autouse=True)
+def mongomock_bulk_update_sort(monkeypatch):
+    """pymongo 4.11 passes ``sort`` to bulk updates, which mongomock 4.3 rejects."""
+    builder = mongomock.collection.BulkOperationBuilder
+    add_update = builder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(builder, "add_update", add_update_without_sort)
+
+
+@pytest.fixture(autouse=True)
+def disable_config_cache(monkeypatch):
+    """Tests share database state by id; keep the process config cache out of it."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ENABLE_CONFIG_CACHE", False)
+
+
 @pytest.fixture
 def mock_llm():
     llm = Mock()
@@ -64,6 +83,10 @@ def mock_mongo_db(monkeypatch):
     monkeypatch.setattr(
         "application.api.user.base.conversations_collection", mock_db["conversations"]
     )
+    monkeypatch.setattr(
+        "application.api.user.base.conversation_messages_collection",
+        mock_db["conversation_messages"],
+    )
     monkeypatch.setattr(
         "application.api.user.base.sources_collection", mock_db["sources"]
     )
@@ -82,6 +105,10 @@ def mock_mongo_db(monkeypatch):
     monkeypatch.setattr(
         "application.api.user.base.user_logs_collection", mock_db["user_logs"]
     )
+    monkeypatch.setattr(
+        "application.api.user.base.analytics_rollups_collection",
+        mock_db["analytics_rollups"],
+    )
     monkeypatch.setattr(
         "application.api.user.base.shared_conversations_collections",
         mock_db["shared_conversations"],
@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Any, Dict, Generator
 from unittest.mock import Mock, patch
 
@@ -211,3 +213,96 @@ class TestLLMHandler:
 
                 chunks = list(result)
                 assert chunks == ["chunk1", "chunk2"]
+
+
+class ParallelTool:
+    parallel_safe = True
+    max_concurrency = 4
+
+
+class TestParallelToolCalls:
+    def _agent(self, delays, release=None):
+        agent = Mock()
+        agent.tool_calls = []
+
+        def execute(tools_dict, call):
+            yield {"type": "tool_call", "data": {"call_id": call.id, "status": "pending"}}
+            if release is not None and call.id in release:
+                release[call.id].wait(5)
+            time.sleep(delays.get(call.id, 0))
+            yield {"type": "tool_call", "data": {"call_id": call.id, "status": "completed"}}
+            agent.tool_calls.append({"call_id": call.id, "result": f"r-{call.id}"})
+            return f"r-{call.id}", call.id
+
+        agent._execute_tool_action.side_effect = execute
+        agent._check_context_limit.return_value = False
+        return agent
+
+    def _run(self, handler, agent, calls):
+        tools_dict = {"1": {"name": "parallel"}}
+        gen = handler.handle_tool_calls(agent, calls, tools_dict, [])
+        events = []
+        while True:
+            try:
+                events.append(next(gen))
+            except StopIteration as e:
+                return events, e.value
+
+    @patch(
+        "application.agents.tools.tool_manager.ToolManager.get_tool_class",
+        return_value=ParallelTool,
+    )
+    def test_results_keep_call_order(self, _):
+        handler = ConcreteHandler()
+        calls = [ToolCall(id=f"c{i}", name="search_1", arguments="{}") for i in range(3)]
+        agent = self._agent({"c0": 0.3, "c1": 0.1, "c2": 0.0})
+
+        started = time.monotonic()
+        events, messages = self._run(handler, agent, calls)
+
+        assert time.monotonic() - started < 0.55
+        completed = [e["data"]["call_id"] for e in events if e["data"]["status"] == "completed"]
+        assert completed == ["c2", "c1", "c0"]
+        tool_messages = [m["content"] for m in messages if m["role"] == "tool"]
+        assert tool_messages == ["r-c0", "r-c1", "r-c2"]
+        assert [m["role"] for m in messages] == ["assistant", "tool"] * 3
+        assert [t["call_id"] for t in agent.tool_calls] == ["c0", "c1", "c2"]
+
+    @patch(
+        "application.agents.tools.tool_manager.ToolManager.get_tool_class",
+        return_value=ParallelTool,
+    )
+    @patch("application.llm.handlers.base.settings")
+    def test_timed_out_call_reports_error(self, mock_settings, _):
+        mock_settings.ENABLE_PARALLEL_TOOL_CALLS = True
+        mock_settings.TOOL_CALL_MAX_WORKERS = 4
+        mock_settings.TOOL_CALL_TIMEOUT_SECONDS = 0.2
+        handler = ConcreteHandler()
+        calls = [ToolCall(id=f"c{i}", name="search_1", arguments="{}") for i in range(2)]
+        release = {"c1": threading.Event()}
+        agent = self._agent({}, release=release)
+
+        events, messages = self._run(handler, agent, calls)
+        release["c1"].set()
+        time.sleep(0.1)
+
+        assert events[-1]["data"]["status"] == "error"
+        assert events[-1]["data"]["call_id"] == "c1"
+        assert messages[1]["content"] == "r-c0"
+        assert "timed out" in messages[2]["content"]
+        # The call finishing after its timeout is not recorded as completed
+        assert [t["call_id"] for t in agent.tool_calls] == ["c0"]
+
+    @patch(
+        "application.agents.tools.tool_manager.ToolManager.get_tool_class",
+        return_value=Mock(parallel_safe=False),
+    )
+    def test_unsafe_tools_run_sequentially(self, _):
+        handler = ConcreteHandler()
+        calls = [ToolCall(id=f"c{i}", name="search_1", arguments="{}") for i in range(2)]
+        agent = self._agent({})
+
+        events, messages = self._run(handler, agent, calls)
+
+        assert [e["data"]["call_id"] for e in events] == ["c0", "c0", "c1", "c1"]
+        assert [m["content"] for m in messages if m["role"] == "tool"] == ["r-c0", "r-c1"]
@@ -185,3 +185,37 @@ def test_prepare_messages_with_attachments_image_and_pdf(openai_llm, monkeypatch
         isinstance(p, dict) and p.get("file", {}).get("file_id") == "file_xyz"
         for p in user_msg["content"]
     )
+
+
+@pytest.mark.unit
+def test_raw_gen_captures_reported_usage(openai_llm, monkeypatch):
+    completions = openai_llm.client.chat.completions
+    original_create = completions.create
+
+    def create_with_usage(**kwargs):
+        response = original_create(**kwargs)
+        response.usage = types.SimpleNamespace(prompt_tokens=12, completion_tokens=3)
+        return response
+
+    monkeypatch.setattr(completions, "create", create_with_usage)
+    openai_llm._raw_gen(
+        openai_llm, model="gpt", messages=[{"role": "user", "content": "hi"}]
+    )
+
+    assert openai_llm._pop_reported_usage() == {
+        "prompt_tokens": 12,
+        "generated_tokens": 3,
+    }
+    assert openai_llm._pop_reported_usage() is None
+
+
+@pytest.mark.unit
+def test_raw_gen_stream_requests_usage_from_openai(openai_llm):
+    list(
+        openai_llm._raw_gen_stream(
+            openai_llm, model="gpt", messages=[{"role": "user", "content": "hi"}]
+        )
+    )
+
+    passed = openai_llm.client.chat.completions.last_kwargs
+    assert passed["stream_options"] == {"include_usage": True}
@@ -0,0 +1,117 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from application.parser.file.archive import ArchiveLimitError, extract_zip
+
+
+def make_zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestExtractZip:
+
+    def test_extracts_only_required_extensions(self, tmp_path):
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(
+            make_zip(
+                {
+                    "guide/a.md": "# A",
+                    "guide/b.bin": "binary",
+                    ".hidden/c.md": "hidden",
+                    "guide/.d.md": "hidden",
+                }
+            )
+        )
+        out = tmp_path / "out"
+
+        extracted = extract_zip(str(zip_path), str(out), required_exts=[".md"])
+
+        assert extracted == [str(out / "guide" / "a.md")]
+        assert (out / "guide" / "a.md").read_text() == "# A"
+        assert not (out / "guide" / "b.bin").exists()
+        assert not (out / ".hidden").exists()
+        assert not zip_path.exists()
+
+    def test_nested_archives_extract_next_to_their_entry(self, tmp_path):
+        inner = make_zip({"b.md": "# B", "deeper.zip": make_zip({"c.md": "# C"})})
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({"a.md": "# A", "sub/inner.zip": inner}))
+        out = tmp_path / "out"
+
+        extracted = extract_zip(
+            str(zip_path), str(out), required_exts=[".md"], max_depth=1
+        )
+
+        assert sorted(extracted) == [str(out / "a.md"), str(out / "sub" / "b.md")]
+        # Depth 2 is beyond the limit and no temporary archives are left behind
+        assert sorted(os.listdir(out / "sub")) == ["b.md"]
+
+    def test_unsafe_paths_stay_inside_target(self, tmp_path):
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({"../../evil.md": "x", "/abs.md": "y"}))
+        out = tmp_path / "out"
+
+        extracted = extract_zip(str(zip_path), str(out), required_exts=[".md"])
+
+        assert sorted(extracted) == [str(out / "abs.md"), str(out / "evil.md")]
+        assert not (tmp_path / "evil.md").exists()
+
+    def test_entry_limit(self, tmp_path):
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({f"{i}.md": "x" for i in range(5)}))
+
+        with pytest.raises(ArchiveLimitError):
+            extract_zip(str(zip_path), str(tmp_path / "out"), max_entries=4)
+
+    def test_byte_limit_counts_nested_archives(self, tmp_path):
+        inner = make_zip({"big.md": "x" * 10000})
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({"inner.zip": inner}))
+
+        with pytest.raises(ArchiveLimitError):
+            extract_zip(
+                str(zip_path), str(tmp_path / "out"), max_total_bytes=len(inner) + 100
+            )
+
+    def test_skipped_entries_do_not_count(self, tmp_path):
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({"a.md": "x", "big.bin": "y" * 10000}))
+
+        extracted = extract_zip(
+            str(zip_path),
+            str(tmp_path / "out"),
+            required_exts=[".md"],
+            max_total_bytes=100,
+            max_entries=1,
+        )
+
+        assert len(extracted) == 1
+
+    def test_existing_links_are_replaced_not_written_through(self, tmp_path):
+        original = tmp_path / "stored.md"
+        original.write_text("stored")
+        out = tmp_path / "out"
+        out.mkdir()
+        os.link(original, out / "a.md")
+        zip_path = tmp_path / "docs.zip"
+        zip_path.write_bytes(make_zip({"a.md": "from zip"}))
+
+        extract_zip(str(zip_path), str(out))
+
+        assert (out / "a.md").read_text() == "from zip"
+        assert original.read_text() == "stored"
+
+    def test_invalid_archive_is_logged_and_kept(self, tmp_path):
+        zip_path = tmp_path / "broken.zip"
+        zip_path.write_bytes(b"not a zip")
+
+        assert extract_zip(str(zip_path), str(tmp_path)) == []
+        assert zip_path.exists()
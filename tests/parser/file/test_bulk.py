@@ -0,0 +1,30 @@
+import zipfile
+
+import pytest
+
+from application.parser.file.archive import extract_zip
+from application.parser.file.bulk import SimpleDirectoryReader
+
+
+@pytest.mark.unit
+class TestSimpleDirectoryReaderListedFiles:
+
+    def test_reads_only_listed_files_relative_to_input_dir(self, tmp_path):
+        zip_path = tmp_path / "docs.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("guide/a.md", "# A")
+            zf.writestr("b.md", "# B")
+        extracted = extract_zip(str(zip_path), str(tmp_path), required_exts=[".md"])
+        (tmp_path / "unlisted.md").write_text("# Not extracted")
+
+        reader = SimpleDirectoryReader(
+            input_dir=str(tmp_path),
+            input_files=sorted(extracted),
+            file_metadata=lambda name: {},
+        )
+        docs = reader.load_data()
+
+        assert sorted(doc.extra_info["source"] for doc in docs) == ["b.md", "guide/a.md"]
+        assert set(reader.directory_structure) == {"b.md", "guide"}
+        assert reader.directory_structure["guide"]["a.md"]["type"] == "text/markdown"
+        assert reader.directory_structure["guide"]["a.md"]["token_count"] > 0
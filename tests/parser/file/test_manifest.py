@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from application.parser.file.manifest import (
+    flatten_directory_structure,
+    is_ingestible,
+    manifest_by_path,
+    manifest_entry,
+    metadata_unchanged,
+    remove_file_entry,
+    set_file_entry,
+    sha256_file,
+    total_token_count,
+)
+
+
+@pytest.mark.unit
+class TestManifestMetadata:
+
+    def test_entry_keeps_known_metadata_only(self):
+        entry = manifest_entry("a.md", {"size": 3, "mtime": None, "etag": "x"}, "abc")
+        assert entry == {"path": "a.md", "size": 3, "etag": "x", "sha256": "abc"}
+
+    def test_manifest_by_path(self):
+        manifest = [{"path": "a.md", "size": 1}, {"size": 2}]
+        assert manifest_by_path(manifest) == {"a.md": {"path": "a.md", "size": 1}}
+        assert manifest_by_path(None) == {}
+
+    def test_unchanged_when_size_and_etag_match(self):
+        entry = {"path": "a.md", "size": 3, "etag": "x", "mtime": 1.0}
+        assert metadata_unchanged(entry, {"size": 3, "etag": "x", "mtime": 2.0})
+
+    def test_changed_when_etag_differs(self):
+        entry = {"path": "a.md", "size": 3, "etag": "x"}
+        assert not metadata_unchanged(entry, {"size": 3, "etag": "y"})
+
+    def test_falls_back_to_mtime(self):
+        entry = {"path": "a.md", "size": 3, "mtime": 1.0}
+        assert metadata_unchanged(entry, {"size": 3, "mtime": 1.0})
+        assert not metadata_unchanged(entry, {"size": 3, "mtime": 2.0})
+
+    def test_size_change_or_unknown_metadata_counts_as_changed(self):
+        entry = {"path": "a.md", "size": 3, "mtime": 1.0}
+        assert not metadata_unchanged(entry, {"size": 4, "mtime": 1.0})
+        assert not metadata_unchanged(entry, {"size": 3})
+        assert not metadata_unchanged({"path": "a.md"}, {})
+
+    def test_is_ingestible(self):
+        extensions = [".md", ".txt"]
+        assert is_ingestible("docs/a.md", extensions)
+        assert not is_ingestible("docs/a.py", extensions)
+        assert not is_ingestible(".git/a.md", extensions)
+        assert not is_ingestible("docs/.hidden.md", extensions)
+
+    def test_sha256_file(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"hello")
+        assert sha256_file(str(path)) == (
+            "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+        )
+
+
+@pytest.mark.unit
+class TestDirectoryStructure:
+
+    def test_set_remove_and_count(self, tmp_path):
+        local_file = tmp_path / "a.md"
+        local_file.write_text("hello")
+        structure = {"top.md": {"type": "text/markdown", "size_bytes": 1, "token_count": 4}}
+
+        set_file_entry(structure, os.path.join("docs", "guide", "a.md"), str(local_file), 7)
+
+        assert flatten_directory_structure(structure) == {
+            "top.md",
+            os.path.join("docs", "guide", "a.md"),
+        }
+        assert structure["docs"]["guide"]["a.md"]["size_bytes"] == 5
+        assert total_token_count(structure) == 11
+
+        remove_file_entry(structure, os.path.join("docs", "guide", "a.md"))
+
+        assert "docs" not in structure
+        assert total_token_count(structure) == 4
+
+    def test_remove_missing_file_is_noop(self):
+        structure = {"docs": {"a.md": {"type": "text/markdown", "size_bytes": 1}}}
+        remove_file_entry(structure, os.path.join("other", "b.md"))
+        assert flatten_directory_structure(structure) == {os.path.join("docs", "a.md")}
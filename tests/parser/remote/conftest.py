@@ -0,0 +1,65 @@
+"""Fakes shared by the remote loader tests."""
+
+import httpx
+import pytest
+
+from application.parser.remote.async_crawler import AsyncCrawler
+
+
+class DictPageCache:
+    """In-memory stand-in for ``PageCache`` that keeps bodies alongside validators."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def set(self, url, response, lastmod=None):
+        self.entries[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "lastmod": lastmod,
+            "final_url": str(response.url),
+            "content_type": response.headers.get("Content-Type", ""),
+            "text": response.text,
+        }
+
+    def update(self, url, entry):
+        self.entries[url] = dict(entry)
+
+
+@pytest.fixture
+def page_cache():
+    return DictPageCache()
+
+
+@pytest.fixture
+def make_crawler(page_cache):
+    """Build an ``AsyncCrawler`` over a MockTransport serving ``pages``.
+
+    ``pages`` maps URLs to HTML, or to ``(body, content_type)`` pairs; any
+    other URL is a 404 and robots.txt is always missing. Requested URLs other
+    than robots.txt are appended to ``requests``. Crawlers built in one test
+    share ``page_cache``.
+    """
+
+    def factory(pages, requests=None):
+        def handler(request):
+            url = str(request.url)
+            if url.endswith("/robots.txt"):
+                return httpx.Response(404)
+            if requests is not None:
+                requests.append(url)
+            if url not in pages:
+                return httpx.Response(404)
+            body = pages[url]
+            if isinstance(body, tuple):
+                body, content_type = body
+            else:
+                content_type = "text/html; charset=utf-8"
+            return httpx.Response(200, text=body, headers={"Content-Type": content_type})
+
+        return AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+
+    return factory
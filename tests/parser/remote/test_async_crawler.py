@@ -0,0 +1,167 @@
+import asyncio
+import time
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from application.parser.remote.async_crawler import AsyncCrawler, PageCache
+from application.parser.remote.disk_cache import DiskCache
+
+
+def html(text, **headers):
+    return httpx.Response(200, text=text, headers={"Content-Type": "text/html", **headers})
+
+
+def test_robots_disallow_is_respected(page_cache):
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\n")
+        return html("ok")
+
+    crawler = AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+    pages = crawler.fetch_all(
+        ["http://example.com/public", "http://example.com/private/page"]
+    )
+
+    assert pages[0].text == "ok"
+    assert pages[1] is None
+    assert "/private/page" not in requested
+    assert requested.count("/robots.txt") == 1
+
+
+def test_crawl_delay_spaces_requests(monkeypatch, page_cache):
+    times = []
+    delays = []
+    original_crawl_delay = RobotFileParser.crawl_delay
+
+    def crawl_delay(self, useragent):
+        delays.append(original_crawl_delay(self, useragent))
+        return 0.1
+
+    monkeypatch.setattr(RobotFileParser, "crawl_delay", crawl_delay)
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nCrawl-delay: 0.5\n")
+        times.append(time.monotonic())
+        return html("ok")
+
+    crawler = AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+    crawler.fetch_all([f"http://example.com/{i}" for i in range(3)])
+
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert len(times) == 3
+    assert all(gap >= 0.09 for gap in gaps)
+    # Fractional delays are rounded up rather than ignored
+    assert delays == [1]
+
+
+def test_per_host_concurrency_is_limited(page_cache):
+    active = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return html("ok")
+
+    crawler = AsyncCrawler(
+        max_per_host=2, cache=page_cache, transport=httpx.MockTransport(handler)
+    )
+    pages = crawler.fetch_all([f"http://example.com/{i}" for i in range(6)])
+
+    assert all(page is not None for page in pages)
+    assert active["peak"] == 2
+
+
+def test_conditional_get_reuses_cached_body(page_cache):
+    seen_headers = []
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return html("fresh", ETag='"v1"')
+
+    crawler = AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+
+    first = crawler.fetch_all(["http://example.com/page"])[0]
+    second = crawler.fetch_all(["http://example.com/page"])[0]
+
+    assert seen_headers == [None, '"v1"']
+    assert first.text == second.text == "fresh"
+    assert not first.not_modified
+    assert second.not_modified
+
+
+def test_non_text_responses_are_skipped(page_cache):
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        return httpx.Response(
+            200, content=b"%PDF", headers={"Content-Type": "application/pdf"}
+        )
+
+    crawler = AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+
+    assert crawler.fetch_all(["http://example.com/file.pdf"]) == [None]
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def test_page_cache_keeps_bodies_out_of_redis(tmp_path, monkeypatch):
+    redis = DictRedis()
+    monkeypatch.setattr(
+        "application.parser.remote.async_crawler.get_redis_instance", lambda: redis
+    )
+    cache = PageCache(60, DiskCache(str(tmp_path), max_bytes=1024 * 1024))
+    response = httpx.Response(
+        200,
+        text="page body",
+        headers={"ETag": '"v1"', "Content-Type": "text/html"},
+        request=httpx.Request("GET", "http://example.com/page"),
+    )
+
+    cache.set("http://example.com/page", response)
+
+    [stored] = redis.data.values()
+    assert "page body" not in stored
+    entry = cache.get("http://example.com/page")
+    assert entry["etag"] == '"v1"'
+    assert entry["text"] == "page body"
+
+
+def test_page_cache_stores_nothing_without_body_cache(monkeypatch):
+    redis = DictRedis()
+    monkeypatch.setattr(
+        "application.parser.remote.async_crawler.get_redis_instance", lambda: redis
+    )
+    cache = PageCache(60)
+    response = httpx.Response(
+        200,
+        text="page body",
+        headers={"ETag": '"v1"'},
+        request=httpx.Request("GET", "http://example.com/page"),
+    )
+
+    cache.set("http://example.com/page", response)
+
+    assert redis.data == {}
+    assert cache.get("http://example.com/page") is None
@@ -1,167 +1,108 @@
-from unittest.mock import MagicMock, patch
+import pytest
 
 from application.parser.remote.crawler_loader import CrawlerLoader
 from application.parser.schema.base import Document
-from langchain.docstore.document import Document as LCDocument
 
 
-class DummyResponse:
-    def __init__(self, text: str) -> None:
-        self.text = text
+@pytest.fixture
+def make_loader(make_crawler):
+    def factory(pages, limit=10, requests=None):
+        return CrawlerLoader(limit=limit, crawler=make_crawler(pages, requests))
 
-    def raise_for_status(self) -> None:
-        return None
+    return factory
 
 
-@patch("application.parser.remote.crawler_loader.requests.get")
-def test_load_data_crawls_same_domain_links(mock_requests_get):
-    responses = {
-        "http://example.com": DummyResponse(
-            """
-            <html>
+def test_load_data_crawls_same_domain_links(make_loader):
+    requests = []
+    loader = make_loader(
+        {
+            "http://example.com": """
+                <html lang="en"><head><title>Home</title></head>
                 <body>
+                    Root content
                     <a href='/about'>About</a>
+                    <a href='/about#team'>Team</a>
                     <a href='https://external.com/news'>External</a>
-                </body>
-            </html>
-            """
-        ),
-        "http://example.com/about": DummyResponse("<html><body>About page</body></html>"),
-    }
+                </body></html>
+            """,
+            "http://example.com/about": "<html><body>About content</body></html>",
+        },
+        requests=requests,
+    )
 
-    def response_side_effect(url: str):
-        if url not in responses:
-            raise AssertionError(f"Unexpected request for URL: {url}")
-        return responses[url]
+    result = loader.load_data("http://example.com")
 
-    mock_requests_get.side_effect = response_side_effect
-
-    root_doc = MagicMock(spec=LCDocument)
-    root_doc.page_content = "Root content"
-    root_doc.metadata = {"source": "http://example.com"}
-
-    about_doc = MagicMock(spec=LCDocument)
-    about_doc.page_content = "About content"
-    about_doc.metadata = {"source": "http://example.com/about"}
-
-    loader_instances = {
-        "http://example.com": MagicMock(),
-        "http://example.com/about": MagicMock(),
-    }
-    loader_instances["http://example.com"].load.return_value = [root_doc]
-    loader_instances["http://example.com/about"].load.return_value = [about_doc]
-
-    loader_call_order = []
-
-    def loader_factory(url_list):
-        url = url_list[0]
-        loader_call_order.append(url)
-        return loader_instances[url]
-
-    crawler = CrawlerLoader(limit=5)
-    crawler.loader = MagicMock(side_effect=loader_factory)
-
-    result = crawler.load_data("http://example.com")
-
-    assert len(result) == 2
     assert all(isinstance(doc, Document) for doc in result)
+    assert [doc.extra_info["source"] for doc in result] == [
+        "http://example.com",
+        "http://example.com/about",
+    ]
+    assert "Root content" in result[0].text
+    assert "About content" in result[1].text
+    assert result[0].extra_info["title"] == "Home"
+    assert result[0].extra_info["language"] == "en"
+    # Each page is requested exactly once and external links are not followed
+    assert sorted(requests) == ["http://example.com", "http://example.com/about"]
 
-    sources = {doc.extra_info.get("source") for doc in result}
-    assert sources == {"http://example.com", "http://example.com/about"}
-
-    texts = {doc.text for doc in result}
-    assert texts == {"Root content", "About content"}
-
-    assert mock_requests_get.call_count == 2
-    assert loader_call_order == ["http://example.com", "http://example.com/about"]
-
-
-@patch("application.parser.remote.crawler_loader.requests.get")
-def test_load_data_accepts_list_input_and_adds_scheme(mock_requests_get):
-    mock_requests_get.return_value = DummyResponse("<html><body>No links here</body></html>")
-
-    doc = MagicMock(spec=LCDocument)
-    doc.page_content = "Homepage"
-    doc.metadata = {"source": "http://example.com"}
-
-    loader_instance = MagicMock()
-    loader_instance.load.return_value = [doc]
-
-    crawler = CrawlerLoader()
-    crawler.loader = MagicMock(return_value=loader_instance)
 
-    result = crawler.load_data(["example.com", "unused.com"])
+def test_load_data_accepts_list_input_and_adds_scheme(make_loader):
+    loader = make_loader({"http://example.com": "<html><body>Homepage</body></html>"})
 
-    mock_requests_get.assert_called_once_with("http://example.com")
-    crawler.loader.assert_called_once_with(["http://example.com"])
+    result = loader.load_data(["example.com", "unused.com"])
 
     assert len(result) == 1
-    assert result[0].text == "Homepage"
-    assert result[0].extra_info == {"source": "http://example.com"}
+    assert result[0].text.strip() == "Homepage"
+    assert result[0].extra_info["source"] == "http://example.com"
 
 
-@patch("application.parser.remote.crawler_loader.requests.get")
-def test_load_data_respects_limit(mock_requests_get):
-    responses = {
-        "http://example.com": DummyResponse(
-            """
-            <html>
-                <body>
-                    <a href='/about'>About</a>
-                </body>
-            </html>
-            """
-        ),
-        "http://example.com/about": DummyResponse("<html><body>About</body></html>"),
-    }
-
-    mock_requests_get.side_effect = lambda url: responses[url]
-
-    root_doc = MagicMock(spec=LCDocument)
-    root_doc.page_content = "Root content"
-    root_doc.metadata = {"source": "http://example.com"}
+def test_load_data_respects_limit(make_loader):
+    requests = []
+    loader = make_loader(
+        {
+            "http://example.com": "<html><body><a href='/about'>About</a></body></html>",
+            "http://example.com/about": "<html><body>About</body></html>",
+        },
+        limit=1,
+        requests=requests,
+    )
 
-    about_doc = MagicMock(spec=LCDocument)
-    about_doc.page_content = "About content"
-    about_doc.metadata = {"source": "http://example.com/about"}
-
-    loader_instances = {
-        "http://example.com": MagicMock(),
-        "http://example.com/about": MagicMock(),
-    }
-    loader_instances["http://example.com"].load.return_value = [root_doc]
-    loader_instances["http://example.com/about"].load.return_value = [about_doc]
-
-    crawler = CrawlerLoader(limit=1)
-    crawler.loader = MagicMock(side_effect=lambda url_list: loader_instances[url_list[0]])
-
-    result = crawler.load_data("http://example.com")
+    result = loader.load_data("http://example.com")
 
     assert len(result) == 1
-    assert result[0].text == "Root content"
-    assert mock_requests_get.call_count == 1
-    assert crawler.loader.call_count == 1
-
-
-@patch("application.parser.remote.crawler_loader.logging")
-@patch("application.parser.remote.crawler_loader.requests.get")
-def test_load_data_logs_and_skips_on_loader_error(mock_requests_get, mock_logging):
-    mock_requests_get.return_value = DummyResponse("<html><body>Error route</body></html>")
-
-    failing_loader_instance = MagicMock()
-    failing_loader_instance.load.side_effect = Exception("load failure")
-
-    crawler = CrawlerLoader()
-    crawler.loader = MagicMock(return_value=failing_loader_instance)
-
-    result = crawler.load_data("http://example.com")
-
-    assert result == []
-    mock_requests_get.assert_called_once_with("http://example.com")
-    failing_loader_instance.load.assert_called_once()
-
-    mock_logging.error.assert_called_once()
-    message, = mock_logging.error.call_args.args
-    assert "Error processing URL http://example.com" in message
-    assert mock_logging.error.call_args.kwargs.get("exc_info") is True
-
+    assert "http://example.com/about" not in requests
+
+
+def test_load_data_order_is_breadth_first(make_loader):
+    loader = make_loader(
+        {
+            "http://example.com": "<a href='/b'>b</a><a href='/a'>a</a>",
+            "http://example.com/b": "<a href='/b/deep'>deep</a>",
+            "http://example.com/a": "<a href='/a/deep'>deep</a>",
+            "http://example.com/b/deep": "b deep",
+            "http://example.com/a/deep": "a deep",
+        }
+    )
+
+    result = loader.load_data("http://example.com")
+
+    assert [doc.extra_info["source"] for doc in result] == [
+        "http://example.com",
+        "http://example.com/b",
+        "http://example.com/a",
+        "http://example.com/b/deep",
+        "http://example.com/a/deep",
+    ]
+
+
+def test_load_data_skips_failed_pages(make_loader):
+    loader = make_loader(
+        {"http://example.com": "<a href='/missing'>missing</a><a href='/ok'>ok</a>",
+         "http://example.com/ok": "fine"}
+    )
+
+    result = loader.load_data("http://example.com")
+
+    assert [doc.extra_info["source"] for doc in result] == [
+        "http://example.com",
+        "http://example.com/ok",
+    ]
@@ -0,0 +1,59 @@
+import os
+
+from application.parser.remote import disk_cache
+from application.parser.remote.disk_cache import DiskCache, get_remote_cache
+from application.storage.directory_lru import TEMP_PREFIX
+
+
+def test_set_and_get_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+    cache.set("https://example.com/a", b"hello")
+
+    assert cache.get("https://example.com/a") == b"hello"
+    assert cache.get("https://example.com/b") is None
+    assert not [
+        name
+        for _, _, files in os.walk(tmp_path)
+        for name in files
+        if name.startswith(TEMP_PREFIX)
+    ]
+
+
+def test_overwrite_keeps_tracked_size(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+    cache.set("key", b"x" * 100)
+    cache.set("key", b"y" * 10)
+
+    assert cache.get("key") == b"y" * 10
+    assert cache.lru.total_bytes == 10
+
+
+def test_evicts_least_recently_used_without_scanning_every_write(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=250)
+    scans = []
+    entries = cache.lru.entries
+    monkeypatch.setattr(cache.lru, "entries", lambda: scans.append(1) or entries())
+
+    cache.set("old", b"a" * 100)
+    cache.set("recent", b"b" * 100)
+    os.utime(cache._path("old"), (1, 1))
+    assert len(scans) == 1
+
+    cache.set("new", b"c" * 100)
+
+    assert len(scans) == 2
+    assert cache.get("old") is None
+    assert cache.get("recent") == b"b" * 100
+    assert cache.get("new") == b"c" * 100
+    assert cache.lru.total_bytes == 200
+
+
+def test_remote_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache.settings, "REMOTE_CACHE_DIR", None)
+    assert get_remote_cache() is None
+
+    monkeypatch.setattr(disk_cache.settings, "REMOTE_CACHE_DIR", str(tmp_path))
+    assert get_remote_cache() is get_remote_cache()
+    assert get_remote_cache().directory == str(tmp_path)
@@ -1,9 +1,13 @@
 import base64
+import io
+import tarfile
 import pytest
 from unittest.mock import patch, MagicMock
 import requests
 
-from application.parser.remote.github_loader import GitHubLoader
+from application.parser.remote import github_loader
+from application.parser.remote.disk_cache import DiskCache
+from application.parser.remote.github_loader import GitHubLoader, RepoCache, git_blob_sha
 
 
 def make_response(json_data=None, status_code=200, raise_error=None):
@@ -87,7 +91,7 @@ class TestGitHubLoaderFetchRepoFiles:
 
 class TestGitHubLoaderLoadData:
     def test_load_data_builds_documents_from_files(self, monkeypatch):
-        loader = GitHubLoader()
+        loader = GitHubLoader(use_archive=False)
 
         # Stub out network-dependent methods
         monkeypatch.setattr(loader, "fetch_repo_files", lambda repo, path="": [
@@ -158,3 +162,172 @@ class TestGitHubLoaderRobustness:
         mock_get.return_value = make_response({"encoding": "base64", "content": "AAA"})
         result = GitHubLoader().fetch_file_content("owner/repo", "bigfile.bin")
         assert result is None
+
+
+class DictCache:
+    def __init__(self):
+        self.blobs = {}
+        self.trees = {}
+
+    def get_blob(self, sha):
+        return self.blobs.get(sha)
+
+    def set_blob(self, sha, text):
+        self.blobs[sha] = text
+
+    def get_tree(self, repo_name):
+        return self.trees.get(repo_name)
+
+    def set_tree(self, repo_name, commit_sha, files):
+        self.trees[repo_name] = {"commit": commit_sha, "files": dict(files)}
+
+
+def make_tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"owner-repo-abc123/{path}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class FakeGitHub:
+    """Serves the API endpoints the archive mode uses for one repository."""
+
+    def __init__(self, files, commit="c1", truncated=False):
+        self.files = files
+        self.commit = commit
+        self.truncated = truncated
+        self.requests = []
+
+    def __call__(self, url, headers=None, stream=False):
+        self.requests.append(url)
+        base = "https://api.github.com/repos/owner/repo"
+        if url == base:
+            return make_response({"default_branch": "dev"})
+        if url == f"{base}/commits/dev":
+            return make_response({"sha": self.commit})
+        if url == f"{base}/git/trees/{self.commit}?recursive=1":
+            tree = [
+                {"path": path, "type": "blob", "mode": "100644",
+                 "sha": git_blob_sha(data), "size": len(data)}
+                for path, data in self.files.items()
+            ]
+            return make_response({"tree": tree, "truncated": self.truncated})
+        if url.startswith(f"{base}/git/blobs/"):
+            sha = url.rsplit("/", 1)[-1]
+            data = next(d for d in self.files.values() if git_blob_sha(d) == sha)
+            return make_response({"encoding": "base64", "content": base64.b64encode(data).decode()})
+        if url == f"{base}/tarball/{self.commit}":
+            assert stream
+            resp = make_response()
+            resp.raw = io.BytesIO(make_tarball(self.files))
+            return resp
+        raise AssertionError(f"Unexpected URL: {url}")
+
+
+class TestGitHubLoaderArchive:
+    FILES = {
+        "README.md": b"# Readme",
+        "src/main.py": b"print('hi')",
+        "logo.png": b"\x89PNG",
+        "empty.txt": b"",
+    }
+
+    def test_git_blob_sha_matches_git(self):
+        assert git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+    def test_first_load_streams_tarball(self, monkeypatch):
+        monkeypatch.setattr(github_loader, "MAX_BLOB_REQUESTS", 0)
+        github = FakeGitHub(self.FILES)
+        loader = GitHubLoader(cache=DictCache())
+
+        with patch("application.parser.remote.github_loader.requests.get", side_effect=github):
+            docs = loader.load_data("https://github.com/owner/repo")
+
+        assert [doc.doc_id for doc in docs] == ["README.md", "src/main.py"]
+        assert docs[0].text == "# Readme"
+        assert docs[0].extra_info == {
+            "title": "README.md",
+            "source": "https://github.com/owner/repo/blob/dev/README.md",
+        }
+        assert len(github.requests) == 4
+        assert not any("/contents/" in url or "/git/blobs/" in url for url in github.requests)
+
+    def test_resync_of_same_commit_downloads_nothing(self, monkeypatch):
+        monkeypatch.setattr(github_loader, "MAX_BLOB_REQUESTS", 0)
+        cache = DictCache()
+        github = FakeGitHub(self.FILES)
+        with patch("application.parser.remote.github_loader.requests.get", side_effect=github):
+            first = GitHubLoader(cache=cache).load_data("https://github.com/owner/repo")
+            github.requests.clear()
+            second = GitHubLoader(cache=cache).load_data("https://github.com/owner/repo")
+
+        assert [doc.text for doc in second] == [doc.text for doc in first]
+        assert github.requests == [
+            "https://api.github.com/repos/owner/repo",
+            "https://api.github.com/repos/owner/repo/commits/dev",
+        ]
+
+    def test_resync_fetches_only_changed_files(self):
+        cache = DictCache()
+        github = FakeGitHub(self.FILES)
+        with patch("application.parser.remote.github_loader.requests.get", side_effect=github):
+            GitHubLoader(cache=cache).load_data("https://github.com/owner/repo")
+            github.files = {**self.FILES, "src/main.py": b"print('bye')"}
+            github.commit = "c2"
+            github.requests.clear()
+            docs = GitHubLoader(cache=cache).load_data("https://github.com/owner/repo")
+
+        changed_sha = git_blob_sha(b"print('bye')")
+        assert docs[1].text == "print('bye')"
+        assert [url for url in github.requests if "/git/blobs/" in url] == [
+            f"https://api.github.com/repos/owner/repo/git/blobs/{changed_sha}"
+        ]
+        assert not any("/tarball/" in url for url in github.requests)
+
+    def test_truncated_tree_reads_everything_from_tarball(self):
+        cache = DictCache()
+        github = FakeGitHub(self.FILES, truncated=True)
+        with patch("application.parser.remote.github_loader.requests.get", side_effect=github):
+            docs = GitHubLoader(cache=cache).load_data("https://github.com/owner/repo")
+
+        assert [doc.doc_id for doc in docs] == ["README.md", "src/main.py"]
+        assert cache.blobs[git_blob_sha(b"# Readme")] == "# Readme"
+        assert "logo.png" not in cache.trees["owner/repo"]["files"]
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class TestRepoCache:
+    def test_file_texts_go_to_disk_and_only_the_tree_to_redis(self, tmp_path, monkeypatch):
+        redis = DictRedis()
+        monkeypatch.setattr(github_loader, "get_redis_instance", lambda: redis)
+        cache = RepoCache(60, DiskCache(str(tmp_path), max_bytes=1024 * 1024))
+
+        cache.set_blob("abc", "file text")
+        cache.set_tree("owner/repo", "c1", {"README.md": "abc"})
+
+        assert cache.get_blob("abc") == "file text"
+        assert cache.get_tree("owner/repo") == {"commit": "c1", "files": {"README.md": "abc"}}
+        assert list(redis.data) == ["github_cache:tree:owner/repo"]
+
+    def test_file_texts_are_not_kept_without_a_disk_cache(self, monkeypatch):
+        redis = DictRedis()
+        monkeypatch.setattr(github_loader, "get_redis_instance", lambda: redis)
+        cache = RepoCache(60)
+
+        cache.set_blob("abc", "file text")
+
+        assert cache.get_blob("abc") is None
+        assert redis.data == {}
@@ -0,0 +1,168 @@
+import httpx
+import pytest
+
+from application.parser.remote.async_crawler import AsyncCrawler
+from application.parser.remote.sitemap_loader import SitemapLoader
+from application.parser.schema.base import Document
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+@pytest.fixture
+def make_loader(make_crawler):
+    def factory(pages, limit=20, requests=None):
+        return SitemapLoader(limit=limit, crawler=make_crawler(pages, requests))
+
+    return factory
+
+
+def page(text):
+    return (f"<html><head><title>{text}</title></head><body>{text}</body></html>", "text/html")
+
+
+def test_load_data_reads_urls_and_nested_sitemaps(make_loader):
+    loader = make_loader(
+        {
+            "http://example.com/sitemap.xml": (
+                f"""<?xml version="1.0" encoding="UTF-8"?>
+                <sitemapindex {NS}>
+                    <sitemap><loc>http://example.com/nested.xml</loc></sitemap>
+                </sitemapindex>""",
+                "application/xml",
+            ),
+            "http://example.com/nested.xml": (
+                f"""<urlset {NS}>
+                    <url><loc>http://example.com/a</loc><lastmod>2024-01-01</lastmod></url>
+                    <url><loc>http://example.com/b</loc></url>
+                </urlset>""",
+                "application/xml",
+            ),
+            "http://example.com/a": page("A"),
+            "http://example.com/b": page("B"),
+        }
+    )
+
+    result = loader.load_data(["http://example.com/sitemap.xml"])
+
+    assert all(isinstance(doc, Document) for doc in result)
+    assert [doc.extra_info["source"] for doc in result] == [
+        "http://example.com/a",
+        "http://example.com/b",
+    ]
+    assert result[0].extra_info["title"] == "A"
+    assert result[0].extra_info["lastmod"] == "2024-01-01"
+    assert "lastmod" not in result[1].extra_info
+
+
+def test_load_data_treats_plain_page_as_single_url(make_loader):
+    loader = make_loader({"http://example.com/page": page("Page")})
+
+    result = loader.load_data("http://example.com/page")
+
+    assert [doc.extra_info["source"] for doc in result] == ["http://example.com/page"]
+
+
+def test_limit_skips_failed_pages(make_loader):
+    urls = "".join(
+        f"<url><loc>http://example.com/{name}</loc></url>" for name in ("a", "missing", "b", "c")
+    )
+    loader = make_loader(
+        {
+            "http://example.com/sitemap.xml": (f"<urlset {NS}>{urls}</urlset>", "text/xml"),
+            "http://example.com/a": page("A"),
+            "http://example.com/b": page("B"),
+            "http://example.com/c": page("C"),
+        },
+        limit=2,
+    )
+
+    result = loader.load_data("http://example.com/sitemap.xml")
+
+    assert [doc.extra_info["source"] for doc in result] == [
+        "http://example.com/a",
+        "http://example.com/b",
+    ]
+
+
+def test_unchanged_lastmod_skips_refetch(make_loader):
+    sitemap = (
+        f"<urlset {NS}>"
+        "<url><loc>http://example.com/a</loc><lastmod>2024-01-01</lastmod></url>"
+        "<url><loc>http://example.com/b</loc><lastmod>2024-01-01</lastmod></url>"
+        "</urlset>"
+    )
+    responses = {
+        "http://example.com/sitemap.xml": (sitemap, "application/xml"),
+        "http://example.com/a": page("A"),
+        "http://example.com/b": page("B"),
+    }
+    make_loader(responses).load_data("http://example.com/sitemap.xml")
+
+    responses["http://example.com/sitemap.xml"] = (
+        sitemap.replace(
+            "<loc>http://example.com/b</loc><lastmod>2024-01-01",
+            "<loc>http://example.com/b</loc><lastmod>2024-02-01",
+        ),
+        "application/xml",
+    )
+    responses["http://example.com/b"] = page("B2")
+    requests = []
+    result = make_loader(responses, requests=requests).load_data(
+        "http://example.com/sitemap.xml"
+    )
+
+    assert "http://example.com/a" not in requests
+    assert "http://example.com/b" in requests
+    assert [doc.extra_info["title"] for doc in result] == ["A", "B2"]
+
+
+def test_sitemap_is_parsed_in_chunks_and_not_cached(page_cache):
+    entries = "".join(f"<url><loc>http://example.com/{i}</loc></url>" for i in range(500))
+    body = f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{entries}</urlset>'.encode()
+    chunks_sent = []
+
+    async def chunks():
+        for start in range(0, len(body), 1024):
+            chunks_sent.append(start)
+            yield body[start:start + 1024]
+
+    def handler(request):
+        if str(request.url).endswith("/robots.txt"):
+            return httpx.Response(404)
+        return httpx.Response(
+            200, content=chunks(), headers={"Content-Type": "application/xml", "ETag": '"v1"'}
+        )
+
+    loader = SitemapLoader(
+        crawler=AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+    )
+
+    result = loader.crawler.run(lambda: loader._extract_urls("http://example.com/sitemap.xml"))
+
+    assert len(result) == 500
+    assert result[0] == ("http://example.com/0", None)
+    assert len(chunks_sent) > 1
+    assert page_cache.entries == {}
+
+
+def test_plain_page_is_not_read_past_the_sniffed_head(page_cache):
+    chunks_sent = []
+
+    async def chunks():
+        for _ in range(100):
+            chunks_sent.append(1)
+            yield b"<html><body>" + b"x" * 1024 + b"</body></html>"
+
+    def handler(request):
+        if str(request.url).endswith("/robots.txt"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=chunks(), headers={"Content-Type": "text/html"})
+
+    loader = SitemapLoader(
+        crawler=AsyncCrawler(cache=page_cache, transport=httpx.MockTransport(handler))
+    )
+
+    result = loader.crawler.run(lambda: loader._extract_urls("http://example.com/page"))
+
+    assert result == [("http://example.com/page", None)]
+    assert len(chunks_sent) < 100
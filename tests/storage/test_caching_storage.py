@@ -0,0 +1,152 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+from application.storage.caching import CachingStorage
+from application.storage.local import LocalStorage
+
+
+class CountingStorage(LocalStorage):
+    """Local storage that reports an ETag and counts downloads."""
+
+    def __init__(self, base_dir):
+        super().__init__(base_dir=base_dir)
+        self.downloads = 0
+
+    def get_file_metadata(self, path):
+        metadata = super().get_file_metadata(path)
+        if metadata is not None:
+            with open(self._get_full_path(path), "rb") as f:
+                metadata["etag"] = str(hash(f.read()))
+        return metadata
+
+    def download_to(self, path, local_path):
+        self.downloads += 1
+        return super().download_to(path, local_path)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    (tmp_path / "remote" / "indexes").mkdir(parents=True)
+    (tmp_path / "remote" / "indexes" / "index.faiss").write_bytes(b"v1")
+    return CountingStorage(str(tmp_path / "remote"))
+
+
+@pytest.fixture
+def cache(backend, tmp_path):
+    return CachingStorage(
+        backend, str(tmp_path / "cache"), max_bytes=1024, revalidate_seconds=0
+    )
+
+
+@pytest.mark.unit
+class TestCachingStorage:
+
+    def test_repeated_reads_download_once(self, cache, backend):
+        for _ in range(3):
+            with cache.get_file("indexes/index.faiss") as f:
+                assert f.read() == b"v1"
+
+        assert backend.downloads == 1
+
+    def test_changed_object_is_refetched(self, cache, backend, tmp_path):
+        cache.get_file("indexes/index.faiss").close()
+        (tmp_path / "remote" / "indexes" / "index.faiss").write_bytes(b"v2-longer")
+
+        with cache.get_file("indexes/index.faiss") as f:
+            assert f.read() == b"v2-longer"
+        assert backend.downloads == 2
+        # The stale version is gone
+        path_dir = os.path.dirname(cache.cached_path("indexes/index.faiss"))
+        assert len(os.listdir(path_dir)) == 1
+
+    def test_revalidation_window_skips_metadata_requests(self, backend, tmp_path):
+        cache = CachingStorage(
+            backend, str(tmp_path / "cache"), max_bytes=1024, revalidate_seconds=60
+        )
+        cache.get_file("indexes/index.faiss").close()
+
+        with patch.object(backend, "get_file_metadata") as get_metadata:
+            cache.get_file("indexes/index.faiss").close()
+
+        get_metadata.assert_not_called()
+
+    def test_save_and_delete_invalidate(self, backend, tmp_path):
+        cache = CachingStorage(
+            backend, str(tmp_path / "cache"), max_bytes=1024, revalidate_seconds=60
+        )
+        cache.get_file("indexes/index.faiss").close()
+
+        cache.save_file(io.BytesIO(b"new"), "indexes/index.faiss")
+        with cache.get_file("indexes/index.faiss") as f:
+            assert f.read() == b"new"
+
+        cache.delete_file("indexes/index.faiss")
+        with pytest.raises(FileNotFoundError):
+            cache.get_file("indexes/index.faiss")
+        assert os.listdir(tmp_path / "cache") == []
+
+    def test_download_to_and_process_file_use_cache(self, cache, backend, tmp_path):
+        target = tmp_path / "work" / "index.faiss"
+        cache.download_to("indexes/index.faiss", str(target))
+        result = cache.process_file(
+            "indexes/index.faiss", lambda local_path: open(local_path, "rb").read()
+        )
+
+        assert target.read_bytes() == b"v1"
+        assert result == b"v1"
+        assert backend.downloads == 1
+
+    def test_least_recently_used_entries_are_evicted(self, backend, tmp_path):
+        for name in ("a", "b", "c"):
+            (tmp_path / "remote" / name).write_bytes(b"x" * 400)
+        cache = CachingStorage(
+            backend, str(tmp_path / "cache"), max_bytes=1000, revalidate_seconds=0
+        )
+
+        a = cache.cached_path("a")
+        b = cache.cached_path("b")
+        os.utime(a, (1, 1))
+        os.utime(b, (2, 2))
+        cache.cached_path("c")
+
+        assert not os.path.exists(a)
+        assert os.path.exists(b)
+
+    def test_misses_below_the_limit_do_not_rescan_the_cache(self, backend, tmp_path):
+        for name in ("a", "b", "c", "d"):
+            (tmp_path / "remote" / name).write_bytes(b"x" * 300)
+        cache = CachingStorage(
+            backend, str(tmp_path / "cache"), max_bytes=1000, revalidate_seconds=0
+        )
+        scans = []
+        entries = cache.lru.entries
+
+        def counting_entries():
+            scans.append(1)
+            return entries()
+
+        with patch.object(cache.lru, "entries", side_effect=counting_entries):
+            for name in ("a", "b", "c"):
+                cache.cached_path(name)
+            assert len(scans) == 1
+            cache.invalidate("a")
+            cache.cached_path("d")
+            assert len(scans) == 1
+            cache.cached_path("a")
+
+        assert len(scans) == 2
+        assert cache.lru.total_bytes <= 900
+
+    def test_unversioned_backend_bypasses_cache(self, tmp_path):
+        backend = LocalStorage(base_dir=str(tmp_path))
+        (tmp_path / "a.txt").write_bytes(b"a")
+        cache = CachingStorage(backend, str(tmp_path / "cache"), max_bytes=1024)
+
+        with patch.object(backend, "get_file_metadata", return_value={}):
+            with cache.get_file("a.txt") as f:
+                assert f.read() == b"a"
+
+        assert os.listdir(tmp_path / "cache") == []
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from application.storage.directory_lru import TEMP_PREFIX, DirectoryLRU
+
+
+def write(lru, name, size, mtime):
+    group_dir = os.path.join(lru.directory, name[0])
+    temp_path = lru.temp_path(group_dir)
+    path = os.path.join(group_dir, name)
+    with open(temp_path, "wb") as f:
+        f.write(b"x" * size)
+    os.replace(temp_path, path)
+    os.utime(path, (mtime, mtime))
+    lru.add_bytes(size)
+    return path
+
+
+@pytest.mark.unit
+class TestDirectoryLRU:
+
+    def test_counts_once_then_tracks_changes(self, tmp_path):
+        lru = DirectoryLRU(str(tmp_path), max_bytes=1000)
+        scans = []
+        entries = lru.entries
+        lru.entries = lambda: scans.append(1) or entries()
+
+        write(lru, "a1", 300, 1)
+        write(lru, "b1", 300, 2)
+        lru.add_bytes(-300)
+
+        assert scans == [1]
+        assert lru.total_bytes == 300
+
+    def test_evicts_oldest_down_to_the_low_water_mark(self, tmp_path):
+        lru = DirectoryLRU(str(tmp_path), max_bytes=1000)
+
+        oldest = write(lru, "a1", 400, 1)
+        middle = write(lru, "b1", 400, 2)
+        newest = write(lru, "c1", 400, 3)
+
+        assert not os.path.exists(oldest)
+        assert not os.path.isdir(os.path.dirname(oldest))
+        assert os.path.exists(middle) and os.path.exists(newest)
+        assert lru.total_bytes == 800
+
+    def test_temp_files_are_not_counted(self, tmp_path):
+        lru = DirectoryLRU(str(tmp_path), max_bytes=1000)
+        temp_path = lru.temp_path(str(tmp_path / "a"))
+
+        assert os.path.basename(temp_path).startswith(TEMP_PREFIX)
+        assert lru.entries() == []
+
+    def test_touch_reports_missing_files(self, tmp_path):
+        path = write(DirectoryLRU(str(tmp_path), max_bytes=1000), "a1", 10, 1)
+
+        assert DirectoryLRU.touch(path)
+        assert os.path.getmtime(path) > 1
+        assert not DirectoryLRU.touch(str(tmp_path / "a" / "missing"))
@@ -235,6 +235,26 @@ class TestLocalStorageListFiles:
             expected_path
         )
 
+    def test_list_files_with_metadata_returns_size_and_mtime(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        (tmp_path / "documents" / "subdir").mkdir(parents=True)
+        (tmp_path / "documents" / "file1.txt").write_bytes(b"abc")
+        (tmp_path / "documents" / "subdir" / "file2.txt").write_bytes(b"hello")
+
+        result = storage.list_files_with_metadata("documents")
+
+        assert set(result) == {
+            os.path.join("documents", "file1.txt"),
+            os.path.join("documents", "subdir", "file2.txt"),
+        }
+        assert result[os.path.join("documents", "file1.txt")]["size"] == 3
+        assert result[os.path.join("documents", "subdir", "file2.txt")]["size"] == 5
+        assert all(isinstance(meta["mtime"], float) for meta in result.values())
+
+    def test_list_files_with_metadata_missing_directory(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        assert storage.list_files_with_metadata("nonexistent") == {}
+
 
 @pytest.mark.unit
 class TestLocalStorageProcessFile:
@@ -399,3 +419,33 @@ class TestLocalStorageRemoveDirectory:
         assert os.path.normpath(mock_rmtree.call_args[0][0]) == os.path.normpath(
             expected_path
         )
+
+
+@pytest.mark.unit
+class TestLocalStorageStreaming:
+
+    def test_iter_file_and_range_reads(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        (tmp_path / "a.bin").write_bytes(b"abcdefgh")
+
+        assert list(storage.iter_file("a.bin", chunk_size=3)) == [b"abc", b"def", b"gh"]
+        assert storage.get_file_range("a.bin", 2, 3) == b"cde"
+        assert storage.get_file_range("a.bin", 6) == b"gh"
+        assert storage.get_file_range("a.bin", 20) == b""
+
+    def test_iter_file_raises_before_iteration(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            storage.iter_file("missing.bin")
+
+    def test_list_directory(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        (tmp_path / "docs" / "sub").mkdir(parents=True)
+        (tmp_path / "docs" / "a.md").write_text("a")
+        (tmp_path / "docs" / "sub" / "b.md").write_text("b")
+
+        assert storage.list_directory("docs") == {
+            "files": [os.path.join("docs", "a.md")],
+            "directories": [os.path.join("docs", "sub")],
+        }
+        assert storage.list_directory("missing") == {"files": [], "directories": []}
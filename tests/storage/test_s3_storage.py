@@ -70,6 +70,7 @@ class TestS3StorageSaveFile:
         """Should upload file to S3 with correct parameters."""
         file_data = io.BytesIO(b"test content")
         path = "documents/test.txt"
+        transfer_config = s3_storage.transfer_config
 
         with patch("application.storage.s3.settings") as mock_settings:
             mock_settings.SAGEMAKER_REGION = "us-east-1"
@@ -79,6 +80,7 @@ class TestS3StorageSaveFile:
             "test-bucket",
             path,
             ExtraArgs={"StorageClass": "INTELLIGENT_TIERING"},
+            Config=transfer_config,
         )
 
         assert result == {
@@ -93,14 +95,33 @@ class TestS3StorageSaveFile:
         """Should use custom storage class when provided."""
         file_data = io.BytesIO(b"test content")
         path = "documents/test.txt"
+        transfer_config = s3_storage.transfer_config
 
         with patch("application.storage.s3.settings") as mock_settings:
             mock_settings.SAGEMAKER_REGION = "us-east-1"
             s3_storage.save_file(file_data, path, storage_class="STANDARD")
         mock_boto3_client.upload_fileobj.assert_called_once_with(
-            file_data, "test-bucket", path, ExtraArgs={"StorageClass": "STANDARD"}
+            file_data,
+            "test-bucket",
+            path,
+            ExtraArgs={"StorageClass": "STANDARD"},
+            Config=transfer_config,
         )
 
+    @pytest.mark.unit
+    def test_transfer_config_uses_multipart_settings(self, s3_storage):
+        """Should build the multipart transfer config from settings."""
+        with patch("application.storage.s3.settings") as mock_settings:
+            mock_settings.S3_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+            mock_settings.S3_MULTIPART_CHUNKSIZE = 32 * 1024 * 1024
+            mock_settings.S3_MAX_CONCURRENCY = 4
+            config = s3_storage.transfer_config
+
+        assert config.multipart_threshold == 16 * 1024 * 1024
+        assert config.multipart_chunksize == 32 * 1024 * 1024
+        assert config.max_concurrency == 4
+        assert s3_storage.transfer_config is config
+
     @pytest.mark.unit
     def test_save_file_propagates_client_error(self, s3_storage, mock_boto3_client):
         """Should propagate ClientError when upload fails."""
@@ -149,29 +170,56 @@ class TestS3StorageFileExists:
         assert result is False
 
 
-class TestS3StorageGetFile:
-    """Test file retrieval functionality."""
+class TestS3StorageGetFileMetadata:
+    """Test metadata lookups."""
 
     @pytest.mark.unit
-    def test_get_file_downloads_and_returns_file_object(
+    def test_get_file_metadata_returns_head_fields(self, s3_storage, mock_boto3_client):
+        """Should map HEAD fields to size, mtime and etag."""
+        from datetime import datetime, timezone
+
+        modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        mock_boto3_client.head_object.return_value = {
+            "ContentLength": 42,
+            "LastModified": modified,
+            "ETag": '"abc"',
+        }
+
+        assert s3_storage.get_file_metadata("documents/test.txt") == {
+            "size": 42,
+            "mtime": modified.timestamp(),
+            "etag": "abc",
+        }
+
+    @pytest.mark.unit
+    def test_get_file_metadata_returns_none_when_missing(
         self, s3_storage, mock_boto3_client
     ):
-        """Should download file from S3 and return BytesIO object."""
-        path = "documents/test.txt"
-        test_content = b"file content"
+        """Should return None for a missing object."""
+        mock_boto3_client.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "head_object"
+        )
 
-        mock_boto3_client.head_object.return_value = {}
+        assert s3_storage.get_file_metadata("documents/missing.txt") is None
 
-        def mock_download(bucket, key, file_obj):
-            file_obj.write(test_content)
 
-        mock_boto3_client.download_fileobj.side_effect = mock_download
+class TestS3StorageGetFile:
+    """Test file retrieval functionality."""
+
+    @pytest.mark.unit
+    def test_get_file_returns_streaming_body(self, s3_storage, mock_boto3_client):
+        """Should return the object body without buffering it."""
+        path = "documents/test.txt"
+        body = io.BytesIO(b"file content")
+        mock_boto3_client.get_object.return_value = {"Body": body}
 
         result = s3_storage.get_file(path)
 
-        assert isinstance(result, io.BytesIO)
-        assert result.read() == test_content
-        mock_boto3_client.download_fileobj.assert_called_once()
+        assert result is body
+        mock_boto3_client.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key=path
+        )
+        mock_boto3_client.download_fileobj.assert_not_called()
 
     @pytest.mark.unit
     def test_get_file_raises_error_when_file_not_found(
@@ -179,13 +227,78 @@ class TestS3StorageGetFile:
     ):
         """Should raise FileNotFoundError when file doesn't exist."""
         path = "documents/nonexistent.txt"
-        mock_boto3_client.head_object.side_effect = ClientError(
-            {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "head_object"
+        mock_boto3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "get_object"
         )
 
         with pytest.raises(FileNotFoundError, match="File not found"):
             s3_storage.get_file(path)
 
+    @pytest.mark.unit
+    def test_iter_file_streams_chunks(self, s3_storage, mock_boto3_client):
+        """Should yield the body in chunks and close it."""
+        body = io.BytesIO(b"abcdefgh")
+        mock_boto3_client.get_object.return_value = {"Body": body}
+
+        chunks = list(s3_storage.iter_file("documents/test.txt", chunk_size=3))
+
+        assert chunks == [b"abc", b"def", b"gh"]
+        assert body.closed
+
+    @pytest.mark.unit
+    def test_get_file_range_sends_range_header(self, s3_storage, mock_boto3_client):
+        """Should request only the requested bytes."""
+        mock_boto3_client.get_object.return_value = {"Body": io.BytesIO(b"cde")}
+
+        result = s3_storage.get_file_range("documents/test.txt", 2, 3)
+
+        assert result == b"cde"
+        mock_boto3_client.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="documents/test.txt", Range="bytes=2-4"
+        )
+
+    @pytest.mark.unit
+    def test_get_file_range_to_end_and_past_end(self, s3_storage, mock_boto3_client):
+        """Should use an open-ended range and return nothing past the end."""
+        mock_boto3_client.get_object.return_value = {"Body": io.BytesIO(b"fgh")}
+        assert s3_storage.get_file_range("documents/test.txt", 5) == b"fgh"
+        assert mock_boto3_client.get_object.call_args.kwargs["Range"] == "bytes=5-"
+
+        mock_boto3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "InvalidRange", "Message": "Invalid range"}},
+            "get_object",
+        )
+        assert s3_storage.get_file_range("documents/test.txt", 100) == b""
+
+    @pytest.mark.unit
+    def test_download_to_uses_managed_transfer(
+        self, s3_storage, mock_boto3_client, tmp_path
+    ):
+        """Should download straight to disk with the multipart config."""
+        local_path = str(tmp_path / "nested" / "test.txt")
+
+        s3_storage.download_to("documents/test.txt", local_path)
+
+        mock_boto3_client.download_file.assert_called_once_with(
+            "test-bucket",
+            "documents/test.txt",
+            local_path,
+            Config=s3_storage.transfer_config,
+        )
+        assert (tmp_path / "nested").is_dir()
+
+    @pytest.mark.unit
+    def test_download_to_raises_error_when_file_not_found(
+        self, s3_storage, mock_boto3_client, tmp_path
+    ):
+        """Should translate a 404 into FileNotFoundError."""
+        mock_boto3_client.download_file.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+
+        with pytest.raises(FileNotFoundError):
+            s3_storage.download_to("documents/missing.txt", str(tmp_path / "x"))
+
 
 class TestS3StorageDeleteFile:
     """Test file deletion functionality."""
@@ -269,6 +382,35 @@ class TestS3StorageListFiles:
         assert result == []
 
 
+class TestS3StorageListDirectory:
+    """Test delimiter-based directory listing."""
+
+    @pytest.mark.unit
+    def test_list_directory_returns_files_and_prefixes(
+        self, s3_storage, mock_boto3_client
+    ):
+        """Should split a listing into direct files and subdirectories."""
+        paginator_mock = MagicMock()
+        mock_boto3_client.get_paginator.return_value = paginator_mock
+        paginator_mock.paginate.return_value = [
+            {
+                "Contents": [{"Key": "documents/"}, {"Key": "documents/a.txt"}],
+                "CommonPrefixes": [{"Prefix": "documents/sub/"}],
+            },
+            {"Contents": [{"Key": "documents/b.txt"}]},
+        ]
+
+        result = s3_storage.list_directory("documents")
+
+        assert result == {
+            "files": ["documents/a.txt", "documents/b.txt"],
+            "directories": ["documents/sub"],
+        }
+        paginator_mock.paginate.assert_called_once_with(
+            Bucket="test-bucket", Prefix="documents/", Delimiter="/"
+        )
+
+
 class TestS3StorageProcessFile:
     """Test file processing functionality."""
 
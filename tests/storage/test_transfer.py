@@ -0,0 +1,116 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from application.storage.base import BaseStorage
+from application.storage.local import LocalStorage
+from application.storage.transfer import TransferManager, _ByteBudget
+
+
+class FakeStorage(LocalStorage):
+    """Serves in-memory files through the default streaming ``download_to``."""
+
+    def __init__(self, files, delay=0.0):
+        super().__init__(base_dir="/nonexistent")
+        self.files = files
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_file(self, path):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if path not in self.files:
+                raise FileNotFoundError(path)
+            return io.BytesIO(self.files[path])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    download_to = BaseStorage.download_to
+
+
+@pytest.mark.unit
+class TestTransferManager:
+
+    def test_downloads_files_concurrently(self, tmp_path):
+        files = {f"src/{i}.txt": f"file {i}".encode() for i in range(8)}
+        storage = FakeStorage(files, delay=0.05)
+
+        results = TransferManager(storage, max_workers=4).download_directory(
+            "src", str(tmp_path), {path: {} for path in files}
+        )
+
+        assert results == {path: None for path in files}
+        assert (tmp_path / "3.txt").read_bytes() == b"file 3"
+        assert storage.peak > 1
+
+    def test_in_flight_bytes_are_bounded(self, tmp_path):
+        files = {f"src/{i}.txt": b"x" * 10 for i in range(6)}
+        storage = FakeStorage(files, delay=0.02)
+
+        TransferManager(storage, max_workers=4, max_in_flight_bytes=20).download_files(
+            [(path, str(tmp_path / os.path.basename(path))) for path in files],
+            sizes={path: 10 for path in files},
+        )
+
+        assert storage.peak <= 2
+
+    def test_failures_are_reported_per_file(self, tmp_path):
+        storage = FakeStorage({"src/a.txt": b"a"})
+
+        results = TransferManager(storage, max_workers=2).download_files(
+            [
+                ("src/a.txt", str(tmp_path / "a.txt")),
+                ("src/missing.txt", str(tmp_path / "missing.txt")),
+            ]
+        )
+
+        assert results["src/a.txt"] is None
+        assert isinstance(results["src/missing.txt"], FileNotFoundError)
+
+    def test_oversized_file_runs_alone(self):
+        budget = _ByteBudget(10)
+        assert budget.acquire(50) == 10
+        budget.release(10)
+        assert budget.acquire(5) == 5
+
+
+@pytest.mark.unit
+class TestLocalStorageDownloadTo:
+
+    def test_links_file_into_destination(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path / "store"))
+        (tmp_path / "store" / "docs").mkdir(parents=True)
+        (tmp_path / "store" / "docs" / "a.md").write_text("hello")
+        target = tmp_path / "work" / "nested" / "a.md"
+
+        storage.download_to("docs/a.md", str(target))
+
+        assert target.read_text() == "hello"
+        assert os.path.samefile(target, tmp_path / "store" / "docs" / "a.md")
+
+    def test_copies_when_linking_fails(self, tmp_path, monkeypatch):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        (tmp_path / "a.md").write_text("hello")
+
+        def fail_link(src, dst):
+            raise OSError("cross-device link")
+
+        monkeypatch.setattr(os, "link", fail_link)
+        storage.download_to("a.md", str(tmp_path / "copy.md"))
+
+        assert (tmp_path / "copy.md").read_text() == "hello"
+        assert not os.path.samefile(tmp_path / "copy.md", tmp_path / "a.md")
+
+    def test_missing_file_raises(self, tmp_path):
+        storage = LocalStorage(base_dir=str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            storage.download_to("missing.md", str(tmp_path / "out.md"))
@@ -0,0 +1,236 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from application.services.analytics_service import (
+    AnalyticsRollupService,
+    truncate_timestamp,
+)
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+@pytest.fixture
+def rollups(db):
+    return AnalyticsRollupService(db["analytics_rollups"])
+
+
+@pytest.mark.unit
+class TestAnalyticsRollupService:
+    def test_truncate_timestamp(self):
+        ts = datetime(2025, 3, 4, 10, 42, 17, 500, tzinfo=timezone.utc)
+
+        assert truncate_timestamp(ts, "minute") == datetime(
+            2025, 3, 4, 10, 42, tzinfo=timezone.utc
+        )
+        assert truncate_timestamp(ts, "hour") == datetime(
+            2025, 3, 4, 10, tzinfo=timezone.utc
+        )
+        assert truncate_timestamp(ts, "day") == datetime(2025, 3, 4, tzinfo=timezone.utc)
+
+    def test_record_updates_every_granularity(self, rollups):
+        ts = datetime(2025, 3, 4, 10, 42, tzinfo=timezone.utc)
+
+        rollups.record("u1", "key", ts, messages=1, tokens=30)
+        rollups.record("u1", "key", ts + timedelta(seconds=5), messages=1)
+
+        docs = list(rollups.collection.find({}))
+        assert len(docs) == 3
+        assert all(doc["messages"] == 2 for doc in docs)
+        assert all(doc["tokens"] == 30 for doc in docs)
+        day_doc = rollups.collection.find_one({"granularity": "day"})
+        assert "expire_at" not in day_doc
+
+    def test_record_many_merges_events_into_one_bulk_write(self, rollups, monkeypatch):
+        ts = datetime(2025, 3, 4, 10, 42, tzinfo=timezone.utc)
+        writes = []
+        bulk_write = rollups.collection.bulk_write
+
+        def record_bulk_write(requests, **kwargs):
+            writes.append(requests)
+            return bulk_write(requests, **kwargs)
+
+        monkeypatch.setattr(rollups.collection, "bulk_write", record_bulk_write)
+
+        rollups.record_many(
+            "u1",
+            None,
+            [
+                (ts, {"messages": -1}),
+                (ts, {"feedback_positive": -1}),
+                (ts + timedelta(hours=2), {"messages": 1}),
+            ],
+        )
+
+        assert len(writes) == 1
+        # Minute and hour buckets differ, the day bucket is shared
+        assert len(writes[0]) == 5
+        day_doc = rollups.collection.find_one({"granularity": "day"})
+        assert day_doc["messages"] == 0
+        assert day_doc["feedback_positive"] == -1
+        minute_doc = rollups.collection.find_one(
+            {"granularity": "minute", "bucket": ts}
+        )
+        assert minute_doc["messages"] == -1
+
+    def test_record_ignores_missing_user(self, rollups):
+        rollups.record(None, None, messages=1)
+
+        assert rollups.collection.count_documents({}) == 0
+
+    def test_get_series_sums_api_keys_and_filters(self, rollups):
+        ts = datetime(2025, 3, 4, 10, 42, tzinfo=timezone.utc)
+        rollups.record("u1", "a", ts, messages=2)
+        rollups.record("u1", None, ts, messages=3)
+        rollups.record("u2", None, ts, messages=7)
+
+        start = ts - timedelta(days=1)
+        end = ts + timedelta(days=1)
+
+        assert rollups.get_series("u1", "day", start, end, metrics=["messages"]) == {
+            "2025-03-04": {"messages": 5}
+        }
+        assert rollups.get_series(
+            "u1", "hour", start, end, api_key="a", metrics=["messages"]
+        ) == {"2025-03-04 10:00": {"messages": 2}}
+
+    def test_feedback_change_moves_counts(self, rollups):
+        old_ts = datetime(2025, 3, 3, 9, 0, tzinfo=timezone.utc)
+        new_ts = datetime(2025, 3, 4, 9, 0, tzinfo=timezone.utc)
+        rollups.record_feedback_change("u1", None, None, None, "LIKE", old_ts)
+
+        rollups.record_feedback_change("u1", None, "LIKE", old_ts, "DISLIKE", new_ts)
+
+        series = rollups.get_series(
+            "u1",
+            "day",
+            old_ts,
+            new_ts,
+            metrics=["feedback_positive", "feedback_negative"],
+        )
+        assert series["2025-03-03"] == {"feedback_positive": 0, "feedback_negative": 0}
+        assert series["2025-03-04"] == {"feedback_positive": 0, "feedback_negative": 1}
+
+    def test_rebuild_from_raw_collections(self, db, rollups):
+        ts = datetime(2025, 3, 4, 10, 42)
+        db["conversations"].insert_one(
+            {
+                "user": "u1",
+                "api_key": "a",
+                "queries": [
+                    {"prompt": "q1", "timestamp": ts},
+                    {
+                        "prompt": "q2",
+                        "timestamp": ts,
+                        "feedback": "LIKE",
+                        "feedback_timestamp": ts,
+                    },
+                    {"prompt": "old", "timestamp": ts - timedelta(days=10)},
+                ],
+            }
+        )
+        db["token_usage"].insert_one(
+            {
+                "user_id": "u1",
+                "api_key": "a",
+                "prompt_tokens": 10,
+                "generated_tokens": 5,
+                "timestamp": ts,
+            }
+        )
+        rollups.record("u1", "a", ts, messages=99)
+
+        day = datetime(2025, 3, 4, tzinfo=timezone.utc)
+        rollups.rebuild(db, day, day + timedelta(days=1) - timedelta(microseconds=1))
+
+        series = rollups.get_series("u1", "minute", day, day + timedelta(days=1))
+        assert series == {
+            "2025-03-04 10:42:00": {
+                "messages": 2,
+                "tokens": 15,
+                "feedback_positive": 1,
+                "feedback_negative": 0,
+            }
+        }
+
+
+@pytest.mark.unit
+class TestConversationRollups:
+    def test_save_conversation_records_messages(self, mock_mongo_db, mock_llm):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        mock_llm.gen.return_value = "Title"
+        service = ConversationService()
+        token = {"sub": "u1"}
+
+        conv_id = service.save_conversation(
+            None, "q1", "a1", "", [], [], mock_llm, "gpt-4", token
+        )
+        service.save_conversation(
+            conv_id, "q2", "a2", "", [], [], mock_llm, "gpt-4", token
+        )
+        service.save_conversation(
+            conv_id, "q1 edited", "a1", "", [], [], mock_llm, "gpt-4", token, index=0
+        )
+
+        rollups = mock_mongo_db[settings.MONGO_DB_NAME]["analytics_rollups"]
+        day_doc = rollups.find_one({"user": "u1", "granularity": "day"})
+        assert day_doc["messages"] == 1
+
+    @pytest.mark.parametrize("storage", ["embedded", "messages"])
+    def test_regenerate_keeps_rollups_in_line_with_stored_feedback(
+        self, mock_mongo_db, mock_llm, monkeypatch, storage
+    ):
+        from application.api.answer.services.conversation_service import (
+            ConversationService,
+        )
+        from application.core.settings import settings
+
+        monkeypatch.setattr(settings, "CONVERSATION_STORAGE", storage)
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        mock_llm.gen.return_value = "Title"
+        service = ConversationService()
+        token = {"sub": "u1"}
+
+        conv_id = service.save_conversation(
+            None, "q1", "a1", "", [], [], mock_llm, "gpt-4", token
+        )
+        service.save_conversation(
+            conv_id, "q2", "a2", "", [], [], mock_llm, "gpt-4", token
+        )
+        liked_at = datetime.now(timezone.utc)
+        feedback = {"feedback": "LIKE", "feedback_timestamp": liked_at}
+        if storage == "messages":
+            db["conversation_messages"].update_one(
+                {"conversation_id": ObjectId(conv_id), "seq": 0}, {"$set": feedback}
+            )
+        else:
+            db["conversations"].update_one(
+                {"_id": ObjectId(conv_id)},
+                {"$set": {f"queries.0.{key}": value for key, value in feedback.items()}},
+            )
+        service.analytics_rollups.record_feedback_change(
+            "u1", None, None, None, "LIKE", liked_at
+        )
+
+        service.save_conversation(
+            conv_id, "q1 again", "a1", "", [], [], mock_llm, "gpt-4", token, index=0
+        )
+
+        queries = service.get_conversation(conv_id, "u1")["queries"]
+        assert [q["prompt"] for q in queries] == ["q1 again"]
+        assert "feedback" not in queries[0]
+        day = truncate_timestamp(liked_at, "day")
+        end = day + timedelta(days=1) - timedelta(microseconds=1)
+        incremental = service.analytics_rollups.get_series("u1", "day", day, end)
+        rebuilt = AnalyticsRollupService(db["rebuilt_rollups"])
+        rebuilt.rebuild(db, day, end)
+        assert incremental == rebuilt.get_series("u1", "day", day, end)
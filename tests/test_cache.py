@@ -2,7 +2,15 @@ import json
 from unittest.mock import MagicMock, patch
 
 import pytest
-from application.cache import gen_cache, gen_cache_key, stream_cache
+from application.cache import (
+    gen_cache,
+    gen_cache_key,
+    get_cached_tool_result,
+    invalidate_tool_results,
+    set_cached_tool_result,
+    stream_cache,
+    tool_result_cache_key,
+)
 from application.utils import get_hash
 
 
@@ -120,3 +128,48 @@ def test_stream_cache_miss(mock_make_redis):
     assert result == ["new_chunk"]
     mock_redis_instance.get.assert_called_once()
     mock_redis_instance.set.assert_called_once()
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+
+    def incr(self, key):
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+
+@patch("application.cache.get_redis_instance")
+def test_invalidate_tool_results_orphans_cached_results(mock_make_redis):
+    redis = DictRedis()
+    mock_make_redis.return_value = redis
+
+    key = tool_result_cache_key("tool1", "list", {"b": 2, "a": 1})
+    assert key == tool_result_cache_key("tool1", "list", {"a": 1, "b": 2})
+    set_cached_tool_result(key, {"items": [1]}, 60)
+    assert get_cached_tool_result(key) == (True, {"items": [1]})
+    other_key = tool_result_cache_key("tool2", "list", {})
+    set_cached_tool_result(other_key, [], 60)
+
+    invalidate_tool_results("tool1")
+
+    new_key = tool_result_cache_key("tool1", "list", {"a": 1, "b": 2})
+    assert new_key != key
+    assert get_cached_tool_result(new_key) == (False, None)
+    assert tool_result_cache_key("tool2", "list", {}) == other_key
+
+
+@patch("application.cache.get_redis_instance")
+def test_tool_result_cache_key_skips_caching_when_redis_fails(mock_make_redis):
+    mock_redis_instance = MagicMock()
+    mock_redis_instance.get.side_effect = ConnectionError("down")
+    mock_make_redis.return_value = mock_redis_instance
+
+    assert tool_result_cache_key("tool1", "list", {}) is None
@@ -1078,5 +1078,221 @@ Understanding async programming is crucial for building scalable Python applicat
         assert result.compression_ratio > 4  # At least 4x compression
 
 
+
+def _compressed(conversation, summary="Stored summary", query_index=1):
+    conversation["compression_metadata"] = {
+        "is_compressed": True,
+        "compression_points": [
+            {
+                "query_index": query_index,
+                "compressed_summary": summary,
+                "compressed_token_count": 10,
+                "original_token_count": 5000,
+            }
+        ],
+    }
+    return conversation
+
+
+class TestBackgroundCompression:
+    """Test suite for soft-threshold background compression"""
+
+    def test_context_tokens_use_latest_summary(self, large_conversation):
+        full = TokenCounter.count_conversation_tokens(large_conversation)
+        _compressed(large_conversation, query_index=98)
+
+        context = TokenCounter.count_context_tokens(large_conversation)
+
+        assert context == 10 + TokenCounter.count_query_tokens(
+            large_conversation["queries"][99:]
+        )
+        assert context < full
+
+    @patch("application.api.answer.services.compression.threshold_checker.get_token_limit")
+    def test_soft_threshold_below_hard_threshold(
+        self, mock_get_token_limit, sample_conversation
+    ):
+        checker = CompressionThresholdChecker(
+            threshold_percentage=0.9, soft_threshold_percentage=0.5
+        )
+        tokens = TokenCounter.count_conversation_tokens(sample_conversation)
+        mock_get_token_limit.return_value = int((tokens + 500) / 0.7)
+
+        assert checker.should_compress_in_background(sample_conversation, "m")
+        assert not checker.should_compress(sample_conversation, "m")
+
+    def test_compress_if_needed_reuses_stored_summary(self, sample_conversation):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+
+        conversation_service = Mock()
+        conversation_service.get_conversation.return_value = _compressed(
+            sample_conversation
+        )
+        conversation_service.get_queries_from.side_effect = (
+            lambda conversation, start: conversation["queries"][start:]
+        )
+        checker = Mock()
+        checker.should_compress.return_value = False
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+
+        with patch.object(orchestrator, "_perform_compression") as perform:
+            result = orchestrator.compress_if_needed("c1", "u1", "gpt-4o", {})
+
+        perform.assert_not_called()
+        conversation_service.get_conversation.assert_called_once_with(
+            "c1", "u1", include_queries=False
+        )
+        conversation_service.get_queries_from.assert_called_once_with(
+            sample_conversation, 2
+        )
+        assert result.success
+        assert not result.compression_performed
+        assert result.compressed_summary == "Stored summary"
+        assert [q["prompt"] for q in result.recent_queries] == [
+            "What are some popular libraries?"
+        ]
+
+    def test_schedule_queues_task_once(self, sample_conversation):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+
+        header = {"_id": "c1", "token_count": 4000}
+        conversation_service = Mock()
+        conversation_service.get_conversation.return_value = header
+        checker = Mock()
+        checker.should_compress_in_background.return_value = True
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+        redis = Mock()
+        redis.set.side_effect = [True, None]
+
+        with patch(
+            "application.api.answer.services.compression.orchestrator.get_redis_instance",
+            return_value=redis,
+        ), patch(
+            "application.api.user.tasks.compress_conversation_task.delay"
+        ) as delay:
+            assert orchestrator.schedule_background_compression(
+                "c1", "u1", "gpt-4o", {"sub": "u1"}
+            )
+            assert not orchestrator.schedule_background_compression(
+                "c1", "u1", "gpt-4o", {"sub": "u1"}
+            )
+
+        delay.assert_called_once_with("c1", "u1", "gpt-4o", {"sub": "u1"})
+        conversation_service.get_conversation.assert_called_with(
+            "c1", "u1", include_queries=False
+        )
+        checker.should_compress_in_background.assert_called_with(
+            header, "gpt-4o", context_tokens=4000
+        )
+
+    def test_schedule_estimates_tokens_after_compression_point(self):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+
+        header = _compressed({"_id": "c1", "token_count": 6000})
+        conversation_service = Mock()
+        conversation_service.get_conversation.return_value = header
+        checker = Mock()
+        checker.should_compress_in_background.return_value = False
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+
+        assert not orchestrator.schedule_background_compression(
+            "c1", "u1", "gpt-4o", {"sub": "u1"}
+        )
+
+        # 10 summary tokens plus the 1000 added since the 5000 compressed
+        checker.should_compress_in_background.assert_called_once_with(
+            header, "gpt-4o", context_tokens=1010
+        )
+        conversation_service.get_queries_from.assert_not_called()
+
+    def test_compress_if_needed_uses_stored_token_count(self):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+
+        header = {"_id": "c1", "token_count": 1200}
+        history = [{"prompt": "Q", "response": "A"}]
+        conversation_service = Mock()
+        conversation_service.get_history.return_value = history
+        checker = Mock()
+        checker.should_compress.return_value = False
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+
+        result = orchestrator.compress_if_needed(
+            "c1", "u1", "gpt-4o", {}, conversation=header
+        )
+
+        assert result.success
+        assert result.as_history() == history
+        checker.should_compress.assert_called_once_with(
+            header, "gpt-4o", 500, context_tokens=1200
+        )
+        conversation_service.get_conversation.assert_not_called()
+        conversation_service.get_queries_from.assert_not_called()
+        conversation_service.get_history.assert_called_once_with(header, "gpt-4o")
+
+    def test_compress_if_needed_loads_turns_only_to_compress(self, sample_conversation):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+        from application.api.answer.services.compression.types import (
+            CompressionResult,
+        )
+
+        header = {"_id": "c1", "token_count": 100000}
+        conversation_service = Mock()
+        conversation_service.get_conversation.return_value = sample_conversation
+        checker = Mock()
+        checker.should_compress.return_value = True
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+
+        with patch.object(
+            orchestrator,
+            "_perform_compression",
+            return_value=CompressionResult.success_no_compression([]),
+        ) as perform:
+            orchestrator.compress_if_needed(
+                "c1", "u1", "gpt-4o", {}, conversation=header
+            )
+
+        conversation_service.get_conversation.assert_called_once_with("c1", "u1")
+        perform.assert_called_once_with("c1", sample_conversation, "gpt-4o", {})
+
+    def test_compress_in_background_releases_pending_flag(self, sample_conversation):
+        from application.api.answer.services.compression import (
+            CompressionOrchestrator,
+        )
+        from application.api.answer.services.compression.types import (
+            CompressionResult,
+        )
+
+        conversation_service = Mock()
+        conversation_service.get_conversation.return_value = sample_conversation
+        checker = Mock()
+        checker.should_compress_in_background.return_value = True
+        orchestrator = CompressionOrchestrator(conversation_service, checker)
+        redis = Mock()
+
+        with patch(
+            "application.api.answer.services.compression.orchestrator.get_redis_instance",
+            return_value=redis,
+        ), patch.object(
+            orchestrator,
+            "_perform_compression",
+            return_value=CompressionResult.failure("boom"),
+        ) as perform:
+            result = orchestrator.compress_in_background("c1", "u1", "gpt-4o", {})
+
+        perform.assert_called_once()
+        assert not result.success
+        redis.delete.assert_called_once_with("compression_pending:c1")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+import time
+from unittest.mock import Mock, patch
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from application.core.config_cache import ConfigCache
+from application.core.settings import settings
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_CONFIG_CACHE", True)
+    cache = ConfigCache(max_size=2, ttl=60, fallback_ttl=60)
+    # No change stream in unit tests
+    monkeypatch.setattr(cache, "_ensure_listener", lambda: None)
+    return cache
+
+
+@pytest.mark.unit
+class TestConfigCache:
+    def test_hit_skips_loader(self, cache):
+        loader = Mock(return_value={"content": "Hi"})
+
+        assert cache.get_or_load("prompts", "p1", loader) == {"content": "Hi"}
+        assert cache.get_or_load("prompts", "p1", loader) == {"content": "Hi"}
+
+        loader.assert_called_once()
+
+    def test_disabled_always_loads(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "ENABLE_CONFIG_CACHE", False)
+        loader = Mock(return_value=None)
+
+        cache.get_or_load("prompts", "p1", loader)
+        cache.get_or_load("prompts", "p1", loader)
+
+        assert loader.call_count == 2
+
+    def test_invalidate_only_affects_collection(self, cache):
+        prompt_loader = Mock(return_value="prompt")
+        agent_loader = Mock(return_value="agent")
+        cache.get_or_load("prompts", "p1", prompt_loader)
+        cache.get_or_load("agents", "a1", agent_loader)
+
+        cache.invalidate("prompts")
+        cache.get_or_load("prompts", "p1", prompt_loader)
+        cache.get_or_load("agents", "a1", agent_loader)
+
+        assert prompt_loader.call_count == 2
+        assert agent_loader.call_count == 1
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        loaders = {key: Mock(return_value=key) for key in ("a", "b", "c")}
+        for key in ("a", "b", "a", "c", "a", "b"):
+            cache.get_or_load("agents", key, loaders[key])
+
+        assert loaders["a"].call_count == 1
+        assert loaders["b"].call_count == 2
+
+    def test_entries_expire_after_fallback_ttl(self, cache):
+        cache.fallback_ttl = 5
+        loader = Mock(return_value="agent")
+        cache.get_or_load("agents", "a1", loader)
+
+        with patch(
+            "application.core.config_cache.time.monotonic",
+            return_value=time.monotonic() + 10,
+        ):
+            cache.get_or_load("agents", "a1", loader)
+
+        assert loader.call_count == 2
+
+    @pytest.mark.parametrize(
+        "change,relevant",
+        [
+            ({"operationType": "insert"}, True),
+            ({"operationType": "delete"}, True),
+            (
+                {
+                    "operationType": "update",
+                    "updateDescription": {"updatedFields": {"lastUsedAt": 1}},
+                },
+                False,
+            ),
+            (
+                {
+                    "operationType": "update",
+                    "updateDescription": {
+                        "updatedFields": {"lastUsedAt": 1, "prompt_id": "x"}
+                    },
+                },
+                True,
+            ),
+        ],
+    )
+    def test_usage_timestamp_updates_are_ignored(self, change, relevant):
+        assert ConfigCache._is_relevant(change) is relevant
+
+    def test_listener_failure_falls_back(self, cache, monkeypatch):
+        monkeypatch.setattr(
+            "application.core.config_cache.MongoDB.get_client",
+            lambda: {settings.MONGO_DB_NAME: mongomock.MongoClient().db},
+        )
+
+        cache._listen()
+
+        assert not cache._listening
+        assert cache._entry_ttl() == cache.fallback_ttl
+
+
+@pytest.mark.unit
+class TestRequestDataLoaderConfigCache:
+    def test_agent_shared_across_requests(self, monkeypatch):
+        from application.core import data_loader as data_loader_module
+        from application.core.data_loader import RequestDataLoader
+
+        monkeypatch.setattr(settings, "ENABLE_CONFIG_CACHE", True)
+        cache = ConfigCache(ttl=60, fallback_ttl=60)
+        monkeypatch.setattr(cache, "_ensure_listener", lambda: None)
+        monkeypatch.setattr(data_loader_module, "config_cache", cache)
+        db = mongomock.MongoClient().db
+        agent_id = db["agents"].insert_one({"key": "k1", "user": "u1"}).inserted_id
+
+        with patch.object(
+            db["agents"], "find_one", wraps=db["agents"].find_one
+        ) as find_one:
+            first = RequestDataLoader(db).get_agent(agent_id=str(agent_id))
+            first["user"] = "mutated"
+            second = RequestDataLoader(db).get_agent(agent_id=str(agent_id))
+            cache.invalidate("agents")
+            RequestDataLoader(db).get_agent(agent_id=str(ObjectId(agent_id)))
+
+        assert second["user"] == "u1"
+        assert find_one.call_count == 2
@@ -0,0 +1,120 @@
+from unittest.mock import patch
+
+import mongomock
+import pytest
+from bson import ObjectId
+from bson.dbref import DBRef
+
+from application.core.data_loader import RequestDataLoader
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+@pytest.mark.unit
+class TestRequestDataLoader:
+    def test_agent_fetched_once_by_id_and_key(self, db):
+        agent_id = db["agents"].insert_one(
+            {"key": "k1", "user": "u1", "prompt_id": "default", "secret": "x"}
+        ).inserted_id
+        loader = RequestDataLoader(db)
+
+        with patch.object(
+            db["agents"], "find_one", wraps=db["agents"].find_one
+        ) as find_one:
+            by_id = loader.get_agent(agent_id=str(agent_id))
+            by_key = loader.get_agent(api_key="k1")
+            loader.get_agent(api_key="k1")
+
+        assert find_one.call_count == 1
+        assert by_id == by_key
+        assert by_id["user"] == "u1"
+        assert "secret" not in by_id
+
+    def test_missing_agent_is_memoized(self, db):
+        loader = RequestDataLoader(db)
+
+        with patch.object(
+            db["agents"], "find_one", wraps=db["agents"].find_one
+        ) as find_one:
+            assert loader.get_agent(api_key="missing") is None
+            assert loader.get_agent(api_key="missing") is None
+
+        assert find_one.call_count == 1
+
+    def test_returned_documents_are_copies(self, db):
+        db["agents"].insert_one({"key": "k1", "sources": ["default"]})
+        loader = RequestDataLoader(db)
+
+        loader.get_agent(api_key="k1")["sources"].append("other")
+
+        assert loader.get_agent(api_key="k1")["sources"] == ["default"]
+
+    def test_user_tools_seed_tools_by_id(self, db):
+        tool_id = db["user_tools"].insert_one(
+            {"user": "u1", "name": "notes", "status": True}
+        ).inserted_id
+        db["user_tools"].insert_one({"user": "u1", "name": "off", "status": False})
+        loader = RequestDataLoader(db)
+
+        user_tools = loader.get_user_tools("u1")
+        with patch.object(
+            db["user_tools"], "find", wraps=db["user_tools"].find
+        ) as find:
+            tools = loader.get_tools([str(tool_id), str(tool_id)])
+
+        assert [tool["name"] for tool in user_tools] == ["notes"]
+        assert [tool["name"] for tool in tools] == ["notes"]
+        find.assert_not_called()
+
+    def test_prompt_and_reference_memoized(self, db):
+        prompt_id = db["prompts"].insert_one({"content": "Hi", "user": "u1"}).inserted_id
+        source_id = db["sources"].insert_one({"retriever": "classic"}).inserted_id
+        loader = RequestDataLoader(db)
+
+        with patch.object(
+            db["prompts"], "find_one", wraps=db["prompts"].find_one
+        ) as find_one, patch.object(
+            db, "dereference", wraps=db.dereference
+        ) as dereference:
+            loader.get_prompt(str(prompt_id))
+            prompt = loader.get_prompt(str(prompt_id))
+            loader.dereference(DBRef("sources", source_id))
+            source = loader.dereference(DBRef("sources", source_id))
+
+        assert prompt == {"_id": prompt_id, "content": "Hi"}
+        assert source["retriever"] == "classic"
+        assert find_one.call_count == 1
+        assert dereference.call_count == 1
+
+
+@pytest.mark.unit
+class TestStreamProcessorDataLoader:
+    def test_agent_read_once_per_request(self, mock_mongo_db):
+        from application.api.answer.services.stream_processor import StreamProcessor
+        from application.core.settings import settings
+
+        db = mock_mongo_db[settings.MONGO_DB_NAME]
+        agent_id = db["agents"].insert_one(
+            {
+                "key": "agent_key",
+                "user": "u1",
+                "prompt_id": "default",
+                "source": "default",
+            }
+        ).inserted_id
+        processor = StreamProcessor(
+            {"question": "q", "agent_id": str(agent_id)}, {"sub": "u1"}
+        )
+
+        with patch.object(
+            db["agents"], "find_one", wraps=db["agents"].find_one
+        ) as find_one:
+            processor.initialize()
+            processor.data_loader.get_agent(api_key="agent_key")
+
+        assert find_one.call_count == 1
+        assert processor.agent_config["user_api_key"] == "agent_key"
+        assert str(ObjectId(agent_id)) in processor.data_loader._agents_by_id
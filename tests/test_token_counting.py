@@ -0,0 +1,82 @@
+import pytest
+
+from application import utils
+
+
+class FakeEncoding:
+    def __init__(self):
+        self.encode_calls = 0
+        self.batch_calls = 0
+
+    def encode(self, text):
+        self.encode_calls += 1
+        return text.split()
+
+    def encode_batch(self, texts):
+        self.batch_calls += 1
+        return [text.split() for text in texts]
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    encoding = FakeEncoding()
+    monkeypatch.setattr(utils, "get_encoding", lambda: encoding)
+    monkeypatch.setattr(utils, "_token_count_cache", utils.OrderedDict())
+    return encoding
+
+
+@pytest.mark.unit
+class TestTokenCounting:
+    def test_counts_are_memoized(self, fake_encoding):
+        text = "one two three"
+
+        assert utils.num_tokens_from_string(text) == 3
+        assert utils.num_tokens_from_string(text) == 3
+        assert fake_encoding.encode_calls == 1
+
+    def test_long_strings_are_keyed_by_digest(self, fake_encoding):
+        text = "word " * 200
+
+        assert utils.num_tokens_from_string(text) == 200
+        assert text not in utils._token_count_cache
+        assert utils.num_tokens_from_string(text) == 200
+        assert fake_encoding.encode_calls == 1
+
+    def test_non_strings_count_as_zero(self, fake_encoding):
+        assert utils.num_tokens_from_string(None) == 0
+        assert utils.num_tokens_from_strings([None, "a b"]) == [0, 2]
+
+    def test_batch_encodes_only_misses_once(self, fake_encoding):
+        utils.num_tokens_from_string("cached text")
+
+        counts = utils.num_tokens_from_strings(["cached text", "a b c", "a b c", "d"])
+
+        assert counts == [2, 3, 3, 1]
+        assert fake_encoding.batch_calls == 1
+        assert fake_encoding.encode_calls == 1
+
+    def test_cache_is_bounded(self, fake_encoding, monkeypatch):
+        monkeypatch.setattr(utils.settings, "TOKEN_COUNT_CACHE_SIZE", 2)
+
+        for text in ["a", "b", "c"]:
+            utils.num_tokens_from_string(text)
+
+        assert list(utils._token_count_cache) == ["b", "c"]
+
+    def test_estimate_mode_skips_encoding(self, fake_encoding, monkeypatch):
+        monkeypatch.setattr(utils, "_bytes_per_token", 4.0)
+
+        assert utils.num_tokens_from_string("x" * 10, estimate=True) == 3
+        assert utils.num_tokens_from_strings(["x" * 8], estimate=True) == [2]
+        assert fake_encoding.encode_calls == 0
+
+    def test_limit_chat_history_uses_estimate_when_enabled(
+        self, fake_encoding, monkeypatch
+    ):
+        monkeypatch.setattr(utils.settings, "TOKEN_BUDGET_ESTIMATE", True)
+        history = [{"prompt": "p" * 40, "response": "r" * 40}]
+
+        trimmed = utils.limit_chat_history(history, max_token_limit=100)
+
+        assert trimmed == history
+        assert fake_encoding.encode_calls == 0
@@ -0,0 +1,86 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import mongomock
+import pytest
+
+from application.usage import UsageRecorder, gen_token_usage, stream_token_usage
+
+
+def _usage(user_id="u1", tokens=(10, 5), timestamp=None):
+    return {
+        "user_id": user_id,
+        "api_key": None,
+        "prompt_tokens": tokens[0],
+        "generated_tokens": tokens[1],
+        "timestamp": timestamp or datetime(2025, 1, 1, 12, 0, 30),
+    }
+
+
+class FakeLLM:
+    def __init__(self, reported=None):
+        self.decoded_token = {"sub": "u1"}
+        self.user_api_key = None
+        self.token_usage = {"prompt_tokens": 0, "generated_tokens": 0}
+        self._reported = reported
+
+    def _pop_reported_usage(self):
+        usage, self._reported = self._reported, None
+        return usage
+
+
+@pytest.mark.unit
+class TestUsageRecorder:
+    def test_flush_writes_batch_and_rollups(self):
+        collection = mongomock.MongoClient().db.token_usage
+        rollups = MagicMock()
+        recorder = UsageRecorder(collection, rollups, flush_interval=60)
+        recorder._buffer.extend([_usage(), _usage(tokens=(1, 1))])
+
+        assert recorder.flush() == 2
+        assert collection.count_documents({}) == 2
+        rollups.record.assert_called_once_with(
+            "u1", None, datetime(2025, 1, 1, 12, 0), tokens=17
+        )
+        assert recorder.flush() == 0
+
+    def test_failed_flush_requeues_records(self):
+        collection = MagicMock()
+        collection.insert_many.side_effect = RuntimeError("down")
+        recorder = UsageRecorder(collection, MagicMock(), flush_interval=60)
+        recorder._buffer.append(_usage())
+
+        assert recorder.flush() == 0
+        assert len(recorder._buffer) == 1
+
+
+@pytest.mark.unit
+class TestUsageDecorators:
+    def test_gen_prefers_reported_usage(self):
+        llm = FakeLLM(reported={"prompt_tokens": 999, "generated_tokens": 999})
+
+        @gen_token_usage
+        def raw(self, model, messages, stream, tools, **kwargs):
+            self._reported = {"prompt_tokens": 42, "generated_tokens": 7}
+            return "some answer"
+
+        raw(llm, "m", [{"role": "user", "content": "hello"}], False, None)
+
+        assert llm.token_usage == {"prompt_tokens": 42, "generated_tokens": 7}
+
+    def test_stream_counts_joined_text_when_not_reported(self, monkeypatch):
+        monkeypatch.setattr(
+            "application.usage.num_tokens_from_string", lambda text: len(text)
+        )
+        llm = FakeLLM()
+
+        @stream_token_usage
+        def raw(self, model, messages, stream, tools, **kwargs):
+            yield "ab"
+            yield {"tool": "call"}
+            yield "cde"
+
+        chunks = list(raw(llm, "m", [{"role": "user", "content": "hi"}], True, None))
+
+        assert len(chunks) == 3
+        assert llm.token_usage == {"prompt_tokens": 2, "generated_tokens": 5}
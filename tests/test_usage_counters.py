@@ -0,0 +1,169 @@
+import datetime
+import time
+from unittest.mock import MagicMock, patch
+
+import mongomock
+import pytest
+
+from application import usage_counters
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*a, **kw) for name, a, kw in self.ops]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def ping(self):
+        return True
+
+    def hincrby(self, key, field, amount):
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+        return bucket[field]
+
+    def hmget(self, key, *fields):
+        bucket = self.data.get(key, {})
+        return [bucket.get(f) for f in fields]
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def expire(self, key, seconds):
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    usage_counters._unavailable_until = 0.0
+    with patch("application.usage_counters.get_redis_instance", return_value=redis):
+        yield redis
+    usage_counters._unavailable_until = 0.0
+
+
+@pytest.mark.unit
+class TestUsageCounters:
+    def test_unseeded_key_returns_none(self, fake_redis):
+        usage_counters.record_usage("key", 10, 5)
+
+        assert usage_counters.get_window_usage("key") is None
+
+    def test_reconcile_seeds_from_mongo_and_counts_new_usage(self, fake_redis):
+        collection = mongomock.MongoClient().db.token_usage
+        now = datetime.datetime.now()
+        collection.insert_many(
+            [
+                {
+                    "api_key": "key",
+                    "prompt_tokens": 10,
+                    "generated_tokens": 5,
+                    "timestamp": now,
+                },
+                {
+                    "api_key": "key",
+                    "prompt_tokens": 1,
+                    "generated_tokens": 1,
+                    "timestamp": now - datetime.timedelta(hours=2),
+                },
+                {
+                    "api_key": "key",
+                    "prompt_tokens": 100,
+                    "generated_tokens": 100,
+                    "timestamp": now - datetime.timedelta(hours=30),
+                },
+                {
+                    "api_key": "other",
+                    "prompt_tokens": 100,
+                    "generated_tokens": 100,
+                    "timestamp": now,
+                },
+            ]
+        )
+
+        assert usage_counters.reconcile_usage("key", collection) is True
+        assert usage_counters.get_window_usage("key") == {"tokens": 17, "requests": 2}
+
+        usage_counters.record_usage("key", 3, 4)
+
+        assert usage_counters.get_window_usage("key") == {"tokens": 24, "requests": 3}
+
+    def test_reconcile_replaces_drifted_buckets(self, fake_redis):
+        collection = mongomock.MongoClient().db.token_usage
+        usage_counters.record_usage("key", 500, 500)
+
+        usage_counters.reconcile_usage("key", collection)
+
+        assert usage_counters.get_window_usage("key") == {"tokens": 0, "requests": 0}
+
+    def test_old_buckets_fall_out_of_window(self, fake_redis):
+        usage_counters.reconcile_usage("key", mongomock.MongoClient().db.token_usage)
+        usage_counters.record_usage("key", 50, 50, timestamp=time.time() - 25 * 3600)
+
+        assert usage_counters.get_window_usage("key") == {"tokens": 0, "requests": 0}
+
+    def test_redis_errors_trigger_cooldown(self):
+        usage_counters._unavailable_until = 0.0
+        broken = MagicMock()
+        broken.pipeline.side_effect = ConnectionError("down")
+        with patch(
+            "application.usage_counters.get_redis_instance", return_value=broken
+        ) as get_instance:
+            assert usage_counters.get_window_usage("key") is None
+            assert usage_counters.record_usage("key", 1, 1) is False
+        assert get_instance.call_count == 1
+        usage_counters._unavailable_until = 0.0
+
+    def test_mongo_window_usage(self):
+        collection = mongomock.MongoClient().db.token_usage
+        collection.insert_one(
+            {
+                "api_key": "key",
+                "prompt_tokens": 7,
+                "generated_tokens": 3,
+                "timestamp": datetime.datetime.now(),
+            }
+        )
+
+        usage = usage_counters.mongo_window_usage("key", collection)
+
+        assert usage == {"tokens": 10, "requests": 1}
+
+    def test_reconcile_limited_agents_selects_limited_keys(self, fake_redis):
+        db = mongomock.MongoClient().db
+        db.agents.insert_many(
+            [
+                {"key": "a", "limited_token_mode": True},
+                {"key": "b", "limited_request_mode": "True"},
+                {"key": "c", "limited_token_mode": False},
+            ]
+        )
+
+        assert usage_counters.reconcile_limited_agents(db) == 2
+        assert usage_counters.get_window_usage("c") is None
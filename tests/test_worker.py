@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+import mongomock
+import pytest
+from bson.objectid import ObjectId
+
+from application import worker
+from application.parser.file.manifest import manifest_by_path, sha256_file
+from application.storage.local import LocalStorage
+
+
+@pytest.fixture
+def reingest_env(tmp_path, monkeypatch):
+    storage = LocalStorage(str(tmp_path))
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    for name, text in (("a.md", "# A\n\nfirst"), ("b.md", "# B\n\nsecond")):
+        (source_dir / name).write_text(text)
+
+    collection = mongomock.MongoClient().db["sources"]
+    monkeypatch.setattr(worker, "sources_collection", collection)
+    monkeypatch.setattr(worker.StorageCreator, "get_storage", lambda: storage)
+    vector_store = MagicMock()
+    vector_store.delete_by_metadata.return_value = 1
+    monkeypatch.setattr(
+        "application.vectorstore.vector_creator.VectorCreator.create_vectorstore",
+        lambda *args, **kwargs: vector_store,
+    )
+
+    manifest = []
+    structure = {}
+    for name in ("a.md", "b.md"):
+        path = source_dir / name
+        stat = path.stat()
+        manifest.append(
+            {
+                "path": name,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "sha256": sha256_file(str(path)),
+            }
+        )
+        structure[name] = {
+            "type": "text/markdown",
+            "size_bytes": stat.st_size,
+            "token_count": 3,
+        }
+    source_id = collection.insert_one(
+        {
+            "user": "alice",
+            "file_path": "src",
+            "directory_structure": structure,
+            "file_manifest": manifest,
+        }
+    ).inserted_id
+    return {
+        "source_id": str(source_id),
+        "source_dir": source_dir,
+        "collection": collection,
+        "vector_store": vector_store,
+        "old_manifest": manifest_by_path(manifest),
+    }
+
+
+def run_reingest(env):
+    return worker.reingest_source_worker(MagicMock(), env["source_id"], "alice")
+
+
+def stored_manifest(env):
+    source = env["collection"].find_one({"_id": ObjectId(env["source_id"])})
+    return manifest_by_path(source["file_manifest"])
+
+
+def test_reingest_replaces_chunks_of_modified_file(reingest_env):
+    (reingest_env["source_dir"] / "a.md").write_text("# A\n\nchanged content")
+
+    result = run_reingest(reingest_env)
+
+    assert result["modified_files"] == ["a.md"]
+    assert result["failed_files"] == []
+    reingest_env["vector_store"].delete_by_metadata.assert_called_once_with(
+        "source", ["a.md"]
+    )
+    assert reingest_env["vector_store"].add_chunk.called
+    entry = stored_manifest(reingest_env)["a.md"]
+    assert entry["sha256"] == sha256_file(str(reingest_env["source_dir"] / "a.md"))
+
+
+def test_failed_download_keeps_old_manifest_entry(reingest_env, monkeypatch):
+    (reingest_env["source_dir"] / "a.md").write_text("# A\n\nchanged content")
+    download_files = worker.TransferManager.download_files
+    attempts = []
+
+    def flaky_download_files(self, files, sizes=None):
+        attempts.append(files)
+        if len(attempts) == 1:
+            return {storage_path: OSError("connection reset") for storage_path, _ in files}
+        return download_files(self, files, sizes)
+
+    monkeypatch.setattr(worker.TransferManager, "download_files", flaky_download_files)
+
+    result = run_reingest(reingest_env)
+
+    assert result["status"] == "no_changes"
+    assert stored_manifest(reingest_env)["a.md"] == reingest_env["old_manifest"]["a.md"]
+
+    # The next run sees the modification again
+    result = run_reingest(reingest_env)
+    assert result["modified_files"] == ["a.md"]
+
+
+def test_failed_chunk_deletion_skips_reindexing(reingest_env):
+    (reingest_env["source_dir"] / "a.md").write_text("# A\n\nchanged content")
+    os.remove(reingest_env["source_dir"] / "b.md")
+    reingest_env["vector_store"].delete_by_metadata.side_effect = RuntimeError("down")
+
+    result = run_reingest(reingest_env)
+
+    assert result["failed_files"] == ["a.md"]
+    reingest_env["vector_store"].add_chunk.assert_not_called()
+    assert stored_manifest(reingest_env)["a.md"] == reingest_env["old_manifest"]["a.md"]
+    source = reingest_env["collection"].find_one(
+        {"_id": ObjectId(reingest_env["source_id"])}
+    )
+    assert "b.md" in source["directory_structure"]
+
+
+def test_mcp_oauth_reports_a_stalled_discovery_as_failed(monkeypatch):
+    class StalledTool:
+        _client = object()
+
+        def __init__(self, config, user_id):
+            pass
+
+        async def _execute_with_client(self, operation):
+            await asyncio.sleep(10)
+
+    statuses = {}
+    redis_client = MagicMock()
+    redis_client.setex.side_effect = lambda key, ttl, value: statuses.__setitem__(key, value)
+    monkeypatch.setattr(worker, "get_redis_instance", lambda: redis_client)
+    monkeypatch.setitem(
+        sys.modules,
+        "application.agents.tools.mcp_tool",
+        types.SimpleNamespace(MCPTool=StalledTool),
+    )
+    monkeypatch.setattr(worker.settings, "MCP_OAUTH_TIMEOUT_SECONDS", 0.05)
+    task = MagicMock()
+    task.request.id = "task-1"
+
+    result = worker.mcp_oauth(task, {"server_url": "http://mcp.example"}, "alice")
+
+    assert result["success"] is False
+    assert "timed out" in result["error"]
+    assert json.loads(statuses["mcp_oauth_status:task-1"])["status"] == "error"
@@ -0,0 +1,141 @@
+from unittest.mock import MagicMock
+
+import mongomock
+import pytest
+
+from application.vectorstore.base import BaseVectorStore
+from application.vectorstore.elasticsearch import ElasticsearchStore
+from application.vectorstore.mongodb import MongoDBVectorStore
+
+
+CHUNKS = [
+    {"text": "Install with pip", "metadata": {"source": "docs/install.md", "title": "Setup"}},
+    {"text": "Configure the API key", "metadata": {"source": "docs/config.md", "title": "Config"}},
+    {"text": "Run the server", "metadata": {"source": "docs/install.md", "title": "Running"}},
+    {"text": "Deploy to Kubernetes", "metadata": {"source": "ops/deploy.md", "title": "Deploy"}},
+]
+
+
+class InMemoryStore(BaseVectorStore):
+    def search(self, *args, **kwargs):
+        return []
+
+    def add_texts(self, texts, metadatas=None, *args, **kwargs):
+        return []
+
+    def get_chunks(self):
+        return [{"doc_id": str(i), **chunk} for i, chunk in enumerate(CHUNKS)]
+
+
+@pytest.fixture
+def mongo_store():
+    store = MongoDBVectorStore.__new__(MongoDBVectorStore)
+    store._text_key = "text"
+    store._embedding_key = "embedding"
+    store._source_id = "src"
+    store._collection = mongomock.MongoClient().db["documents"]
+    store._collection.insert_many(
+        [
+            {"text": chunk["text"], "embedding": [0.1], "source_id": "src", **chunk["metadata"]}
+            for chunk in CHUNKS
+        ]
+        + [{"text": "Other source", "embedding": [0.1], "source_id": "other"}]
+    )
+    return store
+
+
+@pytest.mark.unit
+class TestIterChunks:
+    def test_fallback_filters_and_pages_in_memory(self):
+        page = InMemoryStore().iter_chunks(path="install.md", offset=1, limit=1)
+
+        assert page.total == 2
+        assert [chunk["text"] for chunk in page.chunks] == ["Run the server"]
+        assert page.next_cursor is None
+
+    def test_mongo_filters_server_side(self, mongo_store):
+        by_path = mongo_store.iter_chunks(path="install.md")
+        by_search = mongo_store.iter_chunks(search="CONFIG")
+
+        assert by_path.total == 2
+        assert by_search.total == 1
+        assert by_search.chunks[0]["metadata"] == {
+            "source": "docs/config.md",
+            "title": "Config",
+        }
+
+    def test_mongo_offset_and_cursor_agree(self, mongo_store):
+        first = mongo_store.iter_chunks(limit=2)
+        by_offset = mongo_store.iter_chunks(offset=2, limit=2)
+        by_cursor = mongo_store.iter_chunks(limit=2, cursor=first.next_cursor)
+
+        assert first.total == 4
+        assert [c["text"] for c in by_offset.chunks] == [
+            "Run the server",
+            "Deploy to Kubernetes",
+        ]
+        assert by_cursor.chunks == by_offset.chunks
+        assert "embedding" not in by_cursor.chunks[0]["metadata"]
+
+    def test_elasticsearch_escapes_wildcards_and_matches_substrings(self):
+        store = ElasticsearchStore.__new__(ElasticsearchStore)
+        store.source_id = "src"
+        store.index_name = "docs"
+        store.docsearch = MagicMock()
+        store.docsearch.search.return_value = {"hits": {"hits": [], "total": {"value": 0}}}
+
+        store.iter_chunks(path="notes*?.md", search="Conf")
+
+        filters = store.docsearch.search.call_args.kwargs["query"]["bool"]["filter"]
+        assert filters[1] == {
+            "wildcard": {"metadata.source.keyword": {"value": "*notes\\*\\?.md"}}
+        }
+        assert filters[2]["bool"]["should"] == [
+            {"wildcard": {"text": {"value": "*Conf*", "case_insensitive": True}}},
+            {
+                "wildcard": {
+                    "metadata.title.keyword": {"value": "*Conf*", "case_insensitive": True}
+                }
+            },
+        ]
+
+
+@pytest.mark.unit
+class TestDeleteByMetadata:
+    def test_fallback_deletes_matching_chunks(self):
+        store = InMemoryStore()
+        deleted_ids = []
+        store.delete_chunk = lambda chunk_id: deleted_ids.append(chunk_id)
+
+        assert store.delete_by_metadata("source", ["docs/install.md"]) == 2
+        assert deleted_ids == ["0", "2"]
+
+    def test_mongo_deletes_in_one_query(self, mongo_store):
+        deleted = mongo_store.delete_by_metadata(
+            "source", ["docs/install.md", "ops/deploy.md"]
+        )
+
+        assert deleted == 3
+        remaining = [c["text"] for c in mongo_store.get_chunks()]
+        assert remaining == ["Configure the API key"]
+        assert mongo_store._collection.count_documents({"source_id": "other"}) == 1
+
+    def test_mongo_creates_the_metadata_index_once(self, mongo_store, monkeypatch):
+        monkeypatch.setattr(MongoDBVectorStore, "_metadata_indexes", set())
+        created = []
+        create_index = mongo_store._collection.create_index
+        monkeypatch.setattr(
+            mongo_store._collection,
+            "create_index",
+            lambda *args, **kwargs: created.append(kwargs["name"]) or create_index(*args, **kwargs),
+        )
+
+        mongo_store.delete_by_metadata("source", ["docs/install.md"])
+        mongo_store.delete_by_metadata("source", ["ops/deploy.md"])
+
+        assert created == ["source_id_source"]
+        assert "source_id_source" in mongo_store._collection.index_information()
+
+    def test_no_values_is_a_no_op(self, mongo_store):
+        assert mongo_store.delete_by_metadata("source", []) == 0
+        assert mongo_store.iter_chunks().total == 4